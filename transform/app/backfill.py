@@ -0,0 +1,378 @@
+"""
+Backfill - 날짜 범위 전체를 프로세스 풀에서 재처리합니다.
+
+blob.rewrite로 파일마다 Cloud Function을 다시 트리거하는 대신
+(데이터 타입, 날짜) 파티션을 작업 단위로 나눠 프로세스 풀에서 BatchRunner로 처리합니다.
+- 카테고리 파티션을 먼저 처리한 뒤 나머지(영상/댓글/채널)를 병렬 처리 (영상의 category_name 매핑)
+- 완료된 파티션은 체크포인트 파일에 기록하여 중단 후 다시 실행하면 이어서 처리
+- 파티션이 끝날 때마다 진행률, records/sec, ETA 출력
+- 날짜가 병렬로(순서 없이) 적재되므로 끝나면 영상 변화량을 적재 범위 전체에서 다시 계산
+"""
+import os
+import json
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.clients import get_bucket, get_supabase_client, reset_clients
+from app.core.decoding import load_gcs_page
+from app.core.ledger import ProcessedFileLedger
+from app.core.snapshot_deltas import SNAPSHOT_INTERVAL, rebuild_snapshot_deltas
+from app.core.watermarks import partition_start
+from app.batch import RAW_PREFIX, BatchRunner, build_partition_prefixes, list_blob_paths
+from app.transformers import TRANSFORM_SPECS
+
+logger = logging.getLogger(__name__)
+
+# 먼저 끝나야 하는 데이터 타입 (영상 변환이 dim_categories를 참조)
+FIRST_PHASE_TYPES = ("video_categories",)
+
+
+@dataclass(frozen=True)
+class BackfillUnit:
+    """작업 단위 = (데이터 타입, 날짜) 파티션"""
+    data_type: str
+    day: str
+    prefix: str
+
+    @property
+    def key(self) -> str:
+        return self.prefix
+
+
+def plan_units(data_types: List[str], start_date: str, end_date: str, region: str = "KR") -> List[BackfillUnit]:
+    """날짜 범위와 데이터 타입을 파티션 작업 단위 목록으로 만듭니다. (TRANSFORM_SPECS 순서)"""
+    units = []
+    for data_type in TRANSFORM_SPECS:
+        if data_type not in data_types:
+            continue
+        for prefix in build_partition_prefixes([data_type], start_date, end_date, region):
+            day = prefix.rstrip("/").rsplit("date=", 1)[1]
+            units.append(BackfillUnit(data_type=data_type, day=day, prefix=prefix))
+    return units
+
+
+def discover_date_range(bucket, data_type: str, region: str = "KR") -> Optional[tuple]:
+    """GCS의 date= 파티션 디렉토리를 조회하여 (최초 날짜, 최근 날짜)를 반환합니다."""
+    if data_type == "channels":
+        prefix = f"{RAW_PREFIX}/channels/"
+    else:
+        prefix = f"{RAW_PREFIX}/{data_type}/region={region}/"
+
+    iterator = bucket.list_blobs(prefix=prefix, delimiter="/")
+    for _ in iterator.pages:
+        pass  # prefixes는 페이지를 모두 읽어야 채워짐
+
+    days = sorted(p.rstrip("/").rsplit("date=", 1)[1] for p in iterator.prefixes if "date=" in p)
+    if not days:
+        return None
+    return days[0], days[-1]
+
+
+def first_partition(bucket, data_type: str, region: str = "KR") -> Optional[datetime]:
+    """watermark가 아직 없을 때 시작할 파티션 (GCS의 최초 날짜 00:00 UTC, 데이터가 없으면 None)"""
+    date_range = discover_date_range(bucket, data_type, region)
+    if not date_range:
+        return None
+    return partition_start(data_type, {"date": date_range[0], "hour": "00"})
+
+
+# ============== 체크포인트 ==============
+
+class BackfillCheckpoint:
+    """
+    완료된 작업 단위와 결과 요약을 JSON 파일로 저장합니다.
+
+    같은 실행 조건(signature)일 때만 이어서 처리하고, 조건이 다르면 새로 시작합니다.
+    파일은 임시 파일에 쓴 뒤 교체하므로 중간에 종료되어도 깨지지 않습니다.
+    """
+
+    def __init__(self, path: Optional[str], signature: Dict[str, Any]):
+        self.path = path
+        self.signature = signature
+        self.completed: Dict[str, Dict[str, Any]] = {}
+
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("signature") == signature:
+                self.completed = saved.get("completed", {})
+                logger.info(f"Resuming backfill from {path}: {len(self.completed)} partitions already done")
+            else:
+                logger.warning(f"Checkpoint {path} was created with different options; starting over")
+
+    def is_done(self, unit: BackfillUnit) -> bool:
+        return unit.key in self.completed
+
+    def mark_done(self, unit: BackfillUnit, summary: Dict[str, Any]) -> None:
+        self.completed[unit.key] = summary
+        self.save()
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"signature": self.signature, "completed": self.completed}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def previous_rate(self) -> Optional[float]:
+        """이전 실행에서 측정한 파일당 처리 시간(초) - 드라이런 ETA 추정용"""
+        files = sum(s.get("files_processed", 0) for s in self.completed.values())
+        seconds = sum(s.get("elapsed_seconds", 0.0) for s in self.completed.values())
+        return seconds / files if files and seconds else None
+
+
+# ============== 작업자 프로세스 ==============
+
+def run_unit(unit: BackfillUnit, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    작업자 프로세스에서 파티션 하나를 처리합니다.
+
+    클라이언트는 프로세스마다 한 번 만들어 재사용하고(app.core.clients, 풀 시작 시 reset_clients로 부모 것을 버림),
+    파일 목록 조회, 처리 완료 파일 제외, prefetch, 묶음 적재는 BatchRunner를 그대로 사용합니다.
+    """
+    bucket = get_bucket(options["bucket_name"])
+    supabase_client = get_supabase_client()
+
+    paths = list_blob_paths(bucket, [unit.prefix])
+    runner = BatchRunner(
+        supabase_client,
+        bucket,
+        workers=options["prefetch_workers"],
+        flush_rows=options["flush_rows"],
+        skip_processed=not options["reprocess"],
+        engine=options["engine"],
+    )
+
+    processed = None
+    if not options["reprocess"]:
+        processed = runner.ledger.load_paths(unit.prefix.split("date=")[0], unit.day, unit.day)
+
+    return runner.run(paths, processed=processed).to_dict()
+
+
+# ============== 진행 상황 ==============
+
+class BackfillProgress:
+    """파티션 완료마다 누적 처리량과 남은 시간을 계산합니다."""
+
+    def __init__(self, total_units: int, done_units: int = 0):
+        self.total_units = total_units
+        self.done_units = done_units
+        self.started_units = done_units
+        self.files_processed = 0
+        self.files_failed = 0
+        self.records_written = 0
+        self.started = time.monotonic()
+
+    def update(self, summary: Dict[str, Any]) -> None:
+        self.done_units += 1
+        self.files_processed += summary.get("files_processed", 0)
+        self.files_failed += summary.get("files_failed", 0)
+        self.records_written += summary.get("records_written", 0)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def records_per_sec(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.records_written / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        finished = self.done_units - self.started_units
+        if finished <= 0:
+            return None
+        return self.elapsed_seconds / finished * (self.total_units - self.done_units)
+
+    def to_dict(self) -> Dict[str, Any]:
+        eta = self.eta_seconds
+        return {
+            "partitions_done": self.done_units,
+            "partitions_total": self.total_units,
+            "files_processed": self.files_processed,
+            "files_failed": self.files_failed,
+            "records_written": self.records_written,
+            "elapsed_seconds": round(self.elapsed_seconds, 1),
+            "records_per_sec": round(self.records_per_sec, 1),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+        }
+
+
+# ============== 실행기 ==============
+
+class BackfillRunner:
+    """
+    파티션 작업 단위를 프로세스 풀에서 처리하는 백필 실행기
+
+    Args:
+        processes: 동시에 처리하는 파티션 수 (프로세스 수)
+        prefetch_workers: 프로세스별 다운로드 스레드 수
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        processes: int = 4,
+        prefetch_workers: int = 8,
+        flush_rows: int = 5000,
+        reprocess: bool = False,
+        engine: str = "columnar",
+        checkpoint: Optional[BackfillCheckpoint] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        self.bucket_name = bucket_name
+        self.processes = processes
+        self.checkpoint = checkpoint or BackfillCheckpoint(None, {})
+        self.on_progress = on_progress
+        self.options = {
+            "bucket_name": bucket_name,
+            "prefetch_workers": prefetch_workers,
+            "flush_rows": flush_rows,
+            "reprocess": reprocess,
+            "engine": engine,
+        }
+
+    def run(self, units: List[BackfillUnit]) -> Dict[str, Any]:
+        """카테고리 파티션을 먼저 처리한 뒤 나머지 파티션을 병렬 처리합니다."""
+        pending = [u for u in units if not self.checkpoint.is_done(u)]
+        progress = BackfillProgress(len(units), done_units=len(units) - len(pending))
+        errors: List[Dict[str, Any]] = []
+
+        logger.info(f"Backfill start: {len(pending)}/{len(units)} partitions, {self.processes} processes")
+
+        phases = [
+            [u for u in pending if u.data_type in FIRST_PHASE_TYPES],
+            [u for u in pending if u.data_type not in FIRST_PHASE_TYPES],
+        ]
+
+        # 부모가 계획 단계에서 만든 GCS/Supabase 클라이언트(HTTP 연결 풀 포함)가 fork로 복사되므로
+        # 작업자마다 캐시를 비워 자기 클라이언트를 새로 만들게 함 (소켓 공유 방지)
+        with ProcessPoolExecutor(max_workers=self.processes, initializer=reset_clients) as executor:
+            for phase in phases:
+                futures = {executor.submit(run_unit, unit, self.options): unit for unit in phase}
+                for future in as_completed(futures):
+                    unit = futures[future]
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        logger.error(f"Partition failed: {unit.key}: {e}")
+                        errors.append({"partition": unit.key, "error": str(e)})
+                        continue
+
+                    progress.update(summary)
+                    if summary.get("files_failed", 0) == 0:
+                        # 실패 파일이 있는 파티션은 다음 실행에서 다시 처리 (성공 파일은 원장으로 건너뜀)
+                        self.checkpoint.mark_done(unit, summary)
+                    errors.extend(summary.get("errors", []))
+
+                    snapshot = progress.to_dict()
+                    logger.info(
+                        f"[{snapshot['partitions_done']}/{snapshot['partitions_total']}] {unit.key} "
+                        f"files={summary.get('files_processed', 0)} records={summary.get('records_written', 0)} | "
+                        f"total records={snapshot['records_written']} "
+                        f"{snapshot['records_per_sec']} rec/s ETA {_format_eta(snapshot['eta_seconds'])}"
+                    )
+                    if self.on_progress:
+                        self.on_progress(snapshot)
+
+        video_days = sorted(u.day for u in pending if u.data_type == "videos_list")
+        if video_days:
+            try:
+                rebuild_video_deltas(video_days[0], video_days[-1])
+            except Exception as e:
+                logger.error(f"Delta rebuild failed: {e}")
+                errors.append({"partition": "snapshot_deltas", "error": str(e)})
+
+        result = progress.to_dict()
+        result["errors"] = errors[:20]
+        logger.info(f"Backfill complete: {json.dumps(result, ensure_ascii=False)}")
+        return result
+
+
+def rebuild_video_deltas(start_day: str, end_day: str) -> int:
+    """
+    백필한 날짜 범위와 다음 날 첫 hour의 영상 변화량을 다시 계산합니다.
+
+    프로세스마다 적재 직후 다음 스냅샷을 보정하지만, 인접한 날짜가 동시에 적재되면
+    서로의 행을 보지 못한 채 계산될 수 있으므로 전체가 끝난 뒤 한 번 더 맞춥니다.
+    """
+    start = datetime.fromisoformat(start_day).replace(tzinfo=timezone.utc)
+    end = datetime.fromisoformat(end_day).replace(tzinfo=timezone.utc) + timedelta(days=1) + SNAPSHOT_INTERVAL
+    return rebuild_snapshot_deltas(get_supabase_client(), start, end)
+
+
+def _format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    minutes, sec = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{sec:02d}"
+
+
+# ============== 드라이런 추정 ==============
+
+def estimate_backfill(
+    bucket,
+    supabase_client,
+    units: List[BackfillUnit],
+    reprocess: bool = False,
+    sample_files: int = 3,
+    seconds_per_file: Optional[float] = None,
+    workers: int = 8
+) -> Dict[str, Any]:
+    """
+    실제 적재 없이 대상 파일 수와 예상 레코드 수/소요 시간을 추정합니다.
+
+    - 파일 수: 파티션 목록 조회 + 처리 완료 파일 제외
+    - 레코드 수: 데이터 타입별 sample_files개 파일의 item 수 평균 × 남은 파일 수
+    - 소요 시간: seconds_per_file(이전 실행 체크포인트 기준)이 있을 때만
+    """
+    ledger = ProcessedFileLedger(supabase_client)
+    by_type: Dict[str, Dict[str, Any]] = {}
+
+    for unit in units:
+        stats = by_type.setdefault(unit.data_type, {"partitions": 0, "files": 0, "remaining_files": 0, "_sample": []})
+        paths = list_blob_paths(bucket, [unit.prefix], workers=workers)
+        if not reprocess and paths:
+            processed = ledger.load_paths(unit.prefix.split("date=")[0], unit.day, unit.day)
+            remaining = [p for p in paths if p not in processed]
+        else:
+            remaining = paths
+
+        stats["partitions"] += 1
+        stats["files"] += len(paths)
+        stats["remaining_files"] += len(remaining)
+        if len(stats["_sample"]) < sample_files:
+            stats["_sample"].extend(remaining[:sample_files - len(stats["_sample"])])
+
+    total_files = 0
+    total_records = 0
+    for data_type, stats in by_type.items():
+        sample = stats.pop("_sample")
+        counts = [len(load_gcs_page(bucket, path, data_type).items) for path in sample]
+        items_per_file = sum(counts) / len(counts) if counts else 0.0
+        stats["items_per_file"] = round(items_per_file, 1)
+        stats["estimated_records"] = int(items_per_file * stats["remaining_files"])
+        total_files += stats["remaining_files"]
+        total_records += stats["estimated_records"]
+
+    return {
+        "partitions": len(units),
+        "remaining_files": total_files,
+        "estimated_records": total_records,
+        "estimated_seconds": round(seconds_per_file * total_files, 1) if seconds_per_file else None,
+        "by_data_type": by_type,
+    }
+
+
+def backfill_signature(data_types: List[str], start_date: str, end_date: str, region: str) -> Dict[str, Any]:
+    """체크포인트 재사용 여부를 판단하는 실행 조건"""
+    return {"data_types": sorted(data_types), "start_date": start_date, "end_date": end_date, "region": region}
+
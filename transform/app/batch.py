@@ -0,0 +1,471 @@
+"""
+Batch Runner - 여러 GCS 파일을 한 번의 실행에서 변환/적재합니다.
+
+Cloud Function(transform_handler)은 파일 1개당 1회 호출되므로
+백필/밀린 데이터 처리 시에는 이 실행기로 클라이언트와 카테고리 매핑을 한 번만 만들고,
+파일을 병렬로 미리 받아(prefetch) 변환한 뒤 테이블별로 모아서 적재합니다.
+"""
+import re
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.utils import extract_metadata_from_path, iter_dates
+from app.core.decoding import load_gcs_page
+from app.core.database import PartialWriteError, dedupe_by_keys, get_category_map, invalidate_category_cache
+from app.core.loaders import get_loader
+from app.core.ledger import PathSet, ProcessedFileLedger
+from app.core.watermarks import DAILY_TYPES, Watermark
+from app.transformers import TRANSFORM_SPECS, TransformSpec, get_transformer_for_path
+
+logger = logging.getLogger(__name__)
+
+RAW_PREFIX = "raw/youtube"
+
+
+# ============== 대상 파일 목록 ==============
+
+def build_partition_prefixes(
+    data_types: Iterable[str],
+    start_date: str,
+    end_date: str,
+    region: str = "KR"
+) -> List[str]:
+    """
+    날짜 범위와 데이터 타입에 해당하는 date= 파티션 prefix 목록을 만듭니다.
+
+    Example: raw/youtube/videos_list/region=KR/date=2026-01-12/
+    """
+    prefixes = []
+    for data_type in data_types:
+        for day in iter_dates(start_date, end_date):
+            if data_type == "channels":
+                # 채널 데이터는 region 파티션이 없음
+                prefixes.append(f"{RAW_PREFIX}/channels/date={day}/")
+            else:
+                prefixes.append(f"{RAW_PREFIX}/{data_type}/region={region}/date={day}/")
+    return prefixes
+
+
+def is_data_file(blob_path: str) -> bool:
+    """변환 대상 데이터 파일 여부 (_metadata.json, 비 JSON 파일 제외)"""
+    if blob_path.endswith("_metadata.json"):
+        return False
+    return blob_path.endswith(".json") or blob_path.endswith(".json.gz")
+
+
+def list_blob_paths(bucket, prefixes: Iterable[str], workers: int = 8) -> List[str]:
+    """여러 prefix를 병렬로 조회하여 데이터 파일 경로 목록을 반환합니다."""
+    prefixes = list(prefixes)
+
+    def _list(prefix: str) -> List[str]:
+        return [blob.name for blob in bucket.list_blobs(prefix=prefix) if is_data_file(blob.name)]
+
+    paths: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(prefixes) or 1))) as executor:
+        for result in executor.map(_list, prefixes):
+            paths.extend(result)
+
+    return sorted(paths)
+
+
+def build_watermark_prefixes(data_type: str, partitions: Iterable[datetime], region: str = "KR") -> List[str]:
+    """
+    파티션 시작 시각 목록 → 나열할 prefix 목록
+
+    hour 파티션 24개가 모두 포함된 날짜는 date= prefix 하나로 조회합니다.
+    Example: raw/youtube/videos_list/region=KR/date=2026-01-12/hour=05/
+    """
+    hours_by_day: Dict[str, List[int]] = {}
+    for partition in sorted(set(partitions)):
+        hours_by_day.setdefault(partition.date().isoformat(), []).append(partition.hour)
+
+    prefixes = []
+    for day, hours in hours_by_day.items():
+        day_prefix = build_partition_prefixes([data_type], day, day, region)[0]
+        if data_type in DAILY_TYPES or len(hours) == 24:
+            prefixes.append(day_prefix)
+        else:
+            prefixes.extend(f"{day_prefix}hour={hour:02d}/" for hour in hours)
+    return prefixes
+
+
+def list_since_watermark(
+    bucket,
+    mark: Watermark,
+    until: datetime,
+    start: Optional[datetime] = None,
+    region: str = "KR",
+    workers: int = 8
+) -> Tuple[List[datetime], List[str]]:
+    """
+    watermark 이후 파티션과 holes만 나열합니다.
+
+    Returns:
+        (확인한 파티션 시작 시각 목록, 데이터 파일 경로 목록)
+    """
+    partitions = mark.pending_partitions(until, start)
+    prefixes = build_watermark_prefixes(mark.data_type, partitions, region)
+    return partitions, list_blob_paths(bucket, prefixes, workers=workers)
+
+
+_HOUR_PARTITION = re.compile(r"date=(\d{4}-\d{2}-\d{2})/hour=(\d{2})/")
+
+
+def previous_hour_prefix(run_prefix: str) -> Optional[str]:
+    """
+    같은 run(run_id= 또는 video_id= 디렉토리)을 한 시간 앞 hour 파티션에서 찾을 prefix
+
+    수집기는 업로드마다 hour= 파티션을 계산하므로, hour 경계를 넘긴 run은 앞 페이지가 이전 hour에,
+    나머지와 _metadata.json이 다음 hour에 있습니다. (hour=00이면 전날 hour=23)
+    hour 파티션이 없는 경로(channels)는 None.
+
+    Example:
+        .../date=2026-01-13/hour=00/run_id=r1/ -> .../date=2026-01-12/hour=23/run_id=r1/
+    """
+    match = _HOUR_PARTITION.search(run_prefix)
+    if not match:
+        return None
+    previous = datetime.strptime(f"{match.group(1)} {match.group(2)}", "%Y-%m-%d %H") - timedelta(hours=1)
+    return f"{run_prefix[:match.start()]}date={previous:%Y-%m-%d}/hour={previous:%H}/{run_prefix[match.end():]}"
+
+
+def read_manifest(bucket, manifest_path: str) -> List[str]:
+    """
+    실행 매니페스트에서 처리할 파일 목록을 읽습니다.
+
+    - 로컬 파일: JSON 리스트, {"files": [...]} 또는 줄 단위 경로 목록
+    - GCS의 run 디렉토리 _metadata.json: 같은 run_id 디렉토리의 모든 페이지 파일
+    """
+    if manifest_path.endswith("_metadata.json"):
+        blob_path = manifest_path.replace(f"gs://{bucket.name}/", "")
+        run_prefix = blob_path.rsplit("/", 1)[0] + "/"
+        return list_blob_paths(bucket, [run_prefix])
+
+    with open(manifest_path, encoding="utf-8") as f:
+        content = f.read()
+
+    try:
+        parsed = json.loads(content)
+        paths = parsed.get("files", []) if isinstance(parsed, dict) else parsed
+    except json.JSONDecodeError:
+        paths = [line.strip() for line in content.splitlines() if line.strip()]
+
+    return [p.replace(f"gs://{bucket.name}/", "") for p in paths]
+
+
+def prefetch_pages(
+    bucket,
+    blob_paths: List[str],
+    data_type: str,
+    workers: int = 8,
+    window: int = 32
+) -> Iterator[Tuple[str, Optional[Any], Optional[Exception]]]:
+    """
+    파일을 병렬로 다운로드/압축해제/디코딩하여 입력 순서대로 반환합니다.
+
+    window 개수만큼만 미리 받아두므로 메모리 사용량이 전체 파일 수에 비례하지 않습니다.
+
+    Yields:
+        (blob_path, page, error) - page는 data_type별 페이지 구조체 (app.core.decoding)
+    """
+    def _load(path: str):
+        try:
+            return load_gcs_page(bucket, path, data_type), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        path_iter = iter(blob_paths)
+
+        for path in path_iter:
+            pending.append((path, executor.submit(_load, path)))
+            if len(pending) >= window:
+                break
+
+        while pending:
+            path, future = pending.popleft()
+            raw_data, error = future.result()
+            yield path, raw_data, error
+
+            next_path = next(path_iter, None)
+            if next_path is not None:
+                pending.append((next_path, executor.submit(_load, next_path)))
+
+
+# ============== 적재 ==============
+
+def write_spec_records(
+    client,
+    loader,
+    spec: TransformSpec,
+    records: List[Dict[str, Any]],
+    pending_files: List[Tuple[str, int, Dict[str, Any]]]
+) -> int:
+    """
+    여러 파일의 레코드를 TransformSpec 순서대로 한 번에 적재합니다.
+
+    중복 제거 → before_write → write(전용 적재) 또는 upsert/insert → after_write
+
+    Args:
+        records: pending_files 순서대로 파일별 레코드를 이어 붙인 목록
+        pending_files: (파일 경로, 레코드 수, 경로 메타데이터)
+
+    Returns:
+        int: 반영된 행 수
+    """
+    # after_write는 파일 순서의 원본 레코드를 받음 (pending_files의 레코드 수와 대응)
+    rows = dedupe_by_keys(records, spec.on_conflict) if spec.on_conflict else records
+    if spec.before_write:
+        rows = spec.before_write(client, rows)
+    if spec.write:
+        written = spec.write(client, rows)
+    elif spec.on_conflict:
+        written = loader.upsert(spec.table_name, rows, on_conflict=spec.on_conflict)
+    else:
+        written = loader.insert(spec.table_name, rows)
+    if spec.after_write:
+        spec.after_write(client, records, pending_files)
+    return written
+
+
+# ============== 배치 실행 ==============
+
+@dataclass
+class BatchSummary:
+    """배치 실행 결과 요약"""
+    files_total: int = 0
+    files_processed: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    records_written: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def records_per_sec(self) -> float:
+        return self.records_written / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "files_total": self.files_total,
+            "files_processed": self.files_processed,
+            "files_skipped": self.files_skipped,
+            "files_failed": self.files_failed,
+            "records_written": self.records_written,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "records_per_sec": round(self.records_per_sec, 1),
+            "errors": self.errors[:20],
+        }
+
+
+class BatchRunner:
+    """
+    여러 파일을 한 번에 처리하는 변환 실행기
+
+    - Supabase/GCS 클라이언트와 카테고리 매핑을 실행당 한 번만 준비
+    - prefetch_pages로 다운로드/파싱을 병렬화
+    - engine="columnar"이면 영상을 여러 페이지씩 열 단위로 변환 (행 단위 변환과 결과 동일)
+    - 테이블별 레코드를 flush_rows 단위로 모아서 적재
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        bucket,
+        workers: int = 8,
+        flush_rows: int = 5000,
+        skip_processed: bool = True,
+        dry_run: bool = False,
+        engine: str = "columnar"
+    ):
+        self.client = supabase_client
+        self.bucket = bucket
+        self.workers = workers
+        self.flush_rows = flush_rows
+        self.skip_processed = skip_processed
+        self.dry_run = dry_run
+        self.engine = engine
+        self.loader = get_loader(supabase_client)
+        self.ledger = ProcessedFileLedger(supabase_client)
+        self._failed_entries: List[Dict[str, Any]] = []
+
+    def run(self, blob_paths: Iterable[str], processed: Optional[PathSet] = None) -> BatchSummary:
+        """
+        파일 목록을 데이터 타입 순서(카테고리 → 영상 → 댓글 → 채널)로 처리합니다.
+
+        Args:
+            blob_paths: 처리할 GCS 경로
+            processed: 호출자가 파티션 단위로 미리 조회한 처리 완료 경로 (없으면 경로 목록으로 조회)
+        """
+        started = time.monotonic()
+        summary = BatchSummary()
+
+        grouped: Dict[str, List[str]] = {data_type: [] for data_type in TRANSFORM_SPECS}
+        for path in blob_paths:
+            if not is_data_file(path):
+                continue
+            _, data_type = get_transformer_for_path(path)
+            if data_type in grouped:
+                grouped[data_type].append(path)
+
+        summary.files_total = sum(len(paths) for paths in grouped.values())
+
+        if self.skip_processed and summary.files_total:
+            if processed is None:
+                processed = self.ledger.processed_among(p for paths in grouped.values() for p in paths)
+            for data_type, paths in grouped.items():
+                remaining = [p for p in paths if p not in processed]
+                summary.files_skipped += len(paths) - len(remaining)
+                grouped[data_type] = remaining
+
+        logger.info(
+            f"Batch start: {summary.files_total} files "
+            f"({summary.files_skipped} already processed, dry_run={self.dry_run})"
+        )
+
+        if not self.dry_run:
+            for data_type, paths in grouped.items():
+                if paths:
+                    self._run_data_type(TRANSFORM_SPECS[data_type], paths, summary)
+
+        summary.elapsed_seconds = time.monotonic() - started
+        logger.info(f"Batch complete: {json.dumps(summary.to_dict(), ensure_ascii=False)}")
+        return summary
+
+    def _run_data_type(self, spec: TransformSpec, paths: List[str], summary: BatchSummary) -> None:
+        """단일 데이터 타입의 파일들을 변환하고 flush_rows 단위로 적재합니다."""
+        category_map = get_category_map(self.client) if spec.needs_category_map else None
+        columnar = self.engine == "columnar" and spec.build_batch is not None
+
+        pages: List[Tuple[str, List[Any], Dict[str, Any]]] = []
+        page_items = 0
+
+        for path, page, error in prefetch_pages(self.bucket, paths, spec.data_type, workers=self.workers):
+            metadata = extract_metadata_from_path(path)
+            if error is not None:
+                self._record_failure(path, spec.data_type, metadata, error, summary)
+                continue
+
+            items = page.items
+            pages.append((path, items, metadata))
+            page_items += len(items)
+
+            if page_items >= self.flush_rows:
+                self._build_and_flush(spec, pages, category_map, columnar, summary)
+                pages, page_items = [], 0
+
+        if pages:
+            self._build_and_flush(spec, pages, category_map, columnar, summary)
+
+        if self._failed_entries:
+            self.ledger.record_many(self._failed_entries)
+            self._failed_entries = []
+
+    def _build_and_flush(
+        self,
+        spec: TransformSpec,
+        pages: List[Tuple[str, List[Any], Dict[str, Any]]],
+        category_map: Optional[Dict[str, str]],
+        columnar: bool,
+        summary: BatchSummary
+    ) -> None:
+        """
+        모아둔 페이지를 레코드로 변환하여 적재합니다.
+
+        columnar 엔진은 페이지 전체를 한 번에 변환하고, 실패하면 어느 파일이 문제인지
+        가리기 위해 페이지별 행 단위 변환으로 다시 시도합니다.
+        """
+        page_records: Optional[List[List[Dict[str, Any]]]] = None
+        if columnar:
+            batch = [(items, metadata) for _, items, metadata in pages]
+            try:
+                if spec.needs_category_map:
+                    page_records = spec.build_batch(batch, category_map)
+                else:
+                    page_records = spec.build_batch(batch)
+            except Exception as e:
+                logger.warning(f"Columnar transform failed for {len(pages)} files, retrying per file: {e}")
+
+        buffer: List[Dict[str, Any]] = []
+        pending_files: List[Tuple[str, int, Dict[str, Any]]] = []
+
+        for index, (path, items, metadata) in enumerate(pages):
+            if page_records is not None:
+                records = page_records[index]
+            else:
+                try:
+                    if spec.needs_category_map:
+                        records = spec.build_records(items, metadata, category_map)
+                    else:
+                        records = spec.build_records(items, metadata)
+                except Exception as e:
+                    self._record_failure(path, spec.data_type, metadata, e, summary)
+                    continue
+
+            buffer.extend(records)
+            pending_files.append((path, len(records), metadata))
+
+        if pending_files:
+            self._flush(spec, buffer, pending_files, summary)
+
+    def _flush(
+        self,
+        spec: TransformSpec,
+        records: List[Dict[str, Any]],
+        pending_files: List[Tuple[str, int, Dict[str, Any]]],
+        summary: BatchSummary
+    ) -> None:
+        """모아둔 레코드를 한 번에 적재하고 포함된 파일들을 processed_files에 기록합니다."""
+        try:
+            written = write_spec_records(self.client, self.loader, spec, records, pending_files)
+        except Exception as e:
+            if isinstance(e, PartialWriteError):
+                summary.records_written += e.written
+            for path, _, metadata in pending_files:
+                self._record_failure(path, spec.data_type, metadata, e, summary)
+            return
+
+        if spec.table_name == "dim_categories":
+            invalidate_category_cache()
+
+        self.ledger.record_many(
+            {
+                "file_path": path,
+                "status": "success",
+                "data_type": spec.data_type,
+                "records_count": count,
+                "metadata": metadata,
+            }
+            for path, count, metadata in pending_files
+        )
+
+        summary.files_processed += len(pending_files)
+        summary.records_written += written
+        logger.info(f"Flushed {written} rows into {spec.table_name} from {len(pending_files)} files")
+
+    def _record_failure(
+        self,
+        path: str,
+        data_type: str,
+        metadata: Dict[str, Any],
+        error: Exception,
+        summary: BatchSummary
+    ) -> None:
+        """실패한 파일을 모아두었다가 데이터 타입 처리가 끝나면 error로 일괄 기록합니다."""
+        logger.error(f"Transform failed for {path}: {error}")
+        self._failed_entries.append({
+            "file_path": path,
+            "status": "error",
+            "data_type": data_type,
+            "error_message": str(error),
+            "metadata": metadata,
+        })
+        summary.files_failed += 1
+        summary.errors.append({"file_path": path, "error": str(error)})
@@ -0,0 +1,58 @@
+"""
+Channel History - 채널 통계 이력(fact_channel_stats) 적재
+
+dim_channels UPSERT 후 같은 레코드의 통계만 record_channel_stats RPC로 넘깁니다.
+DB 함수가 직전 구간과 값이 같으면 구간만 연장하고, 바뀐 경우에만 새 행(+delta)을 추가합니다.
+(migrations/0006_channel_stats_history.sql)
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+HISTORY_CHUNK_ROWS = 1000
+
+STAT_FIELDS = ("subscriber_count", "total_view_count", "video_count")
+
+
+def channel_collected_at(metadata: Dict[str, Any]) -> str:
+    """
+    채널 파일의 수집 시각 (date 파티션 00:00 UTC)
+
+    채널 경로에는 hour 파티션이 없으므로 날짜 단위로 맞춥니다. 같은 파일은 항상 같은 값이 됩니다.
+    """
+    try:
+        day = datetime.strptime(metadata["date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except (KeyError, TypeError, ValueError):
+        day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return day.isoformat()
+
+
+def build_channel_stat_rows(records: List[Dict[str, Any]], metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """dim_channels 레코드 → 이력 관측값"""
+    collected_at = channel_collected_at(metadata)
+    return [
+        {"channel_id": r["channel_id"], "collected_at": collected_at, **{f: r.get(f) for f in STAT_FIELDS}}
+        for r in records
+        if r.get("channel_id")
+    ]
+
+
+def record_channel_history(client, rows: List[Dict[str, Any]]) -> int:
+    """
+    관측값을 이력에 반영합니다.
+
+    Returns:
+        int: 새로 추가되거나 값이 바뀐 구간 수 (값이 그대로인 채널은 0)
+    """
+    rows = sorted(rows, key=lambda r: (r["channel_id"], r["collected_at"]))
+    changed = 0
+    for start in range(0, len(rows), HISTORY_CHUNK_ROWS):
+        chunk = rows[start:start + HISTORY_CHUNK_ROWS]
+        result = client.rpc("record_channel_stats", {"stats": chunk}).execute()
+        changed += result.data if isinstance(result.data, int) else 0
+
+    if rows:
+        logger.info(f"Channel history: {len(rows)} observations, {changed} changed")
+    return changed
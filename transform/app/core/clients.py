@@ -0,0 +1,78 @@
+"""
+Clients - GCS / Supabase 클라이언트 싱글톤
+
+Cloud Function 인스턴스가 웜 상태로 재사용되는 동안
+매 이벤트마다 클라이언트를 새로 만들지 않도록 모듈 레벨에서 지연 생성합니다.
+"""
+import os
+import threading
+from typing import Dict, Optional
+
+from google.cloud import storage
+from supabase import create_client, Client
+
+_lock = threading.Lock()
+_gcs_client: Optional[storage.Client] = None
+_supabase_client: Optional[Client] = None
+_buckets: Dict[str, storage.Bucket] = {}
+
+
+def get_gcs_client() -> storage.Client:
+    """GCS 클라이언트 (최초 호출 시 생성)"""
+    global _gcs_client
+
+    if _gcs_client is None:
+        with _lock:
+            if _gcs_client is None:
+                gcp_project = os.environ.get("GCP_PROJECT_ID", "deproject-482905")
+                _gcs_client = storage.Client(project=gcp_project)
+
+    return _gcs_client
+
+
+def get_bucket(bucket_name: str) -> storage.Bucket:
+    """버킷 핸들 (버킷 이름별로 재사용)"""
+    bucket = _buckets.get(bucket_name)
+    if bucket is None:
+        bucket = get_gcs_client().bucket(bucket_name)
+        _buckets[bucket_name] = bucket
+    return bucket
+
+
+def get_supabase_client() -> Client:
+    """Supabase 클라이언트 (최초 호출 시 생성)"""
+    global _supabase_client
+
+    if _supabase_client is None:
+        with _lock:
+            if _supabase_client is None:
+                _supabase_client = create_client(
+                    os.environ.get("SUPABASE_URL"),
+                    os.environ.get("SUPABASE_SERVICE_KEY")
+                )
+
+    return _supabase_client
+
+
+def override_clients(supabase_client=None, buckets: Optional[Dict[str, "storage.Bucket"]] = None) -> None:
+    """
+    클라이언트를 주입합니다. (오프라인 하네스의 로컬 Postgres/파일시스템 버킷 등 같은 인터페이스의 대체 구현)
+
+    reset_clients()로 되돌립니다.
+    """
+    global _supabase_client
+
+    with _lock:
+        if supabase_client is not None:
+            _supabase_client = supabase_client
+        _buckets.update(buckets or {})
+
+
+def reset_clients() -> None:
+    """캐시된 클라이언트 초기화 (테스트/자격 증명 변경 시)"""
+    global _gcs_client, _supabase_client
+
+    with _lock:
+        _gcs_client = None
+        _supabase_client = None
+        _buckets.clear()
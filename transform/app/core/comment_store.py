@@ -0,0 +1,44 @@
+"""
+Comment Store - 시간별 댓글 관측을 dim_comments(comment_id당 1행)에 병합
+
+merge_comments RPC가 first_seen_at / last_seen_at과 최신 좋아요/답글 수를 갱신하고,
+COMMENT_COUNT_HISTORY가 켜져 있으면 값이 바뀐 관측만 fact_comment_counts에 남깁니다.
+(migrations/0007_comment_store.sql)
+"""
+import os
+import logging
+from typing import Any, Dict, List
+
+from app.core.database import write_chunked
+
+logger = logging.getLogger(__name__)
+
+COMMENT_TABLE = "dim_comments"
+COMMENT_COUNT_HISTORY = os.environ.get("COMMENT_COUNT_HISTORY", "1") != "0"
+
+
+def merge_comments(client, records: List[Dict[str, Any]]) -> int:
+    """
+    build_comment_records 형식의 관측을 병합합니다. (청크 병렬 전송, 실패 청크 재시도)
+
+    Returns:
+        int: 병합된 고유 comment_id 수 (청크별 합계)
+
+    Raises:
+        PartialWriteError: 일부 청크만 병합된 경우
+    """
+    if not records:
+        return 0
+
+    def _send(chunk: List[Dict[str, Any]]) -> int:
+        result = client.rpc(
+            "merge_comments",
+            {"comments": chunk, "keep_history": COMMENT_COUNT_HISTORY}
+        ).execute()
+        return result.data if isinstance(result.data, int) else len(chunk)
+
+    try:
+        return write_chunked(COMMENT_TABLE, records, _send)
+    except Exception as e:
+        logger.error(f"Comment merge failed: {e}")
+        raise
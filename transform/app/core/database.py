@@ -1,12 +1,27 @@
 """
 Database Operations - Supabase 관련 DB 작업
 """
+import os
+import json
+import time
 import logging
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, Any, List
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# 대량 쓰기 분할 설정 (PostgREST 요청 크기 제한 회피)
+WRITE_CHUNK_ROWS = int(os.environ.get("WRITE_CHUNK_ROWS", "500"))
+WRITE_CHUNK_BYTES = int(os.environ.get("WRITE_CHUNK_BYTES", str(1024 * 1024)))
+WRITE_PARALLELISM = int(os.environ.get("WRITE_PARALLELISM", "4"))
+WRITE_MAX_ATTEMPTS = int(os.environ.get("WRITE_MAX_ATTEMPTS", "3"))
+
+# dim_categories 인프로세스 캐시 (웜 인스턴스에서 재사용, transform_categories upsert 시 무효화)
+CATEGORY_CACHE_TTL_SECONDS = int(os.environ.get("CATEGORY_CACHE_TTL_SECONDS", "600"))
+_category_cache: Dict[str, str] = {}
+_category_cache_loaded_at: Optional[float] = None
+
 
 def is_file_processed(client, file_path: str) -> bool:
     """
@@ -23,6 +38,32 @@ def is_file_processed(client, file_path: str) -> bool:
         return False
 
 
+def build_processed_record(
+    file_path: str,
+    status: str,
+    data_type: str,
+    records_count: int = 0,
+    error_message: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """processed_files에 저장할 레코드를 만듭니다."""
+    record = {
+        "file_path": file_path,
+        "status": status,
+        "data_type": data_type,
+        "records_count": records_count,
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    
+    if error_message:
+        record["error_message"] = error_message
+    
+    if metadata:
+        record["metadata"] = metadata
+    
+    return record
+
+
 def record_processed_file(
     client,
     file_path: str,
@@ -34,22 +75,16 @@ def record_processed_file(
 ) -> None:
     """
     처리된 파일을 기록합니다.
+    
+    여러 파일을 한 번에 기록할 때는 ProcessedFileLedger.record_many를 사용합니다.
     """
     try:
-        record = {
-            "file_path": file_path,
-            "status": status,
-            "data_type": data_type,
-            "records_count": records_count,
-            "processed_at": datetime.now(timezone.utc).isoformat(),
-        }
-        
-        if error_message:
-            record["error_message"] = error_message
-        
-        if metadata:
-            record["metadata"] = metadata
-        
+        record = build_processed_record(
+            file_path, status, data_type,
+            records_count=records_count,
+            error_message=error_message,
+            metadata=metadata
+        )
         client.table("processed_files").insert(record).execute()
         logger.info(f"Recorded processed file: {file_path} ({status})")
     except Exception as e:
@@ -58,34 +93,210 @@ def record_processed_file(
 
 
 
-def get_category_map(client) -> Dict[str, str]:
+def get_category_map(client, use_cache: bool = True) -> Dict[str, str]:
     """
     카테고리 ID -> 이름 매핑을 조회합니다.
     
+    CATEGORY_CACHE_TTL_SECONDS 동안은 프로세스 내 캐시를 사용합니다.
+    빈 결과는 캐시하지 않습니다. (카테고리 적재 전 상태를 계속 기억하지 않도록)
+    
     Returns:
         dict: {"10": "Music", "20": "Gaming", ...}
     """
+    global _category_cache, _category_cache_loaded_at
+    
+    if use_cache and _category_cache_loaded_at is not None:
+        if time.monotonic() - _category_cache_loaded_at < CATEGORY_CACHE_TTL_SECONDS:
+            return _category_cache
+    
     try:
         result = client.table("dim_categories").select("category_id, category_name").execute()
-        return {str(row["category_id"]): row["category_name"] for row in result.data}
+        category_map = {str(row["category_id"]): row["category_name"] for row in result.data}
     except Exception as e:
         logger.warning(f"Could not load category map: {e}")
         return {}
+    
+    if category_map:
+        _category_cache = category_map
+        _category_cache_loaded_at = time.monotonic()
+    
+    return category_map
+
+
+def invalidate_category_cache() -> None:
+    """카테고리 캐시를 무효화합니다. (dim_categories 변경 후 호출)"""
+    global _category_cache, _category_cache_loaded_at
+    
+    _category_cache = {}
+    _category_cache_loaded_at = None
+
+
+class PartialWriteError(Exception):
+    """
+    일부 청크만 적재된 상태에서 재시도가 모두 실패했을 때 발생합니다.
+    
+    Attributes:
+        written: 실제로 적재된 레코드 수
+        failed: 적재되지 못한 레코드 수
+    """
+
+    def __init__(self, table_name: str, written: int, failed: int, cause: Exception):
+        super().__init__(f"{table_name}: wrote {written} records, {failed} failed ({cause})")
+        self.table_name = table_name
+        self.written = written
+        self.failed = failed
+        self.cause = cause
+
+
+def split_chunks(
+    records: List[Dict[str, Any]],
+    max_rows: int = WRITE_CHUNK_ROWS,
+    max_bytes: int = WRITE_CHUNK_BYTES
+) -> List[List[Dict[str, Any]]]:
+    """
+    레코드를 행 수와 JSON 인코딩 크기 기준으로 나눕니다.
+    
+    단일 레코드가 max_bytes보다 크면 그 레코드만 단독 청크가 됩니다.
+    """
+    chunks: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    current_bytes = 2  # "[]"
+    
+    for record in records:
+        size = len(json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")) + 1
+        if current and (len(current) >= max_rows or current_bytes + size > max_bytes):
+            chunks.append(current)
+            current, current_bytes = [], 2
+        current.append(record)
+        current_bytes += size
+    
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# 요청이 적용되지 않았다고 확신할 수 있는 오류 (insert 재시도 판단용)
+# - 연결 자체를 맺지 못함 (요청을 보내기 전)
+_UNSENT_ERROR_NAMES = {"ConnectionRefusedError", "ConnectError", "ConnectTimeout", "PoolTimeout"}
+# - 서버가 문장을 롤백하거나 실행 전에 거절함 (직렬화 실패, 데드락, 문 타임아웃, 연결 제한, DB 연결 불가)
+_ROLLED_BACK_CODES = {"40001", "40P01", "57014", "53300", "57P03", "PGRST000", "PGRST001", "PGRST002"}
+# - 게이트웨이가 처리 전에 거절함 (rate limit, 서비스 불가)
+_REJECTED_STATUS_CODES = {429, 503}
+
+
+def is_unapplied_write_error(error: BaseException) -> bool:
+    """
+    쓰기 요청이 DB에 적용되지 않은 것이 확실한 오류인지 확인합니다.
+    
+    응답을 받지 못한 오류(읽기 타임아웃, 연결 끊김)는 서버에서 이미 적용되었을 수 있으므로 False입니다.
+    insert처럼 멱등하지 않은 쓰기는 이 함수가 True인 경우에만 재시도합니다.
+    """
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if names & _UNSENT_ERROR_NAMES:
+        return True
+    
+    if str(getattr(error, "code", "") or "") in _ROLLED_BACK_CODES:
+        return True
+    
+    response = getattr(error, "response", None)
+    status_code = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    try:
+        return int(status_code) in _REJECTED_STATUS_CODES
+    except (TypeError, ValueError):
+        return False
+
+
+def write_chunked(
+    table_name: str,
+    records: List[Dict[str, Any]],
+    send: Callable[[List[Dict[str, Any]]], int],
+    max_rows: int = WRITE_CHUNK_ROWS,
+    max_bytes: int = WRITE_CHUNK_BYTES,
+    parallelism: int = WRITE_PARALLELISM,
+    max_attempts: int = WRITE_MAX_ATTEMPTS,
+    retry_if: Optional[Callable[[BaseException], bool]] = None
+) -> int:
+    """
+    청크 단위로 병렬 전송하고 실패한 청크만 재시도합니다.
+    
+    Args:
+        send: 청크 하나를 적재하고 적재된 행 수를 반환하는 함수
+        retry_if: 주어지면 이 함수가 True인 오류로 실패한 청크만 재시도 (멱등하지 않은 insert용)
+    
+    Returns:
+        int: 적재된 레코드 수
+    
+    Raises:
+        PartialWriteError: 재시도 후에도 실패한 청크가 남은 경우 (written에 적재된 수)
+    """
+    chunks = split_chunks(records, max_rows, max_bytes)
+    pending = list(range(len(chunks)))
+    given_up: List[int] = []  # 적용 여부를 알 수 없어 재시도하지 않는 청크
+    written = 0
+    last_error: Optional[Exception] = None
+    
+    for attempt in range(1, max_attempts + 1):
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, min(parallelism, len(pending)))) as executor:
+            futures = [(i, executor.submit(send, chunks[i])) for i in pending]
+            for i, future in futures:
+                try:
+                    written += future.result()
+                except Exception as e:
+                    last_error = e
+                    if retry_if is None or retry_if(e):
+                        failed.append(i)
+                    else:
+                        given_up.append(i)
+        
+        if not failed and not given_up:
+            return written
+        
+        not_retried = f", {len(given_up)} not retried" if given_up else ""
+        logger.warning(
+            f"{len(failed) + len(given_up)}/{len(chunks)} chunks failed for {table_name} "
+            f"(attempt {attempt}/{max_attempts}{not_retried}): {last_error}"
+        )
+        pending = failed
+        if not pending:
+            break
+        if attempt < max_attempts:
+            time.sleep(0.5 * 2 ** (attempt - 1))
+    
+    failed_rows = sum(len(chunks[i]) for i in pending + given_up)
+    raise PartialWriteError(table_name, written, failed_rows, last_error)
+
+
+def dedupe_by_keys(records: List[Dict[str, Any]], on_conflict: str) -> List[Dict[str, Any]]:
+    """
+    충돌 키가 같은 레코드는 마지막 값만 남깁니다.
+    
+    같은 키가 한 요청(문장)에 두 번 들어가면 ON CONFLICT DO UPDATE가 실패하기 때문입니다.
+    """
+    keys = [k.strip() for k in on_conflict.split(",")]
+    deduped = {tuple(r.get(k) for k in keys): r for r in records}
+    return list(deduped.values())
 
 
 def upsert_records(client, table_name: str, records: list, on_conflict: str = "id") -> int:
     """
     레코드를 upsert (insert or update) 합니다.
     
+    크기 기준으로 나눈 청크를 병렬 전송합니다. (write_chunked)
+    같은 키로 다시 보내도 결과가 같으므로 실패한 청크는 오류 종류와 관계없이 재시도합니다.
+    
     Returns:
         int: 처리된 레코드 수
     """
     if not records:
         return 0
     
-    try:
-        result = client.table(table_name).upsert(records, on_conflict=on_conflict).execute()
+    def _send(chunk: List[Dict[str, Any]]) -> int:
+        result = client.table(table_name).upsert(chunk, on_conflict=on_conflict).execute()
         return len(result.data)
+    
+    try:
+        return write_chunked(table_name, records, _send)
     except Exception as e:
         logger.error(f"Upsert failed for {table_name}: {e}")
         raise
@@ -95,15 +306,22 @@ def insert_records(client, table_name: str, records: list) -> int:
     """
     레코드를 insert 합니다. (중복 허용 - 트렌드 분석용)
     
+    크기 기준으로 나눈 청크를 병렬 전송합니다. (write_chunked)
+    insert는 다시 보내면 행이 중복되므로, 적용되지 않은 것이 확실한 오류로 실패한 청크만 재시도합니다.
+    (is_unapplied_write_error, 응답을 받지 못한 청크는 PartialWriteError로 실패)
+    
     Returns:
         int: 삽입된 레코드 수
     """
     if not records:
         return 0
     
-    try:
-        result = client.table(table_name).insert(records).execute()
+    def _send(chunk: List[Dict[str, Any]]) -> int:
+        result = client.table(table_name).insert(chunk).execute()
         return len(result.data)
+    
+    try:
+        return write_chunked(table_name, records, _send, retry_if=is_unapplied_write_error)
     except Exception as e:
         logger.error(f"Insert failed for {table_name}: {e}")
         raise
@@ -0,0 +1,186 @@
+"""
+Decoding - YouTube API 원본 페이지를 타입이 있는 구조체로 디코딩 (msgspec)
+
+- 변환에 쓰는 필드만 선언하므로 나머지 필드(localized, etag, pageInfo 등)는 파싱 단계에서 건너뜀
+- gzip 해제한 bytes를 바로 디코딩 (str 변환, 중간 dict 생성 없음)
+- 기본값은 기존 dict.get(..., 기본값) 규칙과 같게 맞춤
+"""
+import gzip
+from typing import Any, Dict, List, Optional, Union
+
+import msgspec
+
+from app.core import timing
+
+# 통계 값은 API에서 문자열로 오지만 숫자로 오는 경우도 허용
+Count = Union[int, str, None]
+
+
+# ============== 공통 ==============
+
+class Thumbnail(msgspec.Struct):
+    url: Optional[str] = None
+
+
+class Thumbnails(msgspec.Struct):
+    high: Thumbnail = msgspec.field(default_factory=Thumbnail)
+
+
+# ============== videos.list ==============
+
+class VideoSnippet(msgspec.Struct):
+    title: Optional[str] = None
+    channelId: Optional[str] = None
+    channelTitle: Optional[str] = None
+    categoryId: Optional[str] = ""
+    publishedAt: Optional[str] = None
+    tags: List[str] = []
+    thumbnails: Thumbnails = msgspec.field(default_factory=Thumbnails)
+
+
+class VideoStatistics(msgspec.Struct):
+    viewCount: Count = None
+    likeCount: Count = None
+    commentCount: Count = None
+
+
+class VideoContentDetails(msgspec.Struct):
+    duration: Optional[str] = None
+
+
+class VideoItem(msgspec.Struct):
+    id: Optional[str] = None
+    snippet: VideoSnippet = msgspec.field(default_factory=VideoSnippet)
+    statistics: VideoStatistics = msgspec.field(default_factory=VideoStatistics)
+    contentDetails: VideoContentDetails = msgspec.field(default_factory=VideoContentDetails)
+
+
+class VideoListPage(msgspec.Struct):
+    items: List[VideoItem] = []
+
+
+# ============== commentThreads.list ==============
+
+class AuthorChannelId(msgspec.Struct):
+    value: Optional[str] = None
+
+
+class CommentSnippet(msgspec.Struct):
+    videoId: Optional[str] = None
+    textDisplay: str = ""
+    authorDisplayName: Optional[str] = None
+    authorChannelId: AuthorChannelId = msgspec.field(default_factory=AuthorChannelId)
+    likeCount: Count = None
+    publishedAt: Optional[str] = None
+    authorIsChannelOwner: bool = False
+
+
+class TopLevelComment(msgspec.Struct):
+    id: Optional[str] = None
+    snippet: CommentSnippet = msgspec.field(default_factory=CommentSnippet)
+
+
+class CommentThreadSnippet(msgspec.Struct):
+    topLevelComment: TopLevelComment = msgspec.field(default_factory=TopLevelComment)
+    totalReplyCount: Count = None
+
+
+class CommentThreadItem(msgspec.Struct):
+    snippet: CommentThreadSnippet = msgspec.field(default_factory=CommentThreadSnippet)
+
+
+class CommentThreadPage(msgspec.Struct):
+    items: List[CommentThreadItem] = []
+
+
+# ============== channels.list ==============
+
+class ChannelSnippet(msgspec.Struct):
+    title: Optional[str] = None
+    description: str = ""
+    customUrl: Optional[str] = None
+    publishedAt: Optional[str] = None
+    country: Optional[str] = None
+    thumbnails: Thumbnails = msgspec.field(default_factory=Thumbnails)
+
+
+class ChannelStatistics(msgspec.Struct):
+    subscriberCount: Count = None
+    viewCount: Count = None
+    videoCount: Count = None
+
+
+class ChannelItem(msgspec.Struct):
+    id: Optional[str] = None
+    snippet: ChannelSnippet = msgspec.field(default_factory=ChannelSnippet)
+    statistics: ChannelStatistics = msgspec.field(default_factory=ChannelStatistics)
+
+
+class ChannelListPage(msgspec.Struct):
+    items: List[ChannelItem] = []
+
+
+# ============== videoCategories.list ==============
+
+class CategorySnippet(msgspec.Struct):
+    title: str = "Unknown"
+
+
+class CategoryItem(msgspec.Struct):
+    id: Union[int, str] = 0
+    snippet: CategorySnippet = msgspec.field(default_factory=CategorySnippet)
+
+
+class CategoryListPage(msgspec.Struct):
+    items: List[CategoryItem] = []
+
+
+# ============== 디코더 ==============
+
+PAGE_TYPES: Dict[str, type] = {
+    "videos_list": VideoListPage,
+    "comment_threads": CommentThreadPage,
+    "channels": ChannelListPage,
+    "video_categories": CategoryListPage,
+}
+
+ITEM_TYPES: Dict[str, type] = {
+    "videos_list": VideoItem,
+    "comment_threads": CommentThreadItem,
+    "channels": ChannelItem,
+    "video_categories": CategoryItem,
+}
+
+# 디코더는 스레드 간 공유 가능하므로 타입별로 한 번만 생성
+_decoders = {data_type: msgspec.json.Decoder(page_type) for data_type, page_type in PAGE_TYPES.items()}
+
+
+def decode_page(data_type: str, content: bytes):
+    """JSON bytes를 데이터 타입별 페이지 구조체로 디코딩합니다."""
+    return _decoders[data_type].decode(content)
+
+
+def load_gcs_page(bucket, blob_path: str, data_type: str):
+    """
+    GCS 파일을 페이지 구조체로 로드합니다. gzip 압축 파일도 자동 처리합니다.
+
+    load_gcs_json과 달리 str 디코딩과 dict 생성 단계가 없습니다.
+    """
+    with timing.stage("download"):
+        content = bucket.blob(blob_path).download_as_bytes()
+    timing.count("bytes_downloaded", len(content))
+
+    if blob_path.endswith(".gz"):
+        with timing.stage("decompress"):
+            content = gzip.decompress(content)
+        timing.count("bytes_decompressed", len(content))
+
+    with timing.stage("parse"):
+        page = decode_page(data_type, content)
+    timing.count("items", len(page.items))
+    return page
+
+
+def convert_items(data_type: str, items: List[Dict[str, Any]]) -> List[Any]:
+    """이미 파싱된 dict item 목록을 구조체로 변환합니다. (합성 데이터, 스트리밍 파서용)"""
+    return msgspec.convert(items, List[ITEM_TYPES[data_type]])
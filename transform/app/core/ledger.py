@@ -0,0 +1,204 @@
+"""
+Processed Files Ledger - processed_files 대량 조회/기록
+
+- record_many: 여러 파일의 처리 결과를 묶음 insert
+- clear_errors: 재처리로 복구된 파일의 error 기록 정리
+- load_processed: prefix + 날짜 파티션 범위로 페이지네이션 조회
+- PathSet: 수십만 개 경로의 멤버십 검사를 위한 압축 집합
+
+배치 실행기, 백필, 리컨실러가 같은 API를 공유합니다.
+"""
+import logging
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.core.database import PartialWriteError, build_processed_record, insert_records
+from app.core.utils import iter_dates
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "processed_files"
+
+
+class PathSet:
+    """
+    경로 집합의 압축 표현 (정렬된 64bit 해시 배열)
+
+    문자열 set 대비 경로당 8바이트만 사용하고, 조회는 이진 탐색(O(log n))입니다.
+    64bit 해시 충돌로 인한 오탐 확률은 100만 경로 기준 약 3e-8 수준입니다.
+    """
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self._hashes = array("Q", sorted({self._hash(p) for p in paths}))
+
+    @staticmethod
+    def _hash(path: str) -> int:
+        return int.from_bytes(blake2b(path.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def __contains__(self, path: str) -> bool:
+        value = self._hash(path)
+        index = bisect_left(self._hashes, value)
+        return index < len(self._hashes) and self._hashes[index] == value
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def union(self, paths: Iterable[str]) -> "PathSet":
+        """경로를 추가한 새 PathSet을 반환합니다."""
+        merged = PathSet()
+        merged._hashes = array("Q", sorted(set(self._hashes) | {self._hash(p) for p in paths}))
+        return merged
+
+
+class ProcessedFileLedger:
+    """processed_files 테이블에 대한 대량 조회/기록 API"""
+
+    def __init__(self, client, page_size: int = 1000, lookup_chunk: int = 100):
+        self.client = client
+        self.page_size = page_size
+        self.lookup_chunk = lookup_chunk
+
+    # ---------- 기록 ----------
+
+    def record_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        여러 파일의 처리 결과를 청크 단위로 묶어 insert 합니다. (insert_records)
+
+        Args:
+            entries: record_processed_file과 같은 인자 dict
+                     ({"file_path", "status", "data_type", "records_count", "error_message", "metadata"})
+
+        Returns:
+            int: 기록된 행 수
+        """
+        rows = []
+        for entry in entries:
+            row = build_processed_record(
+                entry["file_path"],
+                entry["status"],
+                entry["data_type"],
+                records_count=entry.get("records_count", 0),
+                error_message=entry.get("error_message"),
+                metadata=entry.get("metadata"),
+            )
+            # bulk insert는 모든 행의 컬럼 구성이 같아야 함
+            row.setdefault("error_message", None)
+            row.setdefault("metadata", None)
+            rows.append(row)
+
+        try:
+            written = insert_records(self.client, TABLE_NAME, rows)
+        except PartialWriteError as e:
+            written = e.written
+            logger.error(f"Failed to record {e.failed} processed files: {e}")
+        except Exception as e:
+            written = 0
+            logger.error(f"Failed to record {len(rows)} processed files: {e}")
+
+        if written:
+            logger.info(f"Recorded {written} processed files")
+        return written
+
+    def clear_errors(self, file_paths: Iterable[str]) -> int:
+        """
+        다시 처리되어 성공한 파일의 이전 error 기록을 lookup_chunk개씩 삭제합니다.
+
+        Returns:
+            int: 삭제된 행 수
+        """
+        paths = list(dict.fromkeys(file_paths))
+        deleted = 0
+
+        for start in range(0, len(paths), self.lookup_chunk):
+            chunk = paths[start:start + self.lookup_chunk]
+            try:
+                result = (
+                    self.client.table(TABLE_NAME).delete()
+                    .in_("file_path", chunk).eq("status", "error").execute()
+                )
+                deleted += len(result.data or [])
+            except Exception as e:
+                logger.warning(f"Could not clear error records for {len(chunk)} files: {e}")
+
+        return deleted
+
+    # ---------- 조회 ----------
+
+    def load_processed(
+        self,
+        prefix: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        statuses: Optional[Sequence[str]] = None,
+        columns: str = "file_path, status"
+    ) -> List[Dict[str, Any]]:
+        """
+        prefix(및 date= 파티션 범위)에 해당하는 processed_files 행을 페이지 단위로 조회합니다.
+
+        Args:
+            prefix: 경로 prefix (예: raw/youtube/videos_list/)
+            start_date, end_date: YYYY-MM-DD (양 끝 포함). 없으면 prefix 전체
+            statuses: 상태 필터 (예: ["success"])
+        """
+        if start_date:
+            patterns = [f"{prefix}%date={day}/%" for day in iter_dates(start_date, end_date or start_date)]
+        else:
+            patterns = [f"{prefix}%"]
+
+        rows: List[Dict[str, Any]] = []
+        for pattern in patterns:
+            rows.extend(self._load_pattern(pattern, statuses, columns))
+        return rows
+
+    def load_paths(self, prefix: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   statuses: Optional[Sequence[str]] = ("success",)) -> PathSet:
+        """load_processed 결과를 멤버십 검사용 PathSet으로 반환합니다."""
+        rows = self.load_processed(prefix, start_date, end_date, statuses=statuses, columns="file_path")
+        return PathSet(row["file_path"] for row in rows)
+
+    def processed_among(self, file_paths: Iterable[str], statuses: Optional[Sequence[str]] = ("success",)) -> PathSet:
+        """
+        주어진 경로 중 이미 기록된 경로를 PathSet으로 반환합니다.
+
+        파티션 단위로 묶이지 않은 임의의 경로 목록용이며, lookup_chunk개씩 IN 조회합니다.
+        """
+        paths = list(dict.fromkeys(file_paths))
+        found: List[str] = []
+
+        for start in range(0, len(paths), self.lookup_chunk):
+            chunk = paths[start:start + self.lookup_chunk]
+            try:
+                query = self.client.table(TABLE_NAME).select("file_path").in_("file_path", chunk)
+                if statuses:
+                    query = query.in_("status", list(statuses))
+                found.extend(row["file_path"] for row in query.execute().data)
+            except Exception as e:
+                logger.warning(f"Could not check processed status for {len(chunk)} files: {e}")
+
+        return PathSet(found)
+
+    def _load_pattern(self, pattern: str, statuses: Optional[Sequence[str]], columns: str) -> List[Dict[str, Any]]:
+        """
+        LIKE 패턴 하나를 (file_path, id) 순으로 페이지네이션 조회합니다.
+
+        같은 file_path에 여러 행(재처리 기록)이 있으므로 고유한 id까지 정렬해야
+        페이지 경계에서 행이 빠지거나 두 번 나오지 않습니다.
+        """
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+
+        while True:
+            query = self.client.table(TABLE_NAME).select(columns).like("file_path", pattern)
+            if statuses:
+                query = query.in_("status", list(statuses))
+            result = query.order("file_path").order("id").range(offset, offset + self.page_size - 1).execute()
+
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.page_size:
+                break
+            offset += self.page_size
+
+        return rows
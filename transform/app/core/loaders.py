@@ -0,0 +1,143 @@
+"""
+Loaders - 변환된 레코드를 DB에 적재하는 백엔드
+
+- SupabaseLoader: supabase-py(PostgREST) JSON insert/upsert (기본값)
+- PostgresCopyLoader: Postgres 직접 연결, COPY FROM STDIN → 임시 staging 테이블 → INSERT ... SELECT 병합
+
+TRANSFORM_LOADER 환경변수로 선택합니다. (supabase | postgres)
+postgres 백엔드는 DATABASE_URL(Supabase의 direct/pooler 연결 문자열)이 필요합니다.
+"""
+import os
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.core.database import insert_records, upsert_records
+
+logger = logging.getLogger(__name__)
+
+LOADER_BACKENDS = ("supabase", "postgres")
+
+_lock = threading.Lock()
+_postgres_loader: Optional["PostgresCopyLoader"] = None
+
+
+class SupabaseLoader:
+    """PostgREST를 통한 기존 적재 경로"""
+
+    name = "supabase"
+
+    def __init__(self, client):
+        self.client = client
+
+    def insert(self, table_name: str, records: List[Dict[str, Any]]) -> int:
+        return insert_records(self.client, table_name, records)
+
+    def upsert(self, table_name: str, records: List[Dict[str, Any]], on_conflict: str) -> int:
+        return upsert_records(self.client, table_name, records, on_conflict=on_conflict)
+
+    def close(self) -> None:
+        pass
+
+
+class PostgresCopyLoader:
+    """
+    Postgres COPY 기반 적재기
+
+    요청마다 JSON을 만들고 PostgREST가 다시 파싱하는 대신,
+    커넥션 풀에서 연결을 빌려 COPY로 staging 테이블에 밀어넣고 한 번의 INSERT ... SELECT로 병합합니다.
+    staging 테이블은 ON COMMIT DROP 임시 테이블이므로 트랜잭션이 끝나면 사라집니다.
+    """
+
+    name = "postgres"
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 4):
+        try:
+            from psycopg.types.json import Jsonb
+            from psycopg_pool import ConnectionPool
+        except ImportError as e:
+            raise ImportError(
+                "TRANSFORM_LOADER=postgres requires psycopg[binary] and psycopg-pool"
+            ) from e
+
+        self._jsonb = Jsonb
+        self.pool = ConnectionPool(dsn, min_size=min_size, max_size=max_size, open=True)
+
+    def insert(self, table_name: str, records: List[Dict[str, Any]]) -> int:
+        return self._load(table_name, records)
+
+    def upsert(self, table_name: str, records: List[Dict[str, Any]], on_conflict: str) -> int:
+        keys = [k.strip() for k in on_conflict.split(",")]
+        return self._load(table_name, records, conflict_keys=keys)
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _load(self, table_name: str, records: List[Dict[str, Any]], conflict_keys: Optional[Sequence[str]] = None) -> int:
+        """COPY → staging → 병합을 한 트랜잭션에서 수행하고 반영된 행 수를 반환합니다."""
+        if not records:
+            return 0
+
+        columns = list(records[0].keys())
+        column_list = ", ".join(columns)
+        staging = f"_stage_{table_name}"
+
+        merge_sql = f"INSERT INTO {table_name} ({column_list}) SELECT {column_list} FROM {staging}"
+        if conflict_keys:
+            updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in conflict_keys)
+            action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+            merge_sql += f" ON CONFLICT ({', '.join(conflict_keys)}) {action}"
+
+        try:
+            with self.pool.connection() as conn:
+                with conn.transaction():
+                    with conn.cursor() as cur:
+                        # 컬럼 타입만 복사 (id 시퀀스/NOT NULL 제약은 가져오지 않음)
+                        cur.execute(
+                            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                            f"SELECT {column_list} FROM {table_name} WITH NO DATA"
+                        )
+                        with cur.copy(f"COPY {staging} ({column_list}) FROM STDIN") as copy:
+                            for record in records:
+                                copy.write_row([self._adapt(record.get(c)) for c in columns])
+                        cur.execute(merge_sql)
+                        return cur.rowcount
+        except Exception as e:
+            logger.error(f"COPY load failed for {table_name}: {e}")
+            raise
+
+    def _adapt(self, value: Any) -> Any:
+        # dict(metadata 등)는 jsonb로, 나머지는 psycopg 기본 변환(list → 배열)
+        if isinstance(value, dict):
+            return self._jsonb(value)
+        return value
+
+
+def get_loader(client=None):
+    """
+    TRANSFORM_LOADER 설정에 맞는 적재기를 반환합니다.
+
+    postgres 적재기는 커넥션 풀을 가지므로 프로세스당 하나만 만들어 재사용합니다.
+    """
+    global _postgres_loader
+
+    backend = os.environ.get("TRANSFORM_LOADER", "supabase").lower()
+    if backend not in LOADER_BACKENDS:
+        raise ValueError(f"Unknown TRANSFORM_LOADER: {backend} (expected one of {LOADER_BACKENDS})")
+
+    if backend == "supabase":
+        return SupabaseLoader(client)
+
+    if _postgres_loader is None:
+        with _lock:
+            if _postgres_loader is None:
+                dsn = os.environ.get("DATABASE_URL")
+                if not dsn:
+                    raise ValueError("DATABASE_URL is required when TRANSFORM_LOADER=postgres")
+                _postgres_loader = PostgresCopyLoader(
+                    dsn,
+                    max_size=int(os.environ.get("DATABASE_POOL_SIZE", "4")),
+                )
+                logger.info("Using Postgres COPY loader")
+
+    return _postgres_loader
@@ -0,0 +1,207 @@
+"""
+Retry Queue - 변환 실패 파일의 자동 재시도 큐 (transform_retry_queue)
+
+- 실패 시 오류를 일시적(transient) / 영구적(poison)으로 분류
+- transient: 지수 백오프(+jitter) 후 재시도, max_attempts를 넘으면 dead
+- poison: 다시 시도해도 같은 결과이므로 바로 dead (수동 확인 대상)
+- 작업자는 claim_transform_retries RPC로 항목을 임대하여 가져감 (SKIP LOCKED, 중복 처리 없음)
+
+스키마: migrations/0003_transform_retry_queue.sql (등록 RPC: 0013_retry_enqueue_attempts.sql)
+"""
+import os
+import gzip
+import json
+import random
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import msgspec
+
+from app.core.database import PartialWriteError
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "transform_retry_queue"
+
+RETRY_MAX_ATTEMPTS = int(os.environ.get("RETRY_MAX_ATTEMPTS", "6"))
+RETRY_BASE_SECONDS = float(os.environ.get("RETRY_BASE_SECONDS", "30"))
+RETRY_MAX_DELAY_SECONDS = float(os.environ.get("RETRY_MAX_DELAY_SECONDS", "900"))
+RETRY_LEASE_SECONDS = int(os.environ.get("RETRY_LEASE_SECONDS", "300"))
+
+TRANSIENT = "transient"
+POISON = "poison"
+
+# 재시도하면 성공할 수 있는 오류 (네트워크, 타임아웃, 서버 과부하)
+_TRANSIENT_NAMES = {
+    "ConnectionError", "TimeoutError", "ConnectTimeout", "ReadTimeout", "WriteTimeout", "PoolTimeout",
+    "ConnectError", "ReadError", "WriteError", "RemoteProtocolError", "ProtocolError",
+    "ServiceUnavailable", "TooManyRequests", "InternalServerError", "BadGateway", "GatewayTimeout",
+    "DeadlineExceeded", "RetryError", "TransportError", "OperationalError",
+}
+
+# 같은 입력으로 다시 시도해도 실패하는 오류 (손상된 파일, 스키마 불일치, 삭제된 파일)
+_POISON_TYPES = (
+    msgspec.DecodeError,
+    msgspec.ValidationError,
+    json.JSONDecodeError,
+    gzip.BadGzipFile,
+    UnicodeDecodeError,
+    KeyError,
+    TypeError,
+    ValueError,
+)
+_POISON_NAMES = {"NotFound", "Forbidden", "DataError", "IntegrityError"}
+
+# PostgREST/Postgres 오류 코드 중 재시도 가능한 것 (직렬화 실패, 데드락, 문 타임아웃, 연결 제한)
+_TRANSIENT_PG_CODES = {"40001", "40P01", "57014", "53300", "08006", "PGRST000", "PGRST001", "PGRST002"}
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    오류를 transient / poison으로 분류합니다.
+
+    분류할 수 없는 오류는 transient로 보고 max_attempts까지 재시도합니다.
+    """
+    if isinstance(error, PartialWriteError):
+        return classify_error(error.cause) if error.cause is not None else TRANSIENT
+
+    names = {cls.__name__ for cls in type(error).__mro__}
+    code = str(getattr(error, "code", "") or "")
+
+    if code in _TRANSIENT_PG_CODES or names & _TRANSIENT_NAMES:
+        return TRANSIENT
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return TRANSIENT
+    if names & _POISON_NAMES or isinstance(error, _POISON_TYPES):
+        return POISON
+
+    # PostgREST APIError: 4xx 계열 코드(22xxx 데이터 오류, 23xxx 제약 위반, 42xxx 스키마)는 poison
+    if names & {"APIError"} and code[:2] in {"22", "23", "42"}:
+        return POISON
+
+    cause = error.__cause__ or error.__context__
+    if cause is not None and cause is not error:
+        return classify_error(cause)
+    return TRANSIENT
+
+
+def backoff_seconds(attempts: int, base: float = RETRY_BASE_SECONDS, cap: float = RETRY_MAX_DELAY_SECONDS) -> float:
+    """attempts번 실패한 뒤의 대기 시간 (지수 백오프 상한 안에서 equal jitter)"""
+    delay = min(cap, base * 2 ** max(0, attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RetryQueue:
+    """transform_retry_queue에 대한 등록/임대/결과 기록 API"""
+
+    def __init__(self, client, max_attempts: int = RETRY_MAX_ATTEMPTS):
+        self.client = client
+        self.max_attempts = max_attempts
+
+    # ---------- 등록 ----------
+
+    def enqueue_failure(self, file_path: str, data_type: Optional[str], error: BaseException) -> Optional[str]:
+        """
+        transform_handler의 실패를 등록합니다. (enqueue_transform_retry RPC, migrations/0013)
+
+        처음 실패하면 attempts=1로 등록하고, 이미 있는 항목이면 attempts를 1 올립니다.
+        dead 항목은 dead로 남고 (requeue_dead로만 되살림), 작업자가 임대 중인 항목은 상태를 바꾸지 않습니다.
+
+        Returns:
+            str: 등록 후 상태 (pending / running / dead), 등록에 실패하면 None
+        """
+        error_class = classify_error(error)
+
+        try:
+            status = self.client.rpc("enqueue_transform_retry", {
+                "target_path": file_path,
+                "target_data_type": data_type,
+                "failure_class": error_class,
+                "failure_message": str(error)[:2000],
+                "poison": error_class == POISON,
+                "retry_max_attempts": self.max_attempts,
+                "base_seconds": RETRY_BASE_SECONDS,
+                "max_delay_seconds": RETRY_MAX_DELAY_SECONDS,
+            }).execute().data
+        except Exception as e:
+            logger.warning(f"Could not enqueue retry for {file_path}: {e}")
+            return None
+
+        logger.info(f"Queued {file_path} for retry ({error_class}, status={status})")
+        return status
+
+    # ---------- 작업자 ----------
+
+    def claim(self, batch_size: int = 20, lease_seconds: int = RETRY_LEASE_SECONDS) -> List[Dict[str, Any]]:
+        """재시도 시각이 된 항목을 임대하여 가져옵니다. (attempts가 1 증가한 상태로 반환)"""
+        result = self.client.rpc(
+            "claim_transform_retries",
+            {"batch_size": batch_size, "lease_seconds": lease_seconds}
+        ).execute()
+        return result.data or []
+
+    def mark_succeeded(self, item: Dict[str, Any]) -> None:
+        self._update(item["file_path"], {
+            "status": "succeeded",
+            "locked_until": None,
+            "last_error": None,
+            "error_class": None,
+        })
+
+    def mark_failed(self, item: Dict[str, Any], error: BaseException) -> str:
+        """
+        재시도 실패를 기록합니다.
+
+        Returns:
+            str: 다음 상태 (pending / dead)
+        """
+        attempts = int(item.get("attempts") or 1)
+        max_attempts = int(item.get("max_attempts") or self.max_attempts)
+        error_class = classify_error(error)
+
+        if error_class == POISON or attempts >= max_attempts:
+            status = "dead"
+            next_attempt_at = _now()
+        else:
+            status = "pending"
+            next_attempt_at = _now() + timedelta(seconds=backoff_seconds(attempts))
+
+        self._update(item["file_path"], {
+            "status": status,
+            "error_class": error_class,
+            "last_error": str(error)[:2000],
+            "next_attempt_at": next_attempt_at.isoformat(),
+            "locked_until": None,
+        })
+        return status
+
+    # ---------- 운영 ----------
+
+    def requeue_dead(self, file_paths: Optional[Iterable[str]] = None) -> int:
+        """dead 항목을 다시 pending으로 돌립니다. (원인 수정 후, attempts 초기화)"""
+        query = self.client.table(TABLE_NAME).update({
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": _now().isoformat(),
+            "updated_at": _now().isoformat(),
+        }).eq("status", "dead")
+        if file_paths is not None:
+            query = query.in_("file_path", list(file_paths))
+        return len(query.execute().data or [])
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 항목 수"""
+        counts: Dict[str, int] = {}
+        for status in ("pending", "running", "succeeded", "dead"):
+            result = self.client.table(TABLE_NAME).select("file_path", count="exact").eq("status", status).limit(1).execute()
+            counts[status] = result.count if getattr(result, "count", None) is not None else len(result.data or [])
+        return counts
+
+    def _update(self, file_path: str, values: Dict[str, Any]) -> None:
+        values["updated_at"] = _now().isoformat()
+        self.client.table(TABLE_NAME).update(values).eq("file_path", file_path).execute()
@@ -0,0 +1,40 @@
+"""
+Rollups - 영상 스냅샷 적재 후 집계 테이블(agg_*) 갱신
+
+fact_video_snapshots에 쓴 스냅샷 시각만 refresh_video_rollups RPC로 넘겨
+해당 스냅샷/날짜의 집계만 다시 계산합니다. (migrations/0004_video_rollups.sql)
+"""
+import logging
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# RPC 한 번에 넘기는 스냅샷 수 (백필에서 여러 날짜를 한 번에 적재할 때)
+ROLLUP_CHUNK_SNAPSHOTS = 48
+
+
+def snapshot_times(records: Iterable[Dict[str, Any]]) -> List[str]:
+    """레코드에 포함된 고유 snapshot_at (정렬)"""
+    return sorted({r["snapshot_at"] for r in records if r.get("snapshot_at")})
+
+
+def refresh_video_rollups(client, times: Iterable[str]) -> int:
+    """
+    스냅샷 시각 목록의 집계를 다시 계산합니다.
+
+    실패하면 예외를 그대로 올려 파일이 error/재시도 대상이 되도록 합니다.
+    (fact 적재는 UPSERT라 재처리해도 안전하고, 집계는 다시 계산되므로 결과가 같음)
+
+    Returns:
+        int: 갱신한 스냅샷 수
+    """
+    times = sorted(set(times))
+    refreshed = 0
+    for start in range(0, len(times), ROLLUP_CHUNK_SNAPSHOTS):
+        chunk = times[start:start + ROLLUP_CHUNK_SNAPSHOTS]
+        result = client.rpc("refresh_video_rollups", {"snapshot_times": chunk}).execute()
+        refreshed += result.data if isinstance(result.data, int) else len(chunk)
+
+    if refreshed:
+        logger.info(f"Refreshed video rollups for {refreshed} snapshots")
+    return refreshed
@@ -0,0 +1,207 @@
+"""
+Snapshot Deltas - 적재 직전에 영상별 직전 스냅샷 대비 변화량을 채웁니다.
+
+fact_video_snapshots 레코드에 prev_rank / rank_change / view_delta / minutes_since_prev를 추가합니다.
+(migrations/0005_snapshot_deltas.sql)
+
+직전 스냅샷 조회 순서:
+1. 프로세스 내 캐시: 같은 영상의 바로 이전 hour 스냅샷이 있으면 그대로 사용
+   (snapshot_at은 파티션 hour이므로 1시간 전 스냅샷 사이에는 다른 스냅샷이 있을 수 없음)
+2. 나머지는 previous_video_snapshots RPC로 한 번에 조회 (video_id, snapshot_at 인덱스)
+
+캐시는 적재가 성공한 뒤에만 채웁니다. (remember_snapshots)
+과거 hour를 나중에 적재하면 그 뒤 스냅샷의 변화량을 repair_following_deltas로 다시 계산합니다.
+"""
+import os
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_CACHE_SIZE = int(os.environ.get("SNAPSHOT_CACHE_SIZE", "20000"))
+SNAPSHOT_INTERVAL = timedelta(hours=1)
+
+# repair RPC 한 번에 넘기는 스냅샷 수
+REPAIR_CHUNK_SNAPSHOTS = 48
+
+
+class PreviousSnapshot(NamedTuple):
+    snapshot_at: datetime
+    trending_rank: Optional[int]
+    view_count: Optional[int]
+
+
+def _parse_time(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+class SnapshotCache:
+    """영상별 가장 최근에 본 스냅샷 (LRU, 웜 인스턴스/배치 실행에서 재사용)"""
+
+    def __init__(self, max_entries: int = SNAPSHOT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, PreviousSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, video_id: str) -> Optional[PreviousSnapshot]:
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is not None:
+                self._entries.move_to_end(video_id)
+            return entry
+
+    def put(self, video_id: str, entry: PreviousSnapshot) -> None:
+        """더 최근 스냅샷일 때만 교체합니다. (과거 날짜 재처리가 최신 값을 덮지 않도록)"""
+        with self._lock:
+            current = self._entries.get(video_id)
+            if current is None or entry.snapshot_at >= current.snapshot_at:
+                self._entries[video_id] = entry
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = SnapshotCache()
+
+
+def fetch_previous_snapshots(client, video_ids: List[str], before: datetime) -> Dict[str, PreviousSnapshot]:
+    """video_ids 각각의 before 이전 가장 최근 스냅샷 (DB)"""
+    result = client.rpc(
+        "previous_video_snapshots",
+        {"video_ids": video_ids, "before": before.isoformat()}
+    ).execute()
+
+    return {
+        row["video_id"]: PreviousSnapshot(_parse_time(row["snapshot_at"]), row["trending_rank"], row["view_count"])
+        for row in result.data or []
+    }
+
+
+def attach_snapshot_deltas(client, records: List[Dict[str, Any]], cache: Optional[SnapshotCache] = None) -> List[Dict[str, Any]]:
+    """
+    레코드에 직전 스냅샷 대비 변화량을 채웁니다. (레코드를 직접 수정하고 그대로 반환)
+
+    여러 스냅샷이 섞여 있으면 시간순으로 처리하므로, 같은 배치 안의 이전 hour 레코드도 직전 스냅샷으로 사용합니다.
+    캐시는 읽기만 합니다. 적재가 성공한 뒤 remember_snapshots로 넣어야 실패한 적재가 이후 변화량을 오염시키지 않습니다.
+    """
+    cache = cache or _cache
+
+    by_snapshot: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        by_snapshot.setdefault(record["snapshot_at"], []).append(record)
+
+    # 이 배치에서 이미 처리한 (아직 적재되지 않은) 영상별 최근 레코드
+    batch: Dict[str, PreviousSnapshot] = {}
+    lookups = 0
+    for snapshot_key in sorted(by_snapshot, key=_parse_time):
+        group = by_snapshot[snapshot_key]
+        snapshot_at = _parse_time(snapshot_key)
+
+        previous: Dict[str, PreviousSnapshot] = {}
+        missing: List[str] = []
+        for record in group:
+            entry = batch.get(record["video_id"]) or cache.get(record["video_id"])
+            if entry is not None and entry.snapshot_at == snapshot_at - SNAPSHOT_INTERVAL:
+                previous[record["video_id"]] = entry
+            else:
+                missing.append(record["video_id"])
+
+        if missing:
+            lookups += len(missing)
+            fetched = fetch_previous_snapshots(client, sorted(set(missing)), snapshot_at)
+            for video_id in missing:
+                entry = batch.get(video_id)
+                candidate = fetched.get(video_id)
+                # 아직 적재되지 않은 같은 배치의 이전 레코드가 DB 값보다 최근일 수 있음
+                if entry is not None and (candidate is None or entry.snapshot_at > candidate.snapshot_at):
+                    candidate = entry
+                if candidate is not None:
+                    previous[video_id] = candidate
+
+        for record in group:
+            _fill_delta(record, previous.get(record["video_id"]), snapshot_at)
+            batch[record["video_id"]] = PreviousSnapshot(snapshot_at, record["trending_rank"], record["view_count"])
+
+    if lookups:
+        logger.debug(f"Looked up previous snapshots for {lookups} videos")
+    return records
+
+
+def remember_snapshots(records: List[Dict[str, Any]], cache: Optional[SnapshotCache] = None) -> None:
+    """적재가 성공한 레코드를 직전 스냅샷 캐시에 넣습니다."""
+    cache = cache or _cache
+    for record in records:
+        cache.put(
+            record["video_id"],
+            PreviousSnapshot(_parse_time(record["snapshot_at"]), record.get("trending_rank"), record.get("view_count"))
+        )
+
+
+def repair_following_deltas(client, times: List[str]) -> int:
+    """
+    적재한 스냅샷 시각들의 다음 스냅샷 변화량을 다시 계산합니다. (migrations/0011, repair_next_snapshot_deltas)
+
+    과거 hour가 늦게 적재되면 그 뒤 스냅샷은 더 이전 스냅샷 기준으로 계산되어 있으므로 적재 직후 호출합니다.
+    최신 hour 적재에서는 다음 스냅샷이 없으므로 바뀌는 행이 없습니다.
+
+    Returns:
+        int: 값이 바뀐 행 수
+    """
+    times = sorted(set(times))
+    repaired = 0
+    for start in range(0, len(times), REPAIR_CHUNK_SNAPSHOTS):
+        chunk = times[start:start + REPAIR_CHUNK_SNAPSHOTS]
+        result = client.rpc("repair_next_snapshot_deltas", {"snapshot_times": chunk}).execute()
+        repaired += result.data if isinstance(result.data, int) else 0
+
+    if repaired:
+        logger.info(f"Repaired deltas of {repaired} following snapshots")
+    return repaired
+
+
+def rebuild_snapshot_deltas(client, start: datetime, end: datetime) -> int:
+    """
+    [start, end) 스냅샷의 변화량을 DB의 실제 순서로 다시 계산합니다. (migrations/0005, rebuild_snapshot_deltas)
+
+    여러 날짜를 동시에 적재하는 백필처럼 적재 순서가 뒤섞인 경우 마지막에 한 번 호출합니다.
+
+    Returns:
+        int: 값이 바뀐 행 수
+    """
+    result = client.rpc(
+        "rebuild_snapshot_deltas",
+        {"start_at": start.isoformat(), "end_at": end.isoformat()}
+    ).execute()
+    rebuilt = result.data if isinstance(result.data, int) else 0
+    logger.info(f"Rebuilt deltas of {rebuilt} snapshots in [{start.isoformat()}, {end.isoformat()})")
+    return rebuilt
+
+
+def _fill_delta(record: Dict[str, Any], previous: Optional[PreviousSnapshot], snapshot_at: datetime) -> None:
+    if previous is None:
+        record.update(prev_rank=None, rank_change=None, view_delta=None, minutes_since_prev=None)
+        return
+
+    rank = record.get("trending_rank")
+    record["prev_rank"] = previous.trending_rank
+    record["rank_change"] = (
+        previous.trending_rank - rank if previous.trending_rank is not None and rank is not None else None
+    )
+    record["view_delta"] = (
+        record["view_count"] - previous.view_count if previous.view_count is not None else None
+    )
+    record["minutes_since_prev"] = int((snapshot_at - previous.snapshot_at).total_seconds() // 60)
+
+
+def clear_snapshot_cache() -> None:
+    """프로세스 내 직전 스냅샷 캐시 초기화"""
+    _cache.clear()
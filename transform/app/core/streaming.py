@@ -0,0 +1,131 @@
+"""
+Streaming - 큰 원본 파일을 일정한 메모리로 변환/적재
+
+파일 전체와 레코드 전체를 한 번에 메모리에 올리지 않고
+- GCS에서 청크 단위로 읽으면서 gzip을 점진적으로 해제하고
+- 증분 JSON 파서(ijson)로 items 배열의 item을 하나씩 꺼내
+- STREAM_BATCH_ROWS개씩 구조체 → 레코드로 변환한 뒤 바로 적재합니다.
+
+최대 메모리는 파일 크기가 아니라 배치 크기에 비례합니다.
+"""
+import os
+import gzip
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import ijson
+
+from app.core import timing
+from app.core.decoding import convert_items
+from app.core.database import PartialWriteError
+
+logger = logging.getLogger(__name__)
+
+# 이 크기(압축 기준 bytes) 이상인 파일은 스트리밍으로 처리 (0이면 항상 스트리밍)
+STREAM_THRESHOLD_BYTES = int(os.environ.get("STREAM_THRESHOLD_BYTES", str(8 * 1024 * 1024)))
+# 한 번에 변환/적재하는 item 수
+STREAM_BATCH_ROWS = int(os.environ.get("STREAM_BATCH_ROWS", "1000"))
+# GCS 범위 요청 1회당 읽는 크기 (BlobReader 기본값 40MiB 대신 메모리 상한에 맞춤)
+STREAM_READ_BYTES = 4 * 1024 * 1024
+
+
+def should_stream(bucket, blob_path: str, size: Optional[int] = None) -> bool:
+    """
+    파일 크기가 STREAM_THRESHOLD_BYTES 이상이면 True
+
+    Args:
+        size: 이미 알고 있는 파일 크기 (GCS 이벤트의 size 등). 없으면 blob 메타데이터를 조회합니다.
+    """
+    if STREAM_THRESHOLD_BYTES <= 0:
+        return True
+
+    if size is None:
+        blob = bucket.get_blob(blob_path)
+        size = blob.size if blob is not None and blob.size is not None else 0
+
+    return int(size) >= STREAM_THRESHOLD_BYTES
+
+
+def open_gcs_stream(bucket, blob_path: str):
+    """GCS 파일을 청크 단위로 읽는 파일 객체를 엽니다. gzip 압축 파일은 점진적으로 해제합니다."""
+    reader = bucket.blob(blob_path).open("rb", chunk_size=STREAM_READ_BYTES)
+
+    if blob_path.endswith(".gz"):
+        return gzip.GzipFile(fileobj=reader, mode="rb")
+    return reader
+
+
+def iter_item_batches(
+    bucket,
+    blob_path: str,
+    data_type: str,
+    batch_size: int = STREAM_BATCH_ROWS
+) -> Iterator[List[Any]]:
+    """
+    파일의 items 배열을 batch_size개씩 구조체(app.core.decoding) 목록으로 반환합니다.
+
+    items 외의 최상위 필드는 읽기만 하고 건너뜁니다.
+    """
+    with open_gcs_stream(bucket, blob_path) as stream:
+        batch: List[Dict[str, Any]] = []
+        for item in ijson.items(stream, "items.item", use_float=True):
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield convert_items(data_type, batch)
+                batch = []
+
+        if batch:
+            yield convert_items(data_type, batch)
+
+
+def stream_transform(
+    bucket,
+    blob_path: str,
+    data_type: str,
+    table_name: str,
+    build: Callable[[List[Any]], List[Dict[str, Any]]],
+    write: Callable[[List[Dict[str, Any]]], int],
+    batch_size: int = STREAM_BATCH_ROWS
+) -> Dict[str, Any]:
+    """
+    파일을 배치 단위로 읽고 변환하여 바로 적재합니다.
+
+    Args:
+        build: item 구조체 목록 → 레코드 목록
+        write: 레코드 목록을 적재하고 적재된 행 수를 반환
+
+    Returns:
+        dict: records_count(적재된 행 수), items_count, batches
+
+    Raises:
+        PartialWriteError: 앞선 배치가 적재된 뒤 실패한 경우 (written에 그때까지 적재된 수)
+    """
+    written = 0
+    items_count = 0
+    batches = 0
+
+    try:
+        batches_iter = iter_item_batches(bucket, blob_path, data_type, batch_size)
+        while True:
+            # 다운로드/압축 해제/파싱이 청크 단위로 섞이므로 stream_read 한 단계로 측정
+            with timing.stage("stream_read"):
+                items = next(batches_iter, None)
+            if items is None:
+                break
+            with timing.stage("map"):
+                records = build(items)
+            timing.count("records", len(records))
+            with timing.stage("write"):
+                written += write(records)
+            items_count += len(items)
+            batches += 1
+    except PartialWriteError as e:
+        raise PartialWriteError(table_name, written + e.written, e.failed, e.cause) from e
+    except Exception as e:
+        if written == 0:
+            raise
+        raise PartialWriteError(table_name, written, 0, e) from e
+
+    timing.count("items", items_count)
+    logger.info(f"Streamed {items_count} items from {blob_path} into {table_name} in {batches} batches")
+    return {"records_count": written, "items_count": items_count, "batches": batches}
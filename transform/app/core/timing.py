@@ -0,0 +1,171 @@
+"""
+Timing - 파일 단위 변환 단계별 소요 시간/크기 측정
+
+transform_handler가 timing_scope()로 파일마다 StageTimer를 열면,
+하위 함수(load_gcs_page, 변환기, stream_transform)는 stage()/count()로 같은 타이머에 기록합니다.
+범위 밖(배치 실행기, 벤치마크 등)에서는 기록하지 않으므로 비용이 없습니다.
+
+결과는 processed_files.metadata["timings"]에 저장되고 구조화 로그(JSON)로도 남습니다.
+timing_report.py가 날짜 범위의 기록을 데이터 타입/단계별 p50/p95로 집계합니다.
+"""
+import json
+import math
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 리포트 출력 순서 (그 외 단계는 뒤에 이름순)
+STAGES = (
+    "ledger_check", "list", "download", "decompress", "parse", "stream_read",
+    "category_lookup", "map", "deltas", "write", "rollups", "ledger_write",
+)
+
+_current: ContextVar[Optional["StageTimer"]] = ContextVar("stage_timer", default=None)
+
+
+class StageTimer:
+    """단계별 누적 소요 시간(ms)과 크기/건수 카운터"""
+
+    def __init__(self):
+        self.stages_ms: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """블록 실행 시간을 name 단계에 더합니다. (스트리밍처럼 여러 번 들어가면 합계)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages_ms[name] = self.stages_ms.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    def count(self, name: str, value: int) -> None:
+        self.counts[name] = self.counts.get(name, 0) + int(value)
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round(self.total_ms, 1),
+            "stages_ms": {name: round(ms, 1) for name, ms in self.stages_ms.items()},
+            **self.counts,
+        }
+
+
+@contextmanager
+def timing_scope() -> Iterator[StageTimer]:
+    """현재 컨텍스트(파일 하나 처리)에 새 StageTimer를 엽니다."""
+    timer = StageTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+def stage(name: str):
+    """열린 타이머가 있으면 name 단계로 측정하고, 없으면 아무것도 하지 않습니다."""
+    timer = _current.get()
+    return timer.stage(name) if timer is not None else nullcontext()
+
+
+def count(name: str, value: int) -> None:
+    """열린 타이머가 있으면 카운터(bytes_downloaded, records 등)에 더합니다."""
+    timer = _current.get()
+    if timer is not None:
+        timer.count(name, value)
+
+
+def log_timings(blob_path: str, data_type: str, status: str, timer: StageTimer) -> None:
+    """
+    단계별 측정값을 한 줄짜리 JSON 로그로 남깁니다.
+
+    google-cloud-logging의 StructuredLogHandler를 쓰면 json_fields가 jsonPayload로 들어갑니다.
+    """
+    payload = {
+        "event": "transform_timings",
+        "file_path": blob_path,
+        "data_type": data_type,
+        "status": status,
+        **timer.to_dict(),
+    }
+    logger.info(json.dumps(payload, ensure_ascii=False), extra={"json_fields": payload})
+
+
+# ============== 집계 (timing_report.py) ==============
+
+def percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수 (values는 정렬되어 있어야 함)"""
+    if not values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(values))
+    return values[max(0, min(len(values), rank) - 1)]
+
+
+def summarize_timings(rows: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    processed_files 행(data_type, metadata)을 데이터 타입/단계별 분포로 집계합니다.
+
+    timings가 없는 행(배치 실행기로 처리된 파일, 측정 도입 이전 기록)은 건너뜁니다.
+    run 단위 트리거의 _metadata.json 행은 "videos_list (run)"처럼 별도 타입으로 묶습니다.
+
+    Returns:
+        dict: {data_type: {stage: {"files", "p50", "p95", "max"}}}
+              단계 값은 ms이고, "total"과 카운터(records, bytes_downloaded 등 - 건수/bytes)도 함께 집계합니다.
+    """
+    samples: Dict[str, Dict[str, List[float]]] = {}
+
+    for row in rows:
+        metadata = row.get("metadata") or {}
+        timings = metadata.get("timings")
+        if not timings:
+            continue
+
+        # run 단위 트리거(app/runs.py)는 run 전체를 한 번에 처리하므로 파일 단위 분포와 따로 집계
+        data_type = row.get("data_type") or "unknown"
+        if metadata.get("trigger") == "run":
+            data_type = f"{data_type} (run)"
+        by_stage = samples.setdefault(data_type, {})
+        by_stage.setdefault("total", []).append(float(timings.get("total_ms", 0)))
+        for name, ms in (timings.get("stages_ms") or {}).items():
+            by_stage.setdefault(name, []).append(float(ms))
+        for name, value in timings.items():
+            if name not in ("total_ms", "stages_ms") and isinstance(value, (int, float)):
+                by_stage.setdefault(name, []).append(float(value))
+
+    summary: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for data_type, by_stage in sorted(samples.items()):
+        known = ("total",) + STAGES
+        order = [s for s in known if s in by_stage] + sorted(s for s in by_stage if s not in known)
+        summary[data_type] = {}
+        for name in order:
+            values = sorted(by_stage[name])
+            summary[data_type][name] = {
+                "files": len(values),
+                "p50": round(percentile(values, 50), 1),
+                "p95": round(percentile(values, 95), 1),
+                "max": round(values[-1], 1),
+            }
+    return summary
+
+
+def format_timing_summary(summary: Dict[str, Dict[str, Dict[str, float]]]) -> str:
+    """집계 결과를 데이터 타입별 표로 만듭니다."""
+    lines = []
+    for data_type, stages in summary.items():
+        lines.append(f"[{data_type}]")
+        lines.append(f"  {'stage':<18}{'files':>8}{'p50':>12}{'p95':>12}{'max':>12}")
+        for name, stats in stages.items():
+            lines.append(
+                f"  {name:<18}{stats['files']:>8}"
+                f"{stats['p50']:>12,.1f}{stats['p95']:>12,.1f}{stats['max']:>12,.1f}"
+            )
+        lines.append("")
+    return "\n".join(lines) if lines else "No timing records found."
@@ -1,11 +1,12 @@
 """
 Core Utilities - 경로 파싱, 데이터 변환 유틸리티
 """
+import os
 import re
 import gzip
 import json
-from typing import Any, Optional
-from datetime import datetime, timezone
+from typing import Any, List, Optional
+from datetime import date, datetime, timedelta, timezone
 
 
 def extract_metadata_from_path(blob_path: str) -> dict:
@@ -15,7 +16,7 @@ def extract_metadata_from_path(blob_path: str) -> dict:
     Example path: raw/youtube/videos_list/region=KR/date=2026-01-05/hour=05/run_id=xxx/page_001.json.gz
     
     Returns:
-        dict: region, date, hour, run_id 등의 메타데이터
+        dict: region, date, hour, run_id, page 등의 메타데이터
     """
     metadata = {
         "blob_path": blob_path,
@@ -28,7 +29,8 @@ def extract_metadata_from_path(blob_path: str) -> dict:
         "date": r"date=(\d{4}-\d{2}-\d{2})",
         "hour": r"hour=(\d{2})",
         "run_id": r"run_id=([^/]+)",
-        "video_id": r"video_id=([^/]+)"
+        "video_id": r"video_id=([^/]+)",
+        "page": r"page_(\d+)\.json"
     }
     
     for key, pattern in patterns.items():
@@ -100,3 +102,46 @@ def load_gcs_json(bucket, blob_path: str) -> dict:
         content = gzip.decompress(content)
     
     return json.loads(content.decode("utf-8"))
+
+
+def partition_time(metadata: dict) -> datetime:
+    """
+    경로의 date/hour 파티션을 UTC 시각으로 반환합니다. (없거나 잘못되면 현재 시각)
+    
+    같은 파일을 다시 처리해도 같은 값이 나오므로 자연키(스냅샷/수집 시각)로 사용합니다.
+    """
+    if metadata.get("date") and metadata.get("hour"):
+        try:
+            return datetime.strptime(
+                f"{metadata['date']} {metadata['hour']}:00:00",
+                "%Y-%m-%d %H:%M:%S"
+            ).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc)
+
+
+# 트렌딩 페이지당 영상 수 (collector의 YOUTUBE_MAX_RESULTS와 같아야 함, API 최대 50)
+TRENDING_PAGE_SIZE = int(os.getenv("TRENDING_PAGE_SIZE", "50"))
+
+
+def rank_offset(metadata: dict, page_size: int = TRENDING_PAGE_SIZE) -> int:
+    """
+    페이지 파일의 첫 영상 순위 - 1 을 반환합니다. (page_001 → 0, page_002 → 50, …)
+
+    videos.list는 페이지마다 item 순서가 1위부터 다시 시작하므로,
+    순위(와 그로부터 계산하는 prev_rank/rank_change)가 run 전체에서 유일하도록 페이지 번호만큼 밀어 줍니다.
+    앞 페이지는 항상 page_size개가 채워져 있으므로 다른 페이지를 읽지 않고도 같은 값이 나옵니다.
+    """
+    try:
+        page = int(metadata.get("page") or 1)
+    except (TypeError, ValueError):
+        page = 1
+    return max(page - 1, 0) * page_size
+
+
+def iter_dates(start_date: str, end_date: str) -> List[str]:
+    """YYYY-MM-DD 범위(양 끝 포함)의 날짜 문자열 리스트를 반환합니다."""
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
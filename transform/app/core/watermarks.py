@@ -0,0 +1,186 @@
+"""
+Partition Watermarks - 데이터 타입/리전별 "어디까지 처리됐는지" (transform_watermarks)
+
+리컨실/배치가 매번 전체 기간을 나열하고 processed_files와 비교하지 않도록
+모든 파일이 처리된 가장 최근 파티션(watermark)과 그 이전의 미완료 파티션(holes)을 저장합니다.
+다음 실행은 holes + watermark 이후 파티션만 나열하므로 나열 비용이 새 데이터 양에 비례합니다.
+
+- 파티션: date/hour 단위 (video_categories, channels는 date 단위)
+- 완료: 파티션의 데이터 파일이 모두 success (파일이 없는 파티션도 정착 시간이 지나면 완료)
+- 정착 시간(WATERMARK_SETTLE_MINUTES)이 지나지 않은 파티션은 수집/변환 중일 수 있어 watermark 계산에서 제외
+
+스키마: migrations/0008_partition_watermarks.sql
+"""
+import os
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "transform_watermarks"
+
+WATERMARK_SETTLE_MINUTES = int(os.environ.get("WATERMARK_SETTLE_MINUTES", "120"))
+
+# 시간 파티션이 없는 데이터 타입 (날짜 단위로만 집계)
+DAILY_TYPES = ("video_categories", "channels")
+
+# region 파티션이 없는 데이터 타입 (watermark는 region='' 한 행)
+REGIONLESS_TYPES = ("channels",)
+
+
+# ============== 파티션 시각 ==============
+
+def partition_step(data_type: str) -> timedelta:
+    """파티션 하나의 길이"""
+    return timedelta(days=1) if data_type in DAILY_TYPES else timedelta(hours=1)
+
+
+def floor_partition(data_type: str, moment: datetime) -> datetime:
+    """시각이 속한 파티션의 시작 시각 (UTC)"""
+    moment = moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if data_type in DAILY_TYPES else moment
+
+
+def partition_start(data_type: str, metadata: Mapping[str, Any]) -> Optional[datetime]:
+    """경로 메타데이터(date, hour)의 파티션 시작 시각 (파티션 정보가 없으면 None)"""
+    try:
+        start = datetime.strptime(metadata["date"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        if data_type not in DAILY_TYPES:
+            start += timedelta(hours=int(metadata["hour"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return start
+
+
+def iter_partitions(data_type: str, start: datetime, end: datetime) -> List[datetime]:
+    """start ~ end (양 끝 포함) 파티션 시작 시각 목록"""
+    step = partition_step(data_type)
+    current, end = floor_partition(data_type, start), floor_partition(data_type, end)
+    partitions = []
+    while current <= end:
+        partitions.append(current)
+        current += step
+    return partitions
+
+
+def settled_cutoff(data_type: str, now: Optional[datetime] = None) -> datetime:
+    """
+    watermark를 올릴 수 있는 마지막 파티션
+
+    파티션이 끝난 뒤 WATERMARK_SETTLE_MINUTES가 지나야 늦게 올라온 파일/진행 중인 변환이 없다고 봅니다.
+    """
+    now = now or datetime.now(timezone.utc)
+    return floor_partition(data_type, now - timedelta(minutes=WATERMARK_SETTLE_MINUTES)) - partition_step(data_type)
+
+
+def region_key(data_type: str, region: str) -> str:
+    return "" if data_type in REGIONLESS_TYPES else region
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+# ============== Watermark ==============
+
+@dataclass
+class Watermark:
+    """
+    데이터 타입/리전 하나의 처리 위치
+
+    Args:
+        watermark: 모든 파일이 처리된 가장 최근 파티션 시작 시각 (아직 없으면 None)
+        holes: watermark 이전의 미완료 파티션 (누락/실패 파일이 남아 있음)
+    """
+    data_type: str
+    region: str
+    watermark: Optional[datetime] = None
+    holes: List[datetime] = field(default_factory=list)
+
+    def pending_partitions(self, until: datetime, start: Optional[datetime] = None) -> List[datetime]:
+        """
+        다음 실행에서 나열할 파티션 (holes + watermark 이후 ~ until)
+
+        Args:
+            start: watermark가 아직 없을 때 시작할 파티션 (GCS의 최초 날짜 등)
+        """
+        if self.watermark is not None:
+            first = self.watermark + partition_step(self.data_type)
+        elif start is not None:
+            first = start
+        else:
+            raise ValueError(f"No watermark for {self.data_type}/{self.region or '-'}; a start partition is required")
+        return sorted(set(self.holes) | set(iter_partitions(self.data_type, first, until)))
+
+    def advance(self, complete: Mapping[datetime, bool], cutoff: datetime) -> "Watermark":
+        """
+        이번 실행에서 확인한 파티션의 완료 여부로 새 watermark를 계산합니다.
+
+        - watermark: 정착된(cutoff 이전) 완료 파티션 중 가장 최근 (뒤로 가지 않음)
+        - holes: 새 watermark 이전의 미완료 파티션 (이번에 확인하지 않은 기존 holes는 유지)
+        - watermark 이후의 미완료 파티션은 다음 실행에서 어차피 나열되므로 holes에 넣지 않음
+        """
+        settled = {p: ok for p, ok in complete.items() if p <= cutoff}
+        done = [p for p, ok in settled.items() if ok]
+        if self.watermark is not None:
+            done.append(self.watermark)
+        mark = max(done) if done else None
+
+        holes = {h for h in self.holes if h not in settled}
+        holes.update(p for p, ok in settled.items() if not ok)
+        return Watermark(
+            self.data_type,
+            self.region,
+            mark,
+            sorted(h for h in holes if mark is not None and h < mark),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "data_type": self.data_type,
+            "region": self.region,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "holes": [h.isoformat() for h in self.holes],
+        }
+
+
+class WatermarkStore:
+    """transform_watermarks 조회/저장"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, data_type: str, region: str = "KR") -> Watermark:
+        """저장된 watermark (없으면 watermark=None인 빈 값)"""
+        key = region_key(data_type, region)
+        result = (
+            self.client.table(TABLE_NAME).select("watermark, holes")
+            .eq("data_type", data_type).eq("region", key).execute()
+        )
+        if not result.data:
+            return Watermark(data_type, key)
+
+        row = result.data[0]
+        return Watermark(
+            data_type,
+            key,
+            _parse_time(row.get("watermark")),
+            sorted(_parse_time(h) for h in row.get("holes") or []),
+        )
+
+    def save(self, mark: Watermark) -> None:
+        """watermark를 저장합니다. (data_type, region 당 한 행)"""
+        row = {
+            **mark.to_dict(),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.client.table(TABLE_NAME).upsert(row, on_conflict="data_type,region").execute()
+        logger.info(
+            f"Watermark {mark.data_type}/{mark.region or '-'}: {row['watermark']} ({len(mark.holes)} holes)"
+        )
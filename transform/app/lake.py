@@ -0,0 +1,314 @@
+"""
+Lake Compaction - 하루치 원본 페이지(page_NNN.json.gz)를 Parquet로 압축 저장합니다.
+
+raw/youtube/{data_type}/region=R/date=D/hour=HH/.../page_NNN.json.gz (수천 개)
+→ curated/youtube/{data_type}/region=R/date=D/part-NNNNN.parquet (몇 개) + _manifest.json
+
+- 변환에 쓰는 원본 필드를 평탄화한 열 + 파티션 열(region, date, hour, run_id/video_id)
+- 원본 파일 경로와 페이지 내 위치(source_file, page_number, item_index)를 함께 저장하여 재처리/순위 복원 가능
+- _manifest.json은 Parquet 파일을 모두 쓴 뒤 마지막에 기록 (manifest가 있으면 완료된 날짜)
+"""
+import re
+import io
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.utils import extract_metadata_from_path
+from app.batch import RAW_PREFIX, list_blob_paths, prefetch_pages
+
+logger = logging.getLogger(__name__)
+
+CURATED_PREFIX = "curated/youtube"
+MANIFEST_NAME = "_manifest.json"
+
+_PAGE_NUMBER = re.compile(r"page_(\d+)\.json")
+
+
+def _count(value: Any) -> Optional[int]:
+    """통계 문자열 → int (변환 불가면 null, 원본 값 보존은 하지 않음)"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+# ============== 스키마 ==============
+
+PARTITION_FIELDS = [
+    pa.field("region", pa.string()),
+    pa.field("date", pa.string()),
+    pa.field("hour", pa.string()),
+    pa.field("source_file", pa.string()),
+    pa.field("page_number", pa.int32()),
+    pa.field("item_index", pa.int32()),
+]
+
+VIDEO_SCHEMA = pa.schema(PARTITION_FIELDS + [
+    pa.field("run_id", pa.string()),
+    pa.field("video_id", pa.string()),
+    pa.field("title", pa.string()),
+    pa.field("channel_id", pa.string()),
+    pa.field("channel_title", pa.string()),
+    pa.field("category_id", pa.string()),
+    pa.field("published_at", pa.string()),
+    pa.field("tags", pa.list_(pa.string())),
+    pa.field("thumbnail_url", pa.string()),
+    pa.field("view_count", pa.int64()),
+    pa.field("like_count", pa.int64()),
+    pa.field("comment_count", pa.int64()),
+    pa.field("duration", pa.string()),
+])
+
+COMMENT_SCHEMA = pa.schema(PARTITION_FIELDS + [
+    pa.field("video_id", pa.string()),
+    pa.field("comment_id", pa.string()),
+    pa.field("text_display", pa.string()),
+    pa.field("author_display_name", pa.string()),
+    pa.field("author_channel_id", pa.string()),
+    pa.field("like_count", pa.int64()),
+    pa.field("total_reply_count", pa.int64()),
+    pa.field("published_at", pa.string()),
+    pa.field("author_is_channel_owner", pa.bool_()),
+])
+
+
+def video_rows(items: List[Any], metadata: Dict[str, Any]) -> List[tuple]:
+    """VideoItem 목록 → VIDEO_SCHEMA 순서의 행"""
+    base = _partition_values(metadata)
+    rows = []
+    for index, item in enumerate(items):
+        snippet = item.snippet
+        statistics = item.statistics
+        rows.append(base + (
+            index,
+            metadata.get("run_id"),
+            item.id,
+            snippet.title,
+            snippet.channelId,
+            snippet.channelTitle,
+            snippet.categoryId,
+            snippet.publishedAt,
+            snippet.tags,
+            snippet.thumbnails.high.url,
+            _count(statistics.viewCount),
+            _count(statistics.likeCount),
+            _count(statistics.commentCount),
+            item.contentDetails.duration,
+        ))
+    return rows
+
+
+def comment_rows(items: List[Any], metadata: Dict[str, Any]) -> List[tuple]:
+    """CommentThreadItem 목록 → COMMENT_SCHEMA 순서의 행"""
+    base = _partition_values(metadata)
+    rows = []
+    for index, item in enumerate(items):
+        top_comment = item.snippet.topLevelComment
+        snippet = top_comment.snippet
+        rows.append(base + (
+            index,
+            metadata.get("video_id") or snippet.videoId,
+            top_comment.id,
+            snippet.textDisplay,
+            snippet.authorDisplayName,
+            snippet.authorChannelId.value,
+            _count(snippet.likeCount),
+            _count(item.snippet.totalReplyCount),
+            snippet.publishedAt,
+            snippet.authorIsChannelOwner,
+        ))
+    return rows
+
+
+def _partition_values(metadata: Dict[str, Any]) -> tuple:
+    match = _PAGE_NUMBER.search(metadata.get("blob_path", ""))
+    return (
+        metadata.get("region"),
+        metadata.get("date"),
+        metadata.get("hour"),
+        metadata.get("blob_path"),
+        int(match.group(1)) if match else None,
+    )
+
+
+# 데이터 타입별 (스키마, 행 변환 함수)
+LAKE_TABLES: Dict[str, tuple] = {
+    "videos_list": (VIDEO_SCHEMA, video_rows),
+    "comment_threads": (COMMENT_SCHEMA, comment_rows),
+}
+
+
+# ============== 경로 ==============
+
+def raw_day_prefix(data_type: str, day: str, region: str = "KR") -> str:
+    return f"{RAW_PREFIX}/{data_type}/region={region}/date={day}/"
+
+
+def curated_day_prefix(data_type: str, day: str, region: str = "KR") -> str:
+    return f"{CURATED_PREFIX}/{data_type}/region={region}/date={day}/"
+
+
+def read_lake_manifest(bucket, data_type: str, day: str, region: str = "KR") -> Optional[Dict[str, Any]]:
+    """날짜의 manifest (없으면 None = 아직 압축되지 않은 날짜)"""
+    blob = bucket.blob(curated_day_prefix(data_type, day, region) + MANIFEST_NAME)
+    if not blob.exists():
+        return None
+    return json.loads(blob.download_as_bytes())
+
+
+# ============== 압축 ==============
+
+class DayCompactor:
+    """
+    하루치 원본 페이지를 Parquet 파일로 다시 씁니다.
+
+    Args:
+        max_rows_per_file: Parquet 파일 하나의 최대 행 수 (넘으면 part 파일을 나눔)
+        row_group_rows: Parquet row group 크기
+    """
+
+    def __init__(
+        self,
+        bucket,
+        workers: int = 16,
+        max_rows_per_file: int = 500_000,
+        row_group_rows: int = 128_000,
+        compression: str = "zstd"
+    ):
+        self.bucket = bucket
+        self.workers = workers
+        self.max_rows_per_file = max_rows_per_file
+        self.row_group_rows = row_group_rows
+        self.compression = compression
+
+    def compact(self, data_type: str, day: str, region: str = "KR", force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        날짜 하나를 압축합니다.
+
+        같은 원본 파일 수로 이미 manifest가 있고 읽지 못한 파일(failed_files)이 없으면 건너뜁니다. (force=True면 다시 씀)
+        읽기 오류가 남은 날짜는 다음 실행에서 다시 압축해 빠진 페이지를 채웁니다.
+
+        Returns:
+            dict: manifest (dry_run이면 원본 파일 수만)
+        """
+        schema, to_rows = LAKE_TABLES[data_type]
+        sources = list_blob_paths(self.bucket, [raw_day_prefix(data_type, day, region)], workers=self.workers)
+        if not sources:
+            logger.info(f"No raw pages for {data_type} {day}")
+            return {"data_type": data_type, "date": day, "source_files": 0, "status": "empty"}
+
+        existing = read_lake_manifest(self.bucket, data_type, day, region)
+        if (
+            existing and not force
+            and existing.get("source_file_count") == len(sources)
+            and not existing.get("failed_files")
+        ):
+            logger.info(f"Already compacted: {data_type} {day} ({len(sources)} files)")
+            return {**existing, "status": "skipped"}
+
+        if dry_run:
+            return {"data_type": data_type, "date": day, "source_files": len(sources), "status": "dry_run"}
+
+        prefix = curated_day_prefix(data_type, day, region)
+        parts: List[Dict[str, Any]] = []
+        failed: List[Dict[str, str]] = []
+        buffer: List[tuple] = []
+
+        for path, page, error in prefetch_pages(self.bucket, sources, data_type, workers=self.workers):
+            if error is not None:
+                logger.error(f"Could not read {path}: {error}")
+                failed.append({"file_path": path, "error": str(error)})
+                continue
+
+            buffer.extend(to_rows(page.items, extract_metadata_from_path(path)))
+            if len(buffer) >= self.max_rows_per_file:
+                parts.append(self._write_part(prefix, len(parts), schema, buffer))
+                buffer = []
+
+        if buffer or not parts:
+            parts.append(self._write_part(prefix, len(parts), schema, buffer))
+
+        # 이전 실행에서 더 많은 part를 썼다면 남은 파일 삭제
+        if existing:
+            current = {part["path"] for part in parts}
+            for old in existing.get("files", []):
+                if old["path"] not in current:
+                    self.bucket.blob(old["path"]).delete()
+
+        failed_paths = {f["file_path"] for f in failed}
+        manifest = {
+            "data_type": data_type,
+            "region": region,
+            "date": day,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "format": "parquet",
+            "compression": self.compression,
+            "rows": sum(part["rows"] for part in parts),
+            "bytes": sum(part["bytes"] for part in parts),
+            "files": parts,
+            "source_file_count": len(sources),
+            "source_files": [p for p in sources if p not in failed_paths],
+            "failed_files": failed,
+            "schema": [{"name": f.name, "type": str(f.type)} for f in schema],
+        }
+        self.bucket.blob(prefix + MANIFEST_NAME).upload_from_string(
+            json.dumps(manifest, ensure_ascii=False), content_type="application/json"
+        )
+
+        logger.info(
+            f"Compacted {data_type} {day}: {len(sources)} pages → {len(parts)} parquet files, "
+            f"{manifest['rows']} rows, {manifest['bytes']} bytes"
+        )
+        return {**manifest, "status": "compacted" if not failed else "partial"}
+
+    def _write_part(self, prefix: str, index: int, schema: pa.Schema, rows: List[tuple]) -> Dict[str, Any]:
+        """행 목록을 Parquet 파일 하나로 써서 업로드합니다."""
+        columns = list(zip(*rows)) if rows else [()] * len(schema)
+        table = pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+        sink = io.BytesIO()
+        pq.write_table(table, sink, compression=self.compression, row_group_size=self.row_group_rows)
+        data = sink.getvalue()
+
+        path = f"{prefix}part-{index:05d}.parquet"
+        self.bucket.blob(path).upload_from_string(data, content_type="application/vnd.apache.parquet")
+        return {"path": path, "rows": table.num_rows, "bytes": len(data)}
+
+
+# ============== 읽기 ==============
+
+def load_curated_day(
+    bucket,
+    data_type: str,
+    day: str,
+    region: str = "KR",
+    columns: Optional[List[str]] = None,
+    filters: Optional[Callable[[pa.Table], pa.Table]] = None
+) -> Optional[pa.Table]:
+    """
+    압축된 날짜를 pyarrow.Table로 읽습니다. (manifest의 파일만, 필요한 열만)
+
+    Returns:
+        pa.Table 또는 manifest가 없으면 None
+    """
+    manifest = read_lake_manifest(bucket, data_type, day, region)
+    if manifest is None:
+        return None
+
+    tables = []
+    for part in manifest["files"]:
+        data = bucket.blob(part["path"]).download_as_bytes()
+        table = pq.read_table(io.BytesIO(data), columns=columns)
+        tables.append(filters(table) if filters else table)
+
+    return pa.concat_tables(tables) if tables else None
@@ -0,0 +1,123 @@
+"""
+Schema Migrations - migrations/NNNN_*.sql 버전 적용기
+
+schema_migrations 테이블에 적용한 버전을 기록하고, 아직 적용하지 않은 파일만 번호 순서대로
+파일마다 한 트랜잭션으로 적용합니다. (중간에 실패하면 그 파일은 적용되지 않고 다음 실행에서 다시 시도)
+
+기존 파일은 모두 IF NOT EXISTS / CREATE OR REPLACE로 작성되어 있으므로,
+이 적용기 도입 전에 SQL Editor로 직접 적용한 DB에서 처음 실행해도 안전합니다.
+적용 후 내용이 바뀐 파일은 checksum으로 감지하여 경고만 남깁니다. (이미 적용된 버전은 다시 실행하지 않음)
+"""
+import re
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+TABLE_NAME = "schema_migrations"
+
+# 여러 적용기가 동시에 실행되지 않도록 잡는 advisory lock 키
+LOCK_KEY = 4_809_001
+
+_FILE_PATTERN = re.compile(r"^(\d{4})_(.+)\.sql$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """마이그레이션 파일 하나"""
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+
+def list_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """NNNN_name.sql 파일을 버전 순으로 반환합니다. (같은 번호가 두 개면 오류)"""
+    migrations: Dict[int, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {migrations[version].path.name}, {path.name}")
+        migrations[version] = Migration(version, match.group(2), path)
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def ensure_table(conn) -> None:
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def applied_versions(conn) -> Dict[int, str]:
+    """적용된 버전 → checksum"""
+    ensure_table(conn)
+    return {row[0]: row[1] for row in conn.execute(f"SELECT version, checksum FROM {TABLE_NAME}")}
+
+
+def pending_migrations(conn, target: Optional[int] = None, directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """아직 적용하지 않은 마이그레이션 (target 버전까지)"""
+    applied = applied_versions(conn)
+    pending = []
+    for migration in list_migrations(directory):
+        if target is not None and migration.version > target:
+            break
+        if migration.version not in applied:
+            pending.append(migration)
+        elif applied[migration.version] != migration.checksum:
+            logger.warning(f"{migration.path.name} changed after it was applied (not re-applied)")
+    return pending
+
+
+def migrate(
+    conn,
+    target: Optional[int] = None,
+    dry_run: bool = False,
+    directory: Path = MIGRATIONS_DIR
+) -> List[Migration]:
+    """
+    미적용 마이그레이션을 순서대로 적용합니다.
+
+    Args:
+        conn: psycopg 연결 (autocommit=True, 파일마다 transaction()으로 묶음)
+        target: 이 버전까지만 적용 (없으면 전체)
+        dry_run: 적용할 목록만 반환
+
+    Returns:
+        List[Migration]: 적용한(dry_run이면 적용할) 마이그레이션
+    """
+    conn.execute("SELECT pg_advisory_lock(%s)", (LOCK_KEY,))
+    try:
+        pending = pending_migrations(conn, target, directory)
+        if dry_run:
+            return pending
+
+        for migration in pending:
+            with conn.transaction():
+                conn.execute(migration.sql)
+                conn.execute(
+                    f"INSERT INTO {TABLE_NAME} (version, name, checksum) VALUES (%s, %s, %s)",
+                    (migration.version, migration.name, migration.checksum),
+                )
+            logger.info(f"Applied {migration.path.name}")
+        return pending
+    finally:
+        conn.execute("SELECT pg_advisory_unlock(%s)", (LOCK_KEY,))
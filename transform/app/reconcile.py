@@ -0,0 +1,354 @@
+"""
+Reconcile - 누락/실패 변환 파일을 찾아 배치로 다시 처리합니다.
+
+- 날짜 범위 + 데이터 타입에 해당하는 date= 파티션만 병렬 조회 (버킷 전체 스캔 없음)
+- processed_files는 같은 파티션 범위만 페이지 단위로 조회하여 비교
+- 누락(기록 없음)/실패(error 기록만 있음) 파일을 BatchRunner로 직접 재처리 (rewrite 이벤트 없음)
+- hour 파티션별 커버리지 리포트 (파일 수, 성공/실패/누락, 재처리 결과)
+- scan_since_watermark: 날짜 범위 대신 watermark 이후 파티션과 holes만 나열하고, 결과로 watermark를 올림
+"""
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.core.utils import extract_metadata_from_path, iter_dates
+from app.core.ledger import ProcessedFileLedger
+from app.core.watermarks import (
+    DAILY_TYPES, Watermark, WatermarkStore, floor_partition, partition_start, settled_cutoff,
+)
+from app.batch import RAW_PREFIX, BatchRunner, build_partition_prefixes, list_blob_paths, list_since_watermark
+from app.backfill import first_partition
+from app.transformers import TRANSFORM_SPECS
+
+logger = logging.getLogger(__name__)
+
+GAP_KINDS = ("missing", "failed")
+
+
+@dataclass
+class PartitionCoverage:
+    """hour 파티션 하나의 커버리지"""
+    data_type: str
+    date: str
+    hour: Optional[str]
+    files: int = 0
+    success: int = 0
+    failed: int = 0
+    missing: int = 0
+    recovered: int = 0
+    still_failing: int = 0
+
+    @property
+    def coverage(self) -> float:
+        """성공 파일 비율 (재처리로 복구된 파일 포함)"""
+        return (self.success + self.recovered) / self.files if self.files else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "data_type": self.data_type,
+            "date": self.date,
+            "hour": self.hour,
+            "files": self.files,
+            "success": self.success,
+            "failed": self.failed,
+            "missing": self.missing,
+            "recovered": self.recovered,
+            "still_failing": self.still_failing,
+            "coverage": round(self.coverage, 4),
+        }
+
+
+@dataclass
+class ReconcileReport:
+    """리컨실 결과"""
+    partitions: Dict[tuple, PartitionCoverage] = field(default_factory=dict)
+    gaps: Dict[str, List[str]] = field(default_factory=lambda: {kind: [] for kind in GAP_KINDS})
+    batch: Optional[Dict[str, Any]] = None
+    # scan_since_watermark로 확인한 데이터 타입의 기존 watermark / 갱신된 watermark
+    base_marks: Dict[str, Watermark] = field(default_factory=dict)
+    watermarks: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def partition(self, data_type: str, date: str, hour: Optional[str]) -> PartitionCoverage:
+        key = (data_type, date, hour or "")
+        if key not in self.partitions:
+            self.partitions[key] = PartitionCoverage(data_type, date, hour)
+        return self.partitions[key]
+
+    def empty_partitions(self) -> List[PartitionCoverage]:
+        """GCS에 파일이 하나도 없는 파티션 (수집 누락 후보)"""
+        return [p for p in self.partitions.values() if p.files == 0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        rows = [self.partitions[key].to_dict() for key in sorted(self.partitions)]
+        return {
+            "files": sum(p.files for p in self.partitions.values()),
+            "success": sum(p.success for p in self.partitions.values()),
+            "missing": len(self.gaps["missing"]),
+            "failed": len(self.gaps["failed"]),
+            "recovered": sum(p.recovered for p in self.partitions.values()),
+            "still_failing": sum(p.still_failing for p in self.partitions.values()),
+            "empty_partitions": len(self.empty_partitions()),
+            "batch": self.batch,
+            "watermarks": self.watermarks or None,
+            "partitions": rows,
+        }
+
+
+def classify_paths(
+    paths: Iterable[str],
+    ledger_rows: Iterable[Dict[str, Any]]
+) -> Dict[str, str]:
+    """
+    GCS 경로별 상태를 success / failed / missing으로 분류합니다.
+
+    같은 파일에 여러 기록이 있으면 success가 하나라도 있으면 success입니다.
+    """
+    statuses: Dict[str, set] = defaultdict(set)
+    for row in ledger_rows:
+        statuses[row["file_path"]].add(row.get("status"))
+
+    result = {}
+    for path in paths:
+        seen = statuses.get(path)
+        if not seen:
+            result[path] = "missing"
+        elif "success" in seen:
+            result[path] = "success"
+        else:
+            result[path] = "failed"
+    return result
+
+
+class Reconciler:
+    """
+    날짜 범위 단위 리컨실러
+
+    Args:
+        only: 재처리할 공백 종류 (missing, failed)
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        bucket,
+        workers: int = 8,
+        flush_rows: int = 5000,
+        engine: str = "columnar",
+        only: Sequence[str] = GAP_KINDS
+    ):
+        self.client = supabase_client
+        self.bucket = bucket
+        self.workers = workers
+        self.flush_rows = flush_rows
+        self.engine = engine
+        self.only = tuple(only)
+        self.ledger = ProcessedFileLedger(supabase_client)
+        self.watermarks = WatermarkStore(supabase_client)
+
+    def scan(self, data_types: Sequence[str], start_date: str, end_date: str, region: str = "KR") -> ReconcileReport:
+        """GCS 파티션과 processed_files를 비교하여 커버리지와 공백 목록을 만듭니다."""
+        report = ReconcileReport()
+
+        for data_type in [t for t in TRANSFORM_SPECS if t in data_types]:
+            prefixes = build_partition_prefixes([data_type], start_date, end_date, region)
+            paths = list_blob_paths(self.bucket, prefixes, workers=self.workers)
+
+            type_prefix = prefixes[0].split("date=")[0]
+            ledger_rows = self.ledger.load_processed(type_prefix, start_date, end_date, columns="file_path, status")
+
+            # 파일이 없는 파티션도 리포트에 나오도록 기대 파티션을 먼저 만듦
+            for day in iter_dates(start_date, end_date):
+                if data_type in DAILY_TYPES:
+                    report.partition(data_type, day, None)
+                else:
+                    for hour in range(24):
+                        report.partition(data_type, day, f"{hour:02d}")
+
+            self._add_paths(report, data_type, paths, ledger_rows)
+
+        return report
+
+    def scan_since_watermark(
+        self,
+        data_types: Sequence[str],
+        region: str = "KR",
+        now: Optional[datetime] = None
+    ) -> ReconcileReport:
+        """
+        watermark 이후 파티션과 holes만 나열하여 processed_files와 비교합니다.
+
+        watermark가 아직 없는 데이터 타입은 GCS의 최초 날짜부터 확인합니다.
+        결과를 반영하려면 repair 후 advance_watermarks를 호출합니다.
+        """
+        now = now or datetime.now(timezone.utc)
+        report = ReconcileReport()
+
+        for data_type in [t for t in TRANSFORM_SPECS if t in data_types]:
+            mark = self.watermarks.get(data_type, region)
+            start = None if mark.watermark else first_partition(self.bucket, data_type, region)
+            if mark.watermark is None and start is None:
+                logger.info(f"{data_type}: no partitions in GCS")
+                continue
+
+            partitions, paths = list_since_watermark(
+                self.bucket, mark, floor_partition(data_type, now), start, region, workers=self.workers
+            )
+            report.base_marks[data_type] = mark
+
+            type_prefix = f"{RAW_PREFIX}/channels/" if data_type == "channels" else f"{RAW_PREFIX}/{data_type}/region={region}/"
+            ledger_rows = []
+            for first_day, last_day in _date_ranges(sorted({p.date().isoformat() for p in partitions})):
+                ledger_rows.extend(self.ledger.load_processed(type_prefix, first_day, last_day, columns="file_path, status"))
+
+            for partition in partitions:
+                hour = None if data_type in DAILY_TYPES else f"{partition.hour:02d}"
+                report.partition(data_type, partition.date().isoformat(), hour)
+
+            logger.info(
+                f"{data_type}: watermark {mark.watermark.isoformat() if mark.watermark else '-'}, "
+                f"{len(mark.holes)} holes, {len(partitions)} partitions to check"
+            )
+            self._add_paths(report, data_type, paths, ledger_rows)
+
+        return report
+
+    def advance_watermarks(self, report: ReconcileReport, now: Optional[datetime] = None) -> ReconcileReport:
+        """
+        scan_since_watermark(+ repair) 결과로 watermark와 holes를 갱신하여 저장합니다.
+
+        재처리로 복구된 파일은 성공으로 보고, 파일이 없는 정착된 파티션은 완료로 봅니다.
+        """
+        for data_type, mark in report.base_marks.items():
+            complete = {}
+            for p in report.partitions.values():
+                if p.data_type != data_type:
+                    continue
+                start = partition_start(data_type, {"date": p.date, "hour": p.hour})
+                if start is not None:
+                    complete[start] = p.success + p.recovered == p.files
+
+            advanced = mark.advance(complete, settled_cutoff(data_type, now))
+            self.watermarks.save(advanced)
+            report.watermarks[data_type] = advanced.to_dict()
+
+        return report
+
+    def _add_paths(
+        self,
+        report: ReconcileReport,
+        data_type: str,
+        paths: List[str],
+        ledger_rows: Iterable[Dict[str, Any]]
+    ) -> None:
+        """GCS 경로를 분류하여 파티션 커버리지와 공백 목록에 반영합니다."""
+        classified = classify_paths(paths, ledger_rows)
+
+        for path, status in classified.items():
+            metadata = extract_metadata_from_path(path)
+            hour = None if data_type in DAILY_TYPES else metadata.get("hour")
+            partition = report.partition(data_type, metadata.get("date", ""), hour)
+            partition.files += 1
+            if status == "success":
+                partition.success += 1
+            else:
+                setattr(partition, status, getattr(partition, status) + 1)
+                report.gaps[status].append(path)
+
+        logger.info(
+            f"{data_type}: {len(paths)} files, "
+            f"{sum(1 for s in classified.values() if s == 'missing')} missing, "
+            f"{sum(1 for s in classified.values() if s == 'failed')} failed"
+        )
+
+    def repair(self, report: ReconcileReport) -> ReconcileReport:
+        """공백 파일을 BatchRunner로 재처리하고, 복구된 파일의 이전 error 기록을 정리합니다."""
+        targets = [path for kind in self.only for path in report.gaps[kind]]
+        if not targets:
+            logger.info("No gaps to reprocess")
+            return report
+
+        runner = BatchRunner(
+            self.client,
+            self.bucket,
+            workers=self.workers,
+            flush_rows=self.flush_rows,
+            skip_processed=False,
+            engine=self.engine,
+        )
+        summary = runner.run(targets)
+        report.batch = summary.to_dict()
+
+        failed_paths = {error["file_path"] for error in summary.errors}
+        recovered = {path for path in targets if path not in failed_paths}
+        self.ledger.clear_errors(path for path in report.gaps["failed"] if path in recovered)
+
+        for path in targets:
+            metadata = extract_metadata_from_path(path)
+            data_type = metadata.get("data_type")
+            hour = None if data_type in DAILY_TYPES else metadata.get("hour")
+            partition = report.partition(data_type, metadata.get("date", ""), hour)
+            if path in recovered:
+                partition.recovered += 1
+            else:
+                partition.still_failing += 1
+
+        return report
+
+
+def _date_ranges(days: List[str]) -> List[tuple]:
+    """정렬된 날짜 목록 → 연속 구간 [(시작, 끝)] (processed_files를 필요한 날짜만 조회)"""
+    ranges: List[list] = []
+    for day in days:
+        if ranges and date.fromisoformat(day) - date.fromisoformat(ranges[-1][1]) == timedelta(days=1):
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return [tuple(r) for r in ranges]
+
+
+def _hour_ranges(hours: List[str]) -> str:
+    """["02", "03", "04", "07"] → "02-04, 07" """
+    numbers = sorted(int(h) for h in hours)
+    ranges = []
+    start = prev = numbers[0]
+    for number in numbers[1:] + [None]:
+        if number is not None and number == prev + 1:
+            prev = number
+            continue
+        ranges.append(f"{start:02d}" if start == prev else f"{start:02d}-{prev:02d}")
+        if number is not None:
+            start = prev = number
+    return ", ".join(ranges)
+
+
+def format_report(report: ReconcileReport, show_complete: bool = False) -> str:
+    """
+    hour 파티션별 커버리지 표 (기본은 공백이 있는 파티션만)
+
+    파일이 없는 파티션은 표 대신 (데이터 타입, 날짜)별 hour 범위로 요약합니다.
+    """
+    lines = [f"{'data_type':<17}{'date':<12}{'hour':<6}{'files':>6}{'ok':>6}{'miss':>6}{'fail':>6}{'fixed':>7}{'cov':>8}"]
+    empty: Dict[tuple, List[str]] = defaultdict(list)
+
+    for key in sorted(report.partitions):
+        p = report.partitions[key]
+        if p.files == 0:
+            empty[(p.data_type, p.date)].append(p.hour)
+            continue
+        if not show_complete and p.success == p.files:
+            continue
+        lines.append(
+            f"{p.data_type:<17}{p.date:<12}{(p.hour or '-'):<6}{p.files:>6}{p.success:>6}"
+            f"{p.missing:>6}{p.failed:>6}{p.recovered:>7}{p.coverage:>8.1%}"
+        )
+
+    if empty:
+        lines.append("")
+        lines.append("No files in GCS:")
+        for (data_type, date), hours in sorted(empty.items()):
+            detail = f"hours {_hour_ranges(hours)}" if hours[0] is not None else "whole day"
+            lines.append(f"  {data_type:<17}{date:<12}{detail}")
+
+    return "\n".join(lines)
@@ -0,0 +1,150 @@
+"""
+Retry Worker - 재시도 큐(transform_retry_queue)의 항목을 동시성 제한 안에서 다시 처리합니다.
+
+- claim_transform_retries RPC로 재시도 시각이 된 항목을 임대
+- 파일별 변환 함수(get_transformer_for_path)를 그대로 실행 (run의 _metadata.json은 transform_run)
+- 성공: processed_files에 success 기록 + 이전 error 기록 정리
+- 실패: 오류 분류에 따라 백오프 후 pending 또는 dead
+"""
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.utils import extract_metadata_from_path
+from app.core.ledger import ProcessedFileLedger
+from app.core.retry_queue import RETRY_LEASE_SECONDS, RetryQueue
+from app.runs import is_run_marker, transform_run
+from app.transformers import get_transformer_for_path
+
+logger = logging.getLogger(__name__)
+
+
+class NoTransformerError(ValueError):
+    """경로에 맞는 변환 함수가 없음 (poison)"""
+
+
+@dataclass
+class RetrySummary:
+    """재시도 실행 결과 요약"""
+    claimed: int = 0
+    succeeded: int = 0
+    rescheduled: int = 0
+    dead: int = 0
+    records_written: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "claimed": self.claimed,
+            "succeeded": self.succeeded,
+            "rescheduled": self.rescheduled,
+            "dead": self.dead,
+            "records_written": self.records_written,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "errors": self.errors[:20],
+        }
+
+
+class RetryWorker:
+    """
+    재시도 큐 작업자
+
+    Args:
+        concurrency: 동시에 처리하는 파일 수 (한 번에 임대하는 항목 수)
+        lease_seconds: 임대 시간. 이 시간 안에 결과를 기록하지 못하면 다른 작업자가 다시 가져감
+    """
+
+    def __init__(self, supabase_client, bucket, concurrency: int = 4, lease_seconds: int = RETRY_LEASE_SECONDS):
+        self.client = supabase_client
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.queue = RetryQueue(supabase_client)
+        self.ledger = ProcessedFileLedger(supabase_client)
+
+    def drain(self, max_seconds: Optional[float] = None) -> RetrySummary:
+        """재시도 시각이 된 항목이 없을 때까지(또는 max_seconds까지) 처리합니다."""
+        started = time.monotonic()
+        summary = RetrySummary()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while max_seconds is None or time.monotonic() - started < max_seconds:
+                items = self.queue.claim(batch_size=self.concurrency, lease_seconds=self.lease_seconds)
+                if not items:
+                    break
+
+                summary.claimed += len(items)
+                for item, (status, written, error) in zip(items, executor.map(self.process, items)):
+                    if status == "succeeded":
+                        summary.succeeded += 1
+                        summary.records_written += written
+                    elif status == "dead":
+                        summary.dead += 1
+                    else:
+                        summary.rescheduled += 1
+                    if error:
+                        summary.errors.append({"file_path": item["file_path"], "error": error})
+
+        summary.elapsed_seconds = time.monotonic() - started
+        logger.info(f"Retry drain complete: {summary.to_dict()}")
+        return summary
+
+    def process(self, item: Dict[str, Any]):
+        """
+        항목 하나를 다시 변환합니다.
+
+        결과 기록(mark_failed, ledger, mark_succeeded)이 실패해도 예외를 밖으로 내보내지 않습니다.
+        기록하지 못한 항목은 임대가 만료되면 다시 임대되므로 rescheduled로 보고합니다.
+
+        Returns:
+            tuple: (status, records_written, error_message)
+        """
+        file_path = item["file_path"]
+
+        try:
+            metadata = extract_metadata_from_path(file_path)
+            transformer_func, data_type = get_transformer_for_path(file_path)
+            if not transformer_func:
+                raise NoTransformerError(f"No transformer for path: {file_path}")
+            if is_run_marker(file_path):
+                # run 단위 트리거로 실패한 _metadata.json은 run 전체를 다시 적재
+                transformer_func = transform_run
+                metadata["trigger"] = "run"
+
+            result = transformer_func(self.client, self.bucket, file_path, metadata)
+        except Exception as e:
+            return self._record_failure(item, e)
+
+        written = result.get("records_count", 0)
+        try:
+            self.ledger.record_many([{
+                "file_path": file_path,
+                "status": "success",
+                "data_type": data_type,
+                "records_count": written,
+                "metadata": metadata,
+            }])
+            self.ledger.clear_errors([file_path])
+            self.queue.mark_succeeded(item)
+        except Exception as e:
+            # fact 적재는 끝났고 UPSERT라 임대 만료 후 다시 처리해도 행이 늘지 않음
+            logger.error(f"Retry of {file_path} loaded {written} records but could not record success: {e}")
+            return "rescheduled", 0, f"could not record success: {e}"
+
+        logger.info(f"Retry succeeded for {file_path} (attempt {item.get('attempts')}): {written} records")
+        return "succeeded", written, None
+
+    def _record_failure(self, item: Dict[str, Any], error: BaseException):
+        """재시도 실패를 큐에 기록합니다. 기록하지 못하면 임대 만료 후 다시 시도되도록 rescheduled로 보고"""
+        file_path = item["file_path"]
+        try:
+            status = self.queue.mark_failed(item, error)
+        except Exception as e:
+            logger.error(f"Could not record retry failure for {file_path}: {e} (original error: {error})")
+            return "rescheduled", 0, f"{error} (could not record failure: {e})"
+
+        logger.warning(f"Retry {item.get('attempts')}/{item.get('max_attempts')} failed for {file_path} -> {status}: {error}")
+        return status, 0, str(error)
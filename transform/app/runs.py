@@ -0,0 +1,157 @@
+"""
+Run Transform - 수집 실행(run) 단위 변환
+
+수집기는 run 디렉토리에 page_NNN.json.gz를 모두 올린 뒤 마지막에 _metadata.json을 올립니다.
+TRANSFORM_TRIGGER_MODE=run이면 transform_handler가 페이지 업로드는 건너뛰고,
+_metadata.json 업로드 시 같은 디렉토리의 페이지 전체를 한 번에 변환/적재합니다.
+
+- 파일마다 함수 호출/적재/집계 갱신을 반복하지 않고 run당 한 번만 수행
+- 페이지 하나라도 읽지 못하면 아무것도 적재하지 않음 (스냅샷 일부만 보이는 상태 방지)
+- processed_files에는 _metadata.json(run) 1건과 페이지 파일별 기록이 남음
+- hour 경계를 넘긴 run은 이전 hour 파티션의 같은 run 디렉토리까지 함께 읽음
+
+적재가 한 트랜잭션이 되는 것은 TRANSFORM_LOADER=postgres(한 번의 COPY 병합)일 때입니다.
+supabase 경로는 청크 단위로 나뉘므로 중간에 실패하면 run 전체를 error로 기록하고
+재시도 큐가 run을 다시 적재합니다. (자연키 UPSERT라 다시 적재해도 행이 늘지 않음)
+"""
+import os
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+
+from app.core import timing
+from app.core.database import get_category_map
+from app.core.ledger import ProcessedFileLedger
+from app.core.loaders import get_loader
+from app.core.utils import extract_metadata_from_path
+from app.batch import list_blob_paths, prefetch_pages, previous_hour_prefix, read_manifest, write_spec_records
+from app.transformers import TRANSFORM_SPECS, get_transformer_for_path
+
+logger = logging.getLogger(__name__)
+
+TRIGGER_MODES = ("page", "run")
+RUN_MARKER = "_metadata.json"
+
+# _metadata.json을 쓰는 수집기 (카테고리는 날짜별 단일 파일이라 항상 파일 단위)
+RUN_DATA_TYPES = ("videos_list", "comment_threads", "channels")
+
+# API 페이지 1개 = 파일 1개인 데이터 타입 (채널은 여러 요청을 한 파일로 합쳐서 저장)
+PAGED_DATA_TYPES = ("videos_list", "comment_threads")
+
+
+class IncompleteRunError(RuntimeError):
+    """_metadata.json의 페이지 수만큼 파일이 없음 (재시도 대상)"""
+
+
+def get_trigger_mode() -> str:
+    """TRANSFORM_TRIGGER_MODE 설정 (page: 파일마다 변환, run: _metadata.json 도착 시 run 전체 변환)"""
+    mode = os.environ.get("TRANSFORM_TRIGGER_MODE", "page").lower()
+    if mode not in TRIGGER_MODES:
+        raise ValueError(f"Unknown TRANSFORM_TRIGGER_MODE: {mode} (expected one of {TRIGGER_MODES})")
+    return mode
+
+
+def is_run_marker(blob_path: str) -> bool:
+    """run 단위 변환을 시작하는 _metadata.json 여부"""
+    if not blob_path.endswith(RUN_MARKER):
+        return False
+    _, data_type = get_transformer_for_path(blob_path)
+    return data_type in RUN_DATA_TYPES
+
+
+def transform_run(client, bucket, marker_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    _metadata.json과 같은 디렉토리의 페이지를 모두 읽어 한 번에 변환/적재합니다.
+
+    transform_* 함수와 같은 형태(client, bucket, blob_path, metadata)이므로
+    transform_handler와 재시도 작업자가 그대로 호출합니다. run 자체의 processed_files 기록은 호출자가 남깁니다.
+
+    Raises:
+        IncompleteRunError: 수집 메타데이터의 페이지 수보다 파일이 적음
+        Exception: 페이지 다운로드/디코딩/변환/적재 실패 (이 경우 아무것도 적재하지 않았거나, 재적재가 필요한 상태)
+    """
+    _, data_type = get_transformer_for_path(marker_path)
+    spec = TRANSFORM_SPECS[data_type]
+
+    with timing.stage("list"):
+        run_info = json.loads(bucket.blob(marker_path).download_as_bytes())
+        expected = run_info.get("total_pages") if data_type in PAGED_DATA_TYPES else 1
+        paths = list_run_files(bucket, marker_path, expected)
+
+    if not paths or (expected and len(paths) < expected):
+        raise IncompleteRunError(f"{marker_path}: {len(paths)} files found, expected {expected}")
+
+    # 페이지를 모두 읽은 뒤에만 적재 (하나라도 실패하면 예외로 중단)
+    pages: List[Tuple[str, List[Any], Dict[str, Any]]] = []
+    with timing.stage("download"):
+        for path, page, error in prefetch_pages(bucket, paths, data_type):
+            if error is not None:
+                raise error
+            pages.append((path, page.items, extract_metadata_from_path(path)))
+
+    items_count = sum(len(items) for _, items, _ in pages)
+    timing.count("files", len(pages))
+    timing.count("items", items_count)
+
+    with timing.stage("category_lookup"):
+        category_map = get_category_map(client) if spec.needs_category_map else None
+
+    with timing.stage("map"):
+        page_records = build_run_records(spec, pages, category_map)
+
+    records: List[Dict[str, Any]] = []
+    pending_files = []
+    for (path, _, page_metadata), page_rows in zip(pages, page_records):
+        records.extend(page_rows)
+        pending_files.append((path, len(page_rows), page_metadata))
+    timing.count("records", len(records))
+
+    with timing.stage("write"):
+        written = write_spec_records(client, get_loader(client), spec, records, pending_files)
+
+    with timing.stage("ledger_write"):
+        ProcessedFileLedger(client).record_many(
+            {
+                "file_path": path,
+                "status": "success",
+                "data_type": data_type,
+                "records_count": count,
+                "metadata": {**page_metadata, "run_marker": marker_path},
+            }
+            for path, count, page_metadata in pending_files
+        )
+
+    logger.info(f"Transformed run {marker_path}: {len(pages)} files, {written} rows into {spec.table_name}")
+    return {"records_count": written, "files_count": len(pages), "items_count": items_count}
+
+
+def list_run_files(bucket, marker_path: str, expected: Any = None) -> List[str]:
+    """
+    run의 데이터 파일 목록
+
+    _metadata.json 디렉토리에서 expected개보다 적게 찾으면, 수집 중 hour 경계를 넘긴 run으로 보고
+    이전 hour 파티션의 같은 run 디렉토리(previous_hour_prefix)도 함께 나열합니다.
+    """
+    paths = read_manifest(bucket, marker_path)
+    if not expected or len(paths) >= expected:
+        return paths
+
+    previous = previous_hour_prefix(marker_path.rsplit("/", 1)[0] + "/")
+    if previous is None:
+        return paths
+
+    earlier = list_blob_paths(bucket, [previous])
+    if earlier:
+        logger.info(f"{marker_path}: run spans two hour partitions, {len(earlier)} files under {previous}")
+    return sorted(set(paths) | set(earlier))
+
+
+def build_run_records(spec, pages: List[Tuple[str, List[Any], Dict[str, Any]]], category_map) -> List[List[Dict[str, Any]]]:
+    """페이지별 레코드 목록 (열 단위 변환기가 있으면 run 전체를 한 번에 변환)"""
+    if spec.build_batch is not None:
+        batch = [(items, metadata) for _, items, metadata in pages]
+        return spec.build_batch(batch, category_map) if spec.needs_category_map else spec.build_batch(batch)
+
+    if spec.needs_category_map:
+        return [spec.build_records(items, metadata, category_map) for _, items, metadata in pages]
+    return [spec.build_records(items, metadata) for _, items, metadata in pages]
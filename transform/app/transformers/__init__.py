@@ -1,10 +1,93 @@
 """
 Transformers Package - 데이터 유형별 변환기
 """
-from .videos import transform_videos
-from .categories import transform_categories
-from .comments import transform_comments
-from .channels import transform_channels
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from .videos import transform_videos, build_video_records, VIDEO_NATURAL_KEY
+from .categories import transform_categories, build_category_records
+from .comments import transform_comments, build_comment_records, COMMENT_NATURAL_KEY
+from .channels import transform_channels, build_channel_records
+from .columnar import build_video_batch
+from app.core.rollups import refresh_video_rollups, snapshot_times
+from app.core.snapshot_deltas import attach_snapshot_deltas, remember_snapshots, repair_following_deltas
+from app.core.channel_history import build_channel_stat_rows, record_channel_history
+from app.core.comment_store import COMMENT_TABLE, merge_comments
+
+
+@dataclass(frozen=True)
+class TransformSpec:
+    """데이터 유형별 변환/적재 명세 (배치 실행기용)"""
+    data_type: str
+    table_name: str
+    build_records: Callable
+    on_conflict: Optional[str] = None  # None이면 INSERT, 값이 있으면 해당 키로 UPSERT
+    needs_category_map: bool = False
+    build_batch: Optional[Callable] = None  # 여러 페이지를 한 번에 변환하는 열 단위 변환기 (columnar 엔진)
+    before_write: Optional[Callable] = None  # 적재 직전 호출 (client, records) -> records - 직전 스냅샷 대비 변화량 등
+    after_write: Optional[Callable] = None  # 적재 후 호출 (client, records, pending_files) - 집계/이력 갱신 등
+    write: Optional[Callable] = None  # 로더 대신 사용할 적재 함수 (client, records) -> int - 병합 RPC 등
+
+
+def refresh_rollups_after_write(client, records, pending_files) -> None:
+    """
+    영상 적재 후 처리 (TransformSpec.after_write)
+
+    직전 스냅샷 캐시 갱신 → 늦게 적재된 hour 뒤 스냅샷의 변화량 보정 → 집계 갱신
+    """
+    times = snapshot_times(records)
+    remember_snapshots(records)
+    repair_following_deltas(client, times)
+    refresh_video_rollups(client, times)
+
+
+def record_channel_history_after_write(client, records, pending_files) -> None:
+    """
+    채널 적재 후 통계 이력 반영 (TransformSpec.after_write)
+
+    records는 pending_files 순서대로 파일별 레코드 수만큼 이어져 있으므로 파일별 수집 시각을 다시 붙입니다.
+    """
+    rows = []
+    offset = 0
+    for _, count, metadata in pending_files:
+        rows.extend(build_channel_stat_rows(records[offset:offset + count], metadata))
+        offset += count
+    record_channel_history(client, rows)
+
+
+# 처리 순서 = 정의 순서 (카테고리가 먼저 적재되어야 영상의 category_name 매핑 가능)
+TRANSFORM_SPECS: Dict[str, TransformSpec] = {
+    "video_categories": TransformSpec(
+        data_type="video_categories",
+        table_name="dim_categories",
+        build_records=build_category_records,
+        on_conflict="category_id",
+    ),
+    "videos_list": TransformSpec(
+        data_type="videos_list",
+        table_name="fact_video_snapshots",
+        build_records=build_video_records,
+        on_conflict=VIDEO_NATURAL_KEY,
+        needs_category_map=True,
+        build_batch=build_video_batch,
+        before_write=attach_snapshot_deltas,
+        after_write=refresh_rollups_after_write,
+    ),
+    "comment_threads": TransformSpec(
+        data_type="comment_threads",
+        table_name=COMMENT_TABLE,
+        build_records=build_comment_records,
+        on_conflict=COMMENT_NATURAL_KEY,  # 시간별 관측 중복 제거 키 (적재는 merge_comments)
+        write=merge_comments,
+    ),
+    "channels": TransformSpec(
+        data_type="channels",
+        table_name="dim_channels",
+        build_records=build_channel_records,
+        on_conflict="channel_id",
+        after_write=record_channel_history_after_write,
+    ),
+}
 
 
 def get_transformer_for_path(blob_path: str):
@@ -2,41 +2,52 @@
 Categories Transformer - 카테고리 데이터 변환
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime, timezone
 
-from app.core.utils import load_gcs_json
-from app.core.database import upsert_records
+from app.core import timing
+from app.core.decoding import CategoryItem, load_gcs_page
+from app.core.database import upsert_records, invalidate_category_cache
 
 logger = logging.getLogger(__name__)
 
 
+def build_category_records(items: List[CategoryItem], metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    videoCategories.list 응답의 items(CategoryItem)를 dim_categories 레코드로 변환합니다.
+    """
+    records = []
+    for item in items:
+        record = {
+            "category_id": int(item.id),
+            "category_name": item.snippet.title,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        records.append(record)
+    
+    return records
+
+
 def transform_categories(client, bucket, blob_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
     """
     카테고리 데이터를 변환하여 Supabase에 저장합니다.
     
     카테고리는 거의 변경되지 않으므로 UPSERT 합니다.
     """
-    raw_data = load_gcs_json(bucket, blob_path)
-    items = raw_data.get("items", [])
+    items = load_gcs_page(bucket, blob_path, "video_categories").items
     
     if not items:
         logger.warning(f"No categories found in {blob_path}")
         return {"records_count": 0}
     
-    records = []
-    for item in items:
-        snippet = item.get("snippet", {})
-        
-        record = {
-            "category_id": int(item.get("id", 0)),
-            "category_name": snippet.get("title", "Unknown"),
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        records.append(record)
+    with timing.stage("map"):
+        records = build_category_records(items, metadata)
+    timing.count("records", len(records))
     
     # UPSERT (카테고리는 변경이 거의 없으므로)
-    upserted = upsert_records(client, "dim_categories", records, on_conflict="category_id")
+    with timing.stage("write"):
+        upserted = upsert_records(client, "dim_categories", records, on_conflict="category_id")
+    invalidate_category_cache()
     
     logger.info(f"Transformed {len(records)} categories from {blob_path}")
     return {"records_count": upserted}
@@ -2,52 +2,81 @@
 Channels Transformer - 채널 정보 데이터 변환
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime, timezone
 
-from app.core.utils import load_gcs_json, safe_int
-from app.core.database import insert_records
+from app.core.utils import safe_int
+from app.core import timing
+from app.core.decoding import ChannelItem, load_gcs_page
+from app.core.database import upsert_records
+from app.core.streaming import should_stream, stream_transform
+from app.core.channel_history import build_channel_stat_rows, record_channel_history
 
 logger = logging.getLogger(__name__)
 
 
-def transform_channels(client, bucket, blob_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+def build_channel_records(items: List[ChannelItem], metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
-    채널 데이터를 변환하여 Supabase에 저장합니다.
-    
-    Note: 채널 성장 분석을 위해 중복 데이터도 INSERT 합니다.
+    channels.list 응답의 items(ChannelItem)를 dim_channels 레코드로 변환합니다.
     """
-    raw_data = load_gcs_json(bucket, blob_path)
-    items = raw_data.get("items", [])
-    
-    if not items:
-        logger.warning(f"No channels found in {blob_path}")
-        return {"records_count": 0}
-    
-    snapshot_time = datetime.now(timezone.utc).isoformat()
-    
     records = []
     for item in items:
-        snippet = item.get("snippet", {})
-        statistics = item.get("statistics", {})
+        snippet = item.snippet
+        statistics = item.statistics
         
         record = {
-            "channel_id": item.get("id"),
-            "channel_name": snippet.get("title"),
-            "description": snippet.get("description", "")[:500],  # 500자 제한
-            "custom_url": snippet.get("customUrl"),
-            "channel_created_at": snippet.get("publishedAt"),
-            "country": snippet.get("country"),
-            "subscriber_count": safe_int(statistics.get("subscriberCount")),
-            "total_view_count": safe_int(statistics.get("viewCount")),
-            "video_count": safe_int(statistics.get("videoCount")),
-            "thumbnail_url": snippet.get("thumbnails", {}).get("high", {}).get("url"),
+            "channel_id": item.id,
+            "channel_name": snippet.title,
+            "description": snippet.description[:500],  # 500자 제한
+            "custom_url": snippet.customUrl,
+            "channel_created_at": snippet.publishedAt,
+            "country": snippet.country,
+            "subscriber_count": safe_int(statistics.subscriberCount),
+            "total_view_count": safe_int(statistics.viewCount),
+            "video_count": safe_int(statistics.videoCount),
+            "thumbnail_url": snippet.thumbnails.high.url,
             "updated_at": datetime.now(timezone.utc).isoformat()
         }
         records.append(record)
     
-    # UPSERT (최신 채널 정보 유지)
-    inserted = upsert_records(client, "dim_channels", records, on_conflict="channel_id")
+    return records
+
+
+def transform_channels(client, bucket, blob_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    채널 데이터를 변환하여 Supabase에 저장합니다.
+    
+    Note: dim_channels는 channel_id 기준으로 최신 채널 정보를 UPSERT 하고,
+    통계 이력은 fact_channel_stats에 바뀐 값만 추가합니다.
+    채널 파일은 트렌딩 채널 전체를 합친 응답이므로 큰 파일은 스트리밍으로 배치 단위 변환/적재합니다.
+    """
+    def _write(records: List[Dict[str, Any]]) -> int:
+        # UPSERT (최신 채널 정보 유지) + 통계가 바뀐 채널만 이력에 추가
+        written = upsert_records(client, "dim_channels", records, on_conflict="channel_id")
+        record_channel_history(client, build_channel_stat_rows(records, metadata))
+        return written
+    
+    if should_stream(bucket, blob_path, metadata.get("size")):
+        result = stream_transform(
+            bucket, blob_path, "channels", "dim_channels",
+            build=lambda items: build_channel_records(items, metadata),
+            write=_write
+        )
+        if not result["items_count"]:
+            logger.warning(f"No channels found in {blob_path}")
+        return {"records_count": result["records_count"]}
+    
+    items = load_gcs_page(bucket, blob_path, "channels").items
+    
+    if not items:
+        logger.warning(f"No channels found in {blob_path}")
+        return {"records_count": 0}
+    
+    with timing.stage("map"):
+        records = build_channel_records(items, metadata)
+    timing.count("records", len(records))
+    with timing.stage("write"):
+        inserted = _write(records)
     
     logger.info(f"Transformed {len(records)} channels from {blob_path}")
     return {"records_count": inserted}
@@ -0,0 +1,226 @@
+"""
+Columnar Transformer - 여러 페이지를 열(column) 단위로 한 번에 변환
+
+build_video_records와 결과가 완전히 같은 배치 전용 엔진입니다.
+- item에서 필요한 필드만 한 번에 꺼내 열로 전치
+- duration / categoryId는 배치 내 고유값만 변환한 뒤 펼침 (duration은 정규식 1회)
+- 경과 시간, 참여율, 시간당 조회수, 쇼츠 여부는 NumPy 배열 연산
+"""
+import re
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.core.utils import parse_duration, partition_time, rank_offset, safe_int
+from app.core.decoding import VideoItem
+
+logger = logging.getLogger(__name__)
+
+# (items, metadata) - 파일 1개 분량
+Page = Tuple[List[VideoItem], Dict[str, Any]]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# parse_duration의 정규식을 줄 단위로 적용 (매칭 실패한 줄은 빈 그룹 → 0초)
+_DURATION_LINE = re.compile(r"^(?:PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?.*$", re.MULTILINE)
+
+
+# ============== 열 변환 헬퍼 ==============
+
+def _int_column(values: Sequence[Any]) -> np.ndarray:
+    """safe_int와 같은 규칙(None/변환 불가 → 0)의 int64 열"""
+    try:
+        return np.fromiter((0 if v is None else int(v) for v in values), dtype=np.int64, count=len(values))
+    except (ValueError, TypeError, OverflowError):
+        return np.fromiter((safe_int(v) for v in values), dtype=np.int64, count=len(values))
+
+
+def _epoch_micros(dt: datetime) -> int:
+    return (dt - EPOCH) // ONE_MICROSECOND
+
+
+def _timestamp_column(values: Sequence[str]) -> np.ndarray:
+    """publishedAt 문자열 → UTC epoch 마이크로초 열"""
+    return np.fromiter(
+        (_epoch_micros(datetime.fromisoformat(v.replace("Z", "+00:00"))) for v in values),
+        dtype=np.int64,
+        count=len(values)
+    )
+
+
+def _map_unique(values: Sequence[Any], func: Callable[[Any], Any]) -> List[Any]:
+    """고유값마다 func를 한 번씩만 호출하고 원래 위치로 펼칩니다."""
+    mapping = {value: func(value) for value in set(values)}
+    return [mapping[value] for value in values]
+
+
+def _parse_durations(values: Sequence[Any]) -> Dict[Any, int]:
+    """고유 duration 값 → 초 (parse_duration과 같은 규칙, 정규식 1회 적용)"""
+    uniques = set(values)
+    texts = [v for v in uniques if isinstance(v, str) and "\n" not in v]
+    parsed = {v: parse_duration(v) for v in uniques if not (isinstance(v, str) and "\n" not in v)}
+
+    for text, (hours, minutes, seconds) in zip(texts, _DURATION_LINE.findall("\n".join(texts))):
+        parsed[text] = int(hours or 0) * 3600 + int(minutes or 0) * 60 + int(seconds or 0)
+    return parsed
+
+
+def _page_offsets(pages: Sequence[Page]) -> List[int]:
+    offsets = [0]
+    for items, _ in pages:
+        offsets.append(offsets[-1] + len(items))
+    return offsets
+
+
+# ============== Videos ==============
+
+def build_video_columns(pages: Sequence[Page], category_map: Dict[str, str]) -> Dict[str, Any]:
+    """
+    여러 videos.list 페이지를 fact_video_snapshots 열로 변환합니다.
+
+    Returns:
+        dict: 컬럼명 → 열 (숫자 열은 numpy 배열, 나머지는 tuple/list)
+    """
+    offsets = _page_offsets(pages)
+    total = offsets[-1]
+
+    rows: List[tuple] = []
+    ranks = np.empty(total, dtype=np.int64)
+    snapshot_us = np.empty(total, dtype=np.int64)
+    snapshot_iso: List[str] = []
+
+    for index, (items, metadata) in enumerate(pages):
+        start, end = offsets[index], offsets[index + 1]
+        snapshot_time = partition_time(metadata)
+        snapshot_us[start:end] = _epoch_micros(snapshot_time)
+        ranks[start:end] = np.arange(1, end - start + 1) + rank_offset(metadata)
+        snapshot_iso.extend([snapshot_time.isoformat()] * (end - start))
+
+        # item당 한 번의 append로 필요한 필드만 꺼내고, 아래에서 열로 전치
+        for item in items:
+            snippet = item.snippet
+            statistics = item.statistics
+            rows.append((
+                item.id,
+                snippet.title,
+                snippet.channelId,
+                snippet.channelTitle,
+                snippet.categoryId,
+                snippet.publishedAt,
+                snippet.tags,
+                snippet.thumbnails.high.url,
+                statistics.viewCount,
+                statistics.likeCount,
+                statistics.commentCount,
+                item.contentDetails.duration,
+            ))
+
+    (ids, titles, channel_ids, channel_names, category_ids, published, tags, thumbnails,
+     views, likes, comments, durations) = zip(*rows) if rows else [()] * 12
+
+    view_count = _int_column(views)
+    like_count = _int_column(likes)
+    comment_count = _int_column(comments)
+    duration_map = _parse_durations(durations)
+    duration_sec = np.fromiter((duration_map[d] for d in durations), dtype=np.int64, count=total)
+
+    # 업로드 후 경과 시간: max(1, int(total_seconds / 3600))
+    elapsed_seconds = (snapshot_us - _timestamp_column(published)).astype(np.float64) / 1e6
+    hours_since_published = np.maximum(1, np.trunc(elapsed_seconds / 3600).astype(np.int64))
+
+    has_views = view_count > 0
+    engagement_rate = (like_count + comment_count) / np.where(has_views, view_count, 1)
+
+    return {
+        "video_id": ids,
+        "title": titles,
+        "channel_id": channel_ids,
+        "channel_name": channel_names,
+        "category_id": _map_unique(category_ids, safe_int),
+        "category_name": _map_unique(category_ids, lambda c: category_map.get(str(c), "Unknown")),
+        "published_at": published,
+        "tags": tags,
+        "duration_sec": duration_sec,
+        "is_shorts": duration_sec <= 60,
+        "view_count": view_count,
+        "like_count": like_count,
+        "comment_count": comment_count,
+        "trending_rank": ranks,
+        "snapshot_at": snapshot_iso,
+        "hours_since_published": hours_since_published,
+        "engagement_rate": engagement_rate,
+        "has_views": has_views,
+        "view_velocity": view_count / hours_since_published,
+        "thumbnail_url": thumbnails,
+    }
+
+
+def video_columns_to_records(columns: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """열을 build_video_records와 같은 레코드(dict) 목록으로 변환합니다."""
+    def as_list(name: str) -> Sequence[Any]:
+        column = columns[name]
+        return column.tolist() if isinstance(column, np.ndarray) else column
+
+    # 조회수 0이면 행 단위 변환기와 같이 int 0
+    engagement_rate = [
+        rate if has_views else 0
+        for rate, has_views in zip(as_list("engagement_rate"), as_list("has_views"))
+    ]
+
+    return [
+        {
+            "video_id": video_id,
+            "title": title,
+            "channel_id": channel_id,
+            "channel_name": channel_name,
+            "category_id": category_id,
+            "category_name": category_name,
+            "published_at": published_at,
+            "tags": tags,
+            "duration_sec": duration_sec,
+            "is_shorts": is_shorts,
+            "view_count": view_count,
+            "like_count": like_count,
+            "comment_count": comment_count,
+            "trending_rank": trending_rank,
+            "snapshot_at": snapshot_at,
+            "hours_since_published": hours_since_published,
+            "engagement_rate": rate,
+            "view_velocity": view_velocity,
+            "thumbnail_url": thumbnail_url,
+        }
+        for (
+            video_id, title, channel_id, channel_name, category_id, category_name, published_at,
+            tags, duration_sec, is_shorts, view_count, like_count, comment_count, trending_rank,
+            snapshot_at, hours_since_published, rate, view_velocity, thumbnail_url,
+        ) in zip(
+            as_list("video_id"), as_list("title"), as_list("channel_id"), as_list("channel_name"),
+            as_list("category_id"), as_list("category_name"), as_list("published_at"), as_list("tags"),
+            as_list("duration_sec"), as_list("is_shorts"), as_list("view_count"), as_list("like_count"),
+            as_list("comment_count"), as_list("trending_rank"), as_list("snapshot_at"),
+            as_list("hours_since_published"), engagement_rate, as_list("view_velocity"),
+            as_list("thumbnail_url"),
+        )
+    ]
+
+
+def build_video_batch(pages: Sequence[Page], category_map: Dict[str, str]) -> List[List[Dict[str, Any]]]:
+    """여러 페이지를 열 단위로 변환하고 페이지별 레코드 목록으로 나눠 반환합니다."""
+    records = video_columns_to_records(build_video_columns(pages, category_map))
+    offsets = _page_offsets(pages)
+    return [records[offsets[i]:offsets[i + 1]] for i in range(len(pages))]
+
+
+# ============== Arrow ==============
+
+def columns_to_arrow(columns: Dict[str, Any]):
+    """열을 pyarrow.Table로 변환합니다. (내부용 has_views 열 제외, pyarrow 필요)"""
+    import pyarrow as pa
+
+    return pa.table({
+        name: pa.array(list(values) if isinstance(values, tuple) else values)
+        for name, values in columns.items() if name != "has_views"
+    })
@@ -2,54 +2,87 @@
 Comments Transformer - 댓글 데이터 변환
 """
 import logging
-from typing import Dict, Any
-from datetime import datetime, timezone
+from typing import Dict, Any, List
 
-from app.core.utils import load_gcs_json, safe_int
-from app.core.database import insert_records
+from app.core import timing
+from app.core.utils import partition_time, safe_int
+from app.core.decoding import CommentThreadItem, load_gcs_page
+from app.core.database import dedupe_by_keys
+from app.core.comment_store import COMMENT_TABLE, merge_comments
+from app.core.streaming import should_stream, stream_transform
 
 logger = logging.getLogger(__name__)
 
+COMMENT_NATURAL_KEY = "comment_id,collected_at"
 
-def transform_comments(client, bucket, blob_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+
+def build_comment_records(items: List[CommentThreadItem], metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
-    댓글 데이터를 변환하여 Supabase에 저장합니다.
+    commentThreads.list 응답의 items(CommentThreadItem)를 시간별 댓글 관측 레코드로 변환합니다.
     
-    Note: 트렌드 분석을 위해 중복 데이터도 INSERT 합니다.
+    collected_at은 파티션 hour이므로 (comment_id, collected_at)이 시간별 관측의 자연키입니다.
+    관측은 dim_comments에 comment_id당 1행으로 병합됩니다. (app/core/comment_store.py)
     """
-    raw_data = load_gcs_json(bucket, blob_path)
-    items = raw_data.get("items", [])
-    
-    if not items:
-        logger.warning(f"No comments found in {blob_path}")
-        return {"records_count": 0}
-    
     video_id = metadata.get("video_id")
-    snapshot_time = datetime.now(timezone.utc).isoformat()
+    snapshot_time = partition_time(metadata).isoformat()
     
     records = []
     for item in items:
-        top_comment = item.get("snippet", {}).get("topLevelComment", {})
-        snippet = top_comment.get("snippet", {})
+        top_comment = item.snippet.topLevelComment
+        snippet = top_comment.snippet
         
-        text_display = snippet.get("textDisplay", "")[:1000]
+        text_display = snippet.textDisplay[:1000]
         record = {
-            "comment_id": top_comment.get("id"),
-            "video_id": video_id or snippet.get("videoId"),
-            "author_name": snippet.get("authorDisplayName"),
-            "author_channel_id": snippet.get("authorChannelId", {}).get("value"),
+            "comment_id": top_comment.id,
+            "video_id": video_id or snippet.videoId,
+            "author_name": snippet.authorDisplayName,
+            "author_channel_id": snippet.authorChannelId.value,
             "text_display": text_display,
             "text_length": len(text_display),
-            "like_count": safe_int(snippet.get("likeCount")),
-            "reply_count": safe_int(item.get("snippet", {}).get("totalReplyCount")),
-            "published_at": snippet.get("publishedAt"),
+            "like_count": safe_int(snippet.likeCount),
+            "reply_count": safe_int(item.snippet.totalReplyCount),
+            "published_at": snippet.publishedAt,
             "collected_at": snapshot_time,
-            "is_channel_owner": snippet.get("authorIsChannelOwner", False)
+            "is_channel_owner": snippet.authorIsChannelOwner
         }
         records.append(record)
     
-    # INSERT (트렌드 분석을 위해 중복 허용)
-    inserted = insert_records(client, "fact_comments", records)
+    return records
+
+
+def transform_comments(client, bucket, blob_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    댓글 데이터를 변환하여 Supabase에 저장합니다.
+    
+    Note: comment_id 기준으로 병합(first/last_seen_at, 최신 좋아요/답글 수)하므로
+    같은 댓글이 매시간 수집되어도 행이 늘지 않습니다.
+    큰 파일(STREAM_THRESHOLD_BYTES 이상)은 스트리밍으로 배치 단위 변환/적재합니다.
+    """
+    def _write(records: List[Dict[str, Any]]) -> int:
+        records = dedupe_by_keys(records, COMMENT_NATURAL_KEY)
+        return merge_comments(client, records)
+    
+    if should_stream(bucket, blob_path, metadata.get("size")):
+        result = stream_transform(
+            bucket, blob_path, "comment_threads", COMMENT_TABLE,
+            build=lambda items: build_comment_records(items, metadata),
+            write=_write
+        )
+        if not result["items_count"]:
+            logger.warning(f"No comments found in {blob_path}")
+        return {"records_count": result["records_count"]}
+    
+    items = load_gcs_page(bucket, blob_path, "comment_threads").items
+    
+    if not items:
+        logger.warning(f"No comments found in {blob_path}")
+        return {"records_count": 0}
+    
+    with timing.stage("map"):
+        records = build_comment_records(items, metadata)
+    timing.count("records", len(records))
+    with timing.stage("write"):
+        inserted = _write(records)
     
     logger.info(f"Transformed {len(records)} comments from {blob_path}")
     return {"records_count": inserted}
@@ -2,61 +2,55 @@
 Videos Transformer - 트렌딩 영상 데이터 변환
 """
 import logging
-from typing import Dict, Any
-from datetime import datetime, timezone
+from typing import Dict, Any, List
+from datetime import datetime
 
-from app.core.utils import load_gcs_json, parse_duration, safe_int
-from app.core.database import get_category_map, insert_records
+from app.core import timing
+from app.core.utils import parse_duration, partition_time, rank_offset, safe_int
+from app.core.decoding import VideoItem, load_gcs_page
+from app.core.database import dedupe_by_keys, get_category_map
+from app.core.loaders import get_loader
+from app.core.rollups import refresh_video_rollups, snapshot_times
+from app.core.snapshot_deltas import attach_snapshot_deltas, remember_snapshots, repair_following_deltas
 
 logger = logging.getLogger(__name__)
 
+VIDEO_NATURAL_KEY = "video_id,snapshot_at"
 
-def transform_videos(client, bucket, blob_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+
+def build_video_records(
+    items: List[VideoItem],
+    metadata: Dict[str, Any],
+    category_map: Dict[str, str]
+) -> List[Dict[str, Any]]:
     """
-    트렌딩 영상 데이터를 변환하여 Supabase에 저장합니다.
+    videos.list 응답의 items(VideoItem)를 fact_video_snapshots 레코드로 변환합니다.
     
-    Note: 트렌드 분석을 위해 중복 데이터도 INSERT 합니다 (upsert 아님).
+    DB/GCS 접근 없이 순수 변환만 수행하므로 배치 실행기에서도 그대로 사용합니다.
     """
-    raw_data = load_gcs_json(bucket, blob_path)
-    items = raw_data.get("items", [])
-    
-    if not items:
-        logger.warning(f"No items found in {blob_path}")
-        return {"records_count": 0}
-    
-    # 카테고리 매핑 로드
-    category_map = get_category_map(client)
-    
-    # 스냅샷 시간
-    snapshot_time = datetime.now(timezone.utc)
-    if metadata.get("date") and metadata.get("hour"):
-        try:
-            snapshot_time = datetime.strptime(
-                f"{metadata['date']} {metadata['hour']}:00:00",
-                "%Y-%m-%d %H:%M:%S"
-            ).replace(tzinfo=timezone.utc)
-        except ValueError:
-            pass
+    # 스냅샷 시간 (파티션 hour 기준, (video_id, snapshot_at)이 자연키)
+    snapshot_time = partition_time(metadata)
+    # run 전체 기준 순위 (page_002의 첫 영상은 51위)
+    first_rank = rank_offset(metadata) + 1
     
     records = []
-    for rank, item in enumerate(items, start=1):
-        snippet = item.get("snippet", {})
-        statistics = item.get("statistics", {})
-        content_details = item.get("contentDetails", {})
+    for rank, item in enumerate(items, start=first_rank):
+        snippet = item.snippet
+        statistics = item.statistics
         
-        category_id = snippet.get("categoryId", "")
+        category_id = snippet.categoryId
         category_name = category_map.get(str(category_id), "Unknown")
         
-        published_at_str = snippet.get("publishedAt")
+        published_at_str = snippet.publishedAt
         published_at = datetime.fromisoformat(published_at_str.replace("Z", "+00:00"))
         
         # 업로드 후 경과 시간 (시간 단위)
         hours_since_published = max(1, int((snapshot_time - published_at).total_seconds() / 3600))
         
-        view_count = safe_int(statistics.get("viewCount"))
-        like_count = safe_int(statistics.get("likeCount"))
-        comment_count = safe_int(statistics.get("commentCount"))
-        duration_sec = parse_duration(content_details.get("duration"))
+        view_count = safe_int(statistics.viewCount)
+        like_count = safe_int(statistics.likeCount)
+        comment_count = safe_int(statistics.commentCount)
+        duration_sec = parse_duration(item.contentDetails.duration)
         
         # 참여율 (좋아요 + 댓글) / 조회수
         engagement_rate = (like_count + comment_count) / view_count if view_count > 0 else 0
@@ -64,14 +58,14 @@ def transform_videos(client, bucket, blob_path: str, metadata: Dict[str, Any]) -
         view_velocity = view_count / hours_since_published
         
         record = {
-            "video_id": item.get("id"),
-            "title": snippet.get("title"),
-            "channel_id": snippet.get("channelId"),
-            "channel_name": snippet.get("channelTitle"),
+            "video_id": item.id,
+            "title": snippet.title,
+            "channel_id": snippet.channelId,
+            "channel_name": snippet.channelTitle,
             "category_id": safe_int(category_id),
             "category_name": category_name,
             "published_at": published_at_str,
-            "tags": snippet.get("tags", []),
+            "tags": snippet.tags,
             "duration_sec": duration_sec,
             "is_shorts": duration_sec <= 60,
             "view_count": view_count,
@@ -82,12 +76,50 @@ def transform_videos(client, bucket, blob_path: str, metadata: Dict[str, Any]) -
             "hours_since_published": hours_since_published,
             "engagement_rate": engagement_rate,
             "view_velocity": view_velocity,
-            "thumbnail_url": snippet.get("thumbnails", {}).get("high", {}).get("url")
+            "thumbnail_url": snippet.thumbnails.high.url
         }
         records.append(record)
     
-    # INSERT (트렌드 분석을 위해 중복 허용)
-    inserted = insert_records(client, "fact_video_snapshots", records)
+    return records
+
+
+def transform_videos(client, bucket, blob_path: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    트렌딩 영상 데이터를 변환하여 Supabase에 저장합니다.
+    
+    Note: (video_id, snapshot_at) 기준 UPSERT 하므로 같은 파일을 다시 처리해도 행이 늘지 않습니다.
+          적재 후 다음 스냅샷의 변화량을 보정하고 해당 스냅샷의 집계 테이블(agg_*)을 다시 계산합니다.
+    """
+    items = load_gcs_page(bucket, blob_path, "videos_list").items
+    
+    if not items:
+        logger.warning(f"No items found in {blob_path}")
+        return {"records_count": 0}
+    
+    # 카테고리 매핑 로드
+    with timing.stage("category_lookup"):
+        category_map = get_category_map(client)
+    
+    with timing.stage("map"):
+        records = build_video_records(items, metadata, category_map)
+        # UPSERT (시간별 스냅샷은 유지, 재처리 중복만 제거)
+        records = dedupe_by_keys(records, VIDEO_NATURAL_KEY)
+    timing.count("records", len(records))
+    
+    # 직전 스냅샷 대비 순위/조회수 변화 (prev_rank, rank_change, view_delta, minutes_since_prev)
+    with timing.stage("deltas"):
+        records = attach_snapshot_deltas(client, records)
+    with timing.stage("write"):
+        inserted = get_loader(client).upsert("fact_video_snapshots", records, on_conflict=VIDEO_NATURAL_KEY)
+    remember_snapshots(records)
+    
+    # 늦게 적재된 hour라면 그 뒤 스냅샷의 변화량 보정 (최신 hour면 바뀌는 행 없음)
+    with timing.stage("deltas"):
+        repair_following_deltas(client, snapshot_times(records))
+    
+    # 이 스냅샷의 카테고리/시간별/채널 일별 집계 갱신
+    with timing.stage("rollups"):
+        refresh_video_rollups(client, snapshot_times(records))
     
     logger.info(f"Transformed {len(records)} videos from {blob_path}")
     return {"records_count": inserted}
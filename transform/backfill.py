@@ -0,0 +1,159 @@
+"""
+Backfill CLI - 날짜 범위의 원본 데이터를 프로세스 풀에서 재처리합니다.
+
+full_retrigger.py의 blob.rewrite 방식(파일마다 Cloud Function 재실행)을 대체합니다.
+체크포인트 파일로 중단된 지점부터 이어서 처리할 수 있습니다.
+
+Examples:
+    python backfill.py --start-date=2026-01-01 --end-date=2026-01-31 --dry-run
+    python backfill.py --start-date=2026-01-01 --end-date=2026-01-31 --processes=4
+    python backfill.py --all-dates --data-types=videos_list --reprocess
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.clients import get_bucket, get_supabase_client
+from app.backfill import (
+    BackfillCheckpoint,
+    BackfillRunner,
+    backfill_signature,
+    discover_date_range,
+    estimate_backfill,
+    plan_units,
+)
+from app.transformers import TRANSFORM_SPECS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "plosind-youtube-raw-data")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Parallel backfill runner")
+
+    dates = parser.add_mutually_exclusive_group(required=True)
+    dates.add_argument("--start-date", help="시작 날짜 (YYYY-MM-DD)")
+    dates.add_argument("--all-dates", action="store_true", help="GCS에 있는 전체 날짜 파티션")
+
+    parser.add_argument("--end-date", help="종료 날짜 (기본: 시작 날짜와 동일)")
+    parser.add_argument(
+        "--data-types",
+        default=",".join(TRANSFORM_SPECS.keys()),
+        help="쉼표 구분 데이터 타입 (기본: 전체)",
+    )
+    parser.add_argument("--region", default=os.getenv("YOUTUBE_REGION_CODE", "KR"), help="리전 파티션")
+    parser.add_argument("--processes", type=int, default=4, help="동시에 처리할 파티션(프로세스) 수")
+    parser.add_argument("--workers", type=int, default=8, help="프로세스별 병렬 다운로드 수")
+    parser.add_argument("--flush-rows", type=int, default=5000, help="테이블별 적재 묶음 크기")
+    parser.add_argument("--reprocess", action="store_true", help="이미 처리된 파일도 다시 처리")
+    parser.add_argument(
+        "--engine",
+        choices=["columnar", "python"],
+        default="columnar",
+        help="영상 변환 엔진",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=".backfill_checkpoint.json",
+        help="진행 상황 파일 (빈 값이면 저장하지 않음)",
+    )
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 처리")
+    parser.add_argument("--dry-run", action="store_true", help="대상 파일 수/예상 레코드 수/예상 시간만 출력")
+    parser.add_argument("--sample-files", type=int, default=3, help="드라이런에서 데이터 타입별로 열어볼 파일 수")
+
+    return parser.parse_args(argv)
+
+
+def resolve_date_range(bucket, data_types: List[str], region: str) -> Optional[tuple]:
+    """--all-dates: 데이터 타입별 파티션 범위를 합친 (최초 날짜, 최근 날짜)"""
+    ranges = [r for r in (discover_date_range(bucket, t, region) for t in data_types) if r]
+    if not ranges:
+        return None
+    return min(r[0] for r in ranges), max(r[1] for r in ranges)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 함수"""
+    args = parse_args(argv)
+
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        logger.error("SUPABASE_URL or SUPABASE_SERVICE_KEY is missing in .env")
+        return 1
+
+    data_types = [t.strip() for t in args.data_types.split(",") if t.strip()]
+    unknown = [t for t in data_types if t not in TRANSFORM_SPECS]
+    if unknown:
+        logger.error(f"Unknown data types: {unknown}")
+        return 1
+
+    bucket = get_bucket(GCS_BUCKET_NAME)
+
+    if args.all_dates:
+        date_range = resolve_date_range(bucket, data_types, args.region)
+        if not date_range:
+            logger.error("No date partitions found in GCS")
+            return 1
+        start_date, end_date = date_range
+    else:
+        start_date, end_date = args.start_date, args.end_date or args.start_date
+
+    units = plan_units(data_types, start_date, end_date, args.region)
+    signature = backfill_signature(data_types, start_date, end_date, args.region)
+
+    checkpoint = BackfillCheckpoint(args.checkpoint or None, signature)
+    if args.restart:
+        checkpoint.completed = {}
+
+    logger.info(f"Backfill {start_date} ~ {end_date}: {len(units)} partitions ({', '.join(data_types)})")
+
+    if args.dry_run:
+        pending = [u for u in units if not checkpoint.is_done(u)]
+        estimate = estimate_backfill(
+            bucket,
+            get_supabase_client(),
+            pending,
+            reprocess=args.reprocess,
+            sample_files=args.sample_files,
+            seconds_per_file=checkpoint.previous_rate(),
+            workers=args.workers,
+        )
+        if estimate["estimated_seconds"] is not None:
+            # 파티션을 processes개씩 병렬 처리
+            estimate["estimated_seconds"] = round(estimate["estimated_seconds"] / max(1, args.processes), 1)
+        estimate["partitions_done"] = len(units) - len(pending)
+        print(json.dumps(estimate, indent=2, ensure_ascii=False))
+        return 0
+
+    runner = BackfillRunner(
+        GCS_BUCKET_NAME,
+        processes=args.processes,
+        prefetch_workers=args.workers,
+        flush_rows=args.flush_rows,
+        reprocess=args.reprocess,
+        engine=args.engine,
+        checkpoint=checkpoint,
+    )
+    result = runner.run(units)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0 if result["files_failed"] == 0 and not result["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
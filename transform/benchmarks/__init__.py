@@ -0,0 +1 @@
+"""Transform 성능 측정 스크립트"""
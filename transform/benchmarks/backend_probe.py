@@ -0,0 +1,109 @@
+"""
+Backend Probe - web/backend 서비스로 로컬 Postgres를 조회하는 하위 프로세스 (e2e_pipeline용)
+
+transform과 web/backend가 모두 `app` 패키지를 쓰므로 같은 프로세스에서 import 할 수 없습니다.
+e2e_pipeline이 이 스크립트를 web/backend 기준으로 띄우고, 표준입력으로 한 줄을 보낼 때마다
+대시보드 서비스들을 한 번씩 호출한 결과(최신 스냅샷, 집계 갱신 시각, 호출별 지연)를 JSON 한 줄로 돌려줍니다.
+
+    python benchmarks/backend_probe.py --dsn=postgresql://... --backend-dir=../web/backend
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict
+
+TRANSFORM_DIR = Path(__file__).resolve().parent.parent
+
+
+def install_backend(backend_dir: Path, dsn: str):
+    """web/backend의 app을 import 하고 supabase 클라이언트를 로컬 Postgres 클라이언트로 바꿉니다."""
+    # web/backend의 app이 transform의 app보다 먼저 잡히도록 순서 유지
+    sys.path[:0] = [str(backend_dir), str(TRANSFORM_DIR)]
+    # create_client는 연결하지 않으므로 형식만 맞는 값이면 충분
+    os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+    os.environ.setdefault("SUPABASE_SERVICE_KEY", "offline.harness.key")
+
+    from benchmarks.local_stack import LocalPostgrestClient
+
+    import app.core as core
+    import app.core.base_service as base_service
+    import app.core.database as database
+
+    client = LocalPostgrestClient(dsn, max_size=2)
+    database._supabase_client = client
+    for module in (core, base_service, database):
+        module.supabase = client
+
+    # 서비스 모듈은 import 시점에 app.core.supabase를 가져가므로 교체 후에 import
+    from app.core import BaseService
+    from app.features.analytics.service import AnalyticsService
+    from app.features.categories.service import CategoryService
+    from app.features.trending.service import TrendingService
+    from app.features.videos.service import VideoService
+
+    return BaseService, {
+        "overview": AnalyticsService.get_overview_stats,
+        "hourly_trends": AnalyticsService.get_hourly_trends,
+        "top_channels": AnalyticsService.get_top_channels,
+        "category_stats": CategoryService.get_category_stats,
+        "trending": TrendingService.get_current_trending,
+        "rising": TrendingService.get_rising_videos,
+        "video_history": VideoService.get_video_history,
+    }
+
+
+async def probe(base_service, calls: Dict[str, Callable[..., Awaitable[Any]]]) -> Dict[str, Any]:
+    """서비스 캐시를 비우고 각 호출의 지연(ms)과 최신 스냅샷/집계 시각을 반환합니다."""
+    base_service.clear_cache()
+    latency_ms: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+
+    async def timed(name: str, *args):
+        started = time.perf_counter()
+        try:
+            return await calls[name](*args)
+        except Exception as e:
+            errors[name] = str(e)
+            return None
+        finally:
+            latency_ms[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    trending = await timed("trending")
+    for name in ("overview", "hourly_trends", "top_channels", "category_stats", "rising"):
+        await timed(name)
+
+    videos, snapshot_at = trending if trending else ([], None)
+    if videos:
+        await timed("video_history", videos[0].video_id)
+
+    rollup = await base_service.get_latest_rollup()
+    return {
+        "snapshot_at": snapshot_at.isoformat() if snapshot_at else None,
+        "trending_count": len(videos),
+        "rollup_snapshot_at": rollup["snapshot_at"] if rollup else None,
+        "rollup_updated_at": rollup["updated_at"] if rollup else None,
+        "latency_ms": latency_ms,
+        "errors": errors,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Probe web/backend services against a local Postgres")
+    parser.add_argument("--dsn", required=True)
+    parser.add_argument("--backend-dir", default=str(TRANSFORM_DIR.parent / "web" / "backend"))
+    args = parser.parse_args()
+
+    base_service, calls = install_backend(Path(args.backend_dir).resolve(), args.dsn)
+    print(json.dumps({"ready": True}), flush=True)
+
+    for _ in sys.stdin:
+        print(json.dumps(asyncio.run(probe(base_service, calls)), default=str), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Columnar Transform - 영상 행 단위 변환기 대비 열 단위 변환기 처리량/결과 일치 확인
+
+    cd transform
+    python -m benchmarks.columnar_transform --sizes=10000,100000,1000000
+
+각 크기마다 두 엔진의 결과가 완전히 같은지 먼저 비교한 뒤 처리 시간을 잽니다.
+큰 크기는 고유 item 10,000개를 반복 참조해서 만들기 때문에 입력 생성 메모리는 크게 늘지 않습니다.
+"""
+import gc
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.decoding import convert_items  # noqa: E402
+from app.transformers import build_video_records  # noqa: E402
+from app.transformers.columnar import build_video_batch  # noqa: E402
+from benchmarks.synthetic import CATEGORY_IDS, make_video_items  # noqa: E402
+
+PAGE_SIZE = 50
+UNIQUE_ITEMS = 10_000
+CATEGORY_MAP = {cid: f"Category {cid}" for cid in CATEGORY_IDS}
+
+
+def edge_case_items() -> List[Dict[str, Any]]:
+    """값이 비거나 형식이 다른 item (결과 일치 확인용)"""
+    base = make_video_items(4, seed=99)
+    base[0]["statistics"] = {}
+    base[1]["contentDetails"] = {}
+    base[1]["snippet"].pop("categoryId")
+    base[2]["snippet"]["publishedAt"] = "2026-01-12T09:30:00.250+09:00"
+    base[3]["statistics"]["viewCount"] = "not-a-number"
+    return base
+
+
+def make_pages(size: int) -> List[tuple]:
+    """size개 item을 PAGE_SIZE 단위 페이지((items, metadata))로 나눕니다."""
+    unique = convert_items("videos_list", make_video_items(min(size, UNIQUE_ITEMS)) + edge_case_items())
+    items = [unique[i % len(unique)] for i in range(size)]
+
+    pages = []
+    for number, start in enumerate(range(0, size, PAGE_SIZE)):
+        metadata = {"date": "2026-01-12", "hour": f"{number % 24:02d}"}
+        pages.append((items[start:start + PAGE_SIZE], metadata))
+    return pages
+
+
+def run_rows(pages: List[tuple]) -> List[List[Dict[str, Any]]]:
+    return [build_video_records(items, metadata, CATEGORY_MAP) for items, metadata in pages]
+
+
+def run_columnar(pages: List[tuple], batch_pages: int) -> List[List[Dict[str, Any]]]:
+    result = []
+    for start in range(0, len(pages), batch_pages):
+        result.extend(build_video_batch(pages[start:start + batch_pages], CATEGORY_MAP))
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Row vs columnar video transform benchmark")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--batch-items", type=int, default=5000, help="columnar 엔진 한 번의 변환 item 수 (배치 flush 크기)")
+    args = parser.parse_args()
+
+    batch_pages = max(1, args.batch_items // PAGE_SIZE)
+    results = []
+
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        pages = make_pages(size)
+
+        # timeit과 같이 측정 중에는 GC를 끔 (먼저 만든 결과가 뒤 측정의 GC 비용을 늘리지 않도록)
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            rows = run_rows(pages)
+            row_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            columns = run_columnar(pages, batch_pages)
+            columnar_seconds = time.perf_counter() - started
+        finally:
+            gc.enable()
+
+        if rows != columns:
+            print(f"MISMATCH: size={size}", file=sys.stderr)
+            return 1
+
+        results.append({
+            "items": size,
+            "row_seconds": round(row_seconds, 3),
+            "columnar_seconds": round(columnar_seconds, 3),
+            "row_items_per_sec": round(size / row_seconds, 1),
+            "columnar_items_per_sec": round(size / columnar_seconds, 1),
+            "speedup": round(row_seconds / columnar_seconds, 2),
+        })
+        print(
+            f"{size:>9,} items  row {row_seconds:7.3f}s  "
+            f"columnar {columnar_seconds:7.3f}s  x{row_seconds / columnar_seconds:.2f}",
+            file=sys.stderr,
+        )
+        del rows, columns, pages
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
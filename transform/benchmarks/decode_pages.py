@@ -0,0 +1,100 @@
+"""
+Decode Pages - 원본 페이지 파싱 시간/최대 메모리 비교
+
+- json: gzip 해제 → utf-8 str → json.loads (기존 load_gcs_json 경로)
+- msgspec: gzip 해제 → 타입 구조체로 바로 디코딩 (app.core.decoding)
+
+    cd transform
+    python -m benchmarks.decode_pages --items=50,5000,50000
+
+최대 메모리는 tracemalloc 기준(파이썬 할당)이며, 압축 해제 bytes와 결과 객체를 모두 포함합니다.
+"""
+import gc
+import sys
+import gzip
+import json
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.decoding import decode_page  # noqa: E402
+from benchmarks.synthetic import make_comment_items, make_video_items  # noqa: E402
+
+GENERATORS = {
+    "videos_list": make_video_items,
+    "comment_threads": make_comment_items,
+}
+
+
+def decode_json(compressed: bytes, data_type: str):
+    return json.loads(gzip.decompress(compressed).decode("utf-8"))
+
+
+def decode_msgspec(compressed: bytes, data_type: str):
+    return decode_page(data_type, gzip.decompress(compressed))
+
+
+def measure(func: Callable, compressed: bytes, data_type: str, repeat: int) -> Dict[str, Any]:
+    """repeat 회 중 최소 시간과, 별도 1회 실행의 tracemalloc 최대 메모리"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = func(compressed, data_type)
+        timings.append(time.perf_counter() - started)
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = func(compressed, data_type)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {"seconds": min(timings), "peak_bytes": peak}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="json.loads vs msgspec page decoding")
+    parser.add_argument("--items", default="50,5000,50000", help="페이지당 item 수 목록")
+    parser.add_argument("--data-types", default="videos_list,comment_threads")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for data_type in [t.strip() for t in args.data_types.split(",") if t.strip()]:
+        for count in [int(c) for c in args.items.split(",") if c.strip()]:
+            page = {"kind": "youtube#listResponse", "items": GENERATORS[data_type](count)}
+            compressed = gzip.compress(json.dumps(page, ensure_ascii=False).encode("utf-8"))
+
+            baseline = measure(decode_json, compressed, data_type, args.repeat)
+            typed = measure(decode_msgspec, compressed, data_type, args.repeat)
+
+            results.append({
+                "data_type": data_type,
+                "items": count,
+                "compressed_bytes": len(compressed),
+                "json_seconds": round(baseline["seconds"], 4),
+                "msgspec_seconds": round(typed["seconds"], 4),
+                "speedup": round(baseline["seconds"] / typed["seconds"], 2),
+                "json_peak_bytes": baseline["peak_bytes"],
+                "msgspec_peak_bytes": typed["peak_bytes"],
+                "peak_ratio": round(typed["peak_bytes"] / baseline["peak_bytes"], 2),
+            })
+            print(
+                f"{data_type:<16} {count:>7,} items  "
+                f"json {baseline['seconds'] * 1000:8.1f}ms {baseline['peak_bytes'] / 1e6:7.1f}MB  "
+                f"msgspec {typed['seconds'] * 1000:8.1f}ms {typed['peak_bytes'] / 1e6:7.1f}MB",
+                file=sys.stderr,
+            )
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,432 @@
+"""
+Local Stack - GCS / Supabase / YouTube API의 로컬 대체 구현 (오프라인 하네스용)
+
+- LocalBucket: 로컬 디렉토리를 GCS bucket 인터페이스(blob/get_blob/list_blobs/open/upload_from_string)로 노출
+- LocalPostgrestClient: supabase-py의 table()/rpc() 중 transform과 web/backend가 쓰는 부분을 psycopg로 실행
+- FakeYouTubeApi: youtube_collector의 YouTubeClient와 같은 메서드로 합성 페이지(benchmarks.synthetic)를 반환
+
+transform의 app 패키지에 의존하지 않으므로 web/backend 프로세스(benchmarks.backend_probe)에서도 import 할 수 있습니다.
+"""
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from benchmarks.synthetic import make_channel_items, make_comment_items, make_video_items
+
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+# ============== GCS ==============
+
+class LocalBlob:
+    def __init__(self, bucket: "LocalBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.path = bucket.root / name
+
+    @property
+    def size(self) -> Optional[int]:
+        return self.path.stat().st_size if self.path.exists() else None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def download_as_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+    def open(self, mode: str = "rb", chunk_size: Optional[int] = None):
+        return open(self.path, mode)
+
+    def upload_from_string(self, data, content_type: Optional[str] = None) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = data.encode("utf-8") if isinstance(data, str) else data
+        # 쓰는 중인 파일이 목록에 보이지 않도록 임시 파일에 쓴 뒤 교체
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, self.path)
+        for listener in self.bucket.listeners:
+            listener(self.name, len(payload))
+
+    def delete(self) -> None:
+        self.path.unlink()
+
+
+class _BlobPage(list):
+    """list_blobs 결과 (delimiter 지정 시 prefixes 포함)"""
+
+    prefixes: set
+
+
+class LocalBucket:
+    """
+    로컬 디렉토리 기반 GCS bucket
+
+    listeners: 업로드마다 (name, size)로 호출되는 콜백 목록 (수집 → 변환 지연 측정용)
+    """
+
+    def __init__(self, root: Path, name: str = "offline-bucket"):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.listeners: List[Callable[[str, int], None]] = []
+
+    def blob(self, name: str) -> LocalBlob:
+        return LocalBlob(self, name)
+
+    def get_blob(self, name: str) -> Optional[LocalBlob]:
+        blob = LocalBlob(self, name)
+        return blob if blob.exists() else None
+
+    def list_blobs(self, prefix: str = "", max_results: Optional[int] = None, delimiter: Optional[str] = None) -> _BlobPage:
+        names = sorted(
+            path.relative_to(self.root).as_posix()
+            for path in self.root.rglob("*")
+            if path.is_file() and not path.name.endswith(".tmp")
+        )
+        names = [n for n in names if n.startswith(prefix or "")]
+
+        page = _BlobPage()
+        page.prefixes = set()
+        for name in names:
+            rest = name[len(prefix or ""):]
+            if delimiter and delimiter in rest:
+                page.prefixes.add((prefix or "") + rest.split(delimiter, 1)[0] + delimiter)
+                continue
+            page.append(LocalBlob(self, name))
+            if max_results and len(page) >= max_results:
+                break
+        return page
+
+
+# ============== Supabase (PostgREST) ==============
+
+@dataclass
+class LocalResult:
+    data: Any
+    count: Optional[int] = None
+
+
+def _to_json(value: Any) -> Any:
+    """PostgREST 응답과 같은 JSON 호환 값 (시간은 ISO 문자열)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    return value
+
+
+def _adapt(value: Any) -> Any:
+    """dict / dict 목록은 JSONB로, 스칼라 목록은 배열로 전달"""
+    from psycopg.types.json import Jsonb
+
+    if isinstance(value, dict) or (isinstance(value, list) and value and isinstance(value[0], dict)):
+        return Jsonb(value)
+    return value
+
+
+def _ident(name: str) -> str:
+    if not IDENTIFIER.match(name):
+        raise ValueError(f"Unsupported identifier: {name}")
+    return name
+
+
+class LocalQuery:
+    """supabase-py 쿼리 빌더의 부분 구현 (select/insert/upsert/update/delete + 필터/정렬/범위)"""
+
+    def __init__(self, client: "LocalPostgrestClient", table_name: str):
+        self.client = client
+        self.table_name = _ident(table_name)
+        self.action = "select"
+        self.columns = "*"
+        self.count_mode: Optional[str] = None
+        self.values: Any = None
+        self.on_conflict: Optional[str] = None
+        self.filters: List[str] = []
+        self.params: List[Any] = []
+        self.order_by: List[str] = []
+        self.limit_rows: Optional[int] = None
+        self.offset_rows: Optional[int] = None
+        self._negate = False
+
+    # ---------- 동작 ----------
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "LocalQuery":
+        self.columns = ", ".join(_ident(c.strip()) for c in columns.split(",")) if columns.strip() != "*" else "*"
+        self.count_mode = count
+        return self
+
+    def insert(self, values) -> "LocalQuery":
+        self.action, self.values = "insert", values if isinstance(values, list) else [values]
+        return self
+
+    def upsert(self, values, on_conflict: Optional[str] = None) -> "LocalQuery":
+        self.action, self.values = "upsert", values if isinstance(values, list) else [values]
+        self.on_conflict = on_conflict
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "LocalQuery":
+        self.action, self.values = "update", values
+        return self
+
+    def delete(self) -> "LocalQuery":
+        self.action = "delete"
+        return self
+
+    # ---------- 필터 ----------
+
+    @property
+    def not_(self) -> "LocalQuery":
+        self._negate = True
+        return self
+
+    def _filter(self, sql: str, *params: Any) -> "LocalQuery":
+        self.filters.append(f"NOT ({sql})" if self._negate else sql)
+        self.params.extend(params)
+        self._negate = False
+        return self
+
+    def _compare(self, column: str, operator: str, value: Any) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} {operator} %s", _to_json(value))
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "=", value)
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "<>", value)
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, ">", value)
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, ">=", value)
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "<", value)
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._compare(column, "<=", value)
+
+    def like(self, column: str, pattern: str) -> "LocalQuery":
+        return self._compare(column, "LIKE", pattern)
+
+    def in_(self, column: str, values: List[Any]) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} = ANY(%s)", [_to_json(v) for v in values])
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        literal = {"null": "NULL", "true": "TRUE", "false": "FALSE"}[str(value).lower()]
+        return self._filter(f"{_ident(column)} IS {literal}")
+
+    def order(self, column: str, desc: bool = False) -> "LocalQuery":
+        self.order_by.append(f"{_ident(column)} {'DESC' if desc else 'ASC'}")
+        return self
+
+    def limit(self, rows: int) -> "LocalQuery":
+        self.limit_rows = rows
+        return self
+
+    def range(self, start: int, end: int) -> "LocalQuery":
+        self.offset_rows, self.limit_rows = start, end - start + 1
+        return self
+
+    # ---------- 실행 ----------
+
+    def execute(self) -> LocalResult:
+        where = f" WHERE {' AND '.join(self.filters)}" if self.filters else ""
+
+        if self.action == "select":
+            sql = f"SELECT {self.columns} FROM {self.table_name}{where}"
+            if self.order_by:
+                sql += f" ORDER BY {', '.join(self.order_by)}"
+            if self.limit_rows is not None:
+                sql += f" LIMIT {int(self.limit_rows)}"
+            if self.offset_rows:
+                sql += f" OFFSET {int(self.offset_rows)}"
+            rows = self.client.fetch(sql, self.params)
+            count = None
+            if self.count_mode:
+                count = self.client.fetch(f"SELECT count(*) AS n FROM {self.table_name}{where}", self.params)[0]["n"]
+            return LocalResult(rows, count)
+
+        if self.action == "delete":
+            return LocalResult(self.client.fetch(f"DELETE FROM {self.table_name}{where} RETURNING *", self.params))
+
+        if self.action == "update":
+            assignments = ", ".join(f"{_ident(c)} = %s" for c in self.values)
+            params = [_adapt(v) for v in self.values.values()] + self.params
+            return LocalResult(self.client.fetch(f"UPDATE {self.table_name} SET {assignments}{where} RETURNING *", params))
+
+        return LocalResult(self._write())
+
+    def _write(self) -> List[Dict[str, Any]]:
+        """insert/upsert: 여러 행을 한 문장으로 (PostgREST처럼 모든 행의 컬럼은 첫 행 기준)"""
+        if not self.values:
+            return []
+
+        columns = list(self.values[0].keys())
+        column_list = ", ".join(_ident(c) for c in columns)
+        row_sql = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        sql = f"INSERT INTO {self.table_name} ({column_list}) VALUES " + ", ".join([row_sql] * len(self.values))
+        params = [_adapt(row.get(c)) for row in self.values for c in columns]
+
+        if self.action == "upsert":
+            keys = [k.strip() for k in self.on_conflict.split(",")] if self.on_conflict else self.client.primary_key(self.table_name)
+            updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in keys)
+            sql += f" ON CONFLICT ({', '.join(_ident(k) for k in keys)}) "
+            sql += f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+
+        return self.client.fetch(sql + " RETURNING *", params)
+
+
+class LocalRpc:
+    def __init__(self, client: "LocalPostgrestClient", name: str, params: Optional[Dict[str, Any]]):
+        self.client = client
+        self.name = _ident(name)
+        self.params = params or {}
+
+    def execute(self) -> LocalResult:
+        """
+        함수 호출. 스칼라 함수는 값 하나, 집합/테이블 함수는 행 목록을 반환합니다. (PostgREST와 동일)
+        """
+        args = ", ".join(f"{_ident(k)} => %s" for k in self.params)
+        rows = self.client.fetch(f"SELECT * FROM {self.name}({args})", [_adapt(v) for v in self.params.values()])
+        if self.client.returns_scalar(self.name):
+            return LocalResult(next(iter(rows[0].values())) if rows else None)
+        return LocalResult(rows)
+
+
+class LocalPostgrestClient:
+    """
+    로컬 Postgres에 직접 쿼리하는 supabase Client 대체 구현
+
+    PostgREST의 필터/정렬/범위/UPSERT/RPC 규칙 중 이 저장소가 쓰는 부분만 지원합니다.
+    write_chunked의 병렬 전송을 위해 커넥션 풀을 사용합니다.
+    """
+
+    def __init__(self, dsn: str, max_size: int = 8):
+        from psycopg.rows import dict_row
+        from psycopg_pool import ConnectionPool
+
+        self.pool = ConnectionPool(dsn, min_size=1, max_size=max_size, kwargs={"autocommit": True, "row_factory": dict_row})
+        self._primary_keys: Dict[str, List[str]] = {}
+        self._scalar_functions: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def table(self, table_name: str) -> LocalQuery:
+        return LocalQuery(self, table_name)
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None) -> LocalRpc:
+        return LocalRpc(self, name, params)
+
+    def fetch(self, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            cursor = conn.execute(sql, params)
+            if cursor.description is None:
+                return []
+            return [{k: _to_json(v) for k, v in row.items()} for row in cursor.fetchall()]
+
+    def primary_key(self, table_name: str) -> List[str]:
+        with self._lock:
+            if table_name not in self._primary_keys:
+                rows = self.fetch(
+                    "SELECT a.attname FROM pg_index i "
+                    "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+                    "WHERE i.indrelid = %s::regclass AND i.indisprimary",
+                    [table_name],
+                )
+                self._primary_keys[table_name] = [r["attname"] for r in rows]
+            return self._primary_keys[table_name]
+
+    def returns_scalar(self, name: str) -> bool:
+        with self._lock:
+            if name not in self._scalar_functions:
+                rows = self.fetch(
+                    "SELECT p.proretset, t.typtype FROM pg_proc p JOIN pg_type t ON t.oid = p.prorettype "
+                    "WHERE p.proname = %s LIMIT 1",
+                    [name],
+                )
+                self._scalar_functions[name] = bool(rows) and not rows[0]["proretset"] and rows[0]["typtype"] != "c"
+            return self._scalar_functions[name]
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+# ============== YouTube Data API ==============
+
+class FakeYouTubeApi:
+    """
+    youtube_collector의 YouTubeClient와 같은 메서드를 가진 합성 API
+
+    같은 seed면 같은 영상/채널/댓글 ID를 반환하고, advance()를 부를 때마다 조회수/좋아요가 늘어나
+    수집 주기마다 순위와 변화량이 바뀝니다.
+    """
+
+    def __init__(self, videos: int = 200, comments_per_page: int = 100, comment_pages: int = 2, seed: int = 0):
+        self.videos = videos
+        self.comments_per_page = comments_per_page
+        self.comment_pages = comment_pages
+        self.seed = seed
+        self.cycle = 0
+        self.requests = 0
+
+    def advance(self) -> None:
+        self.cycle += 1
+
+    def _video_items(self) -> List[Dict[str, Any]]:
+        items = make_video_items(self.videos, seed=self.seed)
+        for i, item in enumerate(items):
+            growth = 1 + 0.02 * self.cycle * ((i * 7919 + self.cycle) % 11)
+            stats = item["statistics"]
+            for key in ("viewCount", "likeCount", "commentCount"):
+                stats[key] = str(int(int(stats[key]) * growth))
+        return sorted(items, key=lambda it: -int(it["statistics"]["viewCount"]))
+
+    def get_trending_videos(self, region_code: Optional[str] = None, max_results: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        items = self._video_items()[:max_results or self.videos]
+        page_size = 50
+        for start in range(0, len(items), page_size):
+            self.requests += 1
+            page = {"kind": "youtube#videoListResponse", "items": items[start:start + page_size]}
+            if start + page_size < len(items):
+                page["nextPageToken"] = f"page{start + page_size}"
+            yield page
+
+    def get_video_comments(self, video_id: str, max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        pages = max_pages or self.comment_pages
+        video_seed = sum(map(ord, video_id))
+        for page_num in range(pages):
+            self.requests += 1
+            items = make_comment_items(self.comments_per_page, seed=video_seed + page_num, video_id=video_id)
+            for item in items:
+                snippet = item["snippet"]["topLevelComment"]["snippet"]
+                snippet["likeCount"] += self.cycle * (snippet["likeCount"] % 7)
+            page = {"kind": "youtube#commentThreadListResponse", "items": items}
+            if page_num + 1 < pages:
+                page["nextPageToken"] = f"page{page_num + 1}"
+            yield page
+
+    def get_video_categories(self, region_code: Optional[str] = None) -> Dict[str, Any]:
+        self.requests += 1
+        names = {"1": "Film & Animation", "10": "Music", "17": "Sports", "20": "Gaming",
+                 "22": "People & Blogs", "24": "Entertainment", "25": "News & Politics", "28": "Science & Technology"}
+        return {
+            "kind": "youtube#videoCategoryListResponse",
+            "items": [{"id": cid, "snippet": {"title": title, "assignable": True}} for cid, title in names.items()],
+        }
+
+    def get_channels(self, channel_ids: List[str]) -> Dict[str, Any]:
+        self.requests += 1
+        ids = channel_ids[:50]
+        items = make_channel_items(len(ids), seed=self.seed)
+        for channel_id, item in zip(ids, items):
+            item["id"] = channel_id
+            stats = item["statistics"]
+            stats["subscriberCount"] = str(int(stats["subscriberCount"]) + self.cycle * 100)
+        return {"kind": "youtube#channelListResponse", "items": items}
@@ -0,0 +1,137 @@
+"""
+Streaming Transform - 전체 로드 vs 스트리밍 변환의 최대 메모리/처리 시간 비교
+
+- whole: 파일 전체 다운로드 → 디코딩 → 레코드 전체 생성 → 1회 적재 (기존 경로)
+- stream: 청크 단위 gzip 해제 → ijson 증분 파싱 → STREAM_BATCH_ROWS개씩 변환/적재
+
+    cd transform
+    python -m benchmarks.streaming_transform --items=10000,100000,300000
+
+GCS 대신 로컬 임시 디렉토리를 같은 인터페이스(blob/open/download_as_bytes)로 읽고,
+적재는 행 수만 세므로 변환 경로의 메모리만 비교합니다. (tracemalloc 기준)
+"""
+import gc
+import sys
+import gzip
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.decoding import load_gcs_page  # noqa: E402
+from app.core.streaming import STREAM_BATCH_ROWS, stream_transform  # noqa: E402
+from app.transformers import build_channel_records, build_comment_records  # noqa: E402
+from benchmarks.synthetic import make_channel_items, make_comment_items  # noqa: E402
+
+METADATA = {"date": "2026-01-12", "hour": "00", "video_id": "vid0000000000"}
+
+TARGETS = {
+    "channels": ("dim_channels", make_channel_items, build_channel_records),
+    "comment_threads": ("dim_comments", make_comment_items, build_comment_records),
+}
+
+
+class LocalBlob:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def download_as_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+    def open(self, mode: str = "rb", chunk_size: int = None):
+        return open(self.path, mode)
+
+
+class LocalBucket:
+    """로컬 디렉토리를 GCS bucket처럼 읽는 벤치마크용 어댑터"""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def blob(self, name: str) -> LocalBlob:
+        return LocalBlob(self.root / name)
+
+
+def count_rows(records: List[Dict[str, Any]]) -> int:
+    return len(records)
+
+
+def run_whole(bucket, blob_path: str, data_type: str, table_name: str, build: Callable) -> int:
+    items = load_gcs_page(bucket, blob_path, data_type).items
+    return count_rows(build(items, METADATA))
+
+
+def run_stream(bucket, blob_path: str, data_type: str, table_name: str, build: Callable) -> int:
+    result = stream_transform(
+        bucket, blob_path, data_type, table_name,
+        build=lambda items: build(items, METADATA),
+        write=count_rows
+    )
+    return result["records_count"]
+
+
+def measure(func: Callable, *args) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = func(*args)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rows": rows, "seconds": seconds, "peak_bytes": peak}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Whole-file vs streaming transform memory benchmark")
+    parser.add_argument("--items", default="10000,100000,300000", help="파일당 item 수 목록")
+    parser.add_argument("--data-types", default="channels,comment_threads")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        bucket = LocalBucket(Path(tmp))
+
+        for data_type in [t.strip() for t in args.data_types.split(",") if t.strip()]:
+            table_name, make_items, build = TARGETS[data_type]
+
+            for count in [int(c) for c in args.items.split(",") if c.strip()]:
+                blob_path = f"{data_type}_{count}.json.gz"
+                page = {"kind": "youtube#listResponse", "items": make_items(count)}
+                (Path(tmp) / blob_path).write_bytes(
+                    gzip.compress(json.dumps(page, ensure_ascii=False).encode("utf-8"))
+                )
+                del page
+
+                whole = measure(run_whole, bucket, blob_path, data_type, table_name, build)
+                stream = measure(run_stream, bucket, blob_path, data_type, table_name, build)
+                if whole["rows"] != stream["rows"]:
+                    print(f"MISMATCH: {data_type} items={count}", file=sys.stderr)
+                    return 1
+
+                results.append({
+                    "data_type": data_type,
+                    "items": count,
+                    "batch_rows": STREAM_BATCH_ROWS,
+                    "whole_seconds": round(whole["seconds"], 3),
+                    "stream_seconds": round(stream["seconds"], 3),
+                    "whole_peak_bytes": whole["peak_bytes"],
+                    "stream_peak_bytes": stream["peak_bytes"],
+                })
+                print(
+                    f"{data_type:<16} {count:>8,} items  "
+                    f"whole {whole['seconds']:6.2f}s {whole['peak_bytes'] / 1e6:8.1f}MB  "
+                    f"stream {stream['seconds']:6.2f}s {stream['peak_bytes'] / 1e6:8.1f}MB",
+                    file=sys.stderr,
+                )
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
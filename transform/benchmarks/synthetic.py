@@ -0,0 +1,258 @@
+"""
+Synthetic Pages - YouTube API 응답 형태의 합성 페이지 생성기
+
+GCS/YouTube API 없이 변환·적재 경로의 처리량을 재기 위한 입력을 만듭니다.
+seed를 고정하면 항상 같은 페이지가 생성됩니다.
+
+실제 KR 트렌딩 응답처럼 한국어 제목/태그, 챕터·해시태그·링크가 들어간 긴 설명,
+HTML이 섞인 댓글, 변환에 쓰이지 않는 필드(localized, etag 등)까지 포함해
+디코딩 비용이 실제 페이지 크기에 가깝도록 합니다.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+CATEGORY_IDS = ["1", "10", "17", "20", "22", "24", "25", "28"]
+WORDS = ["트렌딩", "브이로그", "먹방", "리뷰", "하이라이트", "official", "MV", "live", "shorts", "게임", "뉴스", "챌린지"]
+PHRASES = [
+    "오늘 드디어 공개합니다", "끝까지 봐주세요", "역대급 반전", "구독과 좋아요 부탁드려요", "리액션 모음",
+    "현장 직캠", "비하인드 공개", "실시간 반응", "완벽 정리", "처음 해봤습니다", "이건 진짜 미쳤다",
+    "팬미팅 현장", "풀버전", "예고편", "1시간 순삭", "솔직 후기", "가성비 끝판왕", "전격 비교",
+]
+TAG_WORDS = [
+    "먹방", "브이로그", "아이돌", "케이팝", "kpop", "직캠", "예능", "드라마", "리뷰", "언박싱", "게임", "롤",
+    "마인크래프트", "축구", "야구", "뉴스", "시사", "요리", "레시피", "여행", "일상", "ASMR", "shorts", "챌린지",
+]
+EMOJI = ["🔥", "😂", "❤️", "👍", "😭", "✨", "🎉", "💯"]
+BRACKETS = ["[MV]", "[LIVE]", "[ENG SUB]", "[4K]", "[Official]", "[Teaser]", ""]
+
+
+def _text(rng: random.Random, min_words: int, max_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words)))
+
+
+def _sentence(rng: random.Random) -> str:
+    """한국어 구절 + 가끔 이모지"""
+    words = " ".join(rng.choice(PHRASES) for _ in range(rng.randint(1, 3)))
+    return words + (f" {rng.choice(EMOJI)}" if rng.random() < 0.3 else "")
+
+
+def _title(rng: random.Random) -> str:
+    return f"{rng.choice(BRACKETS)} {_sentence(rng)} | {_text(rng, 1, 4)}".strip()
+
+
+def _tags(rng: random.Random) -> List[str]:
+    return [rng.choice(TAG_WORDS) + (f" {rng.choice(TAG_WORDS)}" if rng.random() < 0.3 else "")
+            for _ in range(rng.randint(0, 25))]
+
+
+def _description(rng: random.Random, min_lines: int, max_lines: int) -> str:
+    """챕터 타임스탬프, 해시태그, 링크가 섞인 여러 줄 설명 (수백~수천 자)"""
+    lines = [_sentence(rng) for _ in range(rng.randint(min_lines, max_lines))]
+    if rng.random() < 0.5:
+        lines.append("")
+        lines.extend(f"{m:02d}:{rng.randint(0, 59):02d} {_sentence(rng)}" for m in range(0, rng.randint(3, 12) * 3, 3))
+    lines.append("")
+    lines.append(f"▶ 구독하기: https://www.youtube.com/@channel{rng.randint(0, 99999)}?sub_confirmation=1")
+    lines.append(f"▶ 인스타그램: https://instagram.com/account{rng.randint(0, 99999)}")
+    lines.append(" ".join(f"#{rng.choice(TAG_WORDS)}" for _ in range(rng.randint(2, 8))))
+    return "\n".join(lines)
+
+
+def _timestamp(rng: random.Random, base: datetime, max_hours: int) -> str:
+    published = base - timedelta(hours=rng.randint(1, max_hours), seconds=rng.randint(0, 3599))
+    return published.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _etag(rng: random.Random) -> str:
+    return "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-") for _ in range(27))
+
+
+def make_video_items(count: int, seed: int = 0, base: datetime = None) -> List[Dict[str, Any]]:
+    """videos.list items"""
+    rng = random.Random(seed)
+    base = base or datetime(2026, 1, 12, tzinfo=timezone.utc)
+    items = []
+    for i in range(count):
+        minutes, seconds = rng.randint(0, 59), rng.randint(0, 59)
+        duration = f"PT{rng.randint(1, 2)}H{minutes}M{seconds}S" if i % 7 == 0 else f"PT{minutes}M{seconds}S"
+        view_count = rng.randint(1_000, 50_000_000)
+        title = _title(rng)
+        description = _description(rng, 2, 30)
+        items.append({
+            "kind": "youtube#video",
+            "etag": _etag(rng),
+            "id": f"vid{seed:04d}{i:07d}",
+            "snippet": {
+                "title": title,
+                "description": description,
+                "channelId": f"UC{rng.randint(0, count // 5 + 1):08d}",
+                "channelTitle": _text(rng, 1, 3),
+                "categoryId": rng.choice(CATEGORY_IDS),
+                "publishedAt": _timestamp(rng, base, 24 * 14),
+                "tags": _tags(rng),
+                "thumbnails": {
+                    size: {"url": f"https://i.ytimg.com/vi/vid{i}/{size}default.jpg", "width": w, "height": h}
+                    for size, w, h in (("default", 120, 90), ("medium", 320, 180), ("high", 480, 360), ("standard", 640, 480))
+                },
+                "liveBroadcastContent": "none",
+                "defaultAudioLanguage": "ko",
+                "localized": {"title": title, "description": description},
+            },
+            "statistics": {
+                "viewCount": str(view_count),
+                "likeCount": str(view_count // rng.randint(20, 200)),
+                "favoriteCount": "0",
+                "commentCount": str(view_count // rng.randint(500, 5000)),
+            },
+            "contentDetails": {
+                "duration": duration,
+                "dimension": "2d",
+                "definition": "hd",
+                "caption": rng.choice(["true", "false"]),
+                "licensedContent": True,
+                "projection": "rectangular",
+            },
+        })
+    return items
+
+
+def _comment_text(rng: random.Random) -> str:
+    """textDisplay 형태 (HTML 줄바꿈, 타임스탬프 링크 포함)"""
+    parts = [_sentence(rng) for _ in range(rng.randint(1, 6))]
+    if rng.random() < 0.2:
+        m, s = rng.randint(0, 20), rng.randint(0, 59)
+        parts.insert(0, f'<a href="https://www.youtube.com/watch?v=x&amp;t={m * 60 + s}">{m}:{s:02d}</a>')
+    return "<br>".join(parts)
+
+
+def make_comment_items(count: int, seed: int = 0, video_id: str = "vid0000000000") -> List[Dict[str, Any]]:
+    """commentThreads.list items"""
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 12, tzinfo=timezone.utc)
+    items = []
+    for i in range(count):
+        text = _comment_text(rng)
+        author_id = f"UC{rng.randint(0, 10_000_000):08d}"
+        published = _timestamp(rng, base, 48)
+        items.append({
+            "kind": "youtube#commentThread",
+            "etag": _etag(rng),
+            "id": f"Ug{seed:04d}{i:09d}",
+            "snippet": {
+                "channelId": f"UC{seed:08d}",
+                "videoId": video_id,
+                "canReply": True,
+                "isPublic": True,
+                "totalReplyCount": rng.randint(0, 50),
+                "topLevelComment": {
+                    "kind": "youtube#comment",
+                    "etag": _etag(rng),
+                    "id": f"Ug{seed:04d}{i:09d}",
+                    "snippet": {
+                        "channelId": f"UC{seed:08d}",
+                        "videoId": video_id,
+                        "textDisplay": text,
+                        "textOriginal": text.replace("<br>", "\n"),
+                        "authorDisplayName": f"@user{rng.randint(0, 10_000_000)}",
+                        "authorProfileImageUrl": f"https://yt3.ggpht.com/ytc/{_etag(rng)}=s48-c-k-c0x00ffffff-no-rj",
+                        "authorChannelUrl": f"http://www.youtube.com/{author_id}",
+                        "authorChannelId": {"value": author_id},
+                        "canRate": True,
+                        "viewerRating": "none",
+                        "likeCount": rng.randint(0, 5000),
+                        "publishedAt": published,
+                        "updatedAt": published,
+                        "authorIsChannelOwner": rng.random() < 0.01,
+                    },
+                },
+            },
+        })
+    return items
+
+
+def make_channel_items(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """channels.list items (트렌딩 채널 전체를 합친 응답 형태)"""
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 12, tzinfo=timezone.utc)
+    items = []
+    for i in range(count):
+        view_count = rng.randint(10_000, 5_000_000_000)
+        title = _text(rng, 1, 4)
+        description = _description(rng, 5, 60)
+        items.append({
+            "kind": "youtube#channel",
+            "etag": _etag(rng),
+            "id": f"UC{seed:04d}{i:08d}",
+            "snippet": {
+                "title": title,
+                "description": description,
+                "customUrl": f"@channel{i}",
+                "publishedAt": _timestamp(rng, base, 24 * 365 * 10),
+                "country": rng.choice(["KR", "US", "JP", None]),
+                "thumbnails": {
+                    size: {"url": f"https://yt3.ggpht.com/ch{i}=s{w}", "width": w, "height": w}
+                    for size, w in (("default", 88), ("medium", 240), ("high", 800))
+                },
+                "localized": {"title": title, "description": description},
+            },
+            "statistics": {
+                "subscriberCount": str(view_count // rng.randint(50, 500)),
+                "viewCount": str(view_count),
+                "hiddenSubscriberCount": False,
+                "videoCount": str(rng.randint(1, 20_000)),
+            },
+            "brandingSettings": {
+                "channel": {"title": title, "keywords": " ".join(_tags(rng)), "unsubscribedTrailer": f"vid{i:07d}"},
+            },
+        })
+    return items
+
+
+LIST_KINDS = {
+    "videos_list": "youtube#videoListResponse",
+    "comment_threads": "youtube#commentThreadListResponse",
+    "channels": "youtube#channelListResponse",
+}
+
+
+def make_page(
+    data_type: str,
+    items: List[Dict[str, Any]],
+    next_page_token: Optional[str] = None,
+    total_results: Optional[int] = None
+) -> Dict[str, Any]:
+    """items를 list 응답 봉투(kind, etag, pageInfo, nextPageToken)로 감쌉니다."""
+    page = {
+        "kind": LIST_KINDS[data_type],
+        "etag": _etag(random.Random(len(items))),
+        "pageInfo": {"totalResults": total_results or len(items), "resultsPerPage": len(items)},
+        "items": items,
+    }
+    if next_page_token:
+        page["nextPageToken"] = next_page_token
+    return page
+
+
+def make_pages(data_type: str, total_items: int, page_size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    total_items개 item을 page_size 단위 페이지로 나눈 응답 목록
+
+    comment_threads는 기본 수집 설정처럼 영상당 2페이지씩, 페이지마다 다른 seed로 만들고 (댓글 ID가 겹치지 않음),
+    videos_list/channels는 한 번에 만든 목록을 나눕니다. (한 스냅샷 안에서 ID가 겹치지 않음)
+    """
+    pages = []
+    if data_type == "comment_threads":
+        for number, start in enumerate(range(0, total_items, page_size)):
+            count = min(page_size, total_items - start)
+            items = make_comment_items(count, seed=seed * 10_000 + number, video_id=f"vid{seed:04d}{number // 2:07d}")
+            pages.append(items)
+    else:
+        make_items = make_video_items if data_type == "videos_list" else make_channel_items
+        all_items = make_items(total_items, seed=seed)
+        pages = [all_items[start:start + page_size] for start in range(0, total_items, page_size)]
+
+    return [
+        make_page(data_type, items, next_page_token=f"CAUQAA{number + 1}" if number + 1 < len(pages) else None, total_results=total_items)
+        for number, items in enumerate(pages)
+    ]
@@ -0,0 +1,407 @@
+"""
+Transform Suite - 변환기별 디코딩/매핑/적재 처리량과 최대 메모리를 수집량 배수별로 측정
+
+    cd transform
+    python -m benchmarks.transform_suite --scales=1,10 --output=bench.json
+    python -m benchmarks.transform_suite --scales=1,10 --loaders=memory,postgres --init-schema   # DATABASE_URL 필요
+    python -m benchmarks.transform_suite --scales=1,10 --baseline=bench.json --max-regression=0.2
+
+배수 1은 현재 기본 수집 설정의 1시간 분량입니다.
+- videos_list: 트렌딩 200개 (50개씩 4페이지)
+- comment_threads: 영상 5개 × 2페이지 × 100개
+- channels: 채널 150개 (한 파일로 합친 응답)
+
+transform_handler처럼 페이지(파일)마다 다음 단계를 실행하고 단계별 시간을 합산합니다.
+- decode: gzip 해제 + decode_page
+- map: build_*_records + 자연키 중복 제거 (영상 카테고리 매핑은 고정 맵)
+- load: memory(행 수만 유지하는 인메모리 적재기) 또는 postgres(COPY 적재기 + TransformSpec의
+  before_write/write/after_write - 변화량, 집계 갱신, 댓글 병합, 채널 이력을 로컬 Postgres에서 실행)
+
+시간은 --repeat 회 중 최솟값이고, 최대 메모리는 별도 1회 실행의 tracemalloc 값(입력 페이지 제외)입니다.
+postgres 적재는 매 회차 전에 벤치마크 행(BENCH_DATE 스냅샷, 합성 ID)을 지우므로 로컬 DB에서만 실행하세요.
+"""
+import os
+import gc
+import sys
+import gzip
+import json
+import time
+import argparse
+import logging
+import platform
+import subprocess
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import dedupe_by_keys  # noqa: E402
+from app.core.decoding import decode_page  # noqa: E402
+from app.transformers import TRANSFORM_SPECS  # noqa: E402
+from benchmarks.synthetic import CATEGORY_IDS, make_pages  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# 운영 데이터와 겹치지 않는 스냅샷 날짜 (postgres 적재 정리 기준)
+BENCH_DATE = "2000-01-01"
+CATEGORY_MAP = {cid: f"Category {cid}" for cid in CATEGORY_IDS}
+STAGES = ("decode", "map", "load")
+
+# data_type: (배수 1의 item 수, 페이지당 item 수 - None이면 한 파일)
+BASE_VOLUME = {
+    "videos_list": (200, 50),
+    "comment_threads": (1000, 100),
+    "channels": (150, None),
+}
+
+# postgres 적재 정리: (레코드에서 모을 키, SQL 목록) - %(ids)s는 키 값 목록, %(date)s는 BENCH_DATE
+CLEANUP = {
+    "videos_list": ("video_id", [
+        "DELETE FROM fact_video_snapshots WHERE video_id = ANY(%(ids)s) AND snapshot_at::date = %(date)s",
+        "DELETE FROM agg_hourly_totals WHERE snapshot_at::date = %(date)s",
+        "DELETE FROM agg_category_snapshots WHERE snapshot_at::date = %(date)s",
+        "DELETE FROM agg_channel_daily WHERE day = %(date)s",
+    ]),
+    "comment_threads": ("comment_id", [
+        "DELETE FROM fact_comment_counts WHERE comment_id = ANY(%(ids)s)",
+        "DELETE FROM dim_comments WHERE comment_id = ANY(%(ids)s)",
+    ]),
+    "channels": ("channel_id", [
+        "DELETE FROM fact_channel_stats WHERE channel_id = ANY(%(ids)s)",
+        "DELETE FROM dim_channels WHERE channel_id = ANY(%(ids)s)",
+    ]),
+}
+
+
+@dataclass
+class Workload:
+    """한 변환기 × 배수의 입력 (압축된 페이지와 파일별 경로 메타데이터)"""
+    data_type: str
+    scale: int
+    items: int
+    pages: List[bytes]
+    metadata: List[Dict[str, Any]]
+    raw_bytes: int
+
+
+class InMemoryLoader:
+    """적재 경로 자체의 비용을 빼고 변환 단계만 보기 위한 적재기 (충돌 키 기준으로 dict에 유지)"""
+
+    name = "memory"
+
+    def __init__(self):
+        self.tables: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+
+    def insert(self, table_name: str, records: List[Dict[str, Any]]) -> int:
+        table = self.tables.setdefault(table_name, {})
+        for record in records:
+            table[len(table)] = record
+        return len(records)
+
+    def upsert(self, table_name: str, records: List[Dict[str, Any]], on_conflict: str) -> int:
+        keys = [k.strip() for k in on_conflict.split(",")]
+        table = self.tables.setdefault(table_name, {})
+        for record in records:
+            table[tuple(record.get(k) for k in keys)] = record
+        return len(records)
+
+    def reset(self) -> None:
+        self.tables = {}
+
+    def close(self) -> None:
+        pass
+
+
+class Target:
+    """적재 대상: loader(upsert/insert)와 TransformSpec 훅에 넘길 client (memory는 None → 훅 생략)"""
+
+    def __init__(self, name: str, loader, client=None, dsn: Optional[str] = None):
+        self.name = name
+        self.loader = loader
+        self.client = client
+        self.dsn = dsn
+
+    def reset(self, data_type: str, records: List[Dict[str, Any]]) -> None:
+        """이전 회차 행을 지워 항상 같은 상태(신규 적재)에서 측정합니다."""
+        if self.dsn is None:
+            self.loader.reset()
+            return
+
+        import psycopg
+
+        key, statements = CLEANUP[data_type]
+        params = {"ids": sorted({r[key] for r in records}), "date": BENCH_DATE}
+        with psycopg.connect(self.dsn, autocommit=True) as conn:
+            for sql in statements:
+                conn.execute(sql, params)
+
+    def close(self) -> None:
+        self.loader.close()
+        if self.client is not None:
+            self.client.close()
+
+
+def build_workload(data_type: str, scale: int, seed: int) -> Workload:
+    """합성 페이지를 만들어 gzip으로 압축해 둡니다. (측정 시간에서 제외)"""
+    base_items, page_size = BASE_VOLUME[data_type]
+    items = base_items * scale
+    pages = make_pages(data_type, items, page_size or items, seed=seed)
+
+    compressed, metadata, raw_bytes = [], [], 0
+    for number, page in enumerate(pages):
+        raw = json.dumps(page, ensure_ascii=False).encode("utf-8")
+        raw_bytes += len(raw)
+        compressed.append(gzip.compress(raw))
+        meta = {"date": BENCH_DATE, "hour": "00", "run_id": f"bench_{number:04d}"}
+        if data_type == "comment_threads":
+            meta["video_id"] = page["items"][0]["snippet"]["videoId"]
+        metadata.append(meta)
+
+    return Workload(data_type, scale, items, compressed, metadata, raw_bytes)
+
+
+def run_workload(workload: Workload, target: Target) -> Tuple[Dict[str, float], int, List[Dict[str, Any]]]:
+    """
+    페이지마다 decode → map → load를 실행합니다.
+
+    Returns:
+        (단계별 초, 적재된 행 수, 전체 레코드)
+    """
+    spec = TRANSFORM_SPECS[workload.data_type]
+    seconds = {stage: 0.0 for stage in STAGES}
+    written = 0
+    all_records: List[Dict[str, Any]] = []
+    clock = time.perf_counter
+
+    for compressed, metadata in zip(workload.pages, workload.metadata):
+        started = clock()
+        items = decode_page(workload.data_type, gzip.decompress(compressed)).items
+        decoded = clock()
+
+        if spec.needs_category_map:
+            records = spec.build_records(items, metadata, CATEGORY_MAP)
+        else:
+            records = spec.build_records(items, metadata)
+        records = dedupe_by_keys(records, spec.on_conflict)
+        mapped = clock()
+
+        written += load_records(spec, target, records, metadata)
+        loaded = clock()
+
+        seconds["decode"] += decoded - started
+        seconds["map"] += mapped - decoded
+        seconds["load"] += loaded - mapped
+        all_records.extend(records)
+
+    return seconds, written, all_records
+
+
+def load_records(spec, target: Target, records: List[Dict[str, Any]], metadata: Dict[str, Any]) -> int:
+    """BatchRunner._flush와 같은 순서로 적재합니다. (client가 없으면 훅/전용 write 대신 loader.upsert)"""
+    client = target.client
+    rows = spec.before_write(client, records) if client is not None and spec.before_write else records
+    if client is not None and spec.write:
+        written = spec.write(client, rows)
+    elif spec.on_conflict:
+        written = target.loader.upsert(spec.table_name, rows, on_conflict=spec.on_conflict)
+    else:
+        written = target.loader.insert(spec.table_name, rows)
+    if client is not None and spec.after_write:
+        spec.after_write(client, records, [("bench", len(records), metadata)])
+    return written
+
+
+def measure(workload: Workload, target: Target, repeat: int) -> Dict[str, Any]:
+    """단계별 최소 시간(repeat 회)과 별도 1회 실행의 tracemalloc 최대 메모리"""
+    best: Dict[str, float] = {}
+    records: List[Dict[str, Any]] = []
+    written = 0
+
+    for _ in range(repeat):
+        target.reset(workload.data_type, records)
+        gc.collect()
+        seconds, written, records = run_workload(workload, target)
+        for stage, value in seconds.items():
+            best[stage] = min(best.get(stage, value), value)
+
+    target.reset(workload.data_type, records)
+    gc.collect()
+    tracemalloc.start()
+    run_workload(workload, target)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    target.reset(workload.data_type, records)
+
+    total = sum(best.values())
+    compressed_bytes = sum(len(p) for p in workload.pages)
+    return {
+        "data_type": workload.data_type,
+        "scale": workload.scale,
+        "loader": target.name,
+        "files": len(workload.pages),
+        "items": workload.items,
+        "records": len(records),
+        "written": written,
+        "compressed_bytes": compressed_bytes,
+        "raw_bytes": workload.raw_bytes,
+        "stages": {
+            stage: {
+                "seconds": round(best[stage], 4),
+                "items_per_sec": round(workload.items / best[stage], 1) if best[stage] else None,
+            }
+            for stage in STAGES
+        },
+        "decode_mb_per_sec": round(workload.raw_bytes / 1e6 / best["decode"], 1) if best["decode"] else None,
+        "total_seconds": round(total, 4),
+        "items_per_sec": round(workload.items / total, 1) if total else None,
+        "peak_bytes": peak,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], max_regression: Optional[float]) -> List[str]:
+    """
+    이전 실행 결과와 같은 (data_type, scale, loader)끼리 처리량/최대 메모리 변화를 출력합니다.
+
+    Returns:
+        max_regression(비율)보다 나빠진 항목 목록
+    """
+    previous = {(r["data_type"], r["scale"], r["loader"]): r for r in baseline}
+    regressions = []
+
+    print(f"{'target':<34}{'metric':<16}{'before':>14}{'after':>14}{'change':>10}", file=sys.stderr)
+    for result in results:
+        key = (result["data_type"], result["scale"], result["loader"])
+        before = previous.get(key)
+        if before is None:
+            continue
+
+        label = f"{key[0]} x{key[1]} {key[2]}"
+        metrics = [(f"{s} items/s", before["stages"][s]["items_per_sec"], result["stages"][s]["items_per_sec"], True) for s in STAGES]
+        metrics.append(("peak MB", before["peak_bytes"] / 1e6, result["peak_bytes"] / 1e6, False))
+
+        for name, old, new, higher_is_better in metrics:
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            print(f"{label:<34}{name:<16}{old:>14,.1f}{new:>14,.1f}{change:>+10.1%}", file=sys.stderr)
+            worse = -change if higher_is_better else change
+            if max_regression is not None and worse > max_regression:
+                regressions.append(f"{label} {name}: {old:,.1f} -> {new:,.1f} ({change:+.1%})")
+
+    return regressions
+
+
+def run_metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    """결과 비교 시 참고할 실행 환경"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+    }
+
+
+def make_targets(names: List[str], dsn: Optional[str]) -> List[Target]:
+    targets = []
+    for name in names:
+        if name == "memory":
+            targets.append(Target("memory", InMemoryLoader()))
+        elif name == "postgres":
+            from app.core.loaders import PostgresCopyLoader
+            from benchmarks.local_stack import LocalPostgrestClient
+
+            if not dsn:
+                raise ValueError("DATABASE_URL is required for the postgres loader")
+            targets.append(Target("postgres", PostgresCopyLoader(dsn), client=LocalPostgrestClient(dsn), dsn=dsn))
+        else:
+            raise ValueError(f"Unknown loader: {name}")
+    return targets
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-transformer decode/map/load throughput and peak memory")
+    parser.add_argument("--data-types", default=",".join(BASE_VOLUME.keys()))
+    parser.add_argument("--scales", default="1,10", help="기본 수집량(1시간) 대비 배수 목록")
+    parser.add_argument("--loaders", default="memory", help="쉼표 구분: memory,postgres")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--init-schema", action="store_true", help="migrations/*.sql 적용 (postgres)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, help="baseline 대비 허용 악화 비율 (예: 0.2, 넘으면 exit 1)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    dsn = os.getenv("DATABASE_URL")
+
+    data_types = [t.strip() for t in args.data_types.split(",") if t.strip()]
+    unknown = [t for t in data_types if t not in BASE_VOLUME]
+    if unknown:
+        logger.error(f"Unknown data types: {unknown}")
+        return 1
+
+    loader_names = [n.strip() for n in args.loaders.split(",") if n.strip()]
+    if args.init_schema and dsn:
+        from benchmarks.loader_throughput import init_schema
+        init_schema(dsn)
+
+    try:
+        targets = make_targets(loader_names, dsn)
+    except (ValueError, ImportError) as e:
+        logger.error(str(e))
+        return 1
+
+    results = []
+    try:
+        for data_type in data_types:
+            for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+                workload = build_workload(data_type, scale, args.seed)
+                for target in targets:
+                    result = measure(workload, target, args.repeat)
+                    results.append(result)
+                    stages = result["stages"]
+                    logger.info(
+                        f"{data_type:<16} x{scale:<4} {target.name:<9} "
+                        f"decode {stages['decode']['items_per_sec'] or 0:>11,.0f}/s  "
+                        f"map {stages['map']['items_per_sec'] or 0:>11,.0f}/s  "
+                        f"load {stages['load']['items_per_sec'] or 0:>11,.0f}/s  "
+                        f"peak {result['peak_bytes'] / 1e6:7.1f}MB"
+                    )
+    finally:
+        for target in targets:
+            target.close()
+
+    report = {"meta": run_metadata(args), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Results saved: {args.output}")
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.max_regression)
+        for regression in regressions:
+            logger.error(f"Regression: {regression}")
+
+    print(json.dumps(results, indent=2))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Fact Table Compaction Utility
+재처리(retrigger)로 중복 적재된 fact 행을 자연키 기준으로 정리하고 고유 인덱스를 만듭니다.
+
+- fact_video_snapshots: (video_id, snapshot_at) 중 가장 먼저 적재된 행만 유지
+- fact_comments: (comment_id, 수집 hour) 중 가장 먼저 적재된 행만 유지하고
+                 collected_at을 hour 단위로 맞춤 (transform이 쓰는 키와 동일하게)
+
+Supabase의 직접 연결 문자열(DATABASE_URL)이 필요합니다.
+
+Examples:
+    python compact_facts.py --dry-run
+    python compact_facts.py --tables=fact_comments --vacuum-full
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from typing import Any, Dict
+
+from dotenv import load_dotenv
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# 테이블별 (중복 판단 키 SQL, 정리 후 만들 고유 인덱스)
+COMPACTION_SPECS: Dict[str, Dict[str, str]] = {
+    "fact_video_snapshots": {
+        "partition_by": "video_id, snapshot_at",
+        "normalize": "",
+        "index": "CREATE UNIQUE INDEX IF NOT EXISTS fact_video_snapshots_natural_key "
+                 "ON fact_video_snapshots (video_id, snapshot_at)",
+    },
+    "fact_comments": {
+        "partition_by": "comment_id, date_trunc('hour', collected_at)",
+        "normalize": "UPDATE fact_comments SET collected_at = date_trunc('hour', collected_at) "
+                     "WHERE collected_at <> date_trunc('hour', collected_at)",
+        "index": "CREATE UNIQUE INDEX IF NOT EXISTS fact_comments_natural_key "
+                 "ON fact_comments (comment_id, collected_at)",
+    },
+}
+
+
+def table_sizes(conn, table_name: str) -> Dict[str, Any]:
+    """행 수와 테이블/인덱스 크기 (bytes)"""
+    row = conn.execute(
+        f"SELECT count(*), pg_table_size('{table_name}'), pg_indexes_size('{table_name}'), "
+        f"pg_total_relation_size('{table_name}') FROM {table_name}"
+    ).fetchone()
+    return {"rows": row[0], "table_bytes": row[1], "index_bytes": row[2], "total_bytes": row[3]}
+
+
+def duplicate_ids_sql(table_name: str, partition_by: str) -> str:
+    """키별로 가장 작은 id를 제외한 나머지 id"""
+    return (
+        f"SELECT id FROM (SELECT id, row_number() OVER (PARTITION BY {partition_by} ORDER BY id) AS rn "
+        f"FROM {table_name}) ranked WHERE rn > 1"
+    )
+
+
+def compact_table(conn, table_name: str, dry_run: bool = False, vacuum_full: bool = False) -> Dict[str, Any]:
+    """단일 테이블 중복 제거 → 키 정규화 → 고유 인덱스 생성 → VACUUM"""
+    spec = COMPACTION_SPECS[table_name]
+    duplicates_sql = duplicate_ids_sql(table_name, spec["partition_by"])
+
+    before = table_sizes(conn, table_name)
+    duplicates = conn.execute(f"SELECT count(*) FROM ({duplicates_sql}) d").fetchone()[0]
+    logger.info(f"{table_name}: {duplicates} duplicate rows out of {before['rows']}")
+
+    report = {"table": table_name, "duplicate_rows": duplicates, "before": before}
+    if dry_run:
+        return report
+
+    with conn.transaction():
+        removed = conn.execute(f"DELETE FROM {table_name} WHERE id IN ({duplicates_sql})").rowcount
+        if spec["normalize"]:
+            report["normalized_rows"] = conn.execute(spec["normalize"]).rowcount
+        conn.execute(spec["index"])
+
+    # VACUUM은 트랜잭션 밖에서만 실행 가능 (FULL은 테이블 잠금 + 디스크 반환)
+    conn.execute(f"VACUUM {'FULL ' if vacuum_full else ''}ANALYZE {table_name}")
+
+    after = table_sizes(conn, table_name)
+    report.update({
+        "rows_removed": removed,
+        "after": after,
+        "table_bytes_saved": before["table_bytes"] - after["table_bytes"],
+        "index_bytes_saved": before["index_bytes"] - after["index_bytes"],
+    })
+    logger.info(
+        f"{table_name}: removed {removed} rows, "
+        f"total {before['total_bytes']:,} -> {after['total_bytes']:,} bytes"
+    )
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Deduplicate fact tables on their natural keys")
+    parser.add_argument("--tables", default=",".join(COMPACTION_SPECS.keys()))
+    parser.add_argument("--dry-run", action="store_true", help="중복 행 수만 확인")
+    parser.add_argument("--vacuum-full", action="store_true", help="VACUUM FULL로 디스크 공간 반환 (테이블 잠금)")
+    args = parser.parse_args()
+
+    if not DATABASE_URL:
+        logger.error("DATABASE_URL is missing in .env")
+        return 1
+
+    import psycopg
+
+    tables = [t.strip() for t in args.tables.split(",") if t.strip()]
+    unknown = [t for t in tables if t not in COMPACTION_SPECS]
+    if unknown:
+        logger.error(f"Unknown tables: {unknown}")
+        return 1
+
+    reports = []
+    with psycopg.connect(DATABASE_URL, autocommit=True) as conn:
+        for table_name in tables:
+            reports.append(compact_table(conn, table_name, dry_run=args.dry_run, vacuum_full=args.vacuum_full))
+
+    print(json.dumps(reports, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
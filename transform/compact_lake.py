@@ -0,0 +1,110 @@
+"""
+Lake Compaction CLI - 하루치 원본 JSON 페이지를 curated/ 아래 Parquet 파일로 압축합니다.
+
+백필/분석에서 수천 개의 page_NNN.json.gz를 다시 파싱하지 않고 필요한 열만 읽을 수 있습니다.
+날짜별 _manifest.json이 있으면 이미 압축된 날짜로 보고 건너뜁니다. (원본 파일 수가 바뀌었으면 다시 씀)
+
+Examples:
+    python compact_lake.py --start-date=2026-01-01 --end-date=2026-01-31 --dry-run
+    python compact_lake.py --start-date=2026-01-12 --data-types=videos_list
+    python compact_lake.py --all-dates --force
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.clients import get_bucket
+from app.core.utils import iter_dates
+from app.backfill import discover_date_range
+from app.lake import LAKE_TABLES, DayCompactor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "plosind-youtube-raw-data")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Compact raw pages into daily Parquet files")
+
+    dates = parser.add_mutually_exclusive_group(required=True)
+    dates.add_argument("--start-date", help="시작 날짜 (YYYY-MM-DD)")
+    dates.add_argument("--all-dates", action="store_true", help="GCS에 있는 전체 날짜 파티션")
+
+    parser.add_argument("--end-date", help="종료 날짜 (기본: 시작 날짜와 동일)")
+    parser.add_argument(
+        "--data-types",
+        default=",".join(LAKE_TABLES.keys()),
+        help="쉼표 구분 데이터 타입 (기본: videos_list,comment_threads)",
+    )
+    parser.add_argument("--region", default=os.getenv("YOUTUBE_REGION_CODE", "KR"), help="리전 파티션")
+    parser.add_argument("--workers", type=int, default=16, help="병렬 다운로드 수")
+    parser.add_argument("--max-rows-per-file", type=int, default=500_000, help="Parquet 파일 하나의 최대 행 수")
+    parser.add_argument("--force", action="store_true", help="이미 압축된 날짜도 다시 씀")
+    parser.add_argument("--dry-run", action="store_true", help="날짜별 원본 파일 수만 출력")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 함수"""
+    args = parse_args(argv)
+
+    data_types = [t.strip() for t in args.data_types.split(",") if t.strip()]
+    unknown = [t for t in data_types if t not in LAKE_TABLES]
+    if unknown:
+        logger.error(f"Unsupported data types for compaction: {unknown}")
+        return 1
+
+    bucket = get_bucket(GCS_BUCKET_NAME)
+    compactor = DayCompactor(bucket, workers=args.workers, max_rows_per_file=args.max_rows_per_file)
+
+    results = []
+    failed = False
+    for data_type in data_types:
+        if args.all_dates:
+            date_range = discover_date_range(bucket, data_type, args.region)
+            if date_range is None:
+                logger.info(f"No date partitions for {data_type}")
+                continue
+            days = iter_dates(*date_range)
+        else:
+            days = iter_dates(args.start_date, args.end_date or args.start_date)
+
+        for day in days:
+            try:
+                result = compactor.compact(data_type, day, args.region, force=args.force, dry_run=args.dry_run)
+            except Exception as e:
+                logger.error(f"Compaction failed for {data_type} {day}: {e}")
+                failed = True
+                continue
+
+            results.append({
+                "data_type": data_type,
+                "date": day,
+                "status": result["status"],
+                "source_files": result.get("source_file_count", result.get("source_files")),
+                "rows": result.get("rows"),
+                "files": len(result.get("files", [])),
+                "bytes": result.get("bytes"),
+            })
+            failed = failed or result["status"] == "partial"
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,54 +1,31 @@
-import os
-import logging
-from typing import Set
-from google.cloud import storage
-from supabase import create_client, Client
-from dotenv import load_dotenv
+"""
+모든 과거 트렌딩 비디오 데이터를 재가공합니다.
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+예전에는 blob.rewrite로 파일마다 Cloud Function을 다시 트리거했지만,
+이제는 backfill.py의 프로세스 풀 백필 실행기로 직접 처리합니다.
+(진행률/처리량 출력, 체크포인트로 이어서 처리 가능)
 
-# .env 로드
-load_dotenv()
+    python full_retrigger.py                # == python backfill.py --all-dates --data-types=video_categories,videos_list --reprocess
+    python full_retrigger.py --dry-run      # 추가 인자는 backfill.py로 전달
+"""
+import sys
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
-GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "plosind-youtube-raw-data")
+import backfill
 
-def full_retrigger_videos():
+
+def full_retrigger_videos(extra_args=None) -> int:
     """
-    모든 과거 트렌딩 비디오 데이터를 재가공 트리거합니다.
+    GCS에 있는 모든 날짜의 videos_list 파일을 다시 변환/적재합니다.
+    카테고리가 먼저 적재되어야 하므로 video_categories도 함께 처리합니다.
     """
-    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-        logger.error("SUPABASE_URL or SUPABASE_SERVICE_KEY is missing in .env")
-        return
-
-    # GCS 클라이언트 설정
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(GCS_BUCKET_NAME)
-
-    logger.info("Starting FULL RE-TRIGGER for all video lists...")
-    
-    # videos_list 디렉토리 하위의 모든 JSON 파일 리스트업
-    blobs = storage_client.list_blobs(GCS_BUCKET_NAME, prefix="raw/youtube/videos_list/")
-    
-    count = 0
-    for blob in blobs:
-        # JSON 파일만 트리거 (메타데이터 파일은 제외)
-        if blob.name.endswith(".json.gz") or (blob.name.endswith(".json") and "page_" in blob.name):
-            try:
-                # 자기 자신으로 rewrite하여 GCF 트리거 발생
-                # rewrite는 메타데이터를 보존하면서 이벤트를 발생시키는 가장 안전한 방법입니다.
-                blob.rewrite(blob)
-                count += 1
-                if count % 10 == 0:
-                    logger.info(f"Triggered {count} files...")
-            except Exception as e:
-                logger.error(f"Failed to trigger {blob.name}: {e}")
+    argv = [
+        "--all-dates",
+        "--data-types=video_categories,videos_list",
+        "--reprocess",
+        "--checkpoint=.full_retrigger_checkpoint.json",
+    ]
+    return backfill.main(argv + list(extra_args or []))
 
-    logger.info(f"Successfully re-triggered TOTAL {count} files.")
-    logger.info("The Cloud Function will now process these files in parallel. Check Supabase 'fact_video_snapshots' table in a few minutes.")
 
 if __name__ == "__main__":
-    full_retrigger_videos()
+    sys.exit(full_retrigger_videos(sys.argv[1:]))
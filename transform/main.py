@@ -3,14 +3,15 @@ Cloud Function entry point for GCS trigger
 Transforms raw YouTube data and loads to Supabase
 """
 import os
-import json
 import logging
 import functions_framework
-from google.cloud import storage
-from supabase import create_client
 
+from app.core.clients import get_bucket, get_supabase_client
 from app.core.utils import extract_metadata_from_path
-from app.core.database import is_file_processed, record_processed_file, get_category_map
+from app.core.database import PartialWriteError, is_file_processed, record_processed_file, get_category_map
+from app.core.retry_queue import RetryQueue
+from app.core.timing import log_timings, timing_scope
+from app.runs import RUN_DATA_TYPES, get_trigger_mode, is_run_marker, transform_run
 from app.transformers import get_transformer_for_path, transform_categories
 
 logging.basicConfig(level=logging.INFO)
@@ -45,7 +46,9 @@ def ensure_categories_processed(supabase_client, bucket, metadata: dict):
                 if not is_file_processed(supabase_client, cat_blob_path):
                     logger.info(f"Processing category file first: {cat_blob_path}")
                     cat_metadata = extract_metadata_from_path(cat_blob_path)
-                    result = transform_categories(supabase_client, bucket, cat_blob_path, cat_metadata)
+                    # 카테고리 파일의 단계 측정이 영상 파일 측정에 섞이지 않도록 별도 범위로 처리
+                    with timing_scope():
+                        result = transform_categories(supabase_client, bucket, cat_blob_path, cat_metadata)
                     record_processed_file(
                         supabase_client, cat_blob_path, "success", "video_categories",
                         records_count=result.get("records_count", 0),
@@ -62,73 +65,111 @@ def ensure_categories_processed(supabase_client, bucket, metadata: dict):
 def transform_handler(cloud_event):
     """
     Cloud Function triggered by GCS file upload
+
+    TRANSFORM_TRIGGER_MODE=page (default): every page file is transformed on upload, _metadata.json is skipped.
+    TRANSFORM_TRIGGER_MODE=run: page files of collector runs are skipped and the run's _metadata.json
+    transforms all pages of that run at once (see app/runs.py).
     """
     data = cloud_event.data
     bucket_name = data["bucket"]
     blob_path = data["name"]
+    run_mode = get_trigger_mode() == "run"
 
     logger.info(f"Processing file: gs://{bucket_name}/{blob_path}")
 
-    # Skip metadata files and non-json files
-    if blob_path.endswith("_metadata.json"):
-        logger.info(f"Skipping metadata file: {blob_path}")
-        return {"status": "skipped", "reason": "metadata file"}
+    if run_mode and is_run_marker(blob_path):
+        # The whole run directory is transformed by the marker
+        _, data_type = get_transformer_for_path(blob_path)
+        transformer_func = transform_run
+    else:
+        # Skip metadata files and non-json files
+        if blob_path.endswith("_metadata.json"):
+            logger.info(f"Skipping metadata file: {blob_path}")
+            return {"status": "skipped", "reason": "metadata file"}
+
+        if not (blob_path.endswith(".json") or blob_path.endswith(".json.gz")):
+            logger.info(f"Skipping non-json file: {blob_path}")
+            return {"status": "skipped", "reason": "not json"}
 
-    if not (blob_path.endswith(".json") or blob_path.endswith(".json.gz")):
-        logger.info(f"Skipping non-json file: {blob_path}")
-        return {"status": "skipped", "reason": "not json"}
+        # Get transformer
+        transformer_func, data_type = get_transformer_for_path(blob_path)
+        if not transformer_func:
+            logger.warning(f"No transformer found for path: {blob_path}")
+            return {"status": "skipped", "reason": "no transformer"}
 
-    # Get transformer
-    transformer_func, data_type = get_transformer_for_path(blob_path)
-    if not transformer_func:
-        logger.warning(f"No transformer found for path: {blob_path}")
-        return {"status": "skipped", "reason": "no transformer"}
+        if run_mode and data_type in RUN_DATA_TYPES:
+            logger.info(f"Run trigger mode, waiting for the run's _metadata.json: {blob_path}")
+            return {"status": "skipped", "reason": "run trigger mode"}
 
-    # Initialize clients
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_SERVICE_KEY")
-    gcp_project = os.environ.get("GCP_PROJECT_ID", "deproject-482905")
+    # Reuse clients across invocations on a warm instance
+    bucket = get_bucket(bucket_name)
+    supabase_client = get_supabase_client()
 
-    gcs_client = storage.Client(project=gcp_project)
-    bucket = gcs_client.bucket(bucket_name)
-    supabase_client = create_client(supabase_url, supabase_key)
+    # Per-stage timings are stored in processed_files.metadata["timings"] (see timing_report.py)
+    with timing_scope() as timer:
+        return _transform_file(supabase_client, bucket, blob_path, data, transformer_func, data_type, timer)
 
+
+def _transform_file(supabase_client, bucket, blob_path: str, data: dict, transformer_func, data_type: str, timer):
+    """
+    Check the ledger, transform and record the result of a single file.
+    """
     # Check if already processed
-    if is_file_processed(supabase_client, blob_path):
+    with timer.stage("ledger_check"):
+        already_processed = is_file_processed(supabase_client, blob_path)
+    if already_processed:
         logger.info(f"File already processed: {blob_path}")
         return {"status": "skipped", "reason": "already processed"}
 
     # Extract metadata from path
     metadata = extract_metadata_from_path(blob_path)
+    if transformer_func is transform_run:
+        # Lets timing_report.py keep run-level timings apart from per-page ones
+        metadata["trigger"] = "run"
+    if data.get("size"):
+        # Object size from the event decides whether large files are streamed
+        metadata["size"] = int(data["size"])
     logger.info(f"Extracted metadata: {metadata}")
 
     # Ensure categories are processed before videos (for category_name mapping)
     if data_type == "videos_list":
-        ensure_categories_processed(supabase_client, bucket, metadata)
+        with timer.stage("category_lookup"):
+            ensure_categories_processed(supabase_client, bucket, metadata)
 
     # Transform and load
     try:
         result = transformer_func(supabase_client, bucket, blob_path, metadata)
 
-        # Record success
-        record_processed_file(
-            supabase_client, blob_path, "success", data_type,
-            records_count=result.get("records_count", 0),
-            metadata=metadata
-        )
-
-        logger.info(f"Transform complete: {result}")
-        return {"status": "success", **result}
+        # Record success (ledger_write itself only shows up in the timing log)
+        metadata["timings"] = timer.to_dict()
+        with timer.stage("ledger_write"):
+            record_processed_file(
+                supabase_client, blob_path, "success", data_type,
+                records_count=result.get("records_count", 0),
+                metadata=metadata
+            )
+
+        log_timings(blob_path, data_type, "success", timer)
+        elapsed_ms = int(timer.total_ms)
+        logger.info(f"Transform complete in {elapsed_ms}ms: {result}")
+        return {"status": "success", "elapsed_ms": elapsed_ms, **result}
     except Exception as e:
-        # Record error
-        record_processed_file(
-            supabase_client, blob_path, "error", data_type,
-            error_message=str(e),
-            metadata=metadata
-        )
-
+        # Record error (partial writes keep the exact number of rows that landed)
+        metadata["timings"] = timer.to_dict()
+        with timer.stage("ledger_write"):
+            record_processed_file(
+                supabase_client, blob_path, "error", data_type,
+                records_count=e.written if isinstance(e, PartialWriteError) else 0,
+                error_message=str(e),
+                metadata=metadata
+            )
+
+        log_timings(blob_path, data_type, "error", timer)
         logger.error(f"Transform failed: {e}")
-        return {"status": "error", "error": str(e)}
+
+        # Hand the file to the retry worker (backoff for transient errors, dead-letter for poison)
+        retry_status = RetryQueue(supabase_client).enqueue_failure(blob_path, data_type, e)
+        return {"status": "error", "error": str(e), "retry": retry_status}
 
 
 # ============== Local Testing ==============
@@ -0,0 +1,73 @@
+"""
+Migration CLI - migrations/*.sql 중 아직 적용하지 않은 버전을 순서대로 적용합니다.
+
+DATABASE_URL(또는 --dsn)의 Postgres에 직접 연결합니다. (로컬 Postgres, Supabase 직접 연결 문자열)
+적용 기록은 schema_migrations 테이블에 남습니다.
+
+Examples:
+    python migrate.py --status
+    python migrate.py
+    python migrate.py --target=8
+"""
+import os
+import sys
+import argparse
+import logging
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from app.migrations import applied_versions, list_migrations, migrate
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Apply schema migrations")
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL"), help="Postgres 연결 문자열 (기본: DATABASE_URL)")
+    parser.add_argument("--target", type=int, help="이 버전까지만 적용")
+    parser.add_argument("--status", action="store_true", help="버전별 적용 여부만 출력")
+    parser.add_argument("--dry-run", action="store_true", help="적용할 파일 목록만 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 함수"""
+    args = parse_args(argv)
+
+    if not args.dsn:
+        logger.error("DATABASE_URL (or --dsn) is required")
+        return 1
+
+    import psycopg
+
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        if args.status:
+            applied = applied_versions(conn)
+            for migration in list_migrations():
+                state = "applied" if migration.version in applied else "pending"
+                if migration.version in applied and applied[migration.version] != migration.checksum:
+                    state = "applied (changed)"
+                print(f"{migration.version:04d}  {migration.name:<40}{state}")
+            return 0
+
+        migrations = migrate(conn, target=args.target, dry_run=args.dry_run)
+
+    if not migrations:
+        logger.info("Schema is up to date")
+    elif args.dry_run:
+        for migration in migrations:
+            print(migration.path.name)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+-- =========================================
+-- 0001. 기본 스키마 (dim / fact / processed_files)
+-- 운영 Supabase에 이미 있는 테이블을 로컬 Postgres에서도 재현하기 위한 정의입니다.
+-- 모든 구문은 IF NOT EXISTS 이므로 운영 DB에 다시 실행해도 안전합니다.
+-- =========================================
+
+-- 1. 카테고리 (videoCategories.list)
+CREATE TABLE IF NOT EXISTS dim_categories (
+    category_id INTEGER PRIMARY KEY,
+    category_name TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 2. 채널 최신 상태 (channels.list)
+CREATE TABLE IF NOT EXISTS dim_channels (
+    channel_id TEXT PRIMARY KEY,
+    channel_name TEXT,
+    description TEXT,
+    custom_url TEXT,
+    channel_created_at TIMESTAMPTZ,
+    country TEXT,
+    subscriber_count BIGINT DEFAULT 0,
+    total_view_count BIGINT DEFAULT 0,
+    video_count INTEGER DEFAULT 0,
+    thumbnail_url TEXT,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 3. 트렌딩 영상 스냅샷 (videos.list, 시간별)
+CREATE TABLE IF NOT EXISTS fact_video_snapshots (
+    id BIGSERIAL PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    title TEXT,
+    channel_id TEXT,
+    channel_name TEXT,
+    category_id INTEGER,
+    category_name TEXT,
+    published_at TIMESTAMPTZ,
+    tags TEXT[] DEFAULT '{}',
+    duration_sec INTEGER DEFAULT 0,
+    is_shorts BOOLEAN DEFAULT FALSE,
+    view_count BIGINT DEFAULT 0,
+    like_count BIGINT DEFAULT 0,
+    comment_count BIGINT DEFAULT 0,
+    trending_rank INTEGER,
+    snapshot_at TIMESTAMPTZ NOT NULL,
+    hours_since_published INTEGER,
+    engagement_rate DOUBLE PRECISION,
+    view_velocity DOUBLE PRECISION,
+    thumbnail_url TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 4. 댓글 (commentThreads.list, 시간별)
+CREATE TABLE IF NOT EXISTS fact_comments (
+    id BIGSERIAL PRIMARY KEY,
+    comment_id TEXT NOT NULL,
+    video_id TEXT,
+    author_name TEXT,
+    author_channel_id TEXT,
+    text_display TEXT,
+    text_length INTEGER DEFAULT 0,
+    like_count INTEGER DEFAULT 0,
+    reply_count INTEGER DEFAULT 0,
+    published_at TIMESTAMPTZ,
+    collected_at TIMESTAMPTZ NOT NULL,
+    is_channel_owner BOOLEAN DEFAULT FALSE
+);
+
+-- 5. 변환 처리 기록 (transform_handler / 배치 실행기)
+CREATE TABLE IF NOT EXISTS processed_files (
+    id BIGSERIAL PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    data_type TEXT,
+    records_count INTEGER DEFAULT 0,
+    error_message TEXT,
+    metadata JSONB,
+    processed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS processed_files_file_path_idx
+ON processed_files (file_path text_pattern_ops);
@@ -0,0 +1,15 @@
+-- =========================================
+-- 0002. fact 테이블 자연키 (재처리 멱등성)
+-- transform은 아래 키로 UPSERT 합니다.
+--   fact_video_snapshots: (video_id, snapshot_at)
+--   fact_comments:        (comment_id, collected_at)  -- collected_at = 파티션 hour
+--
+-- 기존 DB에 중복 행이 있으면 인덱스 생성이 실패하므로
+-- 먼저 `python compact_facts.py`로 중복을 정리합니다. (정리 후 같은 인덱스를 생성함)
+-- =========================================
+
+CREATE UNIQUE INDEX IF NOT EXISTS fact_video_snapshots_natural_key
+ON fact_video_snapshots (video_id, snapshot_at);
+
+CREATE UNIQUE INDEX IF NOT EXISTS fact_comments_natural_key
+ON fact_comments (comment_id, collected_at);
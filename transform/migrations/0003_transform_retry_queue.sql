@@ -0,0 +1,64 @@
+-- =========================================
+-- 0003. 변환 실패 재시도 큐
+-- transform_handler가 실패한 파일을 등록하고, retry_worker.py가 백오프 후 다시 처리합니다.
+--   pending  : next_attempt_at 이후 재시도 대기
+--   running  : 작업자가 가져감 (locked_until까지 임대, 만료되면 다시 가져갈 수 있음)
+--   succeeded: 재시도 성공
+--   dead     : 영구 오류(poison) 또는 max_attempts 초과 → 수동 확인
+-- =========================================
+
+CREATE TABLE IF NOT EXISTS transform_retry_queue (
+    file_path TEXT PRIMARY KEY,
+    data_type TEXT,
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'running', 'succeeded', 'dead')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 6,
+    error_class TEXT,
+    last_error TEXT,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_until TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS transform_retry_queue_due_idx
+ON transform_retry_queue (next_attempt_at)
+WHERE status IN ('pending', 'running');
+
+
+-- 재시도할 항목을 가져갑니다. (여러 작업자가 동시에 호출해도 같은 항목을 중복으로 가져가지 않음)
+-- 가져가는 시점에 attempts를 올리므로, 작업자가 중간에 죽어도 시도 횟수는 누적됩니다.
+CREATE OR REPLACE FUNCTION claim_transform_retries(batch_size INTEGER DEFAULT 20, lease_seconds INTEGER DEFAULT 300)
+RETURNS SETOF transform_retry_queue
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- 임대가 만료됐는데 더 시도할 수 없는 항목은 dead로 전환
+    UPDATE transform_retry_queue
+    SET status = 'dead',
+        locked_until = NULL,
+        last_error = COALESCE(last_error, '') || ' (lease expired after final attempt)',
+        updated_at = NOW()
+    WHERE status = 'running'
+      AND locked_until < NOW()
+      AND attempts >= max_attempts;
+
+    RETURN QUERY
+    UPDATE transform_retry_queue q
+    SET status = 'running',
+        attempts = q.attempts + 1,
+        locked_until = NOW() + make_interval(secs => lease_seconds),
+        updated_at = NOW()
+    WHERE q.file_path IN (
+        SELECT file_path
+        FROM transform_retry_queue
+        WHERE (status = 'pending' AND next_attempt_at <= NOW())
+           OR (status = 'running' AND locked_until < NOW())
+        ORDER BY next_attempt_at
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING q.*;
+END;
+$$;
@@ -0,0 +1,160 @@
+-- =========================================
+-- 0004. 영상 스냅샷 집계(rollup) 테이블
+-- transform이 fact_video_snapshots를 적재할 때마다 해당 스냅샷/날짜의 집계만 다시 계산합니다.
+-- 대시보드는 fact 테이블 대신 아래 테이블의 수백 행만 읽습니다.
+--   agg_category_snapshots: 스냅샷 × 카테고리   (카테고리 통계/분포)
+--   agg_hourly_totals     : 스냅샷(hour)별 합계/평균 (오버뷰, 시간별 트렌드)
+--   agg_channel_daily     : 날짜(UTC) × 채널     (채널별 트렌딩 횟수/최고 순위)
+--
+-- 기존 데이터는 한 번 채워 넣습니다:
+--   SELECT rebuild_video_rollups('-infinity', 'infinity');
+-- =========================================
+
+-- 집계 재계산 시 스냅샷 단위 조회용 (자연키 인덱스는 video_id가 앞이라 사용할 수 없음)
+CREATE INDEX IF NOT EXISTS fact_video_snapshots_snapshot_at_idx
+ON fact_video_snapshots (snapshot_at);
+
+CREATE TABLE IF NOT EXISTS agg_category_snapshots (
+    snapshot_at TIMESTAMPTZ NOT NULL,
+    category_name TEXT NOT NULL,
+    video_count INTEGER NOT NULL,
+    total_views BIGINT NOT NULL,
+    total_likes BIGINT NOT NULL,
+    total_comments BIGINT NOT NULL,
+    avg_view_count BIGINT NOT NULL,
+    avg_engagement_rate DOUBLE PRECISION NOT NULL,
+    shorts_count INTEGER NOT NULL,
+    shorts_ratio DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (snapshot_at, category_name)
+);
+
+CREATE TABLE IF NOT EXISTS agg_hourly_totals (
+    snapshot_at TIMESTAMPTZ PRIMARY KEY,
+    video_count INTEGER NOT NULL,
+    total_views BIGINT NOT NULL,
+    total_likes BIGINT NOT NULL,
+    total_comments BIGINT NOT NULL,
+    avg_views BIGINT NOT NULL,
+    avg_likes BIGINT NOT NULL,
+    avg_engagement_rate DOUBLE PRECISION NOT NULL,  -- 참여율이 0/NULL인 영상 제외
+    shorts_count INTEGER NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS agg_channel_daily (
+    day DATE NOT NULL,
+    channel_id TEXT NOT NULL,
+    channel_name TEXT,
+    snapshot_count INTEGER NOT NULL,  -- 그날 트렌딩에 등장한 (영상, 스냅샷) 수
+    video_count INTEGER NOT NULL,     -- 그날 트렌딩에 오른 고유 영상 수
+    best_rank INTEGER,
+    max_view_count BIGINT NOT NULL,
+    avg_view_count BIGINT NOT NULL,
+    avg_engagement_rate DOUBLE PRECISION NOT NULL,
+    first_seen_at TIMESTAMPTZ NOT NULL,
+    last_seen_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (day, channel_id)
+);
+
+
+-- 주어진 스냅샷의 집계와 그 스냅샷이 속한 날짜의 채널 집계를 다시 계산합니다.
+-- 다시 계산하는 방식이므로 같은 파일을 재처리해도 결과가 같습니다.
+CREATE OR REPLACE FUNCTION refresh_video_rollups(snapshot_times TIMESTAMPTZ[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    touched_days DATE[];
+BEGIN
+    IF snapshot_times IS NULL OR cardinality(snapshot_times) = 0 THEN
+        RETURN 0;
+    END IF;
+
+    -- 동시에 적재되는 파일끼리 DELETE → INSERT가 겹치지 않도록 직렬화 (스냅샷당 수십 행이라 짧음)
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_video_rollups'));
+
+    DELETE FROM agg_category_snapshots WHERE snapshot_at = ANY(snapshot_times);
+    INSERT INTO agg_category_snapshots (
+        snapshot_at, category_name, video_count, total_views, total_likes, total_comments,
+        avg_view_count, avg_engagement_rate, shorts_count, shorts_ratio
+    )
+    SELECT
+        snapshot_at,
+        COALESCE(NULLIF(category_name, ''), '기타'),
+        count(*),
+        COALESCE(sum(view_count), 0),
+        COALESCE(sum(like_count), 0),
+        COALESCE(sum(comment_count), 0),
+        COALESCE(sum(view_count), 0) / count(*),
+        COALESCE(sum(engagement_rate), 0) / count(*),
+        count(*) FILTER (WHERE is_shorts),
+        count(*) FILTER (WHERE is_shorts) * 100.0 / count(*)
+    FROM fact_video_snapshots
+    WHERE snapshot_at = ANY(snapshot_times)
+    GROUP BY 1, 2;
+
+    DELETE FROM agg_hourly_totals WHERE snapshot_at = ANY(snapshot_times);
+    INSERT INTO agg_hourly_totals (
+        snapshot_at, video_count, total_views, total_likes, total_comments,
+        avg_views, avg_likes, avg_engagement_rate, shorts_count
+    )
+    SELECT
+        snapshot_at,
+        count(*),
+        COALESCE(sum(view_count), 0),
+        COALESCE(sum(like_count), 0),
+        COALESCE(sum(comment_count), 0),
+        COALESCE(sum(view_count), 0) / count(*),
+        COALESCE(sum(like_count), 0) / count(*),
+        COALESCE(avg(engagement_rate) FILTER (WHERE engagement_rate > 0), 0),
+        count(*) FILTER (WHERE is_shorts)
+    FROM fact_video_snapshots
+    WHERE snapshot_at = ANY(snapshot_times)
+    GROUP BY 1;
+
+    touched_days := ARRAY(
+        SELECT DISTINCT (t AT TIME ZONE 'UTC')::DATE FROM unnest(snapshot_times) AS t
+    );
+
+    DELETE FROM agg_channel_daily WHERE day = ANY(touched_days);
+    INSERT INTO agg_channel_daily (
+        day, channel_id, channel_name, snapshot_count, video_count, best_rank,
+        max_view_count, avg_view_count, avg_engagement_rate, first_seen_at, last_seen_at
+    )
+    SELECT
+        d.day,
+        f.channel_id,
+        max(f.channel_name),
+        count(*),
+        count(DISTINCT f.video_id),
+        min(f.trending_rank),
+        COALESCE(max(f.view_count), 0),
+        COALESCE(sum(f.view_count), 0) / count(*),
+        COALESCE(avg(f.engagement_rate), 0),
+        min(f.snapshot_at),
+        max(f.snapshot_at)
+    FROM unnest(touched_days) AS d(day)
+    JOIN fact_video_snapshots f
+      ON f.snapshot_at >= d.day::TIMESTAMP AT TIME ZONE 'UTC'
+     AND f.snapshot_at < (d.day + 1)::TIMESTAMP AT TIME ZONE 'UTC'
+    WHERE f.channel_id IS NOT NULL
+    GROUP BY 1, 2;
+
+    RETURN cardinality(snapshot_times);
+END;
+$$;
+
+
+-- 기간 안의 모든 스냅샷 집계를 다시 계산합니다. (최초 적재, 수동 보정용)
+CREATE OR REPLACE FUNCTION rebuild_video_rollups(start_at TIMESTAMPTZ, end_at TIMESTAMPTZ)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    SELECT refresh_video_rollups(ARRAY(
+        SELECT DISTINCT snapshot_at
+        FROM fact_video_snapshots
+        WHERE snapshot_at >= start_at AND snapshot_at < end_at
+    ));
+$$;
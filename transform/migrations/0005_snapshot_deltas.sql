@@ -0,0 +1,80 @@
+-- =========================================
+-- 0005. 스냅샷 간 변화량 (직전 스냅샷 대비)
+-- transform이 적재 시 같은 영상의 직전 스냅샷을 찾아 아래 열을 채웁니다.
+--   prev_rank          : 직전 스냅샷의 trending_rank (첫 등장이면 NULL)
+--   rank_change        : prev_rank - trending_rank (양수 = 순위 상승)
+--   view_delta         : view_count - 직전 view_count
+--   minutes_since_prev : 직전 스냅샷과의 간격 (분)
+--
+-- 직전 스냅샷보다 먼저 적재된 행(백필 순서가 뒤바뀐 경우)은 아래 함수로 다시 계산합니다:
+--   SELECT rebuild_snapshot_deltas('2026-01-01', '2026-02-01');
+-- =========================================
+
+ALTER TABLE fact_video_snapshots ADD COLUMN IF NOT EXISTS prev_rank INTEGER;
+ALTER TABLE fact_video_snapshots ADD COLUMN IF NOT EXISTS rank_change INTEGER;
+ALTER TABLE fact_video_snapshots ADD COLUMN IF NOT EXISTS view_delta BIGINT;
+ALTER TABLE fact_video_snapshots ADD COLUMN IF NOT EXISTS minutes_since_prev INTEGER;
+
+-- 순위 변동 조회용 (스냅샷 안에서 상승/하락/신규 진입 필터)
+CREATE INDEX IF NOT EXISTS fact_video_snapshots_rank_change_idx
+ON fact_video_snapshots (snapshot_at, rank_change);
+
+
+-- 영상별 before 이전의 가장 최근 스냅샷 (자연키 인덱스 (video_id, snapshot_at)를 역방향으로 한 번씩 탐색)
+CREATE OR REPLACE FUNCTION previous_video_snapshots(video_ids TEXT[], before TIMESTAMPTZ)
+RETURNS TABLE (video_id TEXT, snapshot_at TIMESTAMPTZ, trending_rank INTEGER, view_count BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT p.video_id, p.snapshot_at, p.trending_rank, p.view_count
+    FROM unnest(video_ids) AS v(id)
+    CROSS JOIN LATERAL (
+        SELECT f.video_id, f.snapshot_at, f.trending_rank, f.view_count
+        FROM fact_video_snapshots f
+        WHERE f.video_id = v.id AND f.snapshot_at < before
+        ORDER BY f.snapshot_at DESC
+        LIMIT 1
+    ) p;
+$$;
+
+
+-- 기간 안의 행에 대해 변화량을 다시 계산합니다. (직전 스냅샷은 기간 밖이어도 찾음)
+CREATE OR REPLACE FUNCTION rebuild_snapshot_deltas(start_at TIMESTAMPTZ, end_at TIMESTAMPTZ)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    WITH ordered AS (
+        SELECT
+            id,
+            trending_rank,
+            view_count,
+            snapshot_at,
+            lag(trending_rank) OVER w AS p_rank,
+            lag(view_count) OVER w AS p_views,
+            lag(snapshot_at) OVER w AS p_at
+        FROM fact_video_snapshots
+        WHERE video_id IN (
+            SELECT DISTINCT video_id FROM fact_video_snapshots
+            WHERE snapshot_at >= start_at AND snapshot_at < end_at
+        )
+        WINDOW w AS (PARTITION BY video_id ORDER BY snapshot_at)
+    )
+    UPDATE fact_video_snapshots f
+    SET prev_rank = o.p_rank,
+        rank_change = o.p_rank - o.trending_rank,
+        view_delta = o.view_count - o.p_views,
+        minutes_since_prev = (EXTRACT(EPOCH FROM o.snapshot_at - o.p_at) / 60)::INTEGER
+    FROM ordered o
+    WHERE f.id = o.id
+      AND o.snapshot_at >= start_at AND o.snapshot_at < end_at
+      AND (f.prev_rank IS DISTINCT FROM o.p_rank
+           OR f.view_delta IS DISTINCT FROM o.view_count - o.p_views
+           OR f.minutes_since_prev IS DISTINCT FROM (EXTRACT(EPOCH FROM o.snapshot_at - o.p_at) / 60)::INTEGER);
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
@@ -0,0 +1,133 @@
+-- =========================================
+-- 0006. 채널 통계 이력 (변경분만 저장)
+-- dim_channels는 최신 상태만 유지하고, 통계 이력은 fact_channel_stats에 구간(run) 단위로 쌓습니다.
+--   - 값(구독자/총 조회수/영상 수)이 직전 구간과 같으면 새 행 없이 last_seen_at만 늘림 (run-length)
+--   - 값이 바뀌면 새 구간을 추가하고 직전 구간 대비 증감(*_delta)을 함께 저장 (delta)
+-- 특정 시점의 값 = collected_at <= 시점인 가장 최근 구간, 기간 성장 = 구간 delta의 합
+-- =========================================
+
+CREATE TABLE IF NOT EXISTS fact_channel_stats (
+    channel_id TEXT NOT NULL,
+    collected_at TIMESTAMPTZ NOT NULL,   -- 구간 시작 (이 값이 처음 관측된 수집 시각)
+    last_seen_at TIMESTAMPTZ NOT NULL,   -- 같은 값이 마지막으로 관측된 수집 시각
+    observations INTEGER NOT NULL DEFAULT 1,
+    subscriber_count BIGINT,
+    total_view_count BIGINT,
+    video_count INTEGER,
+    subscriber_delta BIGINT,             -- 직전 구간 대비 (첫 구간이면 NULL)
+    view_delta BIGINT,
+    video_delta INTEGER,
+    PRIMARY KEY (channel_id, collected_at)
+);
+
+CREATE INDEX IF NOT EXISTS fact_channel_stats_collected_at_idx
+ON fact_channel_stats (collected_at);
+
+
+-- 채널 통계 관측값을 이력에 반영합니다. (같은 파일을 다시 처리해도 결과가 같음)
+-- stats: [{"channel_id", "collected_at", "subscriber_count", "total_view_count", "video_count"}, ...]
+-- 반환값: 새로 추가되거나 값이 바뀐 구간 수
+CREATE OR REPLACE FUNCTION record_channel_stats(stats JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    s RECORD;
+    prev fact_channel_stats%ROWTYPE;
+    before_prev fact_channel_stats%ROWTYPE;
+    nxt fact_channel_stats%ROWTYPE;
+    changed INTEGER := 0;
+BEGIN
+    -- 같은 채널을 동시에 갱신하지 않도록 직렬화 (채널 파일은 하루 몇 개뿐)
+    PERFORM pg_advisory_xact_lock(hashtext('record_channel_stats'));
+
+    FOR s IN
+        SELECT *
+        FROM jsonb_to_recordset(stats) AS x(
+            channel_id TEXT, collected_at TIMESTAMPTZ,
+            subscriber_count BIGINT, total_view_count BIGINT, video_count INTEGER
+        )
+        WHERE channel_id IS NOT NULL AND collected_at IS NOT NULL
+        ORDER BY channel_id, collected_at
+    LOOP
+        SELECT * INTO prev
+        FROM fact_channel_stats
+        WHERE channel_id = s.channel_id AND collected_at <= s.collected_at
+        ORDER BY collected_at DESC
+        LIMIT 1;
+
+        IF FOUND
+           AND prev.subscriber_count IS NOT DISTINCT FROM s.subscriber_count
+           AND prev.total_view_count IS NOT DISTINCT FROM s.total_view_count
+           AND prev.video_count IS NOT DISTINCT FROM s.video_count THEN
+            -- 값이 같음: 구간 연장 (이미 포함된 시각이면 변경 없음)
+            IF s.collected_at > prev.last_seen_at THEN
+                UPDATE fact_channel_stats
+                SET last_seen_at = s.collected_at, observations = observations + 1
+                WHERE channel_id = prev.channel_id AND collected_at = prev.collected_at;
+            END IF;
+            CONTINUE;
+        END IF;
+
+        IF FOUND AND prev.collected_at = s.collected_at THEN
+            -- 같은 시각을 다른 값으로 다시 적재: 값과 delta를 교체
+            SELECT * INTO before_prev
+            FROM fact_channel_stats
+            WHERE channel_id = s.channel_id AND collected_at < s.collected_at
+            ORDER BY collected_at DESC
+            LIMIT 1;
+
+            UPDATE fact_channel_stats
+            SET subscriber_count = s.subscriber_count,
+                total_view_count = s.total_view_count,
+                video_count = s.video_count,
+                subscriber_delta = s.subscriber_count - before_prev.subscriber_count,
+                view_delta = s.total_view_count - before_prev.total_view_count,
+                video_delta = s.video_count - before_prev.video_count
+            WHERE channel_id = prev.channel_id AND collected_at = prev.collected_at;
+        ELSE
+            INSERT INTO fact_channel_stats (
+                channel_id, collected_at, last_seen_at, subscriber_count, total_view_count, video_count,
+                subscriber_delta, view_delta, video_delta
+            )
+            VALUES (
+                s.channel_id, s.collected_at, s.collected_at, s.subscriber_count, s.total_view_count, s.video_count,
+                s.subscriber_count - prev.subscriber_count,
+                s.total_view_count - prev.total_view_count,
+                s.video_count - prev.video_count
+            );
+        END IF;
+
+        -- 뒤에 이미 적재된 구간이 있으면 (백필 순서가 뒤바뀐 경우) 값이 같으면 합치고, 다르면 delta를 다시 계산
+        SELECT * INTO nxt
+        FROM fact_channel_stats
+        WHERE channel_id = s.channel_id AND collected_at > s.collected_at
+        ORDER BY collected_at
+        LIMIT 1;
+
+        IF FOUND THEN
+            IF nxt.subscriber_count IS NOT DISTINCT FROM s.subscriber_count
+               AND nxt.total_view_count IS NOT DISTINCT FROM s.total_view_count
+               AND nxt.video_count IS NOT DISTINCT FROM s.video_count THEN
+                DELETE FROM fact_channel_stats
+                WHERE channel_id = nxt.channel_id AND collected_at = nxt.collected_at;
+
+                UPDATE fact_channel_stats
+                SET last_seen_at = GREATEST(last_seen_at, nxt.last_seen_at),
+                    observations = observations + nxt.observations
+                WHERE channel_id = s.channel_id AND collected_at = s.collected_at;
+            ELSE
+                UPDATE fact_channel_stats
+                SET subscriber_delta = nxt.subscriber_count - s.subscriber_count,
+                    view_delta = nxt.total_view_count - s.total_view_count,
+                    video_delta = nxt.video_count - s.video_count
+                WHERE channel_id = nxt.channel_id AND collected_at = nxt.collected_at;
+            END IF;
+        END IF;
+
+        changed := changed + 1;
+    END LOOP;
+
+    RETURN changed;
+END;
+$$;
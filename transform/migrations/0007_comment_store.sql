@@ -0,0 +1,153 @@
+-- =========================================
+-- 0007. 댓글 저장소 (comment_id당 1행)
+-- 같은 인기 댓글이 매시간 수집되어 fact_comments가 수집 횟수만큼 커지던 구조를 대체합니다.
+--   dim_comments       : comment_id당 1행, first_seen_at / last_seen_at, 최신 좋아요/답글 수
+--   fact_comment_counts: 좋아요/답글 수가 바뀐 관측만 저장하는 이력 (선택, COMMENT_COUNT_HISTORY)
+--
+-- transform은 merge_comments RPC로 시간별 관측을 한 번에 병합합니다.
+-- 기존 fact_comments 데이터는 기간을 나눠 옮깁니다 (하루씩 권장):
+--   SELECT merge_comments(jsonb_agg(to_jsonb(f)))
+--   FROM fact_comments f WHERE collected_at >= '2026-01-12' AND collected_at < '2026-01-13';
+-- =========================================
+
+CREATE TABLE IF NOT EXISTS dim_comments (
+    comment_id TEXT PRIMARY KEY,
+    video_id TEXT,
+    author_name TEXT,
+    author_channel_id TEXT,
+    text_display TEXT,
+    text_length INTEGER DEFAULT 0,
+    published_at TIMESTAMPTZ,
+    is_channel_owner BOOLEAN DEFAULT FALSE,
+    like_count INTEGER DEFAULT 0,    -- last_seen_at 시점의 값
+    reply_count INTEGER DEFAULT 0,
+    first_seen_at TIMESTAMPTZ NOT NULL,
+    last_seen_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS dim_comments_video_id_idx
+ON dim_comments (video_id, like_count DESC);
+
+CREATE INDEX IF NOT EXISTS dim_comments_last_seen_at_idx
+ON dim_comments (last_seen_at);
+
+CREATE TABLE IF NOT EXISTS fact_comment_counts (
+    comment_id TEXT NOT NULL,
+    collected_at TIMESTAMPTZ NOT NULL,
+    like_count INTEGER,
+    reply_count INTEGER,
+    PRIMARY KEY (comment_id, collected_at)
+);
+
+
+-- 시간별 댓글 관측(JSON 배열) → 행 (build_comment_records 형식, 모르는 키는 무시)
+CREATE OR REPLACE FUNCTION comment_observations(comments JSONB)
+RETURNS TABLE (
+    comment_id TEXT, video_id TEXT, author_name TEXT, author_channel_id TEXT,
+    text_display TEXT, text_length INTEGER, like_count INTEGER, reply_count INTEGER,
+    published_at TIMESTAMPTZ, collected_at TIMESTAMPTZ, is_channel_owner BOOLEAN
+)
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT DISTINCT ON (x.comment_id, x.collected_at) x.*
+    FROM jsonb_to_recordset(comments) AS x(
+        comment_id TEXT, video_id TEXT, author_name TEXT, author_channel_id TEXT,
+        text_display TEXT, text_length INTEGER, like_count INTEGER, reply_count INTEGER,
+        published_at TIMESTAMPTZ, collected_at TIMESTAMPTZ, is_channel_owner BOOLEAN
+    )
+    WHERE x.comment_id IS NOT NULL AND x.collected_at IS NOT NULL
+    ORDER BY x.comment_id, x.collected_at;
+$$;
+
+
+-- 관측을 dim_comments에 병합합니다. (같은 파일을 다시 처리해도 결과가 같음)
+-- 반환값: 병합된 고유 comment_id 수
+CREATE OR REPLACE FUNCTION merge_comments(comments JSONB, keep_history BOOLEAN DEFAULT TRUE)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    merged INTEGER;
+BEGIN
+    -- 좋아요/답글 수가 직전 값과 다른 관측만 이력에 추가
+    -- 배치의 첫 관측은 그 시각 이전의 마지막 이력 행과, 나머지는 배치 안의 직전 관측과 비교합니다.
+    IF keep_history THEN
+        INSERT INTO fact_comment_counts (comment_id, collected_at, like_count, reply_count)
+        SELECT t.comment_id, t.collected_at, t.like_count, t.reply_count
+        FROM (
+            SELECT
+                o.comment_id, o.collected_at, o.like_count, o.reply_count,
+                row_number() OVER w AS rn,
+                lag(o.like_count) OVER w AS prev_like,
+                lag(o.reply_count) OVER w AS prev_reply
+            FROM comment_observations(comments) o
+            WINDOW w AS (PARTITION BY o.comment_id ORDER BY o.collected_at)
+        ) t
+        LEFT JOIN LATERAL (
+            SELECT TRUE AS found, h.like_count, h.reply_count
+            FROM fact_comment_counts h
+            WHERE h.comment_id = t.comment_id AND h.collected_at < t.collected_at
+            ORDER BY h.collected_at DESC
+            LIMIT 1
+        ) stored ON t.rn = 1
+        WHERE CASE
+            WHEN t.rn = 1 THEN stored.found IS NULL
+                OR t.like_count IS DISTINCT FROM stored.like_count
+                OR t.reply_count IS DISTINCT FROM stored.reply_count
+            ELSE t.like_count IS DISTINCT FROM t.prev_like
+                OR t.reply_count IS DISTINCT FROM t.prev_reply
+        END
+        ON CONFLICT (comment_id, collected_at) DO NOTHING;
+
+        -- 과거 시각이 나중에 적재되면 뒤 이력 행이 직전 값과 같아질 수 있으므로 정리
+        DELETE FROM fact_comment_counts h
+        USING (
+            SELECT
+                c.comment_id, c.collected_at,
+                lag(c.collected_at) OVER w IS NOT NULL
+                    AND c.like_count IS NOT DISTINCT FROM lag(c.like_count) OVER w
+                    AND c.reply_count IS NOT DISTINCT FROM lag(c.reply_count) OVER w AS redundant
+            FROM fact_comment_counts c
+            WHERE c.comment_id IN (SELECT o.comment_id FROM comment_observations(comments) o)
+            WINDOW w AS (PARTITION BY c.comment_id ORDER BY c.collected_at)
+        ) r
+        WHERE r.redundant AND h.comment_id = r.comment_id AND h.collected_at = r.collected_at;
+    END IF;
+
+    INSERT INTO dim_comments (
+        comment_id, video_id, author_name, author_channel_id, text_display, text_length,
+        published_at, is_channel_owner, like_count, reply_count, first_seen_at, last_seen_at
+    )
+    SELECT
+        l.comment_id, l.video_id, l.author_name, l.author_channel_id, l.text_display, l.text_length,
+        l.published_at, l.is_channel_owner, l.like_count, l.reply_count, s.first_seen_at, s.last_seen_at
+    FROM (
+        SELECT DISTINCT ON (o.comment_id) o.*
+        FROM comment_observations(comments) o
+        ORDER BY o.comment_id, o.collected_at DESC
+    ) l
+    JOIN (
+        SELECT o.comment_id, min(o.collected_at) AS first_seen_at, max(o.collected_at) AS last_seen_at
+        FROM comment_observations(comments) o
+        GROUP BY o.comment_id
+    ) s ON s.comment_id = l.comment_id
+    ON CONFLICT (comment_id) DO UPDATE SET
+        first_seen_at = LEAST(dim_comments.first_seen_at, EXCLUDED.first_seen_at),
+        last_seen_at = GREATEST(dim_comments.last_seen_at, EXCLUDED.last_seen_at),
+        -- 최신 값은 더 최근 관측일 때만 교체 (과거 파일 재처리가 최신 값을 덮지 않도록)
+        like_count = CASE WHEN EXCLUDED.last_seen_at >= dim_comments.last_seen_at
+                          THEN EXCLUDED.like_count ELSE dim_comments.like_count END,
+        reply_count = CASE WHEN EXCLUDED.last_seen_at >= dim_comments.last_seen_at
+                           THEN EXCLUDED.reply_count ELSE dim_comments.reply_count END,
+        text_display = CASE WHEN EXCLUDED.last_seen_at >= dim_comments.last_seen_at
+                            THEN EXCLUDED.text_display ELSE dim_comments.text_display END,
+        text_length = CASE WHEN EXCLUDED.last_seen_at >= dim_comments.last_seen_at
+                           THEN EXCLUDED.text_length ELSE dim_comments.text_length END,
+        author_name = CASE WHEN EXCLUDED.last_seen_at >= dim_comments.last_seen_at
+                           THEN EXCLUDED.author_name ELSE dim_comments.author_name END;
+
+    GET DIAGNOSTICS merged = ROW_COUNT;
+    RETURN merged;
+END;
+$$;
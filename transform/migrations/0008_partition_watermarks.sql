@@ -0,0 +1,17 @@
+-- =========================================
+-- 0008. 파티션 watermark
+-- 데이터 타입/리전별로 모든 파일이 처리된 가장 최근 date/hour 파티션과 그 이전의 미완료 파티션을 저장합니다.
+--   watermark: 파티션 시작 시각 (video_categories, channels는 날짜 00:00 UTC)
+--   holes    : watermark 이전인데 누락/실패 파일이 남아 있는 파티션
+-- reconcile.py / run_batch.py --since-watermark가 holes + watermark 이후 파티션만 나열하고 결과로 갱신합니다.
+-- channels는 region 파티션이 없으므로 region = ''
+-- =========================================
+
+CREATE TABLE IF NOT EXISTS transform_watermarks (
+    data_type TEXT NOT NULL,
+    region TEXT NOT NULL DEFAULT '',
+    watermark TIMESTAMPTZ,
+    holes TIMESTAMPTZ[] NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (data_type, region)
+);
@@ -0,0 +1,165 @@
+-- =========================================
+-- 0009. fact_video_snapshots 월 단위 range 파티션 + 조회 경로 인덱스
+-- 스냅샷은 snapshot_at(UTC 월) 파티션에 저장됩니다. (fact_video_snapshots_pYYYY_MM, 범위 밖은 _default)
+--   - 기간 조회/집계 재계산은 해당 월 파티션만 읽음 (partition pruning)
+--   - 보관 기간이 지난 월은 DELETE 대신 파티션 단위로 정리 가능
+-- 파티션 키가 기본키에 포함되어야 하므로 기본키는 (id, snapshot_at)입니다. 자연키 UPSERT는 그대로 동작합니다.
+--
+-- 기존(일반 테이블) DB에서는 한 트랜잭션 안에서 새 파티션 테이블로 행을 옮기고 교체합니다.
+-- fact_video_snapshots를 참조하는 view(ai_* 등)는 정의를 보관했다가 다시 만듭니다.
+-- (권한은 스키마 기본 권한을 따르므로 별도로 부여한 GRANT/RLS 정책이 있다면 다시 적용해야 합니다)
+--
+-- 다음 달 파티션은 미리 만들어 둡니다 (월 1회, 없으면 _default 파티션에 저장됨):
+--   SELECT create_snapshot_partitions(now(), now() + interval '1 month');
+-- =========================================
+
+-- [start_at, end_at] 기간을 덮는 월 파티션을 만듭니다. (이미 있으면 건너뜀)
+-- _default 파티션에 들어가 있던 같은 월의 행은 새 파티션으로 옮깁니다.
+-- 반환값: 새로 만든 파티션 수
+CREATE OR REPLACE FUNCTION create_snapshot_partitions(start_at TIMESTAMPTZ, end_at TIMESTAMPTZ)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start TIMESTAMPTZ := date_trunc('month', start_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    month_end TIMESTAMPTZ;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= end_at LOOP
+        month_end := (date_trunc('month', month_start AT TIME ZONE 'UTC') + interval '1 month') AT TIME ZONE 'UTC';
+        partition_name := 'fact_video_snapshots_p' || to_char(month_start AT TIME ZONE 'UTC', 'YYYY_MM');
+
+        IF to_regclass(partition_name) IS NULL THEN
+            CREATE TEMP TABLE _snapshot_partition_rows ON COMMIT DROP AS
+            SELECT * FROM fact_video_snapshots_default
+            WHERE snapshot_at >= month_start AND snapshot_at < month_end;
+
+            DELETE FROM fact_video_snapshots_default
+            WHERE snapshot_at >= month_start AND snapshot_at < month_end;
+
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF fact_video_snapshots FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_end
+            );
+
+            INSERT INTO fact_video_snapshots SELECT * FROM _snapshot_partition_rows;
+            DROP TABLE _snapshot_partition_rows;
+            created := created + 1;
+        END IF;
+
+        month_start := month_end;
+    END LOOP;
+
+    RETURN created;
+END;
+$$;
+
+
+DO $$
+DECLARE
+    seq TEXT := pg_get_serial_sequence('fact_video_snapshots', 'id');
+    first_at TIMESTAMPTZ;
+    v RECORD;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'fact_video_snapshots'::regclass) = 'p' THEN
+        RETURN;  -- 이미 파티션 테이블
+    END IF;
+
+    -- 의존 view 정의 보관 (view 위의 view까지, 깊은 것부터 삭제 / 얕은 것부터 생성)
+    CREATE TEMP TABLE _snapshot_dependent_views ON COMMIT DROP AS
+    WITH RECURSIVE deps(oid, depth) AS (
+        SELECT r.ev_class, 1
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        WHERE d.refobjid = 'fact_video_snapshots'::regclass AND r.ev_class <> d.refobjid
+        UNION
+        SELECT r.ev_class, deps.depth + 1
+        FROM deps
+        JOIN pg_depend d ON d.refobjid = deps.oid
+        JOIN pg_rewrite r ON r.oid = d.objid
+        WHERE r.ev_class <> deps.oid
+    )
+    SELECT
+        n.nspname AS schema_name,
+        c.relname AS view_name,
+        c.relkind,
+        c.reloptions,
+        pg_get_viewdef(c.oid) AS definition,
+        max(deps.depth) AS depth
+    FROM deps
+    JOIN pg_class c ON c.oid = deps.oid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    GROUP BY n.nspname, c.relname, c.relkind, c.reloptions, c.oid;
+
+    FOR v IN SELECT * FROM _snapshot_dependent_views ORDER BY depth DESC LOOP
+        EXECUTE format(
+            'DROP %s IF EXISTS %I.%I',
+            CASE v.relkind WHEN 'm' THEN 'MATERIALIZED VIEW' ELSE 'VIEW' END, v.schema_name, v.view_name
+        );
+    END LOOP;
+
+    -- 기존 테이블/인덱스 이름을 비워 둠
+    ALTER TABLE fact_video_snapshots RENAME TO fact_video_snapshots_unpartitioned;
+    IF EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'fact_video_snapshots_pkey' AND conrelid = 'fact_video_snapshots_unpartitioned'::regclass
+    ) THEN
+        ALTER TABLE fact_video_snapshots_unpartitioned RENAME CONSTRAINT fact_video_snapshots_pkey TO fact_video_snapshots_unpartitioned_pkey;
+    END IF;
+    ALTER INDEX IF EXISTS fact_video_snapshots_natural_key RENAME TO fact_video_snapshots_unpartitioned_natural_key;
+    ALTER INDEX IF EXISTS fact_video_snapshots_snapshot_at_idx RENAME TO fact_video_snapshots_unpartitioned_snapshot_at_idx;
+    ALTER INDEX IF EXISTS fact_video_snapshots_rank_change_idx RENAME TO fact_video_snapshots_unpartitioned_rank_change_idx;
+    IF seq IS NOT NULL THEN
+        EXECUTE format('ALTER SEQUENCE %s OWNED BY NONE', seq);
+    END IF;
+
+    CREATE TABLE fact_video_snapshots (LIKE fact_video_snapshots_unpartitioned INCLUDING DEFAULTS)
+    PARTITION BY RANGE (snapshot_at);
+    ALTER TABLE fact_video_snapshots ADD PRIMARY KEY (id, snapshot_at);
+    CREATE TABLE fact_video_snapshots_default PARTITION OF fact_video_snapshots DEFAULT;
+
+    SELECT min(snapshot_at) INTO first_at FROM fact_video_snapshots_unpartitioned;
+    PERFORM create_snapshot_partitions(COALESCE(first_at, now()), now() + interval '1 month');
+
+    INSERT INTO fact_video_snapshots SELECT * FROM fact_video_snapshots_unpartitioned;
+    IF seq IS NOT NULL THEN
+        EXECUTE format('ALTER SEQUENCE %s OWNED BY fact_video_snapshots.id', seq);
+    END IF;
+    DROP TABLE fact_video_snapshots_unpartitioned;
+
+    FOR v IN SELECT * FROM _snapshot_dependent_views ORDER BY depth LOOP
+        EXECUTE format(
+            'CREATE %s %I.%I%s AS %s',
+            CASE v.relkind WHEN 'm' THEN 'MATERIALIZED VIEW' ELSE 'VIEW' END,
+            v.schema_name,
+            v.view_name,
+            CASE WHEN v.reloptions IS NULL THEN '' ELSE ' WITH (' || array_to_string(v.reloptions, ', ') || ')' END,
+            rtrim(v.definition, ';')
+        );
+    END LOOP;
+END;
+$$;
+
+
+-- ========== 조회 경로 인덱스 (부모에 만들면 모든 파티션에 생성됨) ==========
+
+-- 자연키 UPSERT, 영상 히스토리 (video_id = ? ORDER BY snapshot_at), 영상 최신 행 (… DESC LIMIT 1)
+CREATE UNIQUE INDEX IF NOT EXISTS fact_video_snapshots_natural_key
+ON fact_video_snapshots (video_id, snapshot_at);
+
+-- 최신 스냅샷 시각 (ORDER BY snapshot_at DESC LIMIT 1), 스냅샷 TOP N (snapshot_at = ? ORDER BY trending_rank)
+-- 0004의 (snapshot_at) 인덱스를 대체합니다.
+CREATE INDEX IF NOT EXISTS fact_video_snapshots_snapshot_rank_idx
+ON fact_video_snapshots (snapshot_at, trending_rank);
+
+DROP INDEX IF EXISTS fact_video_snapshots_snapshot_at_idx;
+
+-- 급상승 (snapshot_at = ? AND view_velocity IS NOT NULL ORDER BY view_velocity DESC)
+CREATE INDEX IF NOT EXISTS fact_video_snapshots_velocity_idx
+ON fact_video_snapshots (snapshot_at, view_velocity DESC)
+WHERE view_velocity IS NOT NULL;
+
+-- 순위 변동 (0005와 같음, 파티션 테이블로 교체된 경우 다시 생성)
+CREATE INDEX IF NOT EXISTS fact_video_snapshots_rank_change_idx
+ON fact_video_snapshots (snapshot_at, rank_change);
@@ -0,0 +1,389 @@
+-- =========================================
+-- 0010. 오래된 시간별 스냅샷 → 일별 영상 집계 (보관 기간 / downsampling)
+-- fact_video_snapshots는 최근 N일(SNAPSHOT_RETENTION_DAYS)만 시간 단위로 보관합니다.
+-- 그보다 오래된 날짜는 fact_video_daily (영상 × UTC 날짜) 한 행으로 접고 시간별 행은 삭제합니다.
+--   - 보관 기간이 모두 지난 월 파티션은 DROP, 경계 월은 DELETE
+--   - 원본은 GCS raw 레이어이므로 필요하면 재처리로 시간별 행을 다시 만들 수 있습니다.
+--     (재처리된 시간별 행은 다음 실행에서 같은 날짜의 일별 행에 다시 합쳐짐)
+--
+-- 읽는 쪽:
+--   video_daily_history : 최근은 시간별 행을 날짜로 묶고, 오래된 날짜는 fact_video_daily를 그대로 보여주는 view
+--   ai_daily_summary, ai_channel_stats : video_daily_history 기준으로 다시 정의
+--   영상 히스토리 API  : 시간별 행 + 시간별 행이 없는 날짜의 일별 행
+--
+-- 실행 (transform/retention.py가 매일 호출):
+--   SELECT rollup_video_snapshots(now() - interval '30 days');
+-- =========================================
+
+CREATE TABLE IF NOT EXISTS fact_video_daily (
+    video_id TEXT NOT NULL,
+    day DATE NOT NULL,                       -- UTC 날짜
+    -- 그날 마지막 스냅샷의 영상 정보
+    title TEXT,
+    channel_id TEXT,
+    channel_name TEXT,
+    category_id INTEGER,
+    category_name TEXT,
+    published_at TIMESTAMPTZ,
+    duration_sec INTEGER,
+    is_shorts BOOLEAN,
+    thumbnail_url TEXT,
+    -- 스냅샷 범위
+    hours_mask INTEGER NOT NULL,             -- 스냅샷이 있는 UTC 시각 (bit 0 = 0시 … bit 23 = 23시)
+    snapshot_count INTEGER NOT NULL,         -- 트렌딩에 등장한 시간 수
+    first_snapshot_at TIMESTAMPTZ NOT NULL,
+    last_snapshot_at TIMESTAMPTZ NOT NULL,
+    -- 순위
+    best_rank INTEGER,
+    worst_rank INTEGER,
+    last_rank INTEGER,
+    prev_rank INTEGER,                       -- 그날 첫 스냅샷의 직전 순위 (0005 prev_rank)
+    -- 조회수/반응
+    first_view_count BIGINT,
+    last_view_count BIGINT,
+    max_view_count BIGINT,
+    prev_view_count BIGINT,                  -- 그날 첫 스냅샷의 직전 조회수 (첫 등장이면 NULL)
+    like_count BIGINT,
+    comment_count BIGINT,
+    engagement_rate DOUBLE PRECISION,
+    max_view_velocity DOUBLE PRECISION,
+    -- 직전 스냅샷 대비 그날의 변화량 (시간별 view_delta / rank_change를 이어 붙인 값과 같음)
+    view_delta BIGINT GENERATED ALWAYS AS (last_view_count - COALESCE(prev_view_count, first_view_count)) STORED,
+    rank_change INTEGER GENERATED ALWAYS AS (prev_rank - last_rank) STORED,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (video_id, day)
+);
+
+-- 날짜 단위 집계 (ai_daily_summary 등)
+CREATE INDEX IF NOT EXISTS fact_video_daily_day_idx
+ON fact_video_daily (day);
+
+
+-- before가 속한 UTC 날짜 이전의 시간별 스냅샷을 일별 행으로 접고 삭제합니다.
+-- 같은 날짜가 이미 있으면 합칩니다. (시각 비트 OR, 최소/최대, 첫/마지막 스냅샷 값은 시각이 앞/뒤인 쪽)
+-- 합치는 연산이 모두 멱등이므로 같은 시간을 재처리한 행이 다시 들어와도 중복 집계되지 않습니다.
+-- (재처리된 행은 직전 스냅샷이 이미 접혀 있어 prev_* 가 비어 있으므로 첫 스냅샷 시각이 같으면 기존 값을 유지)
+-- dry_run이면 집계 대상만 세고 아무것도 바꾸지 않습니다.
+CREATE OR REPLACE FUNCTION rollup_video_snapshots(before TIMESTAMPTZ, dry_run BOOLEAN DEFAULT FALSE)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := date_trunc('day', before AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    hourly_rows BIGINT;
+    days INTEGER;
+    daily_rows INTEGER := 0;
+    dropped INTEGER := 0;
+    p RECORD;
+BEGIN
+    -- 적재(refresh_video_rollups)와 달리 오래 걸릴 수 있으므로 retention끼리만 직렬화
+    PERFORM pg_advisory_xact_lock(hashtext('rollup_video_snapshots'));
+
+    SELECT count(*), count(DISTINCT (snapshot_at AT TIME ZONE 'UTC')::DATE)
+    INTO hourly_rows, days
+    FROM fact_video_snapshots
+    WHERE snapshot_at < cutoff;
+
+    IF dry_run OR hourly_rows = 0 THEN
+        RETURN jsonb_build_object(
+            'cutoff', cutoff, 'days', days, 'hourly_rows', hourly_rows,
+            'daily_rows', 0, 'partitions_dropped', 0, 'dry_run', dry_run
+        );
+    END IF;
+
+    INSERT INTO fact_video_daily AS d (
+        video_id, day, title, channel_id, channel_name, category_id, category_name,
+        published_at, duration_sec, is_shorts, thumbnail_url,
+        hours_mask, snapshot_count, first_snapshot_at, last_snapshot_at,
+        best_rank, worst_rank, last_rank, prev_rank,
+        first_view_count, last_view_count, max_view_count, prev_view_count,
+        like_count, comment_count, engagement_rate, max_view_velocity
+    )
+    SELECT
+        g.video_id, g.day, l.title, l.channel_id, l.channel_name, l.category_id, l.category_name,
+        l.published_at, l.duration_sec, l.is_shorts, l.thumbnail_url,
+        g.hours_mask, g.snapshot_count, g.first_snapshot_at, g.last_snapshot_at,
+        g.best_rank, g.worst_rank, l.trending_rank, f.prev_rank,
+        f.view_count, l.view_count, g.max_view_count, f.view_count - f.view_delta,
+        l.like_count, l.comment_count, l.engagement_rate, g.max_view_velocity
+    FROM (
+        SELECT
+            video_id,
+            (snapshot_at AT TIME ZONE 'UTC')::DATE AS day,
+            bit_or(1 << EXTRACT(HOUR FROM snapshot_at AT TIME ZONE 'UTC')::INTEGER) AS hours_mask,
+            count(*) AS snapshot_count,
+            min(snapshot_at) AS first_snapshot_at,
+            max(snapshot_at) AS last_snapshot_at,
+            min(trending_rank) AS best_rank,
+            max(trending_rank) AS worst_rank,
+            max(view_count) AS max_view_count,
+            max(view_velocity) AS max_view_velocity
+        FROM fact_video_snapshots
+        WHERE snapshot_at < cutoff
+        GROUP BY 1, 2
+    ) g
+    JOIN fact_video_snapshots f
+      ON f.video_id = g.video_id AND f.snapshot_at = g.first_snapshot_at AND f.snapshot_at < cutoff
+    JOIN fact_video_snapshots l
+      ON l.video_id = g.video_id AND l.snapshot_at = g.last_snapshot_at AND l.snapshot_at < cutoff
+    ON CONFLICT (video_id, day) DO UPDATE SET
+        title = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.title ELSE d.title END,
+        channel_id = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.channel_id ELSE d.channel_id END,
+        channel_name = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.channel_name ELSE d.channel_name END,
+        category_id = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.category_id ELSE d.category_id END,
+        category_name = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.category_name ELSE d.category_name END,
+        published_at = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.published_at ELSE d.published_at END,
+        duration_sec = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.duration_sec ELSE d.duration_sec END,
+        is_shorts = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.is_shorts ELSE d.is_shorts END,
+        thumbnail_url = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.thumbnail_url ELSE d.thumbnail_url END,
+        hours_mask = d.hours_mask | EXCLUDED.hours_mask,
+        snapshot_count = length(replace((d.hours_mask | EXCLUDED.hours_mask)::BIT(24)::TEXT, '0', '')),
+        first_snapshot_at = LEAST(d.first_snapshot_at, EXCLUDED.first_snapshot_at),
+        last_snapshot_at = GREATEST(d.last_snapshot_at, EXCLUDED.last_snapshot_at),
+        best_rank = LEAST(d.best_rank, EXCLUDED.best_rank),
+        worst_rank = GREATEST(d.worst_rank, EXCLUDED.worst_rank),
+        last_rank = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.last_rank ELSE d.last_rank END,
+        prev_rank = CASE WHEN EXCLUDED.first_snapshot_at < d.first_snapshot_at THEN EXCLUDED.prev_rank ELSE d.prev_rank END,
+        first_view_count = CASE WHEN EXCLUDED.first_snapshot_at < d.first_snapshot_at THEN EXCLUDED.first_view_count ELSE d.first_view_count END,
+        last_view_count = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.last_view_count ELSE d.last_view_count END,
+        max_view_count = GREATEST(d.max_view_count, EXCLUDED.max_view_count),
+        prev_view_count = CASE WHEN EXCLUDED.first_snapshot_at < d.first_snapshot_at THEN EXCLUDED.prev_view_count ELSE d.prev_view_count END,
+        like_count = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.like_count ELSE d.like_count END,
+        comment_count = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.comment_count ELSE d.comment_count END,
+        engagement_rate = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.engagement_rate ELSE d.engagement_rate END,
+        max_view_velocity = GREATEST(d.max_view_velocity, EXCLUDED.max_view_velocity),
+        updated_at = NOW();
+
+    GET DIAGNOSTICS daily_rows = ROW_COUNT;
+
+    -- 보관 기간이 모두 지난 월 파티션 (0009: fact_video_snapshots_pYYYY_MM)은 통째로 삭제
+    FOR p IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'fact_video_snapshots'::regclass
+          AND c.relname ~ '^fact_video_snapshots_p[0-9]{4}_[0-9]{2}$'
+          AND (to_date(right(c.relname, 7), 'YYYY_MM') + interval '1 month') AT TIME ZONE 'UTC' <= cutoff
+    LOOP
+        EXECUTE format('DROP TABLE %I', p.relname);
+        dropped := dropped + 1;
+    END LOOP;
+
+    -- 경계 월 파티션, _default 파티션 (파티션되지 않은 테이블이면 전체)
+    DELETE FROM fact_video_snapshots WHERE snapshot_at < cutoff;
+
+    RETURN jsonb_build_object(
+        'cutoff', cutoff, 'days', days, 'hourly_rows', hourly_rows,
+        'daily_rows', daily_rows, 'partitions_dropped', dropped, 'dry_run', dry_run
+    );
+END;
+$$;
+
+
+-- 보관 기간이 지난 날짜의 채널 집계는 시간별 행이 일부만 남아 있을 수 있으므로 (재처리) 다시 계산하지 않습니다.
+-- (0004와 같고 agg_channel_daily 대상 날짜에서 fact_video_daily로 접힌 날짜만 제외)
+CREATE OR REPLACE FUNCTION refresh_video_rollups(snapshot_times TIMESTAMPTZ[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    touched_days DATE[];
+BEGIN
+    IF snapshot_times IS NULL OR cardinality(snapshot_times) = 0 THEN
+        RETURN 0;
+    END IF;
+
+    -- 동시에 적재되는 파일끼리 DELETE → INSERT가 겹치지 않도록 직렬화 (스냅샷당 수십 행이라 짧음)
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_video_rollups'));
+
+    DELETE FROM agg_category_snapshots WHERE snapshot_at = ANY(snapshot_times);
+    INSERT INTO agg_category_snapshots (
+        snapshot_at, category_name, video_count, total_views, total_likes, total_comments,
+        avg_view_count, avg_engagement_rate, shorts_count, shorts_ratio
+    )
+    SELECT
+        snapshot_at,
+        COALESCE(NULLIF(category_name, ''), '기타'),
+        count(*),
+        COALESCE(sum(view_count), 0),
+        COALESCE(sum(like_count), 0),
+        COALESCE(sum(comment_count), 0),
+        COALESCE(sum(view_count), 0) / count(*),
+        COALESCE(sum(engagement_rate), 0) / count(*),
+        count(*) FILTER (WHERE is_shorts),
+        count(*) FILTER (WHERE is_shorts) * 100.0 / count(*)
+    FROM fact_video_snapshots
+    WHERE snapshot_at = ANY(snapshot_times)
+    GROUP BY 1, 2;
+
+    DELETE FROM agg_hourly_totals WHERE snapshot_at = ANY(snapshot_times);
+    INSERT INTO agg_hourly_totals (
+        snapshot_at, video_count, total_views, total_likes, total_comments,
+        avg_views, avg_likes, avg_engagement_rate, shorts_count
+    )
+    SELECT
+        snapshot_at,
+        count(*),
+        COALESCE(sum(view_count), 0),
+        COALESCE(sum(like_count), 0),
+        COALESCE(sum(comment_count), 0),
+        COALESCE(sum(view_count), 0) / count(*),
+        COALESCE(sum(like_count), 0) / count(*),
+        COALESCE(avg(engagement_rate) FILTER (WHERE engagement_rate > 0), 0),
+        count(*) FILTER (WHERE is_shorts)
+    FROM fact_video_snapshots
+    WHERE snapshot_at = ANY(snapshot_times)
+    GROUP BY 1;
+
+    touched_days := ARRAY(
+        SELECT DISTINCT (t AT TIME ZONE 'UTC')::DATE FROM unnest(snapshot_times) AS t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM fact_video_daily WHERE day = (t AT TIME ZONE 'UTC')::DATE
+        )
+    );
+
+    DELETE FROM agg_channel_daily WHERE day = ANY(touched_days);
+    INSERT INTO agg_channel_daily (
+        day, channel_id, channel_name, snapshot_count, video_count, best_rank,
+        max_view_count, avg_view_count, avg_engagement_rate, first_seen_at, last_seen_at
+    )
+    SELECT
+        d.day,
+        f.channel_id,
+        max(f.channel_name),
+        count(*),
+        count(DISTINCT f.video_id),
+        min(f.trending_rank),
+        COALESCE(max(f.view_count), 0),
+        COALESCE(sum(f.view_count), 0) / count(*),
+        COALESCE(avg(f.engagement_rate), 0),
+        min(f.snapshot_at),
+        max(f.snapshot_at)
+    FROM unnest(touched_days) AS d(day)
+    JOIN fact_video_snapshots f
+      ON f.snapshot_at >= d.day::TIMESTAMP AT TIME ZONE 'UTC'
+     AND f.snapshot_at < (d.day + 1)::TIMESTAMP AT TIME ZONE 'UTC'
+    WHERE f.channel_id IS NOT NULL
+    GROUP BY 1, 2;
+
+    RETURN cardinality(snapshot_times);
+END;
+$$;
+
+
+-- 영상 × UTC 날짜 히스토리 (보관 기간 안은 시간별 행을 묶고, 밖은 fact_video_daily)
+-- 같은 날짜에 두 tier가 모두 있으면 (재처리 후 아직 접히지 않은 경우) 시간별 행을 씁니다.
+CREATE OR REPLACE VIEW video_daily_history AS
+SELECT
+    h.video_id,
+    h.day,
+    'hour'::TEXT AS resolution,
+    h.title,
+    h.channel_id,
+    h.channel_name,
+    h.category_name,
+    h.is_shorts,
+    h.snapshot_count,
+    h.first_snapshot_at,
+    h.last_snapshot_at,
+    h.best_rank,
+    h.last_rank,
+    h.view_count,
+    h.max_view_count,
+    h.like_count,
+    h.comment_count,
+    h.engagement_rate,
+    h.view_count - COALESCE(h.first_view_count - h.first_view_delta, h.first_view_count) AS view_delta,
+    h.prev_rank - h.last_rank AS rank_change
+FROM (
+    SELECT
+        video_id,
+        (snapshot_at AT TIME ZONE 'UTC')::DATE AS day,
+        (array_agg(title ORDER BY snapshot_at DESC))[1] AS title,
+        (array_agg(channel_id ORDER BY snapshot_at DESC))[1] AS channel_id,
+        (array_agg(channel_name ORDER BY snapshot_at DESC))[1] AS channel_name,
+        (array_agg(category_name ORDER BY snapshot_at DESC))[1] AS category_name,
+        (array_agg(is_shorts ORDER BY snapshot_at DESC))[1] AS is_shorts,
+        count(*)::INTEGER AS snapshot_count,
+        min(snapshot_at) AS first_snapshot_at,
+        max(snapshot_at) AS last_snapshot_at,
+        min(trending_rank) AS best_rank,
+        (array_agg(trending_rank ORDER BY snapshot_at DESC))[1] AS last_rank,
+        (array_agg(prev_rank ORDER BY snapshot_at))[1] AS prev_rank,
+        (array_agg(view_count ORDER BY snapshot_at DESC))[1] AS view_count,
+        max(view_count) AS max_view_count,
+        (array_agg(view_count ORDER BY snapshot_at))[1] AS first_view_count,
+        (array_agg(view_delta ORDER BY snapshot_at))[1] AS first_view_delta,
+        (array_agg(like_count ORDER BY snapshot_at DESC))[1] AS like_count,
+        (array_agg(comment_count ORDER BY snapshot_at DESC))[1] AS comment_count,
+        (array_agg(engagement_rate ORDER BY snapshot_at DESC))[1] AS engagement_rate
+    FROM fact_video_snapshots
+    GROUP BY 1, 2
+) h
+UNION ALL
+SELECT
+    d.video_id,
+    d.day,
+    'day'::TEXT AS resolution,
+    d.title,
+    d.channel_id,
+    d.channel_name,
+    d.category_name,
+    d.is_shorts,
+    d.snapshot_count,
+    d.first_snapshot_at,
+    d.last_snapshot_at,
+    d.best_rank,
+    d.last_rank,
+    d.last_view_count AS view_count,
+    d.max_view_count,
+    d.like_count,
+    d.comment_count,
+    d.engagement_rate,
+    d.view_delta,
+    d.rank_change
+FROM fact_video_daily d
+WHERE NOT EXISTS (
+    SELECT 1 FROM fact_video_snapshots f
+    WHERE f.video_id = d.video_id
+      AND f.snapshot_at >= d.day::TIMESTAMP AT TIME ZONE 'UTC'
+      AND f.snapshot_at < (d.day + 1)::TIMESTAMP AT TIME ZONE 'UTC'
+);
+
+
+-- ========== AI(chat) view: 기간 전체를 보는 view는 두 tier를 함께 읽음 ==========
+-- 컬럼 이름/의미는 chat VIEW_CATALOG와 같습니다. (시점 기준 view는 최근 스냅샷만 읽으므로 그대로 둠)
+
+DROP VIEW IF EXISTS ai_daily_summary;
+CREATE VIEW ai_daily_summary AS
+SELECT
+    day AS "날짜",
+    count(DISTINCT video_id) AS "고유_영상수",
+    count(DISTINCT channel_id) AS "고유_채널수",
+    round(avg(view_count)) AS "평균_조회수",
+    round((avg(engagement_rate) * 100)::NUMERIC, 2) AS "평균_참여율_퍼센트",
+    mode() WITHIN GROUP (ORDER BY category_name) AS "최다_카테고리"
+FROM video_daily_history
+GROUP BY day
+ORDER BY day DESC;
+
+DROP VIEW IF EXISTS ai_channel_stats;
+CREATE VIEW ai_channel_stats AS
+SELECT
+    COALESCE(c.channel_name, max(h.channel_name)) AS "채널명",
+    c.subscriber_count AS "구독자수",
+    count(DISTINCT h.video_id) AS "트렌딩_영상수",
+    count(DISTINCT h.day) AS "트렌딩_일수",
+    min(h.best_rank) AS "최고_순위",
+    round(avg(h.view_count)) AS "평균_조회수",
+    round(avg(h.like_count)) AS "평균_좋아요",
+    round((avg(h.engagement_rate) * 100)::NUMERIC, 2) AS "평균_참여율_퍼센트",
+    max(h.max_view_count) AS "최고_조회수",
+    c.video_count AS "채널_총영상수",
+    c.country AS "국가",
+    h.channel_id
+FROM video_daily_history h
+LEFT JOIN dim_channels c ON c.channel_id = h.channel_id
+WHERE h.channel_id IS NOT NULL
+GROUP BY h.channel_id, c.channel_name, c.subscriber_count, c.video_count, c.country
+ORDER BY "트렌딩_영상수" DESC;
@@ -0,0 +1,73 @@
+-- =========================================
+-- 0011. 늦게 적재된 스냅샷 뒤의 변화량 보정
+-- 변화량(prev_rank, rank_change, view_delta, minutes_since_prev)은 적재 시점에 DB에 있던 직전 스냅샷으로 계산합니다.
+-- 과거 hour를 나중에 적재하면 (백필, reconcile/trigger_missing, 재시도 큐, run 단위 재적재)
+-- 그 hour의 *다음* 스냅샷은 이미 더 이전 스냅샷 기준으로 계산되어 있으므로, 적재 직후 아래 함수로 다시 계산합니다.
+--
+-- 적재한 (영상, 스냅샷)마다 다음 스냅샷을 인덱스로 한 번씩 찾으므로,
+-- 최신 hour 적재(다음 스냅샷이 없음)에서는 영상당 인덱스 탐색 한 번으로 끝납니다.
+-- =========================================
+
+-- snapshot_times에 적재된 영상별로 바로 다음 스냅샷의 변화량을 실제 직전 스냅샷 기준으로 다시 계산합니다.
+-- 반환값: 값이 바뀐 행 수
+CREATE OR REPLACE FUNCTION repair_next_snapshot_deltas(snapshot_times TIMESTAMPTZ[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    IF snapshot_times IS NULL OR cardinality(snapshot_times) = 0 THEN
+        RETURN 0;
+    END IF;
+
+    WITH loaded AS (
+        SELECT video_id, snapshot_at
+        FROM fact_video_snapshots
+        WHERE snapshot_at = ANY(snapshot_times)
+    ),
+    following AS (
+        SELECT DISTINCT n.id, n.video_id, n.snapshot_at, n.trending_rank, n.view_count
+        FROM loaded l
+        CROSS JOIN LATERAL (
+            SELECT f.id, f.video_id, f.snapshot_at, f.trending_rank, f.view_count
+            FROM fact_video_snapshots f
+            WHERE f.video_id = l.video_id AND f.snapshot_at > l.snapshot_at
+            ORDER BY f.snapshot_at
+            LIMIT 1
+        ) n
+    ),
+    repaired AS (
+        SELECT
+            n.id,
+            n.snapshot_at,
+            p.trending_rank AS p_rank,
+            p.trending_rank - n.trending_rank AS r_change,
+            n.view_count - p.view_count AS v_delta,
+            (EXTRACT(EPOCH FROM n.snapshot_at - p.snapshot_at) / 60)::INTEGER AS minutes
+        FROM following n
+        CROSS JOIN LATERAL (
+            SELECT f.snapshot_at, f.trending_rank, f.view_count
+            FROM fact_video_snapshots f
+            WHERE f.video_id = n.video_id AND f.snapshot_at < n.snapshot_at
+            ORDER BY f.snapshot_at DESC
+            LIMIT 1
+        ) p
+    )
+    UPDATE fact_video_snapshots f
+    SET prev_rank = r.p_rank,
+        rank_change = r.r_change,
+        view_delta = r.v_delta,
+        minutes_since_prev = r.minutes
+    FROM repaired r
+    WHERE f.id = r.id
+      AND f.snapshot_at = r.snapshot_at
+      AND (f.prev_rank IS DISTINCT FROM r.p_rank
+           OR f.rank_change IS DISTINCT FROM r.r_change
+           OR f.view_delta IS DISTINCT FROM r.v_delta
+           OR f.minutes_since_prev IS DISTINCT FROM r.minutes);
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
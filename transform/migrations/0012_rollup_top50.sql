@@ -0,0 +1,104 @@
+-- =========================================
+-- 0012. 대시보드 집계를 트렌딩 TOP 50으로 한정
+-- 집계 테이블 도입 전 오버뷰/카테고리 통계는 최신 스냅샷의 trending_rank 상위 50개만 읽었습니다.
+-- (BaseService.get_latest_snapshot_data('*', 50))
+-- 0004의 agg_hourly_totals / agg_category_snapshots는 스냅샷의 모든 행(페이지 전체, 약 200개)을 묶어
+-- total_videos, total_views, 쇼츠 비율, 카테고리별 영상 수의 의미가 바뀌었으므로 다시 TOP 50으로 맞춥니다.
+-- agg_channel_daily(채널별 트렌딩 등장 횟수)는 대시보드가 읽지 않으므로 전체 순위를 그대로 집계합니다.
+--
+-- trending_rank는 run 전체 기준 순위여야 합니다. (페이지 오프셋 반영 전 적재된 스냅샷은 페이지마다 1부터 시작)
+-- 해당 스냅샷을 reconcile/backfill로 다시 적재한 뒤 집계를 다시 계산합니다:
+--   SELECT rebuild_video_rollups('-infinity', 'infinity');
+-- =========================================
+
+-- 0010과 같고 스냅샷/카테고리 집계에 trending_rank <= 50 조건만 추가
+-- (snapshot_at, trending_rank) 인덱스(0009)로 스냅샷당 50행만 읽습니다.
+CREATE OR REPLACE FUNCTION refresh_video_rollups(snapshot_times TIMESTAMPTZ[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    touched_days DATE[];
+BEGIN
+    IF snapshot_times IS NULL OR cardinality(snapshot_times) = 0 THEN
+        RETURN 0;
+    END IF;
+
+    -- 동시에 적재되는 파일끼리 DELETE → INSERT가 겹치지 않도록 직렬화 (스냅샷당 수십 행이라 짧음)
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_video_rollups'));
+
+    DELETE FROM agg_category_snapshots WHERE snapshot_at = ANY(snapshot_times);
+    INSERT INTO agg_category_snapshots (
+        snapshot_at, category_name, video_count, total_views, total_likes, total_comments,
+        avg_view_count, avg_engagement_rate, shorts_count, shorts_ratio
+    )
+    SELECT
+        snapshot_at,
+        COALESCE(NULLIF(category_name, ''), '기타'),
+        count(*),
+        COALESCE(sum(view_count), 0),
+        COALESCE(sum(like_count), 0),
+        COALESCE(sum(comment_count), 0),
+        COALESCE(sum(view_count), 0) / count(*),
+        COALESCE(sum(engagement_rate), 0) / count(*),
+        count(*) FILTER (WHERE is_shorts),
+        count(*) FILTER (WHERE is_shorts) * 100.0 / count(*)
+    FROM fact_video_snapshots
+    WHERE snapshot_at = ANY(snapshot_times)
+      AND trending_rank <= 50
+    GROUP BY 1, 2;
+
+    DELETE FROM agg_hourly_totals WHERE snapshot_at = ANY(snapshot_times);
+    INSERT INTO agg_hourly_totals (
+        snapshot_at, video_count, total_views, total_likes, total_comments,
+        avg_views, avg_likes, avg_engagement_rate, shorts_count
+    )
+    SELECT
+        snapshot_at,
+        count(*),
+        COALESCE(sum(view_count), 0),
+        COALESCE(sum(like_count), 0),
+        COALESCE(sum(comment_count), 0),
+        COALESCE(sum(view_count), 0) / count(*),
+        COALESCE(sum(like_count), 0) / count(*),
+        COALESCE(avg(engagement_rate) FILTER (WHERE engagement_rate > 0), 0),
+        count(*) FILTER (WHERE is_shorts)
+    FROM fact_video_snapshots
+    WHERE snapshot_at = ANY(snapshot_times)
+      AND trending_rank <= 50
+    GROUP BY 1;
+
+    touched_days := ARRAY(
+        SELECT DISTINCT (t AT TIME ZONE 'UTC')::DATE FROM unnest(snapshot_times) AS t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM fact_video_daily WHERE day = (t AT TIME ZONE 'UTC')::DATE
+        )
+    );
+
+    DELETE FROM agg_channel_daily WHERE day = ANY(touched_days);
+    INSERT INTO agg_channel_daily (
+        day, channel_id, channel_name, snapshot_count, video_count, best_rank,
+        max_view_count, avg_view_count, avg_engagement_rate, first_seen_at, last_seen_at
+    )
+    SELECT
+        d.day,
+        f.channel_id,
+        max(f.channel_name),
+        count(*),
+        count(DISTINCT f.video_id),
+        min(f.trending_rank),
+        COALESCE(max(f.view_count), 0),
+        COALESCE(sum(f.view_count), 0) / count(*),
+        COALESCE(avg(f.engagement_rate), 0),
+        min(f.snapshot_at),
+        max(f.snapshot_at)
+    FROM unnest(touched_days) AS d(day)
+    JOIN fact_video_snapshots f
+      ON f.snapshot_at >= d.day::TIMESTAMP AT TIME ZONE 'UTC'
+     AND f.snapshot_at < (d.day + 1)::TIMESTAMP AT TIME ZONE 'UTC'
+    WHERE f.channel_id IS NOT NULL
+    GROUP BY 1, 2;
+
+    RETURN cardinality(snapshot_times);
+END;
+$$;
@@ -0,0 +1,71 @@
+-- =========================================
+-- 0013. 재시도 큐 등록 시 시도 횟수 누적
+-- transform_handler가 같은 파일로 다시 실패하면 (재트리거, reconcile/trigger_missing)
+-- 기존 행을 attempts=1, pending으로 덮어써 시도 횟수가 초기화되고 dead 항목이 되살아났습니다.
+-- 등록을 아래 RPC로 옮겨 충돌 시 기존 상태를 기준으로 갱신합니다.
+--   pending  : attempts + 1, poison이거나 max_attempts에 도달하면 dead, 아니면 백오프 후 다시 pending
+--   running  : 작업자가 임대 중이므로 상태/임대는 그대로 두고 attempts + 1, 오류만 기록
+--   dead     : dead 유지 (requeue_dead로만 되살림), attempts + 1, 오류만 기록
+--   succeeded: 새 실패이므로 처음 등록과 같이 attempts=1부터 다시 시작
+-- =========================================
+
+-- 반환값: 등록 후 상태 (pending / running / dead)
+-- 백오프는 retry_queue.backoff_seconds와 같은 식 (지수 백오프 상한 안에서 equal jitter)
+CREATE OR REPLACE FUNCTION enqueue_transform_retry(
+    target_path TEXT,
+    target_data_type TEXT,
+    failure_class TEXT,
+    failure_message TEXT,
+    poison BOOLEAN,
+    retry_max_attempts INTEGER DEFAULT 6,
+    base_seconds DOUBLE PRECISION DEFAULT 30,
+    max_delay_seconds DOUBLE PRECISION DEFAULT 900
+)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    result_status TEXT;
+BEGIN
+    INSERT INTO transform_retry_queue AS q (
+        file_path, data_type, status, attempts, max_attempts, error_class, last_error,
+        next_attempt_at, locked_until, updated_at
+    )
+    VALUES (
+        target_path,
+        target_data_type,
+        CASE WHEN poison OR retry_max_attempts <= 1 THEN 'dead' ELSE 'pending' END,
+        1,
+        retry_max_attempts,
+        failure_class,
+        failure_message,
+        NOW() + make_interval(secs => least(max_delay_seconds, base_seconds) * (0.5 + random() / 2)),
+        NULL,
+        NOW()
+    )
+    ON CONFLICT (file_path) DO UPDATE
+    SET attempts = CASE WHEN q.status = 'succeeded' THEN 1 ELSE q.attempts + 1 END,
+        max_attempts = CASE WHEN q.status = 'succeeded' THEN EXCLUDED.max_attempts ELSE q.max_attempts END,
+        data_type = COALESCE(EXCLUDED.data_type, q.data_type),
+        status = CASE
+            WHEN q.status IN ('dead', 'running') THEN q.status
+            WHEN q.status = 'succeeded' THEN EXCLUDED.status
+            WHEN poison OR q.attempts + 1 >= q.max_attempts THEN 'dead'
+            ELSE 'pending'
+        END,
+        next_attempt_at = CASE
+            WHEN q.status IN ('dead', 'running') THEN q.next_attempt_at
+            WHEN q.status = 'succeeded' THEN EXCLUDED.next_attempt_at
+            WHEN poison OR q.attempts + 1 >= q.max_attempts THEN NOW()
+            ELSE NOW() + make_interval(secs =>
+                least(max_delay_seconds, base_seconds * 2 ^ q.attempts) * (0.5 + random() / 2))
+        END,
+        locked_until = CASE WHEN q.status = 'running' THEN q.locked_until ELSE NULL END,
+        error_class = EXCLUDED.error_class,
+        last_error = EXCLUDED.last_error,
+        updated_at = NOW()
+    RETURNING q.status INTO result_status;
+
+    RETURN result_status;
+END;
+$$;
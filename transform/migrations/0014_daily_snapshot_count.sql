@@ -0,0 +1,128 @@
+-- =========================================
+-- 0014. fact_video_daily.snapshot_count를 hours_mask 비트 수로 통일
+-- 0010의 rollup_video_snapshots는 날짜를 처음 접을 때 snapshot_count를 행 수(count(*))로,
+-- 이미 있는 날짜와 합칠 때는 hours_mask의 비트 수로 계산해 같은 데이터도 경로에 따라 값이 달랐습니다.
+-- (같은 hour에 스냅샷이 두 개 이상이면 count(*)가 더 큼) 두 경로 모두 비트 수("트렌딩에 등장한 시간 수")로 계산합니다.
+-- =========================================
+
+-- 0010과 같고 처음 접을 때의 snapshot_count만 hours_mask 비트 수로 변경
+CREATE OR REPLACE FUNCTION rollup_video_snapshots(before TIMESTAMPTZ, dry_run BOOLEAN DEFAULT FALSE)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := date_trunc('day', before AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    hourly_rows BIGINT;
+    days INTEGER;
+    daily_rows INTEGER := 0;
+    dropped INTEGER := 0;
+    p RECORD;
+BEGIN
+    -- 적재(refresh_video_rollups)와 달리 오래 걸릴 수 있으므로 retention끼리만 직렬화
+    PERFORM pg_advisory_xact_lock(hashtext('rollup_video_snapshots'));
+
+    SELECT count(*), count(DISTINCT (snapshot_at AT TIME ZONE 'UTC')::DATE)
+    INTO hourly_rows, days
+    FROM fact_video_snapshots
+    WHERE snapshot_at < cutoff;
+
+    IF dry_run OR hourly_rows = 0 THEN
+        RETURN jsonb_build_object(
+            'cutoff', cutoff, 'days', days, 'hourly_rows', hourly_rows,
+            'daily_rows', 0, 'partitions_dropped', 0, 'dry_run', dry_run
+        );
+    END IF;
+
+    INSERT INTO fact_video_daily AS d (
+        video_id, day, title, channel_id, channel_name, category_id, category_name,
+        published_at, duration_sec, is_shorts, thumbnail_url,
+        hours_mask, snapshot_count, first_snapshot_at, last_snapshot_at,
+        best_rank, worst_rank, last_rank, prev_rank,
+        first_view_count, last_view_count, max_view_count, prev_view_count,
+        like_count, comment_count, engagement_rate, max_view_velocity
+    )
+    SELECT
+        g.video_id, g.day, l.title, l.channel_id, l.channel_name, l.category_id, l.category_name,
+        l.published_at, l.duration_sec, l.is_shorts, l.thumbnail_url,
+        g.hours_mask, g.snapshot_count, g.first_snapshot_at, g.last_snapshot_at,
+        g.best_rank, g.worst_rank, l.trending_rank, f.prev_rank,
+        f.view_count, l.view_count, g.max_view_count, f.view_count - f.view_delta,
+        l.like_count, l.comment_count, l.engagement_rate, g.max_view_velocity
+    FROM (
+        SELECT
+            video_id,
+            (snapshot_at AT TIME ZONE 'UTC')::DATE AS day,
+            bit_or(1 << EXTRACT(HOUR FROM snapshot_at AT TIME ZONE 'UTC')::INTEGER) AS hours_mask,
+            length(replace(bit_or(1 << EXTRACT(HOUR FROM snapshot_at AT TIME ZONE 'UTC')::INTEGER)::BIT(24)::TEXT, '0', '')) AS snapshot_count,
+            min(snapshot_at) AS first_snapshot_at,
+            max(snapshot_at) AS last_snapshot_at,
+            min(trending_rank) AS best_rank,
+            max(trending_rank) AS worst_rank,
+            max(view_count) AS max_view_count,
+            max(view_velocity) AS max_view_velocity
+        FROM fact_video_snapshots
+        WHERE snapshot_at < cutoff
+        GROUP BY 1, 2
+    ) g
+    JOIN fact_video_snapshots f
+      ON f.video_id = g.video_id AND f.snapshot_at = g.first_snapshot_at AND f.snapshot_at < cutoff
+    JOIN fact_video_snapshots l
+      ON l.video_id = g.video_id AND l.snapshot_at = g.last_snapshot_at AND l.snapshot_at < cutoff
+    ON CONFLICT (video_id, day) DO UPDATE SET
+        title = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.title ELSE d.title END,
+        channel_id = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.channel_id ELSE d.channel_id END,
+        channel_name = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.channel_name ELSE d.channel_name END,
+        category_id = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.category_id ELSE d.category_id END,
+        category_name = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.category_name ELSE d.category_name END,
+        published_at = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.published_at ELSE d.published_at END,
+        duration_sec = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.duration_sec ELSE d.duration_sec END,
+        is_shorts = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.is_shorts ELSE d.is_shorts END,
+        thumbnail_url = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.thumbnail_url ELSE d.thumbnail_url END,
+        hours_mask = d.hours_mask | EXCLUDED.hours_mask,
+        snapshot_count = length(replace((d.hours_mask | EXCLUDED.hours_mask)::BIT(24)::TEXT, '0', '')),
+        first_snapshot_at = LEAST(d.first_snapshot_at, EXCLUDED.first_snapshot_at),
+        last_snapshot_at = GREATEST(d.last_snapshot_at, EXCLUDED.last_snapshot_at),
+        best_rank = LEAST(d.best_rank, EXCLUDED.best_rank),
+        worst_rank = GREATEST(d.worst_rank, EXCLUDED.worst_rank),
+        last_rank = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.last_rank ELSE d.last_rank END,
+        prev_rank = CASE WHEN EXCLUDED.first_snapshot_at < d.first_snapshot_at THEN EXCLUDED.prev_rank ELSE d.prev_rank END,
+        first_view_count = CASE WHEN EXCLUDED.first_snapshot_at < d.first_snapshot_at THEN EXCLUDED.first_view_count ELSE d.first_view_count END,
+        last_view_count = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.last_view_count ELSE d.last_view_count END,
+        max_view_count = GREATEST(d.max_view_count, EXCLUDED.max_view_count),
+        prev_view_count = CASE WHEN EXCLUDED.first_snapshot_at < d.first_snapshot_at THEN EXCLUDED.prev_view_count ELSE d.prev_view_count END,
+        like_count = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.like_count ELSE d.like_count END,
+        comment_count = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.comment_count ELSE d.comment_count END,
+        engagement_rate = CASE WHEN EXCLUDED.last_snapshot_at >= d.last_snapshot_at THEN EXCLUDED.engagement_rate ELSE d.engagement_rate END,
+        max_view_velocity = GREATEST(d.max_view_velocity, EXCLUDED.max_view_velocity),
+        updated_at = NOW();
+
+    GET DIAGNOSTICS daily_rows = ROW_COUNT;
+
+    -- 보관 기간이 모두 지난 월 파티션 (0009: fact_video_snapshots_pYYYY_MM)은 통째로 삭제
+    FOR p IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'fact_video_snapshots'::regclass
+          AND c.relname ~ '^fact_video_snapshots_p[0-9]{4}_[0-9]{2}$'
+          AND (to_date(right(c.relname, 7), 'YYYY_MM') + interval '1 month') AT TIME ZONE 'UTC' <= cutoff
+    LOOP
+        EXECUTE format('DROP TABLE %I', p.relname);
+        dropped := dropped + 1;
+    END LOOP;
+
+    -- 경계 월 파티션, _default 파티션 (파티션되지 않은 테이블이면 전체)
+    DELETE FROM fact_video_snapshots WHERE snapshot_at < cutoff;
+
+    RETURN jsonb_build_object(
+        'cutoff', cutoff, 'days', days, 'hourly_rows', hourly_rows,
+        'daily_rows', daily_rows, 'partitions_dropped', dropped, 'dry_run', dry_run
+    );
+END;
+$$;
+
+-- 이미 접힌 행 보정
+UPDATE fact_video_daily
+SET snapshot_count = length(replace(hours_mask::BIT(24)::TEXT, '0', '')),
+    updated_at = NOW()
+WHERE snapshot_count <> length(replace(hours_mask::BIT(24)::TEXT, '0', ''));
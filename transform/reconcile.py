@@ -0,0 +1,141 @@
+"""
+Reconcile CLI - 날짜 범위의 누락/실패 변환 파일을 찾아 배치로 다시 처리합니다.
+
+trigger_missing.py(누락), retrigger_failed.py(실패)의 rewrite 트리거 방식을 대체합니다.
+실행이 끝나면 hour 파티션별 커버리지 리포트를 출력합니다.
+--since-watermark는 날짜 범위 대신 watermark 이후 파티션과 holes만 확인하고, 결과로 watermark를 올립니다.
+
+Examples:
+    python reconcile.py --start-date=2026-01-12 --end-date=2026-01-13 --dry-run
+    python reconcile.py --start-date=2026-01-12 --data-types=videos_list,comment_threads
+    python reconcile.py --all-dates --only=failed --report=coverage.json
+    python reconcile.py --since-watermark
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.clients import get_bucket, get_supabase_client
+from app.backfill import discover_date_range
+from app.reconcile import GAP_KINDS, Reconciler, format_report
+from app.transformers import TRANSFORM_SPECS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "plosind-youtube-raw-data")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Reconcile missing/failed transforms")
+
+    dates = parser.add_mutually_exclusive_group(required=True)
+    dates.add_argument("--start-date", help="시작 날짜 (YYYY-MM-DD)")
+    dates.add_argument("--all-dates", action="store_true", help="GCS에 있는 전체 날짜 파티션")
+    dates.add_argument(
+        "--since-watermark",
+        action="store_true",
+        help="watermark 이후 파티션과 holes만 확인하고 watermark 갱신 (transform_watermarks)",
+    )
+
+    parser.add_argument("--end-date", help="종료 날짜 (기본: 시작 날짜와 동일)")
+    parser.add_argument(
+        "--data-types",
+        default=",".join(TRANSFORM_SPECS.keys()),
+        help="쉼표 구분 데이터 타입 (기본: 전체)",
+    )
+    parser.add_argument("--region", default=os.getenv("YOUTUBE_REGION_CODE", "KR"), help="리전 파티션")
+    parser.add_argument(
+        "--only",
+        default=",".join(GAP_KINDS),
+        help="재처리할 공백 종류 (missing: 기록 없음, failed: error 기록만 있음)",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="병렬 조회/다운로드 수")
+    parser.add_argument("--flush-rows", type=int, default=5000, help="테이블별 적재 묶음 크기")
+    parser.add_argument("--engine", choices=["columnar", "python"], default="columnar", help="영상 변환 엔진")
+    parser.add_argument("--dry-run", action="store_true", help="커버리지 리포트만 출력하고 재처리하지 않음")
+    parser.add_argument("--report", help="파티션별 커버리지 리포트(JSON)를 저장할 경로")
+    parser.add_argument("--show-complete", action="store_true", help="공백이 없는 파티션도 표에 출력")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 함수"""
+    args = parse_args(argv)
+
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        logger.error("SUPABASE_URL or SUPABASE_SERVICE_KEY is missing in .env")
+        return 1
+
+    data_types = [t.strip() for t in args.data_types.split(",") if t.strip()]
+    only = [k.strip() for k in args.only.split(",") if k.strip()]
+    unknown = [t for t in data_types if t not in TRANSFORM_SPECS] + [k for k in only if k not in GAP_KINDS]
+    if unknown:
+        logger.error(f"Unknown data types or gap kinds: {unknown}")
+        return 1
+
+    bucket = get_bucket(GCS_BUCKET_NAME)
+    supabase_client = get_supabase_client()
+
+    reconciler = Reconciler(
+        supabase_client,
+        bucket,
+        workers=args.workers,
+        flush_rows=args.flush_rows,
+        engine=args.engine,
+        only=only,
+    )
+
+    if args.since_watermark:
+        logger.info(f"Reconciling since watermark ({', '.join(data_types)})")
+        report = reconciler.scan_since_watermark(data_types, args.region)
+        if not args.dry_run:
+            report = reconciler.advance_watermarks(reconciler.repair(report))
+        return print_report(report, args)
+
+    if args.all_dates:
+        ranges = [r for r in (discover_date_range(bucket, t, args.region) for t in data_types) if r]
+        if not ranges:
+            logger.error("No date partitions found in GCS")
+            return 1
+        start_date, end_date = min(r[0] for r in ranges), max(r[1] for r in ranges)
+    else:
+        start_date, end_date = args.start_date, args.end_date or args.start_date
+
+    logger.info(f"Reconciling {start_date} ~ {end_date} ({', '.join(data_types)})")
+    report = reconciler.scan(data_types, start_date, end_date, args.region)
+    if not args.dry_run:
+        report = reconciler.repair(report)
+    return print_report(report, args)
+
+
+def print_report(report, args: argparse.Namespace) -> int:
+    """리포트를 저장/출력하고 종료 코드를 반환합니다. (재처리 후에도 실패가 남으면 1)"""
+    result = report.to_dict()
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        logger.info(f"Coverage report saved: {args.report}")
+
+    print(format_report(report, show_complete=args.show_complete))
+    print(json.dumps({k: v for k, v in result.items() if k != "partitions"}, indent=2, ensure_ascii=False))
+    return 0 if result["still_failing"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
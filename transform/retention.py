@@ -0,0 +1,97 @@
+"""
+Snapshot Retention CLI - 보관 기간이 지난 시간별 스냅샷을 일별 영상 집계로 접습니다.
+
+fact_video_snapshots의 --days(SNAPSHOT_RETENTION_DAYS)일 이전 UTC 날짜를 fact_video_daily로 합치고
+시간별 행은 삭제합니다. (migrations/0010, rollup_video_snapshots)
+원본은 GCS raw 레이어이므로 시간별 행이 다시 필요하면 reconcile/backfill로 재처리합니다.
+실행 후 다음 달 스냅샷 파티션도 미리 만들어 둡니다. (0009, create_snapshot_partitions)
+
+하루 한 번 실행하면 됩니다. (월 파티션 DROP 동안 적재가 잠시 대기하므로 적재가 적은 시간 권장)
+
+Examples:
+    python retention.py --dry-run
+    python retention.py --days=45
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.clients import get_supabase_client
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+
+# 시간 단위로 보관할 최근 일수 (그 이전 날짜는 일 단위)
+SNAPSHOT_RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", "30"))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Roll old hourly video snapshots into daily aggregates")
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=SNAPSHOT_RETENTION_DAYS,
+        help=f"시간 단위로 보관할 최근 일수 (기본: SNAPSHOT_RETENTION_DAYS={SNAPSHOT_RETENTION_DAYS})",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="접을 날짜/행 수만 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 함수"""
+    args = parse_args(argv)
+
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        logger.error("SUPABASE_URL or SUPABASE_SERVICE_KEY is missing in .env")
+        return 1
+
+    if args.days < 1:
+        logger.error(f"--days must be at least 1: {args.days}")
+        return 1
+
+    supabase_client = get_supabase_client()
+    now = datetime.now(timezone.utc)
+    before = now - timedelta(days=args.days)
+
+    logger.info(f"Rolling up hourly snapshots before {before.date()} (retention {args.days} days, dry_run={args.dry_run})")
+    result = supabase_client.rpc(
+        "rollup_video_snapshots",
+        {"before": before.isoformat(), "dry_run": args.dry_run},
+    ).execute().data
+
+    logger.info(
+        f"{result['hourly_rows']} hourly rows over {result['days']} days -> "
+        f"{result['daily_rows']} daily rows, {result['partitions_dropped']} partitions dropped"
+    )
+
+    if not args.dry_run:
+        created = supabase_client.rpc(
+            "create_snapshot_partitions",
+            {"start_at": now.isoformat(), "end_at": (now + timedelta(days=31)).isoformat()},
+        ).execute().data
+        result["partitions_created"] = created
+        if created:
+            logger.info(f"Created {created} snapshot partitions")
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Retry Worker CLI / Cloud Run Job 진입점
+transform_handler가 재시도 큐에 등록한 실패 파일을 백오프 후 자동으로 다시 처리합니다.
+
+Examples:
+    python retry_worker.py                          # 재시도 시각이 된 항목을 모두 처리하고 종료 (스케줄 실행용)
+    python retry_worker.py --loop --poll-seconds=30 # 계속 실행
+    python retry_worker.py --stats
+    python retry_worker.py --requeue-dead           # 원인 수정 후 dead 항목 다시 시도
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+
+from dotenv import load_dotenv
+
+from app.core.clients import get_bucket, get_supabase_client
+from app.core.retry_queue import RETRY_LEASE_SECONDS, RetryQueue
+from app.retry_worker import RetryWorker
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "plosind-youtube-raw-data")
+
+
+def parse_args() -> argparse.Namespace:
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Transform retry queue worker")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 처리할 파일 수")
+    parser.add_argument("--lease-seconds", type=int, default=RETRY_LEASE_SECONDS, help="항목 임대 시간")
+    parser.add_argument("--max-seconds", type=float, help="한 번 실행의 최대 처리 시간")
+    parser.add_argument("--loop", action="store_true", help="큐가 비어도 종료하지 않고 계속 대기")
+    parser.add_argument("--poll-seconds", type=float, default=30, help="--loop에서 큐를 다시 확인하는 간격")
+    parser.add_argument("--stats", action="store_true", help="상태별 항목 수만 출력")
+    parser.add_argument("--requeue-dead", action="store_true", help="dead 항목을 pending으로 되돌림")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """메인 함수"""
+    args = parse_args()
+
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        logger.error("SUPABASE_URL or SUPABASE_SERVICE_KEY is missing in .env")
+        return 1
+
+    supabase_client = get_supabase_client()
+    queue = RetryQueue(supabase_client)
+
+    if args.stats:
+        print(json.dumps(queue.stats(), indent=2))
+        return 0
+
+    if args.requeue_dead:
+        logger.info(f"Requeued {queue.requeue_dead()} dead items")
+        return 0
+
+    worker = RetryWorker(
+        supabase_client,
+        get_bucket(GCS_BUCKET_NAME),
+        concurrency=args.concurrency,
+        lease_seconds=args.lease_seconds,
+    )
+
+    while True:
+        summary = worker.drain(max_seconds=args.max_seconds)
+        if not args.loop:
+            break
+        time.sleep(args.poll_seconds)
+
+    print(json.dumps(summary.to_dict(), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Batch Transform CLI / Cloud Run Job 진입점
+여러 GCS 파일을 한 번의 실행에서 변환하여 Supabase에 적재합니다.
+
+Examples:
+    python run_batch.py --start-date=2026-01-12 --end-date=2026-01-13
+    python run_batch.py --start-date=2026-01-12 --data-types=videos_list,comment_threads
+    python run_batch.py --prefix=raw/youtube/videos_list/region=KR/date=2026-01-12/
+    python run_batch.py --manifest=gs://bucket/raw/youtube/videos_list/.../run_id=xxx/_metadata.json
+    python run_batch.py --since-watermark --data-types=videos_list,comment_threads
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+from app.core.clients import get_bucket, get_supabase_client
+from app.core.utils import extract_metadata_from_path
+from app.core.watermarks import Watermark, WatermarkStore, floor_partition, partition_start, settled_cutoff
+from app.batch import (
+    BatchRunner, BatchSummary, build_partition_prefixes, list_blob_paths, list_since_watermark, read_manifest,
+)
+from app.backfill import first_partition
+from app.transformers import TRANSFORM_SPECS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "plosind-youtube-raw-data")
+
+
+def parse_args() -> argparse.Namespace:
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Batch transform runner")
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--prefix", help="처리할 GCS prefix (예: raw/youtube/videos_list/region=KR/date=2026-01-12/)")
+    source.add_argument("--start-date", help="시작 날짜 (YYYY-MM-DD)")
+    source.add_argument("--manifest", help="파일 목록(JSON/텍스트) 또는 run 디렉토리의 _metadata.json 경로")
+    source.add_argument(
+        "--since-watermark",
+        action="store_true",
+        help="watermark 이후 파티션과 holes만 처리하고 watermark 갱신 (transform_watermarks)",
+    )
+
+    parser.add_argument("--end-date", help="종료 날짜 (기본: 시작 날짜와 동일)")
+    parser.add_argument(
+        "--data-types",
+        default=",".join(TRANSFORM_SPECS.keys()),
+        help="쉼표 구분 데이터 타입 (기본: 전체)",
+    )
+    parser.add_argument("--region", default=os.getenv("YOUTUBE_REGION_CODE", "KR"), help="리전 파티션")
+    parser.add_argument("--workers", type=int, default=8, help="병렬 다운로드 수")
+    parser.add_argument("--flush-rows", type=int, default=5000, help="테이블별 적재 묶음 크기")
+    parser.add_argument("--reprocess", action="store_true", help="이미 처리된 파일도 다시 처리")
+    parser.add_argument("--dry-run", action="store_true", help="대상 파일 수만 확인")
+    parser.add_argument(
+        "--engine",
+        choices=["columnar", "python"],
+        default="columnar",
+        help="영상 변환 엔진 (columnar: 페이지 묶음 열 단위, python: 페이지별 행 단위)",
+    )
+
+    return parser.parse_args()
+
+
+def advance_watermarks(
+    store: WatermarkStore,
+    checked: Dict[str, Tuple[Watermark, List[datetime], List[str]]],
+    summary: BatchSummary,
+    now: datetime
+) -> None:
+    """처리 결과로 watermark를 올립니다. (실패 파일이 하나라도 있는 파티션은 미완료)"""
+    failed = {error["file_path"] for error in summary.errors}
+
+    for data_type, (mark, partitions, paths) in checked.items():
+        complete = {partition: True for partition in partitions}
+        for path in paths:
+            if path in failed:
+                complete[partition_start(data_type, extract_metadata_from_path(path))] = False
+        store.save(mark.advance(complete, settled_cutoff(data_type, now)))
+
+
+def main() -> int:
+    """메인 함수"""
+    args = parse_args()
+
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        logger.error("SUPABASE_URL or SUPABASE_SERVICE_KEY is missing in .env")
+        return 1
+
+    bucket = get_bucket(GCS_BUCKET_NAME)
+    supabase_client = get_supabase_client()
+
+    data_types = [t.strip() for t in args.data_types.split(",") if t.strip()]
+    unknown = [t for t in data_types if t not in TRANSFORM_SPECS]
+    if unknown:
+        logger.error(f"Unknown data types: {unknown}")
+        return 1
+
+    now = datetime.now(timezone.utc)
+    store = WatermarkStore(supabase_client)
+    checked: Dict[str, Tuple[Watermark, List[datetime], List[str]]] = {}
+
+    if args.prefix:
+        blob_paths = list_blob_paths(bucket, [args.prefix], workers=args.workers)
+    elif args.manifest:
+        blob_paths = read_manifest(bucket, args.manifest)
+    elif args.since_watermark:
+        blob_paths = []
+        for data_type in [t for t in TRANSFORM_SPECS if t in data_types]:
+            mark = store.get(data_type, args.region)
+            start = None if mark.watermark else first_partition(bucket, data_type, args.region)
+            if mark.watermark is None and start is None:
+                continue
+            partitions, paths = list_since_watermark(
+                bucket, mark, floor_partition(data_type, now), start, args.region, workers=args.workers
+            )
+            logger.info(f"{data_type}: {len(partitions)} partitions since watermark, {len(paths)} files")
+            checked[data_type] = (mark, partitions, paths)
+            blob_paths.extend(paths)
+    else:
+        prefixes = build_partition_prefixes(data_types, args.start_date, args.end_date or args.start_date, args.region)
+        blob_paths = list_blob_paths(bucket, prefixes, workers=args.workers)
+
+    logger.info(f"Found {len(blob_paths)} files to consider")
+
+    runner = BatchRunner(
+        supabase_client,
+        bucket,
+        workers=args.workers,
+        flush_rows=args.flush_rows,
+        skip_processed=not args.reprocess,
+        dry_run=args.dry_run,
+        engine=args.engine,
+    )
+    summary = runner.run(blob_paths)
+    if checked and not args.dry_run:
+        advance_watermarks(store, checked, summary, now)
+
+    print(json.dumps(summary.to_dict(), indent=2, ensure_ascii=False))
+    return 0 if summary.files_failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Pytest 설정 및 공통 Fixtures
+"""
+import sys
+from pathlib import Path
+
+# transform 루트를 sys.path에 추가 (app 패키지 import)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
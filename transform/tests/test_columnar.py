@@ -0,0 +1,109 @@
+"""
+Columnar Transformer 회귀 테스트
+
+테스트 대상:
+1. build_video_batch - build_video_records와 레코드가 값/타입까지 완전히 같음
+"""
+from typing import Any, Dict, List
+
+from app.core.decoding import convert_items
+from app.transformers import build_video_records
+from app.transformers.columnar import build_video_batch
+
+CATEGORY_MAP = {"10": "Music", "20": "Gaming"}
+
+
+def video_item(video_id: str, **overrides: Any) -> Dict[str, Any]:
+    """videos.list item (overrides: duration, publishedAt, viewCount, likeCount, commentCount, categoryId)"""
+    return {
+        "id": video_id,
+        "snippet": {
+            "title": f"title {video_id}",
+            "channelId": "c1",
+            "channelTitle": "channel",
+            "categoryId": overrides.get("categoryId", "10"),
+            "publishedAt": overrides.get("publishedAt", "2026-01-10T03:00:00Z"),
+            "tags": ["a", "b"],
+            "thumbnails": {"high": {"url": f"https://i.ytimg.com/{video_id}.jpg"}},
+        },
+        "statistics": {
+            "viewCount": overrides.get("viewCount", "12345"),
+            "likeCount": overrides.get("likeCount", "100"),
+            "commentCount": overrides.get("commentCount", "7"),
+        },
+        "contentDetails": {"duration": overrides.get("duration", "PT3M20S")},
+    }
+
+
+def edge_case_pages() -> List[tuple]:
+    """행 단위 변환기와 어긋나기 쉬운 값을 담은 페이지 (page_001, page_002)"""
+    first = [
+        video_item("day_duration", duration="P1DT2H"),
+        video_item("hours_duration", duration="PT1H2M3S"),
+        video_item("shorts", duration="PT59S"),
+        video_item("no_duration", duration=None),
+        video_item("fractional_seconds", publishedAt="2026-01-11T22:59:59.999999Z"),
+        video_item("kst_offset", publishedAt="2026-01-12T09:30:00+09:00"),
+        video_item("future_published", publishedAt="2026-01-12T23:00:00Z"),
+    ]
+    second = [
+        video_item("views_none", viewCount=None),
+        video_item("views_fractional", viewCount="1.5"),
+        video_item("views_zero", viewCount="0", likeCount="0", commentCount="0"),
+        video_item("views_int", viewCount=999, likeCount=None),
+        video_item("unknown_category", categoryId="99"),
+        video_item("empty_category", categoryId=""),
+    ]
+    return [
+        (convert_items("videos_list", first), {"date": "2026-01-12", "hour": "10", "page": 1}),
+        (convert_items("videos_list", second), {"date": "2026-01-12", "hour": "10", "page": "2"}),
+    ]
+
+
+def typed(records: List[Dict[str, Any]]) -> List[Dict[str, tuple]]:
+    """값과 타입을 함께 비교 (1 == 1.0 == True 구분)"""
+    return [{key: (type(value), value) for key, value in record.items()} for record in records]
+
+
+class TestBuildVideoBatch:
+    """열 단위 엔진과 행 단위 변환기 결과 비교"""
+
+    def test_matches_row_transform_with_types(self):
+        """엣지 케이스를 포함한 모든 레코드가 값과 타입까지 같음"""
+        pages = edge_case_pages()
+        expected = [build_video_records(items, metadata, CATEGORY_MAP) for items, metadata in pages]
+
+        actual = build_video_batch(pages, CATEGORY_MAP)
+
+        assert [typed(page) for page in actual] == [typed(page) for page in expected]
+
+    def test_page_offsets_give_run_global_ranks(self):
+        """page_002의 첫 영상은 51위 (행 단위 변환기와 같은 순위)"""
+        pages = edge_case_pages()
+
+        actual = build_video_batch(pages, CATEGORY_MAP)
+
+        assert [r["trending_rank"] for r in actual[0]] == list(range(1, 8))
+        assert [r["trending_rank"] for r in actual[1]] == list(range(51, 57))
+
+    def test_edge_case_values(self):
+        """duration/조회수 엣지 케이스가 safe_int, parse_duration 규칙대로 변환됨"""
+        pages = edge_case_pages()
+
+        records = {r["video_id"]: r for page in build_video_batch(pages, CATEGORY_MAP) for r in page}
+
+        assert records["day_duration"]["duration_sec"] == 0
+        assert records["hours_duration"]["duration_sec"] == 3723
+        assert records["shorts"]["is_shorts"] is True
+        assert records["views_none"]["view_count"] == 0
+        assert records["views_fractional"]["view_count"] == 0
+        assert records["views_zero"]["engagement_rate"] == 0
+        assert type(records["views_zero"]["engagement_rate"]) is int
+        assert records["kst_offset"]["hours_since_published"] == 9
+        assert records["unknown_category"]["category_name"] == "Unknown"
+
+    def test_empty_batch(self):
+        """빈 페이지도 행 단위 변환기와 같이 빈 목록"""
+        pages = [([], {"date": "2026-01-12", "hour": "10", "page": 1})]
+
+        assert build_video_batch(pages, CATEGORY_MAP) == [[]]
@@ -0,0 +1,150 @@
+"""
+Database 쓰기 유닛 테스트
+
+테스트 대상:
+1. is_unapplied_write_error - 적용되지 않은 것이 확실한 오류 판별
+2. write_chunked / insert_records / upsert_records - 실패 청크 재시도 범위
+"""
+from typing import Any, Dict, List
+
+import pytest
+
+from app.core import database
+from app.core.database import PartialWriteError, insert_records, is_unapplied_write_error, upsert_records
+
+
+class ConnectError(Exception):
+    """httpx.ConnectError와 같은 이름 (요청 전송 전 실패)"""
+
+
+class ReadTimeout(Exception):
+    """httpx.ReadTimeout과 같은 이름 (요청은 보냈고 응답을 받지 못함)"""
+
+
+class APIError(Exception):
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.code = code
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(status_code)
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class FlakyClient:
+    """처음 failures번의 쓰기 요청은 error로 실패하고 이후에는 성공하는 클라이언트"""
+
+    def __init__(self, error: Exception, failures: int = 1):
+        self.error = error
+        self.failures = failures
+        self.sent: List[List[Dict[str, Any]]] = []
+
+    def table(self, name):
+        return self
+
+    def insert(self, rows):
+        return self._request(rows)
+
+    def upsert(self, rows, on_conflict=None):
+        return self._request(rows)
+
+    def _request(self, rows):
+        client = self
+
+        class Query:
+            def execute(self):
+                client.sent.append(rows)
+                if len(client.sent) <= client.failures:
+                    raise client.error
+                return _Result(rows)
+
+        return Query()
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(database.time, "sleep", lambda seconds: None)
+
+
+class TestIsUnappliedWriteError:
+    """재시도해도 중복되지 않는 오류 판별"""
+
+    @pytest.mark.parametrize("error", [
+        ConnectionRefusedError(),
+        ConnectError("refused"),
+        APIError("40001"),
+        APIError("PGRST000"),
+        HTTPStatusError(429),
+        HTTPStatusError(503),
+    ])
+    def test_unapplied(self, error):
+        """연결 전 실패, 롤백된 문장, 게이트웨이 거절은 적용되지 않음"""
+        assert is_unapplied_write_error(error) is True
+
+    @pytest.mark.parametrize("error", [
+        ReadTimeout("no response"),
+        ConnectionResetError(),
+        HTTPStatusError(502),
+        APIError("23505"),
+        RuntimeError("unknown"),
+    ])
+    def test_possibly_applied(self, error):
+        """응답을 받지 못했거나 알 수 없는 오류는 적용되었을 수 있음"""
+        assert is_unapplied_write_error(error) is False
+
+
+class TestWriteRetries:
+    """insert / upsert 재시도 범위"""
+
+    def test_insert_not_retried_when_response_lost(self):
+        """응답을 받지 못한 insert 청크는 다시 보내지 않음 (중복 행 방지)"""
+        client = FlakyClient(ReadTimeout("no response"))
+
+        with pytest.raises(PartialWriteError) as exc:
+            insert_records(client, "processed_files", [{"file_path": "a"}, {"file_path": "b"}])
+
+        assert len(client.sent) == 1
+        assert exc.value.written == 0
+        assert exc.value.failed == 2
+
+    def test_insert_retried_when_not_sent(self):
+        """연결을 맺지 못한 insert 청크는 재시도"""
+        client = FlakyClient(ConnectError("refused"))
+
+        written = insert_records(client, "processed_files", [{"file_path": "a"}])
+
+        assert written == 1
+        assert len(client.sent) == 2
+
+    def test_upsert_retried_on_any_error(self):
+        """upsert는 멱등하므로 응답을 받지 못해도 재시도"""
+        client = FlakyClient(ReadTimeout("no response"))
+
+        written = upsert_records(client, "fact_video_snapshots", [{"video_id": "a"}], on_conflict="video_id")
+
+        assert written == 1
+        assert len(client.sent) == 2
+
+    def test_only_unapplied_chunks_retried(self):
+        """여러 청크 중 재시도 가능한 청크만 다시 보내고, 나머지는 실패로 집계"""
+        errors = {0: ReadTimeout("lost"), 1: ConnectError("refused")}
+
+        def send(chunk):
+            error = errors.pop(chunk[0]["n"], None)
+            if error:
+                raise error
+            return len(chunk)
+
+        records = [{"n": n} for n in range(3)]
+        with pytest.raises(PartialWriteError) as exc:
+            database.write_chunked("t", records, send, max_rows=1, parallelism=1, retry_if=is_unapplied_write_error)
+
+        assert exc.value.written == 2
+        assert exc.value.failed == 1
@@ -0,0 +1,85 @@
+"""
+Lake Compaction 유닛 테스트
+
+테스트 대상:
+1. DayCompactor.compact - 이미 압축된 날짜 건너뛰기 / 읽기 오류가 남은 날짜 다시 압축
+"""
+import json
+from typing import Dict
+
+from app.lake import DayCompactor
+
+DAY = "2026-01-12"
+RUN = f"raw/youtube/videos_list/region=KR/date={DAY}/hour=00/run_id=r1"
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+
+    def exists(self) -> bool:
+        return self.name in self.bucket.objects
+
+    def download_as_bytes(self) -> bytes:
+        return self.bucket.objects[self.name]
+
+    def upload_from_string(self, data, content_type=None) -> None:
+        self.bucket.objects[self.name] = data.encode() if isinstance(data, str) else data
+
+    def delete(self) -> None:
+        self.bucket.objects.pop(self.name, None)
+
+
+class FakeBucket:
+    """메모리 객체 저장소"""
+
+    name = "bkt"
+
+    def __init__(self, objects: Dict[str, bytes]):
+        self.objects = dict(objects)
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+    def list_blobs(self, prefix: str = ""):
+        return [FakeBlob(self, n) for n in sorted(self.objects) if n.startswith(prefix)]
+
+
+def video_page(video_id: str) -> bytes:
+    return json.dumps({"items": [{
+        "id": video_id,
+        "snippet": {"title": "t", "channelId": "c1", "channelTitle": "ch", "categoryId": "10",
+                    "publishedAt": "2026-01-10T03:00:00Z"},
+        "statistics": {"viewCount": "1000", "likeCount": "10", "commentCount": "5"},
+        "contentDetails": {"duration": "PT1M5S"},
+    }]}).encode()
+
+
+class TestDayCompactor:
+    """날짜 단위 Parquet 압축"""
+
+    def test_unchanged_day_is_skipped(self):
+        """원본 파일 수가 같고 실패 파일이 없으면 다시 쓰지 않음"""
+        bucket = FakeBucket({f"{RUN}/page_001.json": video_page("a"), f"{RUN}/page_002.json": video_page("b")})
+        compactor = DayCompactor(bucket, workers=1)
+        compactor.compact("videos_list", DAY)
+
+        result = compactor.compact("videos_list", DAY)
+
+        assert result["status"] == "skipped"
+
+    def test_day_with_failed_files_is_compacted_again(self):
+        """읽지 못한 페이지가 있던 날짜는 원본 파일 수가 같아도 다시 압축해 빠진 행을 채움"""
+        bucket = FakeBucket({f"{RUN}/page_001.json": video_page("a"), f"{RUN}/page_002.json": b"{broken"})
+        compactor = DayCompactor(bucket, workers=1)
+        first = compactor.compact("videos_list", DAY)
+        bucket.objects[f"{RUN}/page_002.json"] = video_page("b")
+
+        second = compactor.compact("videos_list", DAY)
+
+        assert first["status"] == "partial"
+        assert first["rows"] == 1
+        assert second["status"] == "compacted"
+        assert second["rows"] == 2
+        assert second["failed_files"] == []
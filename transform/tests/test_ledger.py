@@ -0,0 +1,76 @@
+"""
+Processed File Ledger 유닛 테스트
+
+테스트 대상:
+1. load_processed - 같은 file_path가 여러 행일 때 페이지 경계에서 누락/중복 없음
+"""
+from typing import Any, Dict, List
+
+from app.core.ledger import ProcessedFileLedger
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class UnstableOrderClient:
+    """
+    ORDER BY 키가 같은 행의 순서를 요청마다 바꿔 돌려주는 클라이언트
+
+    Postgres는 정렬 키가 같은 행의 순서를 보장하지 않으므로, 고유 키까지 정렬하지 않으면
+    offset 페이지네이션에서 행이 빠지거나 두 번 나올 수 있습니다.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+        self.requests = 0
+
+    def table(self, name):
+        client = self
+
+        class Query:
+            def __init__(self):
+                self.orders: List[str] = []
+                self.bounds = (0, len(client.rows))
+
+            def select(self, columns):
+                return self
+
+            def like(self, key, pattern):
+                return self
+
+            def in_(self, key, values):
+                return self
+
+            def order(self, key):
+                self.orders.append(key)
+                return self
+
+            def range(self, start, end):
+                self.bounds = (start, end + 1)
+                return self
+
+            def execute(self):
+                client.requests += 1
+                rows = client.rows if client.requests % 2 else list(reversed(client.rows))
+                rows = sorted(rows, key=lambda r: tuple(r[k] for k in self.orders))
+                return _Result([dict(r) for r in rows[self.bounds[0]:self.bounds[1]]])
+
+        return Query()
+
+
+class TestLoadProcessed:
+    """processed_files 페이지네이션"""
+
+    def test_duplicate_paths_across_pages_returned_once(self):
+        """재처리로 같은 file_path 행이 여러 개여도 모든 행이 한 번씩 조회됨"""
+        rows = [
+            {"id": i, "file_path": f"raw/youtube/videos_list/page_{i // 3:03d}.json", "status": "success"}
+            for i in range(10)
+        ]
+        ledger = ProcessedFileLedger(UnstableOrderClient(rows), page_size=2)
+
+        loaded = ledger.load_processed("raw/youtube/videos_list/")
+
+        assert sorted(r["id"] for r in loaded) == list(range(10))
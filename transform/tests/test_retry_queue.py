@@ -0,0 +1,298 @@
+"""
+Retry Queue / Retry Worker 유닛 테스트
+
+테스트 대상:
+1. classify_error - transient / poison 분류
+2. backoff_seconds - 지수 백오프 + equal jitter
+3. RetryQueue.mark_failed / enqueue_failure - pending → dead 전환
+4. RetryWorker.process / drain - 결과 기록 실패가 drain을 멈추지 않음
+"""
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import msgspec
+import pytest
+
+from app.core import retry_queue
+from app.core.database import PartialWriteError
+from app.core.retry_queue import POISON, TRANSIENT, RetryQueue, backoff_seconds, classify_error
+from app import retry_worker
+from app.retry_worker import RetryWorker
+
+
+class APIError(Exception):
+    """postgrest.exceptions.APIError와 같은 이름/code 속성을 가진 오류"""
+
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.code = code
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, client, table: str):
+        self.client = client
+        self.table_name = table
+        self.values: Dict[str, Any] = {}
+        self.filters: Dict[str, Any] = {}
+
+    def update(self, values):
+        self.values = values
+        return self
+
+    def eq(self, key, value):
+        self.filters[key] = value
+        return self
+
+    def execute(self):
+        self.client.updates.append((self.table_name, self.filters, self.values))
+        return _Result([])
+
+
+class FakeClient:
+    """table().update().eq() 호출과 rpc 호출을 기록하는 클라이언트"""
+
+    def __init__(self, rpc_data=None):
+        self.updates: List[tuple] = []
+        self.rpcs: List[tuple] = []
+        self.rpc_data = rpc_data
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, name, params):
+        self.rpcs.append((name, params))
+        return type("Query", (), {"execute": lambda _self: _Result(self.rpc_data)})()
+
+
+def item(attempts: int, max_attempts: int = 3) -> Dict[str, Any]:
+    return {"file_path": "raw/youtube/videos_list/page_001.json", "attempts": attempts, "max_attempts": max_attempts}
+
+
+class TestClassifyError:
+    """오류 분류"""
+
+    @pytest.mark.parametrize("error", [
+        ConnectionError("reset"),
+        TimeoutError(),
+        APIError("40001"),
+        APIError("PGRST001"),
+        RuntimeError("unknown"),
+    ])
+    def test_transient(self, error):
+        """네트워크/타임아웃/재시도 가능한 PG 코드/알 수 없는 오류는 transient"""
+        assert classify_error(error) == TRANSIENT
+
+    @pytest.mark.parametrize("error", [
+        msgspec.DecodeError("bad json"),
+        json.JSONDecodeError("bad", "{", 0),
+        KeyError("items"),
+        ValueError("bad value"),
+        APIError("23505"),
+        APIError("42P01"),
+    ])
+    def test_poison(self, error):
+        """손상된 입력, 스키마 불일치, 제약 위반은 poison"""
+        assert classify_error(error) == POISON
+
+    def test_partial_write_uses_cause(self):
+        """PartialWriteError는 원인 오류로 분류"""
+        assert classify_error(PartialWriteError("t", 1, 1, ConnectionError())) == TRANSIENT
+        assert classify_error(PartialWriteError("t", 1, 1, APIError("22P02"))) == POISON
+
+    def test_follows_cause_chain(self):
+        """분류할 수 없는 오류는 __cause__를 따라가 분류"""
+        try:
+            try:
+                raise msgspec.DecodeError("bad")
+            except msgspec.DecodeError as e:
+                raise RuntimeError("wrapped") from e
+        except RuntimeError as wrapped:
+            assert classify_error(wrapped) == POISON
+
+
+class TestBackoffSeconds:
+    """지수 백오프"""
+
+    def test_doubles_within_jitter_range(self, monkeypatch):
+        """jitter 최소(delay/2)와 최대(delay)가 시도마다 두 배로 증가"""
+        monkeypatch.setattr(retry_queue.random, "uniform", lambda low, high: low)
+        assert [backoff_seconds(n, base=10, cap=1000) for n in (1, 2, 3)] == [5, 10, 20]
+
+        monkeypatch.setattr(retry_queue.random, "uniform", lambda low, high: high)
+        assert [backoff_seconds(n, base=10, cap=1000) for n in (1, 2, 3)] == [10, 20, 40]
+
+    def test_capped(self):
+        """상한을 넘지 않음"""
+        assert all(backoff_seconds(n, base=30, cap=900) <= 900 for n in range(1, 20))
+
+
+class TestMarkFailed:
+    """재시도 실패 기록 (pending / dead 전환)"""
+
+    def test_transient_below_max_is_rescheduled(self):
+        """일시적 오류이고 시도 횟수가 남으면 pending, 다음 시도는 미래"""
+        client = FakeClient()
+
+        status = RetryQueue(client).mark_failed(item(attempts=1), ConnectionError("down"))
+
+        [(_, filters, values)] = client.updates
+        assert status == "pending"
+        assert values["status"] == "pending"
+        assert values["error_class"] == TRANSIENT
+        assert values["locked_until"] is None
+        assert datetime.fromisoformat(values["next_attempt_at"]) > datetime.now(timezone.utc)
+        assert filters == {"file_path": item(1)["file_path"]}
+
+    def test_transient_at_max_is_dead(self):
+        """max_attempts에 도달하면 dead"""
+        client = FakeClient()
+
+        status = RetryQueue(client).mark_failed(item(attempts=3, max_attempts=3), ConnectionError("down"))
+
+        assert status == "dead"
+        assert client.updates[0][2]["status"] == "dead"
+
+    def test_poison_is_dead_on_first_attempt(self):
+        """poison은 시도 횟수와 관계없이 바로 dead"""
+        client = FakeClient()
+
+        status = RetryQueue(client).mark_failed(item(attempts=1), ValueError("bad"))
+
+        assert status == "dead"
+        assert client.updates[0][2]["error_class"] == POISON
+
+
+class TestEnqueueFailure:
+    """handler 실패 등록 (enqueue_transform_retry RPC)"""
+
+    def test_passes_classification_and_returns_rpc_status(self):
+        """분류 결과와 max_attempts를 RPC에 넘기고 RPC가 돌려준 상태를 반환"""
+        client = FakeClient(rpc_data="dead")
+
+        status = RetryQueue(client, max_attempts=4).enqueue_failure("a.json", "videos", ValueError("bad"))
+
+        [(name, params)] = client.rpcs
+        assert status == "dead"
+        assert name == "enqueue_transform_retry"
+        assert params["target_path"] == "a.json"
+        assert params["poison"] is True
+        assert params["retry_max_attempts"] == 4
+
+    def test_rpc_failure_returns_none(self):
+        """등록 자체가 실패하면 None (handler 응답은 그대로 error)"""
+        client = FakeClient()
+        client.rpc = lambda name, params: (_ for _ in ()).throw(ConnectionError("down"))
+
+        assert RetryQueue(client).enqueue_failure("a.json", "videos", ConnectionError("x")) is None
+
+
+class FakeQueue:
+    """claim 한 번만 항목을 돌려주고 결과 기록 호출을 남기는 큐"""
+
+    def __init__(self, items, fail_on=()):
+        self.items = list(items)
+        self.fail_on = set(fail_on)
+        self.calls: List[tuple] = []
+
+    def claim(self, batch_size, lease_seconds):
+        items, self.items = self.items, []
+        return items
+
+    def mark_failed(self, item, error):
+        self.calls.append(("mark_failed", item["file_path"]))
+        if "mark_failed" in self.fail_on:
+            raise ConnectionError("queue down")
+        return "pending"
+
+    def mark_succeeded(self, item):
+        self.calls.append(("mark_succeeded", item["file_path"]))
+        if "mark_succeeded" in self.fail_on:
+            raise ConnectionError("queue down")
+
+
+class FakeLedger:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.recorded: List[Dict[str, Any]] = []
+
+    def record_many(self, rows):
+        if self.fail:
+            raise ConnectionError("ledger down")
+        self.recorded.extend(rows)
+
+    def clear_errors(self, paths):
+        pass
+
+
+def make_worker(monkeypatch, transformer, queue, ledger=None) -> RetryWorker:
+    monkeypatch.setattr(retry_worker, "get_transformer_for_path", lambda path: (transformer, "videos"))
+    worker = RetryWorker(FakeClient(), bucket=None, concurrency=2)
+    worker.queue = queue
+    worker.ledger = ledger or FakeLedger()
+    return worker
+
+
+def ok(client, bucket, path, metadata):
+    return {"records_count": 5}
+
+
+def boom(client, bucket, path, metadata):
+    raise ConnectionError("supabase down")
+
+
+class TestRetryWorkerProcess:
+    """항목 처리 결과와 결과 기록 실패 처리"""
+
+    def test_success_records_ledger_and_queue(self, monkeypatch):
+        """성공하면 ledger에 success를 남기고 succeeded로 표시"""
+        queue, ledger = FakeQueue([]), FakeLedger()
+        worker = make_worker(monkeypatch, ok, queue, ledger)
+
+        assert worker.process(item(1)) == ("succeeded", 5, None)
+        assert ledger.recorded[0]["status"] == "success"
+        assert queue.calls == [("mark_succeeded", item(1)["file_path"])]
+
+    def test_transform_failure_uses_mark_failed_status(self, monkeypatch):
+        """변환 실패는 mark_failed가 정한 상태로 보고"""
+        worker = make_worker(monkeypatch, boom, FakeQueue([]))
+
+        status, written, error = worker.process(item(1))
+
+        assert (status, written) == ("pending", 0)
+        assert "supabase down" in error
+
+    def test_mark_failed_error_is_reported_as_rescheduled(self, monkeypatch):
+        """실패 기록 자체가 실패해도 예외를 내보내지 않고 rescheduled (임대 만료 후 다시 임대)"""
+        worker = make_worker(monkeypatch, boom, FakeQueue([], fail_on={"mark_failed"}))
+
+        status, written, error = worker.process(item(1))
+
+        assert (status, written) == ("rescheduled", 0)
+        assert "supabase down" in error and "queue down" in error
+
+    @pytest.mark.parametrize("queue_fail, ledger_fail", [(set(), True), ({"mark_succeeded"}, False)])
+    def test_success_bookkeeping_error_is_reported_as_rescheduled(self, monkeypatch, queue_fail, ledger_fail):
+        """적재 후 ledger/큐 기록이 실패하면 succeeded로 세지 않고 rescheduled"""
+        worker = make_worker(monkeypatch, ok, FakeQueue([], fail_on=queue_fail), FakeLedger(fail=ledger_fail))
+
+        status, written, error = worker.process(item(1))
+
+        assert (status, written) == ("rescheduled", 0)
+        assert "could not record success" in error
+
+    def test_drain_continues_past_bookkeeping_errors(self, monkeypatch):
+        """한 항목의 기록 실패가 나머지 항목 처리를 멈추지 않음"""
+        items = [dict(item(1), file_path=f"raw/youtube/videos_list/page_{n:03d}.json") for n in (1, 2, 3)]
+        worker = make_worker(monkeypatch, boom, FakeQueue(items, fail_on={"mark_failed"}))
+
+        summary = worker.drain()
+
+        assert summary.claimed == 3
+        assert summary.rescheduled == 3
+        assert len(summary.errors) == 3
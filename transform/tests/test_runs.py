@@ -0,0 +1,94 @@
+"""
+Run Transform 유닛 테스트
+
+테스트 대상:
+1. previous_hour_prefix - 이전 hour 파티션 prefix (날짜 넘김 포함)
+2. list_run_files - hour 경계를 넘긴 run의 페이지 목록
+"""
+from typing import List
+
+from app.batch import previous_hour_prefix
+from app.runs import list_run_files
+
+VIDEOS = "raw/youtube/videos_list/region=KR"
+COMMENTS = "raw/youtube/comment_threads/region=KR"
+
+
+class FakeBlob:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FakeBucket:
+    """prefix 목록 조회만 지원하는 버킷 (조회한 prefix 기록)"""
+
+    name = "bkt"
+
+    def __init__(self, names: List[str]):
+        self.names = names
+        self.listed: List[str] = []
+
+    def list_blobs(self, prefix: str = ""):
+        self.listed.append(prefix)
+        return [FakeBlob(n) for n in self.names if n.startswith(prefix)]
+
+
+class TestPreviousHourPrefix:
+    """이전 hour 파티션 prefix"""
+
+    def test_same_day(self):
+        """같은 날짜 안에서는 hour만 1 감소"""
+        assert previous_hour_prefix(f"{VIDEOS}/date=2026-01-12/hour=10/run_id=r1/") == \
+            f"{VIDEOS}/date=2026-01-12/hour=09/run_id=r1/"
+
+    def test_date_rollover_at_hour_00(self):
+        """hour=00이면 전날 hour=23"""
+        assert previous_hour_prefix(f"{COMMENTS}/date=2026-03-01/hour=00/video_id=v1/") == \
+            f"{COMMENTS}/date=2026-02-28/hour=23/video_id=v1/"
+
+    def test_no_hour_partition(self):
+        """hour 파티션이 없는 경로(channels)는 None"""
+        assert previous_hour_prefix("raw/youtube/channels/date=2026-01-12/run_id=r1/") is None
+
+
+class TestListRunFiles:
+    """run 페이지 목록"""
+
+    def test_run_split_across_two_hours(self):
+        """페이지가 이전 hour와 _metadata.json hour에 나뉘어 있으면 두 디렉토리를 합쳐 반환"""
+        earlier = f"{VIDEOS}/date=2026-01-12/hour=23/run_id=r1"
+        later = f"{VIDEOS}/date=2026-01-13/hour=00/run_id=r1"
+        bucket = FakeBucket([
+            f"{earlier}/page_001.json.gz",
+            f"{earlier}/page_002.json.gz",
+            f"{later}/page_003.json.gz",
+            f"{later}/page_004.json.gz",
+            f"{later}/_metadata.json",
+            f"{VIDEOS}/date=2026-01-12/hour=23/run_id=r0/page_001.json.gz",
+        ])
+
+        paths = list_run_files(bucket, f"{later}/_metadata.json", expected=4)
+
+        assert [p.rsplit("/", 1)[1] for p in paths] == [
+            "page_001.json.gz", "page_002.json.gz", "page_003.json.gz", "page_004.json.gz",
+        ]
+        assert all("run_id=r1/" in p for p in paths)
+
+    def test_complete_run_does_not_list_previous_hour(self):
+        """페이지 수가 맞으면 이전 hour는 조회하지 않음"""
+        run = f"{VIDEOS}/date=2026-01-12/hour=10/run_id=r1"
+        bucket = FakeBucket([f"{run}/page_001.json.gz", f"{run}/page_002.json.gz", f"{run}/_metadata.json"])
+
+        paths = list_run_files(bucket, f"{run}/_metadata.json", expected=2)
+
+        assert len(paths) == 2
+        assert bucket.listed == [f"{run}/"]
+
+    def test_still_short_when_pages_missing(self):
+        """이전 hour에도 없으면 찾은 만큼만 반환 (호출자가 IncompleteRunError)"""
+        run = f"{VIDEOS}/date=2026-01-12/hour=10/run_id=r1"
+        bucket = FakeBucket([f"{run}/page_001.json.gz", f"{run}/_metadata.json"])
+
+        paths = list_run_files(bucket, f"{run}/_metadata.json", expected=3)
+
+        assert paths == [f"{run}/page_001.json.gz"]
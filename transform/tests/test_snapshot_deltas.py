@@ -0,0 +1,181 @@
+"""
+Snapshot Deltas 유닛 테스트
+
+테스트 대상:
+1. attach_snapshot_deltas - 순서대로/누락 hour/순서가 뒤바뀐 적재에서 직전 스냅샷 선택
+2. remember_snapshots - 적재 성공 후에만 캐시 갱신
+3. repair_following_deltas - 다음 스냅샷 보정 RPC 호출
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from app.core.snapshot_deltas import (
+    SnapshotCache,
+    attach_snapshot_deltas,
+    remember_snapshots,
+    repair_following_deltas,
+)
+
+BASE = datetime(2026, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def hour(n: int) -> str:
+    return (BASE + timedelta(hours=n)).isoformat()
+
+
+def record(video_id: str, n: int, rank: int, views: int) -> Dict[str, Any]:
+    return {"video_id": video_id, "snapshot_at": hour(n), "trending_rank": rank, "view_count": views}
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeClient:
+    """적재된 스냅샷을 메모리에 두고 previous_video_snapshots / repair RPC를 흉내 내는 클라이언트"""
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+        self.calls: List[tuple] = []
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        self.rows.extend(dict(r) for r in records)
+
+    def rpc(self, name: str, params: Dict[str, Any]):
+        self.calls.append((name, params))
+        if name == "previous_video_snapshots":
+            before = params["before"]
+            latest: Dict[str, Dict[str, Any]] = {}
+            for row in self.rows:
+                if row["video_id"] in params["video_ids"] and row["snapshot_at"] < before:
+                    if row["video_id"] not in latest or row["snapshot_at"] > latest[row["video_id"]]["snapshot_at"]:
+                        latest[row["video_id"]] = row
+            data = [
+                {"video_id": v, "snapshot_at": r["snapshot_at"], "trending_rank": r["trending_rank"], "view_count": r["view_count"]}
+                for v, r in latest.items()
+            ]
+        else:
+            data = len(params["snapshot_times"])
+        return type("Query", (), {"execute": lambda _self: _Result(data)})()
+
+    def lookups(self) -> int:
+        return sum(1 for name, _ in self.calls if name == "previous_video_snapshots")
+
+
+def load(client: FakeClient, cache: SnapshotCache, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """transform_videos와 같은 순서: 변화량 계산 → 적재 → 캐시 갱신"""
+    records = attach_snapshot_deltas(client, records, cache=cache)
+    client.write(records)
+    remember_snapshots(records, cache=cache)
+    return records
+
+
+class TestAttachSnapshotDeltas:
+    """직전 스냅샷 대비 변화량 계산"""
+
+    def test_first_appearance_has_no_delta(self):
+        """직전 스냅샷이 없으면 변화량은 모두 None"""
+        client, cache = FakeClient(), SnapshotCache()
+
+        [row] = load(client, cache, [record("a", 0, 10, 1000)])
+
+        assert row["prev_rank"] is None
+        assert row["rank_change"] is None
+        assert row["view_delta"] is None
+        assert row["minutes_since_prev"] is None
+
+    def test_consecutive_hours_use_cache(self):
+        """바로 이전 hour가 캐시에 있으면 DB 조회 없이 계산"""
+        client, cache = FakeClient(), SnapshotCache()
+        load(client, cache, [record("a", 0, 10, 1000)])
+        lookups = client.lookups()
+
+        [row] = load(client, cache, [record("a", 1, 4, 1500)])
+
+        assert client.lookups() == lookups
+        assert row["prev_rank"] == 10
+        assert row["rank_change"] == 6
+        assert row["view_delta"] == 500
+        assert row["minutes_since_prev"] == 60
+
+    def test_missing_hour_uses_latest_earlier_snapshot(self):
+        """중간 hour가 없으면 그보다 앞선 가장 최근 스냅샷 기준 (간격 120분)"""
+        client, cache = FakeClient(), SnapshotCache()
+        load(client, cache, [record("a", 0, 10, 1000)])
+
+        [row] = load(client, cache, [record("a", 2, 12, 1800)])
+
+        assert row["prev_rank"] == 10
+        assert row["rank_change"] == -2
+        assert row["view_delta"] == 800
+        assert row["minutes_since_prev"] == 120
+
+    def test_out_of_order_load_ignores_newer_cached_snapshot(self):
+        """나중 hour가 먼저 적재되어 캐시에 있어도 과거 hour는 그 이전 스냅샷 기준으로 계산"""
+        client, cache = FakeClient(), SnapshotCache()
+        load(client, cache, [record("a", 0, 10, 1000)])
+        load(client, cache, [record("a", 2, 3, 3000)])
+
+        [row] = load(client, cache, [record("a", 1, 5, 2000)])
+
+        assert row["prev_rank"] == 10
+        assert row["view_delta"] == 1000
+        assert row["minutes_since_prev"] == 60
+
+    def test_out_of_order_load_keeps_latest_in_cache(self):
+        """과거 hour 적재가 캐시의 최신 스냅샷을 덮지 않음"""
+        client, cache = FakeClient(), SnapshotCache()
+        load(client, cache, [record("a", 5, 3, 5000)])
+
+        load(client, cache, [record("a", 1, 9, 1000)])
+
+        assert cache.get("a").snapshot_at == BASE + timedelta(hours=5)
+
+    def test_batch_with_several_hours_chains_within_batch(self):
+        """한 배치에 여러 hour가 섞여 있으면 아직 적재되지 않은 앞 hour 레코드를 직전 스냅샷으로 사용"""
+        client, cache = FakeClient(), SnapshotCache()
+
+        rows = load(client, cache, [record("a", 2, 1, 300), record("a", 0, 3, 100), record("a", 1, 2, 200)])
+
+        by_hour = {r["snapshot_at"]: r for r in rows}
+        assert by_hour[hour(0)]["prev_rank"] is None
+        assert by_hour[hour(1)]["prev_rank"] == 3
+        assert by_hour[hour(1)]["view_delta"] == 100
+        assert by_hour[hour(2)]["prev_rank"] == 2
+        assert by_hour[hour(2)]["view_delta"] == 100
+
+    def test_failed_write_does_not_poison_cache(self):
+        """적재가 실패한 레코드는 캐시에 남지 않아 다음 hour가 DB의 실제 직전 스냅샷을 사용"""
+        client, cache = FakeClient(), SnapshotCache()
+        load(client, cache, [record("a", 0, 10, 1000)])
+
+        # hour 1: 변화량만 계산하고 적재 실패 (write/remember 없음)
+        attach_snapshot_deltas(client, [record("a", 1, 1, 99999)], cache=cache)
+        [row] = load(client, cache, [record("a", 2, 5, 1600)])
+
+        assert row["prev_rank"] == 10
+        assert row["view_delta"] == 600
+        assert row["minutes_since_prev"] == 120
+
+
+class TestRepairFollowingDeltas:
+    """늦게 적재된 hour 뒤 스냅샷 보정 RPC"""
+
+    def test_sends_unique_sorted_times_in_chunks(self, monkeypatch):
+        """고유 스냅샷 시각을 정렬해 REPAIR_CHUNK_SNAPSHOTS개씩 나눠 호출"""
+        monkeypatch.setattr("app.core.snapshot_deltas.REPAIR_CHUNK_SNAPSHOTS", 2)
+        client = FakeClient()
+
+        repaired = repair_following_deltas(client, [hour(2), hour(0), hour(1), hour(0)])
+
+        chunks = [params["snapshot_times"] for name, params in client.calls]
+        assert chunks == [[hour(0), hour(1)], [hour(2)]]
+        assert repaired == 3
+
+    def test_no_times_no_call(self):
+        """적재한 스냅샷이 없으면 호출하지 않음"""
+        client = FakeClient()
+
+        assert repair_following_deltas(client, []) == 0
+        assert client.calls == []
@@ -0,0 +1,126 @@
+"""
+Partition Watermark 유닛 테스트
+
+테스트 대상:
+1. Watermark.pending_partitions - holes + watermark 이후 파티션, 최초 실행 시작 파티션
+2. Watermark.advance - 정착 시간, holes 유지/해소, watermark 역행 방지
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.watermarks import Watermark
+
+BASE = datetime(2026, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def hour(n: int) -> datetime:
+    return BASE + timedelta(hours=n)
+
+
+class TestPendingPartitions:
+    """다음 실행에서 나열할 파티션"""
+
+    def test_holes_and_partitions_after_watermark(self):
+        """이전 holes와 watermark 다음 파티션부터 until까지"""
+        mark = Watermark("videos_list", "KR", watermark=hour(5), holes=[hour(2)])
+
+        pending = mark.pending_partitions(until=hour(7))
+
+        assert pending == [hour(2), hour(6), hour(7)]
+
+    def test_first_run_starts_from_start(self):
+        """watermark가 없으면 start부터 나열"""
+        mark = Watermark("videos_list", "KR")
+
+        pending = mark.pending_partitions(until=hour(2), start=hour(0))
+
+        assert pending == [hour(0), hour(1), hour(2)]
+
+    def test_first_run_without_start_raises(self):
+        """watermark도 start도 없으면 시작 지점을 알 수 없음"""
+        mark = Watermark("videos_list", "KR")
+
+        with pytest.raises(ValueError):
+            mark.pending_partitions(until=hour(2))
+
+    def test_daily_type_steps_by_day(self):
+        """날짜 단위 데이터 타입은 하루씩 나열"""
+        mark = Watermark("channels", "", watermark=BASE)
+
+        pending = mark.pending_partitions(until=BASE + timedelta(days=2))
+
+        assert pending == [BASE + timedelta(days=1), BASE + timedelta(days=2)]
+
+
+class TestAdvance:
+    """확인한 파티션 완료 여부로 watermark 갱신"""
+
+    def test_first_run_without_watermark(self):
+        """기존 watermark가 없으면 완료된 가장 최근 파티션이 watermark, 그 이전 미완료는 holes"""
+        mark = Watermark("videos_list", "KR")
+        complete = {hour(0): True, hour(1): False, hour(2): True}
+
+        advanced = mark.advance(complete, cutoff=hour(2))
+
+        assert advanced.watermark == hour(2)
+        assert advanced.holes == [hour(1)]
+
+    def test_first_run_with_nothing_complete(self):
+        """완료된 파티션이 없으면 watermark는 여전히 None (다음 실행도 start부터)"""
+        mark = Watermark("videos_list", "KR")
+
+        advanced = mark.advance({hour(0): False, hour(1): False}, cutoff=hour(1))
+
+        assert advanced.watermark is None
+        assert advanced.holes == []
+
+    def test_unsettled_partitions_do_not_move_watermark(self):
+        """cutoff 이후 파티션은 완료여도 watermark를 올리지 않고 holes에도 넣지 않음"""
+        mark = Watermark("videos_list", "KR", watermark=hour(3))
+        complete = {hour(4): True, hour(5): True, hour(6): False}
+
+        advanced = mark.advance(complete, cutoff=hour(4))
+
+        assert advanced.watermark == hour(4)
+        assert advanced.holes == []
+
+    def test_incomplete_after_watermark_is_not_a_hole(self):
+        """새 watermark 이후의 미완료 파티션은 다음 실행에서 어차피 나열되므로 holes가 아님"""
+        mark = Watermark("videos_list", "KR", watermark=hour(3))
+        complete = {hour(4): True, hour(5): False}
+
+        advanced = mark.advance(complete, cutoff=hour(5))
+
+        assert advanced.watermark == hour(4)
+        assert advanced.holes == []
+
+    def test_watermark_never_moves_backwards(self):
+        """이번에 확인한 파티션이 모두 이전이거나 미완료여도 watermark는 유지"""
+        mark = Watermark("videos_list", "KR", watermark=hour(5), holes=[hour(2)])
+        complete = {hour(2): True, hour(6): False}
+
+        advanced = mark.advance(complete, cutoff=hour(6))
+
+        assert advanced.watermark == hour(5)
+        assert advanced.holes == []
+
+    def test_unchecked_holes_are_kept(self):
+        """이번 실행에서 확인하지 않은 기존 holes는 그대로 남음"""
+        mark = Watermark("videos_list", "KR", watermark=hour(5), holes=[hour(1), hour(2)])
+        complete = {hour(2): True, hour(6): True}
+
+        advanced = mark.advance(complete, cutoff=hour(6))
+
+        assert advanced.watermark == hour(6)
+        assert advanced.holes == [hour(1)]
+
+    def test_rechecked_hole_still_incomplete_is_kept(self):
+        """다시 확인했지만 여전히 미완료인 hole은 유지되고 새 미완료 파티션이 추가됨"""
+        mark = Watermark("videos_list", "KR", watermark=hour(5), holes=[hour(2)])
+        complete = {hour(2): False, hour(6): False, hour(7): True}
+
+        advanced = mark.advance(complete, cutoff=hour(7))
+
+        assert advanced.watermark == hour(7)
+        assert advanced.holes == [hour(2), hour(6)]
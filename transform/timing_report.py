@@ -0,0 +1,90 @@
+"""
+Timing Report CLI - processed_files에 기록된 단계별 소요 시간을 데이터 타입별 p50/p95로 집계합니다.
+
+transform_handler가 파일마다 metadata["timings"]에 남긴 값을 읽습니다.
+(ledger_check, download, decompress, parse, category_lookup, map, write, ... / records, bytes_downloaded 등)
+배치 실행기로 처리된 파일과 측정 도입 이전 기록은 timings가 없어 건너뜁니다.
+
+Examples:
+    python timing_report.py --start-date=2026-01-12
+    python timing_report.py --start-date=2026-01-12 --end-date=2026-01-18 --data-types=videos_list
+    python timing_report.py --start-date=2026-01-12 --status=error --json
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.clients import get_supabase_client
+from app.core.ledger import ProcessedFileLedger
+from app.core.timing import format_timing_summary, summarize_timings
+from app.transformers import TRANSFORM_SPECS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """CLI 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Summarize per-stage transform timings")
+    parser.add_argument("--start-date", required=True, help="시작 날짜 파티션 (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="종료 날짜 (기본: 시작 날짜와 동일)")
+    parser.add_argument(
+        "--data-types",
+        default=",".join(TRANSFORM_SPECS.keys()),
+        help="쉼표 구분 데이터 타입 (기본: 전체)",
+    )
+    parser.add_argument("--status", choices=["success", "error", "all"], default="success", help="집계할 처리 결과")
+    parser.add_argument("--json", action="store_true", help="표 대신 JSON으로 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """메인 함수"""
+    args = parse_args(argv)
+
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        logger.error("SUPABASE_URL or SUPABASE_SERVICE_KEY is missing in .env")
+        return 1
+
+    data_types = [t.strip() for t in args.data_types.split(",") if t.strip()]
+    unknown = [t for t in data_types if t not in TRANSFORM_SPECS]
+    if unknown:
+        logger.error(f"Unknown data types: {unknown}")
+        return 1
+
+    ledger = ProcessedFileLedger(get_supabase_client())
+    statuses = None if args.status == "all" else [args.status]
+    end_date = args.end_date or args.start_date
+
+    rows = []
+    for data_type in data_types:
+        rows.extend(ledger.load_processed(
+            f"raw/youtube/{data_type}/", args.start_date, end_date,
+            statuses=statuses, columns="data_type, metadata",
+        ))
+    logger.info(f"Loaded {len(rows)} processed_files rows ({args.start_date} ~ {end_date})")
+
+    summary = summarize_timings(rows)
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print(format_timing_summary(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
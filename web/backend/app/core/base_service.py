@@ -78,6 +78,17 @@ class BaseService:
         
         return result.data, latest_time
     
+    @classmethod
+    async def get_latest_rollup(cls) -> Optional[Dict[str, Any]]:
+        """가장 최근 스냅샷의 시간별 집계 행 (agg_hourly_totals, transform이 적재 시 갱신)"""
+        result = supabase.table('agg_hourly_totals')\
+            .select('*')\
+            .order('snapshot_at', desc=True)\
+            .limit(1)\
+            .execute()
+        
+        return result.data[0] if result.data else None
+    
     @classmethod
     def clear_cache(cls):
         """캐시 초기화"""
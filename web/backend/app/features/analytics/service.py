@@ -2,7 +2,6 @@
 Analytics Service - 대시보드 분석 비즈니스 로직
 """
 from typing import Dict, List
-from datetime import datetime
 from app.core import supabase, BaseService
 
 
@@ -11,31 +10,23 @@ class AnalyticsService:
     
     @staticmethod
     async def get_overview_stats() -> Dict:
-        """오버뷰 통계"""
-        data, latest_time = await BaseService.get_latest_snapshot_data('*', 50)
+        """오버뷰 통계 (최신 스냅샷의 agg_hourly_totals 한 행)"""
+        totals = await BaseService.get_latest_rollup()
         
-        if not data:
+        if not totals:
             return {}
         
-        # 직접 데이터 사용 (불필요한 객체 생성 제거)
-        total_views = sum(v.get('view_count') or 0 for v in data)
-        total_likes = sum(v.get('like_count') or 0 for v in data)
-        total_comments = sum(v.get('comment_count') or 0 for v in data)
-        
-        engagement_rates = [v['engagement_rate'] for v in data if v.get('engagement_rate')]
-        avg_engagement = sum(engagement_rates) / len(engagement_rates) if engagement_rates else 0
-        
-        shorts_count = sum(1 for v in data if v.get('is_shorts'))
-        shorts_ratio = (shorts_count / len(data)) * 100 if data else 0
+        video_count = totals['video_count']
+        shorts_ratio = (totals['shorts_count'] / video_count) * 100 if video_count else 0
         
         return {
-            'total_videos': len(data),
-            'total_views': total_views,
-            'total_likes': total_likes,
-            'total_comments': total_comments,
-            'avg_engagement_rate': round(avg_engagement, 2),
+            'total_videos': video_count,
+            'total_views': totals['total_views'],
+            'total_likes': totals['total_likes'],
+            'total_comments': totals['total_comments'],
+            'avg_engagement_rate': round(totals['avg_engagement_rate'] or 0, 2),
             'shorts_ratio': round(shorts_ratio, 1),
-            'snapshot_at': latest_time.isoformat() if isinstance(latest_time, datetime) else latest_time
+            'snapshot_at': totals['snapshot_at']
         }
     
     @staticmethod
@@ -73,38 +64,21 @@ class AnalyticsService:
     
     @staticmethod
     async def get_hourly_trends(hours: int = 24) -> List[Dict]:
-        """시간별 트렌드 (최근 N시간)"""
-        result = supabase.table('fact_video_snapshots')\
-            .select('snapshot_at, view_count, like_count')\
+        """시간별 트렌드 (최근 N시간, 스냅샷별 집계 agg_hourly_totals)"""
+        result = supabase.table('agg_hourly_totals')\
+            .select('snapshot_at, avg_views, avg_likes')\
             .order('snapshot_at', desc=True)\
-            .limit(hours * 50)\
+            .limit(hours)\
             .execute()
         
         if not result.data:
             return []
         
-        hourly_map = {}
-        for row in result.data:
-            hour = row['snapshot_at'][:13]
-            if hour not in hourly_map:
-                hourly_map[hour] = {
-                    'time': hour,
-                    'total_views': 0,
-                    'total_likes': 0,
-                    'count': 0
-                }
-            
-            hourly_map[hour]['total_views'] += row['view_count'] or 0
-            hourly_map[hour]['total_likes'] += row['like_count'] or 0
-            hourly_map[hour]['count'] += 1
-        
-        trends = []
-        for hour, data in sorted(hourly_map.items()):
-            trends.append({
-                'time': hour,
-                'avg_views': int(data['total_views'] / data['count']),
-                'avg_likes': int(data['total_likes'] / data['count'])
-            })
-        
-        return trends[-hours:]
-
+        return [
+            {
+                'time': row['snapshot_at'][:13],
+                'avg_views': row['avg_views'],
+                'avg_likes': row['avg_likes']
+            }
+            for row in reversed(result.data)
+        ]
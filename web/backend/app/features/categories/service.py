@@ -3,7 +3,7 @@ Categories Service - 카테고리 비즈니스 로직
 """
 from typing import List, Dict
 from collections import defaultdict
-from app.core import BaseService
+from app.core import supabase, BaseService
 from .schemas import CategoryStats
 
 
@@ -15,51 +15,38 @@ class CategoryService:
     
     @staticmethod
     async def get_category_stats() -> List[CategoryStats]:
-        """카테고리별 통계 계산"""
-        # 최신 스냅샷 데이터 조회 (중복 쿼리 제거)
-        data, latest_time = await BaseService.get_latest_snapshot_data(
-            'category_name, view_count, engagement_rate, is_shorts', 
-            50
-        )
+        """카테고리별 통계 (최신 스냅샷의 agg_category_snapshots, transform이 적재 시 집계)"""
+        latest = await BaseService.get_latest_rollup()
         
-        if not data:
+        if not latest:
             return []
         
+        latest_time = latest['snapshot_at']
+        
         # 캐시 확인
-        cache_key = str(latest_time) if latest_time else 'none'
+        cache_key = str(latest_time)
         if cache_key in CategoryService._stats_cache:
             return CategoryService._stats_cache[cache_key]
         
-        # 이미 가져온 데이터 사용 (중복 쿼리 제거)
-        # 카테고리별 집계
-        category_map: Dict[str, dict] = defaultdict(lambda: {
-            'count': 0,
-            'total_views': 0,
-            'total_engagement': 0,
-            'shorts_count': 0
-        })
+        result = supabase.table('agg_category_snapshots')\
+            .select('category_name, video_count, avg_view_count, avg_engagement_rate, shorts_ratio')\
+            .eq('snapshot_at', latest_time)\
+            .execute()
         
-        for row in data:
-            cat = row.get('category_name') or '기타'
-            category_map[cat]['count'] += 1
-            category_map[cat]['total_views'] += row.get('view_count') or 0
-            category_map[cat]['total_engagement'] += row.get('engagement_rate') or 0
-            category_map[cat]['shorts_count'] += 1 if row.get('is_shorts') else 0
+        trends = await CategoryService._get_view_trends(latest_time)
         
-        # 통계 객체 생성
-        stats = []
-        for cat, cat_data in category_map.items():
-            if cat_data['count'] == 0:
-                continue
-            
-            stats.append(CategoryStats(
-                category_name=cat,
-                video_count=cat_data['count'],
-                avg_view_count=int(cat_data['total_views'] / cat_data['count']),
-                avg_engagement_rate=round(cat_data['total_engagement'] / cat_data['count'], 2),
-                shorts_ratio=round(cat_data['shorts_count'] / cat_data['count'] * 100, 1),
-                trend="+0%"  # TODO: 이전 스냅샷과 비교
-            ))
+        stats = [
+            CategoryStats(
+                category_name=row['category_name'],
+                video_count=row['video_count'],
+                avg_view_count=row['avg_view_count'],
+                avg_engagement_rate=round(row['avg_engagement_rate'], 2),
+                shorts_ratio=round(row['shorts_ratio'], 1),
+                trend=trends.get(row['category_name'], "+0%")
+            )
+            for row in result.data or []
+            if row['video_count']
+        ]
         
         # 비디오 수 기준 정렬
         stats.sort(key=lambda x: x.video_count, reverse=True)
@@ -69,6 +56,34 @@ class CategoryService:
         
         return stats
     
+    @staticmethod
+    async def _get_view_trends(snapshot_at: str) -> Dict[str, str]:
+        """
+        카테고리별 직전 스냅샷 대비 조회수 증가율 ("+12%")
+        
+        transform이 적재 시 저장한 view_delta를 합산하므로 이전 스냅샷과 조인하지 않습니다.
+        (직전 스냅샷이 없는 신규 진입 영상은 제외)
+        agg_category_snapshots와 같은 기준으로 트렌딩 상위 50위까지만 집계합니다.
+        """
+        result = supabase.table('fact_video_snapshots')\
+            .select('category_name, view_count, view_delta')\
+            .eq('snapshot_at', snapshot_at)\
+            .lte('trending_rank', 50)\
+            .not_.is_('view_delta', 'null')\
+            .execute()
+        
+        growth: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        for row in result.data or []:
+            cat = row.get('category_name') or '기타'
+            growth[cat][0] += row['view_delta']
+            growth[cat][1] += (row['view_count'] or 0) - row['view_delta']
+        
+        return {
+            cat: f"{delta / base * 100:+.0f}%"
+            for cat, (delta, base) in growth.items()
+            if base > 0
+        }
+    
     @staticmethod
     async def get_category_distribution() -> Dict[str, int]:
         """카테고리별 분포 (파이 차트용)"""
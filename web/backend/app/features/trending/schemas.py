@@ -26,6 +26,10 @@ class VideoSnapshot(BaseModel):
     hours_since_published: Optional[int] = None
     engagement_rate: Optional[float] = None
     view_velocity: Optional[float] = None
+    prev_rank: Optional[int] = None
+    rank_change: Optional[int] = None
+    view_delta: Optional[int] = None
+    minutes_since_prev: Optional[int] = None
     
     class Config:
         from_attributes = True
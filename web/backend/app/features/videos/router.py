@@ -1,6 +1,8 @@
 """
 Videos Router - 비디오 API 엔드포인트
 """
+from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, HTTPException
 from .service import VideoService
 from .schemas import VideoHistory
@@ -9,10 +11,14 @@ router = APIRouter(prefix="/api/videos", tags=["Videos"])
 
 
 @router.get("/{video_id}/history", response_model=VideoHistory)
-async def get_video_history(video_id: str):
-    """비디오 성장 히스토리 (시계열)"""
+async def get_video_history(
+    video_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+):
+    """비디오 성장 히스토리 (시계열, 보관 기간이 지난 날짜는 일별 포인트)"""
     try:
-        history = await VideoService.get_video_history(video_id)
+        history = await VideoService.get_video_history(video_id, start=start, end=end)
         
         if not history:
             raise HTTPException(status_code=404, detail="Video not found")
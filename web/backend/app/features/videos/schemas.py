@@ -15,6 +15,8 @@ class VideoHistoryPoint(BaseModel):
     comment_count: int
     view_growth: Optional[int] = None
     rank_change: Optional[int] = None
+    resolution: str = "hour"  # hour: 시간별 스냅샷, day: 보관 기간이 지나 일별로 접힌 날짜 (순위는 그날 최고 순위)
+    snapshot_count: int = 1
 
 
 class VideoHistory(BaseModel):
@@ -1,6 +1,7 @@
 """
 Videos Service - 비디오 상세 비즈니스 로직
 """
+from datetime import datetime
 from typing import Optional
 from app.core import supabase
 from .schemas import VideoHistory, VideoHistoryPoint
@@ -10,47 +11,82 @@ class VideoService:
     """비디오 상세 정보 서비스"""
     
     @staticmethod
-    async def get_video_history(video_id: str) -> Optional[VideoHistory]:
-        """비디오 성장 히스토리 (시계열)"""
-        result = supabase.table('fact_video_snapshots')\
-            .select('snapshot_at, trending_rank, view_count, like_count, comment_count, title, channel_name')\
-            .eq('video_id', video_id)\
-            .order('snapshot_at')\
-            .execute()
-        
-        if not result.data:
+    async def get_video_history(
+        video_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Optional[VideoHistory]:
+        """
+        비디오 성장 히스토리 (시계열)
+
+        최근(보관 기간 안)은 fact_video_snapshots의 시간별 포인트,
+        보관 기간이 지나 fact_video_daily로 접힌 날짜는 일별 포인트로 이어 붙입니다.
+        """
+        hourly_query = supabase.table('fact_video_snapshots')\
+            .select('snapshot_at, trending_rank, view_count, like_count, comment_count, title, channel_name, view_delta, rank_change')\
+            .eq('video_id', video_id)
+        daily_query = supabase.table('fact_video_daily')\
+            .select('day, last_snapshot_at, best_rank, first_view_count, last_view_count, like_count, comment_count, '
+                    'title, channel_name, view_delta, rank_change, snapshot_count')\
+            .eq('video_id', video_id)
+        if start:
+            hourly_query = hourly_query.gte('snapshot_at', start.isoformat())
+            daily_query = daily_query.gte('day', start.date().isoformat())
+        if end:
+            hourly_query = hourly_query.lt('snapshot_at', end.isoformat())
+            daily_query = daily_query.lte('day', end.date().isoformat())
+
+        hourly = hourly_query.order('snapshot_at').execute().data or []
+        daily = daily_query.order('day').execute().data or []
+
+        # 같은 날짜에 시간별 행이 있으면 (재처리 후 아직 접히지 않은 경우) 시간별 행을 씀
+        hourly_days = {s['snapshot_at'][:10] for s in hourly}
+        daily = [d for d in daily if d['day'] not in hourly_days]
+
+        if not hourly and not daily:
             return None
-        
-        # 히스토리 포인트 생성
-        history_points = []
-        for i, snapshot in enumerate(result.data):
-            point = VideoHistoryPoint(
+
+        # 히스토리 포인트 생성 (일별 포인트의 순위는 그날 최고 순위, 조회수는 그날 마지막 값)
+        points = []
+        for day in daily:
+            points.append((day['first_view_count'], day, VideoHistoryPoint(
+                snapshot_at=day['last_snapshot_at'],
+                trending_rank=day['best_rank'],
+                view_count=day['last_view_count'],
+                like_count=day['like_count'],
+                comment_count=day['comment_count'],
+                view_growth=day.get('view_delta'),
+                rank_change=day.get('rank_change'),
+                resolution='day',
+                snapshot_count=day['snapshot_count']
+            )))
+        for snapshot in hourly:
+            # 직전 스냅샷 대비 변화량은 transform이 적재 시 계산해 둔 값 (첫 등장이면 None)
+            points.append((snapshot['view_count'], snapshot, VideoHistoryPoint(
                 snapshot_at=snapshot['snapshot_at'],
                 trending_rank=snapshot['trending_rank'],
                 view_count=snapshot['view_count'],
                 like_count=snapshot['like_count'],
-                comment_count=snapshot['comment_count']
-            )
-            
-            # 성장률 계산
-            if i > 0:
-                prev = result.data[i-1]
-                point.view_growth = snapshot['view_count'] - prev['view_count']
-                point.rank_change = prev['trending_rank'] - snapshot['trending_rank']
-            
-            history_points.append(point)
-        
+                comment_count=snapshot['comment_count'],
+                view_growth=snapshot.get('view_delta'),
+                rank_change=snapshot.get('rank_change')
+            )))
+        points.sort(key=lambda p: p[2].snapshot_at)
+        history_points = [p[2] for p in points]
+
         # 인사이트 계산
-        first = result.data[0]
-        last = result.data[-1]
-        
+        first_views = points[0][0]
+        last = points[-1][1]
+        total_view_growth = history_points[-1].view_count - first_views
+        hours_in_trending = sum(p.snapshot_count for p in history_points)
+
         insights = {
-            'peak_rank': min([s['trending_rank'] for s in result.data]),
-            'total_view_growth': last['view_count'] - first['view_count'],
-            'hours_in_trending': len(result.data),
-            'avg_hourly_views': int((last['view_count'] - first['view_count']) / len(result.data)) if len(result.data) > 0 else 0
+            'peak_rank': min([p.trending_rank for p in history_points]),
+            'total_view_growth': total_view_growth,
+            'hours_in_trending': hours_in_trending,
+            'avg_hourly_views': int(total_view_growth / hours_in_trending) if hours_in_trending > 0 else 0
         }
-        
+
         return VideoHistory(
             video_id=video_id,
             title=last['title'],
@@ -58,4 +94,3 @@ class VideoService:
             history=history_points,
             insights=insights
         )
-
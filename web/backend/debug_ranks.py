@@ -39,26 +39,25 @@ async def check_anomalies():
     print("\n=== 2. Checking Other Tables ===")
     
     # Check Comments
-    print("\n--- Fact Comments Sample (Latest) ---")
-    comments = supabase.table('fact_comments')\
-        .select('comment_id, collected_at')\
-        .order('collected_at', desc=True)\
+    print("\n--- Dim Comments Sample (Latest) ---")
+    comments = supabase.table('dim_comments')\
+        .select('comment_id, last_seen_at')\
+        .order('last_seen_at', desc=True)\
         .limit(10)\
         .execute()
         
-    # Check for duplicate comment_ids in recent batch
+    # Comments seen in the latest batch (dim_comments keeps one row per comment_id)
     if comments.data:
-        last_time = comments.data[0]['collected_at']
+        last_time = comments.data[0]['last_seen_at']
         print(f"Latest Comment Time: {last_time}")
-        recent_comments = supabase.table('fact_comments')\
-            .select('comment_id')\
-            .eq('collected_at', last_time)\
+        recent_comments = supabase.table('dim_comments')\
+            .select('comment_id, first_seen_at')\
+            .eq('last_seen_at', last_time)\
             .execute()
             
-        c_ids = [c['comment_id'] for c in recent_comments.data]
-        dups = [item for item, count in Counter(c_ids).items() if count > 1]
-        print(f"Total Comments in batch: {len(c_ids)}")
-        print(f"Duplicate Comment IDs found: {len(dups)}")
+        new_comments = [c for c in recent_comments.data if c['first_seen_at'] == last_time]
+        print(f"Total Comments in batch: {len(recent_comments.data)}")
+        print(f"First seen in batch: {len(new_comments)}")
     else:
         print("No comments found.")
 
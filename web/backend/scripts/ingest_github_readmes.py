@@ -0,0 +1,292 @@
+"""
+GitHub README 증분 인덱싱 스크립트
+github_collector가 GCS에 적재한 README.md를 읽어서 knowledge_embeddings에 반영합니다.
+
+동작 방식:
+    1. raw/github/repos/ 하위의 README.md 목록만 조회 (본문 다운로드 없음)
+    2. 리포지토리별 최신 README의 md5를 기존 인덱스(metadata.readme_md5)와 비교
+    3. 변경된 README만 다운로드 → chunk_markdown으로 분할
+    4. content_hash로 이미 저장된 청크는 건너뛰고 새 청크만 일괄 임베딩
+    5. content_hash 기준 upsert + 더 이상 존재하지 않는 청크 삭제
+       (청크가 하나도 없는 README는 빈 표시 행으로 md5만 기록해 다음 실행에서 다시 받지 않음)
+
+README가 하나도 바뀌지 않았다면 목록 조회 외에는 다운로드/임베딩/쓰기를 하지 않습니다.
+
+사용법:
+    cd web/backend
+    python -m scripts.ingest_github_readmes
+    python -m scripts.ingest_github_readmes --repo apache/airflow --dry-run
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# 프로젝트 루트 경로 설정
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# .env 파일 경로 명시적 지정 (scripts 폴더의 상위 = backend 폴더)
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+from google.cloud import storage
+
+from app.core import supabase
+from app.features.chat.utils.embeddings import chunk_markdown, generate_embeddings_batch
+
+# GCS 설정 (github_collector와 동일한 환경 변수 이름)
+GCP_PROJECT_ID = os.getenv("GCP_PROJECT_ID")
+GCS_BUCKET_NAME = os.getenv("GITHUB_GCS_BUCKET_NAME") or os.getenv("GCS_BUCKET_NAME")
+
+README_PREFIX = "raw/github/repos/"
+SOURCE_TYPE = "github_readme"
+TABLE_NAME = "knowledge_embeddings"
+PAGE_SIZE = 1000
+
+# raw/github/repos/repo=owner_repo/date=YYYY-MM-DD/hour=HH/README.md
+README_PATH_PATTERN = re.compile(
+    r"repo=(?P<repo>[^/]+)/date=(?P<date>\d{4}-\d{2}-\d{2})/hour=(?P<hour>\d{2})/README\.md$"
+)
+
+
+def content_hash(repo: str, content: str) -> str:
+    """청크 식별용 해시 (같은 내용이라도 리포지토리가 다르면 별도 행)"""
+    return hashlib.sha256(f"{repo}\n{content}".encode("utf-8")).hexdigest()
+
+
+def list_latest_readmes(bucket, repo_filter: Optional[str] = None) -> Dict[str, storage.Blob]:
+    """
+    리포지토리별 최신 README blob을 찾습니다.
+
+    목록 조회 결과에 md5가 포함되어 있으므로 본문은 다운로드하지 않습니다.
+    """
+    prefix = README_PREFIX
+    if repo_filter:
+        prefix = f"{README_PREFIX}repo={repo_filter.replace('/', '_')}/"
+
+    latest: Dict[str, storage.Blob] = {}
+    for blob in bucket.list_blobs(prefix=prefix, match_glob="**/README.md"):
+        match = README_PATH_PATTERN.search(blob.name)
+        if not match:
+            continue
+
+        repo = match.group("repo")
+        # date=/hour= 파티션은 사전순 비교가 곧 시간순 비교
+        if repo not in latest or blob.name > latest[repo].name:
+            latest[repo] = blob
+
+    return latest
+
+
+def load_indexed_state() -> Dict[str, Dict[str, object]]:
+    """
+    이미 인덱싱된 README 청크 정보를 리포지토리별로 조회합니다. (임베딩 벡터 제외)
+
+    Returns:
+        {repo: {"readme_md5": str (행마다 다르면 None), "hashes": set}}
+    """
+    state: Dict[str, Dict[str, object]] = {}
+    offset = 0
+
+    while True:
+        result = supabase.table(TABLE_NAME)\
+            .select("content_hash, metadata")\
+            .eq("metadata->>source_type", SOURCE_TYPE)\
+            .order("id")\
+            .range(offset, offset + PAGE_SIZE - 1)\
+            .execute()
+
+        rows = result.data or []
+        for row in rows:
+            metadata = row.get("metadata") or {}
+            repo = metadata.get("repo_key")
+            if not repo:
+                continue
+            entry = state.setdefault(repo, {"readme_md5": None, "hashes": set(), "md5s": set()})
+            entry["hashes"].add(row.get("content_hash"))
+            entry["md5s"].add(metadata.get("readme_md5"))
+
+        if len(rows) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
+
+    # 행마다 readme_md5가 다르면 이전 실행이 중간에 실패한 것이므로 None으로 두어 다시 인덱싱
+    for entry in state.values():
+        md5s = entry.pop("md5s")
+        entry["readme_md5"] = next(iter(md5s)) if len(md5s) == 1 else None
+
+    return state
+
+
+def load_repo_metadata(bucket, readme_blob_name: str) -> dict:
+    """README와 같은 파티션의 metadata.json.gz(리포지토리 메타데이터)를 읽습니다."""
+    meta_path = readme_blob_name.rsplit("/", 1)[0] + "/metadata.json.gz"
+    try:
+        content = bucket.blob(meta_path).download_as_bytes()
+        return json.loads(gzip.decompress(content))
+    except Exception as e:
+        print(f"   ⚠️ 메타데이터 로드 실패 ({meta_path}): {e}")
+        return {}
+
+
+def build_rows(repo_key: str, blob: storage.Blob, readme: str, repo_meta: dict) -> List[dict]:
+    """README를 청크로 분할하고 knowledge_embeddings 행(임베딩 제외)을 만듭니다."""
+    full_name = repo_meta.get("full_name") or repo_key.replace("_", "/", 1)
+    rows = []
+    seen: Set[str] = set()
+
+    for i, chunk in enumerate(chunk_markdown(readme)):
+        chunk_hash = content_hash(repo_key, chunk["content"])
+        if chunk_hash in seen:
+            continue
+        seen.add(chunk_hash)
+
+        rows.append({
+            "content": chunk["content"],
+            "content_hash": chunk_hash,
+            "metadata": {
+                "source": f"github:{full_name}",
+                "source_type": SOURCE_TYPE,
+                "repo": full_name,
+                "repo_key": repo_key,
+                "heading": chunk["heading"],
+                "chunk_index": i,
+                "readme_md5": blob.md5_hash,
+                "blob_path": blob.name,
+                "stars": repo_meta.get("stars"),
+                "language": repo_meta.get("language"),
+                "topics": repo_meta.get("topics", []),
+                "url": repo_meta.get("url"),
+            },
+        })
+
+    return rows
+
+
+def build_empty_marker(repo_key: str, blob: storage.Blob) -> dict:
+    """
+    청크가 없는 README의 표시 행 (임베딩 없음)
+
+    본문이 비어 있어 벡터/텍스트 검색에는 걸리지 않고, readme_md5만 남겨 같은 README를 다시 받지 않게 합니다.
+    README에 청크가 생기면 stale 행으로 삭제됩니다.
+    """
+    return {
+        "content": "",
+        "content_hash": content_hash(repo_key, ""),
+        "metadata": {
+            "source_type": SOURCE_TYPE,
+            "repo_key": repo_key,
+            "readme_md5": blob.md5_hash,
+            "blob_path": blob.name,
+            "empty": True,
+        },
+    }
+
+
+async def index_repo(
+    bucket,
+    repo_key: str,
+    blob: storage.Blob,
+    indexed_hashes: Set[str],
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """변경된 리포지토리 하나를 재인덱싱합니다. 새 청크만 임베딩합니다."""
+    readme = blob.download_as_bytes().decode("utf-8", errors="replace")
+    repo_meta = load_repo_metadata(bucket, blob.name)
+    rows = build_rows(repo_key, blob, readme, repo_meta)
+    if not rows:
+        print("   청크 없음 → md5만 기록")
+        rows = [build_empty_marker(repo_key, blob)]
+
+    new_rows = [r for r in rows if r["content_hash"] not in indexed_hashes]
+    kept_rows = [r for r in rows if r["content_hash"] in indexed_hashes]
+    current_hashes = {r["content_hash"] for r in rows}
+    stale_hashes = [h for h in indexed_hashes if h not in current_hashes]
+    embedded = sum(1 for r in new_rows if r["content"])
+
+    print(f"   청크 {len(rows)}개 (신규 {len(new_rows)}, 유지 {len(kept_rows)}, 삭제 {len(stale_hashes)})")
+
+    if dry_run:
+        return {"embedded": embedded, "updated": len(kept_rows), "deleted": len(stale_hashes)}
+
+    # 오래된 청크를 먼저 삭제 (삭제가 실패하면 남은 행의 readme_md5가 이전 값이라 다음 실행에서 다시 처리)
+    if stale_hashes:
+        supabase.table(TABLE_NAME).delete().in_("content_hash", stale_hashes).execute()
+
+    if new_rows:
+        # 같은 내용의 청크는 한 번만 임베딩 (content_hash에는 repo가 포함되므로 본문 기준으로 재중복 제거)
+        # 빈 표시 행은 임베딩하지 않음 (embedding NULL)
+        unique_contents = list(dict.fromkeys(r["content"] for r in new_rows if r["content"]))
+        vectors = await generate_embeddings_batch(unique_contents) if unique_contents else []
+        vector_by_content = dict(zip(unique_contents, vectors))
+
+        for row in new_rows:
+            row["embedding"] = vector_by_content.get(row["content"])
+
+        supabase.table(TABLE_NAME).upsert(new_rows, on_conflict="content_hash").execute()
+
+    if kept_rows:
+        # 임베딩은 그대로 두고 메타데이터(readme_md5, chunk_index 등)만 갱신
+        supabase.table(TABLE_NAME).upsert(kept_rows, on_conflict="content_hash").execute()
+
+    return {"embedded": embedded, "updated": len(kept_rows), "deleted": len(stale_hashes)}
+
+
+async def main(repo_filter: Optional[str] = None, dry_run: bool = False):
+    """메인 실행 함수"""
+    print("=" * 50)
+    print("🚀 GitHub README 증분 인덱싱 시작")
+    print("=" * 50)
+
+    if not GCS_BUCKET_NAME:
+        raise ValueError("GCS_BUCKET_NAME must be set in .env")
+
+    storage_client = storage.Client(project=GCP_PROJECT_ID)
+    bucket = storage_client.bucket(GCS_BUCKET_NAME)
+
+    latest = list_latest_readmes(bucket, repo_filter)
+    state = load_indexed_state()
+    print(f"\n📚 README {len(latest)}개 발견, 인덱싱된 리포지토리 {len(state)}개")
+
+    changed = {
+        repo: blob for repo, blob in latest.items()
+        if state.get(repo, {}).get("readme_md5") != blob.md5_hash
+    }
+
+    if not changed:
+        print("\n✅ 변경된 README가 없습니다. 작업을 종료합니다.")
+        return
+
+    totals = {"embedded": 0, "updated": 0, "deleted": 0}
+    for repo, blob in sorted(changed.items()):
+        print(f"\n📄 처리 중: {repo} ({blob.name})")
+        try:
+            indexed_hashes = state.get(repo, {}).get("hashes", set())
+            counts = await index_repo(bucket, repo, blob, indexed_hashes, dry_run=dry_run)
+            for key, value in counts.items():
+                totals[key] += value
+        except Exception as e:
+            print(f"   ❌ 오류: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"✅ 인덱싱 완료! 변경 리포지토리 {len(changed)}개, "
+          f"임베딩 {totals['embedded']}개, 갱신 {totals['updated']}개, 삭제 {totals['deleted']}개"
+          f"{' (dry-run)' if dry_run else ''}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GitHub README 증분 인덱싱")
+    parser.add_argument("--repo", help="특정 리포지토리만 처리 (예: apache/airflow)")
+    parser.add_argument("--dry-run", action="store_true", help="쓰기 없이 변경 대상만 출력")
+    args = parser.parse_args()
+
+    asyncio.run(main(repo_filter=args.repo, dry_run=args.dry_run))
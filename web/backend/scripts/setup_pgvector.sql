@@ -37,7 +37,15 @@ CREATE INDEX IF NOT EXISTS knowledge_embeddings_metadata_idx
 ON knowledge_embeddings 
 USING GIN (metadata);
 
--- 5. 유사도 검색 함수 생성
+-- 5. 증분 인덱싱용 청크 해시 (scripts/ingest_github_readmes.py)
+-- 같은 청크를 다시 임베딩하지 않도록 content_hash 기준으로 upsert 합니다.
+-- 손으로 작성한 knowledge_base 문서는 NULL이므로 UNIQUE 제약에 걸리지 않습니다.
+ALTER TABLE knowledge_embeddings ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS knowledge_embeddings_content_hash_idx
+ON knowledge_embeddings (content_hash);
+
+-- 6. 유사도 검색 함수 생성
 CREATE OR REPLACE FUNCTION match_knowledge(
     query_embedding vector(768),
     match_threshold float DEFAULT 0.7,
@@ -65,7 +73,7 @@ BEGIN
 END;
 $$;
 
--- 6. RLS(Row Level Security) 설정 (선택사항)
+-- 7. RLS(Row Level Security) 설정 (선택사항)
 -- 공개 읽기 허용
 ALTER TABLE knowledge_embeddings ENABLE ROW LEVEL SECURITY;
 
@@ -0,0 +1,45 @@
+"""
+Embeddings 유틸리티 테스트 - chunk_text / chunk_markdown
+"""
+from app.features.chat.utils.embeddings import chunk_text, chunk_markdown
+
+
+class TestChunkText:
+    """긴 텍스트 분할 테스트"""
+
+    def test_short_text_returns_single_chunk(self):
+        """chunk_size 이하 텍스트는 그대로 반환"""
+        assert chunk_text("짧은 문장", chunk_size=100) == ["짧은 문장"]
+
+    def test_long_text_terminates_and_covers_end(self):
+        """긴 텍스트도 유한 개의 청크로 분할되고 마지막 단어를 포함"""
+        text = " ".join(f"word{i}" for i in range(500))
+
+        chunks = chunk_text(text, chunk_size=200, overlap=20)
+
+        assert 1 < len(chunks) < 50
+        assert all(len(c) <= 200 for c in chunks)
+        assert chunks[-1].endswith("word499")
+
+
+class TestChunkMarkdown:
+    """마크다운 섹션 분할 테스트"""
+
+    def test_split_by_heading(self):
+        """헤딩 단위로 섹션이 나뉨"""
+        content = "# 소개\n본문 A\n## 설치\n본문 B"
+
+        chunks = chunk_markdown(content)
+
+        assert [c["heading"] for c in chunks] == ["소개", "설치"]
+
+    def test_large_section_is_split_into_parts(self):
+        """max_chunk_size를 넘는 섹션은 Part 단위로 추가 분할"""
+        content = "# Usage\n" + ("lorem ipsum " * 300) + "\n# Last\n" + ("dolor sit " * 300)
+
+        chunks = chunk_markdown(content, max_chunk_size=800)
+
+        headings = [c["heading"] for c in chunks]
+        assert "Usage (Part 2)" in headings
+        assert "Last (Part 2)" in headings
+        assert all(len(c["content"]) <= 800 for c in chunks)
@@ -13,10 +13,19 @@ from src.storage.gcs import GCSStorage
 class BaseCollector(ABC):
     """수집기 베이스 클래스"""
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        youtube: YouTubeClient | None = None,
+        storage: GCSStorage | None = None,
+    ):
+        """
+        Args:
+            youtube, storage: 대체 클라이언트 (오프라인 하네스의 가짜 API/로컬 버킷). 없으면 설정으로 생성
+        """
         self.config = config
-        self.youtube = YouTubeClient(config.youtube)
-        self.storage = GCSStorage(config.gcp)
+        self.youtube = youtube or YouTubeClient(config.youtube)
+        self.storage = storage or GCSStorage(config.gcp)
         self.run_id = self._generate_run_id()
         self.logger = logging.getLogger(self.__class__.__name__)
 
@@ -11,10 +11,16 @@ from src.config import GCPConfig
 class GCSStorage:
     """GCS 스토리지 클라이언트"""
 
-    def __init__(self, config: GCPConfig):
+    def __init__(self, config: GCPConfig, bucket: storage.Bucket | None = None):
+        """
+        Args:
+            bucket: 이미 만든 버킷 핸들 (같은 인터페이스의 로컬 버킷 포함). 없으면 설정으로 생성
+        """
         self.config = config
-        self._client = storage.Client(project=config.project_id)
-        self._bucket = self._client.bucket(config.bucket_name)
+        if bucket is None:
+            self._client = storage.Client(project=config.project_id)
+            bucket = self._client.bucket(config.bucket_name)
+        self._bucket = bucket
 
     def upload_json(
         self,